@@ -18,6 +18,7 @@ from routers.optimize import router as optimize_router
 from routers.system import router as system_router
 from routers.templates import router as templates_router
 from services import job_runner
+from services.admission import AdmissionController
 
 
 def _get_allowed_origins(settings: app_config.Settings) -> list[str]:
@@ -80,6 +81,8 @@ def create_app() -> FastAPI:
 
     install_exception_handlers(app)
 
+    app.state.admission = AdmissionController.from_settings(settings)
+
     job_backend = job_runner.create_backend(settings)
     job_runner.configure(job_backend)
     app.state.job_backend = job_backend
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+from pathlib import Path
+
+from demo.print_utils import color, print_table
+from schemas import OptimizationRequest
+from services.cost_estimator import FEATURE_NAMES, fit, plan_features, total_ms
+
+# Timed-out or failed solves do not tell how long the plan needs
+_USABLE_STATUSES = {"ok", "infeasible"}
+
+
+def _samples(roots: list[str]) -> list[tuple[dict[str, int], float]]:
+    """Pairs of requests/<job_id>.json and results/<job_id>.json (the job
+    payload bucket layout, e.g. after ``aws s3 sync``)."""
+    samples: list[tuple[dict[str, int], float]] = []
+    for raw in roots:
+        root = Path(raw)
+        for result_path in sorted((root / "results").glob("*.json")):
+            request_path = root / "requests" / result_path.name
+            if not request_path.exists():
+                continue
+            result = json.loads(result_path.read_text(encoding="utf-8"))
+            if result.get("status") not in _USABLE_STATUSES:
+                continue
+            ms = total_ms(result.get("stats"))
+            req = OptimizationRequest.model_validate_json(
+                request_path.read_text(encoding="utf-8")
+            )
+            if ms is None or req.plan is None:
+                continue
+            samples.append((plan_features(req.plan), ms))
+    return samples
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Fit the solve-cost estimator on logged job timings"
+    )
+    parser.add_argument(
+        "roots", nargs="+", help="Directories containing requests/ and results/"
+    )
+    parser.add_argument(
+        "--out", default="cost_model.json", help="Output path (COST_MODEL_PATH)"
+    )
+    args = parser.parse_args()
+
+    samples = _samples(args.roots)
+    model = fit(samples)
+    Path(args.out).write_text(
+        json.dumps(model.to_json(), indent=2) + "\n", encoding="utf-8"
+    )
+
+    print(color(f"{len(samples)} samples, sigma={model.sigma:.3f}", kind="title"))
+    print_table(
+        ["feature", "coef"],
+        [[name, f"{c:.4f}"] for name, c in zip(FEATURE_NAMES, model.coef, strict=True)],
+    )
+    within = sum(
+        1
+        for features, ms in samples
+        if abs(math.log(model.predict(features)[0] / max(1.0, ms))) <= math.log(2)
+    )
+    print(f"within 2x of actual: {within}/{len(samples)}")
+    print(f"wrote {args.out}")
+
+
+if __name__ == "__main__":
+    main()
@@ -18,6 +18,9 @@ class Settings:
     sync_timeout_ms: int
     async_timeout_s: int
     cp_num_workers: int
+    cp_cpu_budget: int
+    cp_min_workers: int
+    solve_max_concurrent: int
     job_backend: str
     redis_url: str | None
     rate_limit_enabled: bool
@@ -29,6 +32,35 @@ class Settings:
     job_queue_url: str | None
     job_queue_arn: str | None
     jobs_ttl_days: int
+    solver_capture: str | None
+    result_cache_enabled: bool
+    result_cache_max_mb: int
+    result_cache_persist: bool
+    idempotency_window_s: int
+    jobs_idem_index_name: str | None
+    job_priority_aging_s: int
+    job_priority_limits: str
+    job_priority_queue_url: str | None
+    job_priority_threshold: int
+    job_process_workers: int
+    job_process_memory_mb: int
+    admission_enabled: bool
+    admission_max_slots: int
+    admission_queue: int
+    admission_queue_timeout_ms: int
+    admission_slot_variables: int
+    admission_overflow: str
+    cost_model_path: str | None
+    sync_cost_routing: str
+    greedy_hint: bool
+    granularity_max_variables: int
+    lns_round_ms: int
+    lns_parallel: int
+    solver_portfolio: tuple[str, ...]
+    solver_portfolio_min_variables: int
+    frontier_store_max: int
+    frontier_parallel: int
+    scenario_parallel: int
 
 
 def _csv(name: str) -> tuple[str, ...]:
@@ -92,6 +124,9 @@ def load_settings() -> Settings:
         sync_timeout_ms=_bounded_int("SYNC_TIMEOUT_MS", 30000, 100, 100000),
         async_timeout_s=_bounded_int("ASYNC_TIMEOUT_S", 1800, 10, 24 * 3600),
         cp_num_workers=_bounded_int("CP_NUM_WORKERS", 0, 0, 64),
+        cp_cpu_budget=_bounded_int("CP_CPU_BUDGET", 0, 0, 1024),
+        cp_min_workers=_bounded_int("CP_MIN_WORKERS", 4, 1, 64),
+        solve_max_concurrent=_bounded_int("SOLVE_MAX_CONCURRENT", 0, 0, 1024),
         job_backend=(
             os.getenv("JOB_BACKEND", "inmemory").strip().lower() or "inmemory"
         ),
@@ -119,6 +154,67 @@ def load_settings() -> Settings:
             arn if (arn := os.getenv("JOB_QUEUE_ARN", "").strip()) else None
         ),
         jobs_ttl_days=_bounded_int("JOBS_TTL_DAYS", 365, 1, 3650),
+        solver_capture=(
+            target if (target := os.getenv("SOLVER_CAPTURE", "").strip()) else None
+        ),
+        result_cache_enabled=os.getenv("RESULT_CACHE_ENABLED", "true").strip().lower()
+        in {"1", "true", "yes", "on"},
+        result_cache_max_mb=_bounded_int("RESULT_CACHE_MAX_MB", 64, 1, 4096),
+        result_cache_persist=os.getenv("RESULT_CACHE_PERSIST", "false").strip().lower()
+        in {"1", "true", "yes", "on"},
+        idempotency_window_s=_bounded_int(
+            "IDEMPOTENCY_WINDOW_S", 24 * 3600, 0, 7 * 24 * 3600
+        ),
+        jobs_idem_index_name=(
+            name if (name := os.getenv("JOBS_IDEM_INDEX_NAME", "").strip()) else None
+        ),
+        job_priority_aging_s=_bounded_int("JOB_PRIORITY_AGING_S", 60, 0, 24 * 3600),
+        job_priority_limits=os.getenv("JOB_PRIORITY_LIMITS", "").strip(),
+        job_priority_queue_url=(
+            url if (url := os.getenv("JOB_PRIORITY_QUEUE_URL", "").strip()) else None
+        ),
+        job_priority_threshold=_bounded_int("JOB_PRIORITY_THRESHOLD", 2, -1000, 1000),
+        job_process_workers=_bounded_int("JOB_PROCESS_WORKERS", 0, 0, 256),
+        job_process_memory_mb=_bounded_int("JOB_PROCESS_MEMORY_MB", 0, 0, 1024 * 1024),
+        admission_enabled=os.getenv("ADMISSION_ENABLED", "true").strip().lower()
+        in {"1", "true", "yes", "on"},
+        admission_max_slots=_bounded_int("ADMISSION_MAX_SLOTS", 0, 0, 1024),
+        admission_queue=_bounded_int("ADMISSION_QUEUE", 8, 0, 1000),
+        admission_queue_timeout_ms=_bounded_int(
+            "ADMISSION_QUEUE_TIMEOUT_MS", 2000, 0, 60000
+        ),
+        admission_slot_variables=_bounded_int(
+            "ADMISSION_SLOT_VARIABLES", 20000, 1, 10_000_000
+        ),
+        admission_overflow=(
+            mode
+            if (mode := os.getenv("ADMISSION_OVERFLOW", "reject").strip().lower())
+            in {"reject", "async"}
+            else "reject"
+        ),
+        cost_model_path=(
+            path if (path := os.getenv("COST_MODEL_PATH", "").strip()) else None
+        ),
+        sync_cost_routing=(
+            mode
+            if (mode := os.getenv("SYNC_COST_ROUTING", "off").strip().lower())
+            in {"off", "reject", "async"}
+            else "off"
+        ),
+        greedy_hint=os.getenv("GREEDY_HINT", "true").strip().lower()
+        in {"1", "true", "yes", "on"},
+        granularity_max_variables=_bounded_int(
+            "GRANULARITY_MAX_VARIABLES", 20000, 1, 10_000_000
+        ),
+        lns_round_ms=_bounded_int("LNS_ROUND_MS", 2000, 100, 600_000),
+        lns_parallel=_bounded_int("LNS_PARALLEL", 2, 1, 64),
+        solver_portfolio=_csv("SOLVER_PORTFOLIO"),
+        solver_portfolio_min_variables=_bounded_int(
+            "SOLVER_PORTFOLIO_MIN_VARIABLES", 20000, 0, 10_000_000
+        ),
+        frontier_store_max=_bounded_int("FRONTIER_STORE_MAX", 16, 1, 1000),
+        frontier_parallel=_bounded_int("FRONTIER_PARALLEL", 2, 1, 64),
+        scenario_parallel=_bounded_int("SCENARIO_PARALLEL", 2, 1, 64),
     )
 
 
@@ -154,6 +250,18 @@ def cp_num_workers() -> int:
     return settings().cp_num_workers
 
 
+def cp_cpu_budget() -> int:
+    return settings().cp_cpu_budget
+
+
+def cp_min_workers() -> int:
+    return settings().cp_min_workers
+
+
+def solve_max_concurrent() -> int:
+    return settings().solve_max_concurrent
+
+
 def async_timeout_s() -> int:
     return settings().async_timeout_s
 
@@ -200,3 +308,119 @@ def job_queue_arn() -> str | None:
 
 def jobs_ttl_days() -> int:
     return settings().jobs_ttl_days
+
+
+def solver_capture() -> str | None:
+    return settings().solver_capture
+
+
+def result_cache_enabled() -> bool:
+    return settings().result_cache_enabled
+
+
+def result_cache_max_mb() -> int:
+    return settings().result_cache_max_mb
+
+
+def result_cache_persist() -> bool:
+    return settings().result_cache_persist
+
+
+def idempotency_window_s() -> int:
+    return settings().idempotency_window_s
+
+
+def jobs_idem_index_name() -> str | None:
+    return settings().jobs_idem_index_name
+
+
+def job_priority_aging_s() -> int:
+    return settings().job_priority_aging_s
+
+
+def job_priority_limits() -> str:
+    return settings().job_priority_limits
+
+
+def job_priority_queue_url() -> str | None:
+    return settings().job_priority_queue_url
+
+
+def job_priority_threshold() -> int:
+    return settings().job_priority_threshold
+
+
+def job_process_workers() -> int:
+    return settings().job_process_workers
+
+
+def job_process_memory_mb() -> int:
+    return settings().job_process_memory_mb
+
+
+def admission_enabled() -> bool:
+    return settings().admission_enabled
+
+
+def admission_max_slots() -> int:
+    return settings().admission_max_slots
+
+
+def admission_queue() -> int:
+    return settings().admission_queue
+
+
+def admission_queue_timeout_ms() -> int:
+    return settings().admission_queue_timeout_ms
+
+
+def admission_slot_variables() -> int:
+    return settings().admission_slot_variables
+
+
+def admission_overflow() -> str:
+    return settings().admission_overflow
+
+
+def cost_model_path() -> str | None:
+    return settings().cost_model_path
+
+
+def sync_cost_routing() -> str:
+    return settings().sync_cost_routing
+
+
+def greedy_hint() -> bool:
+    return settings().greedy_hint
+
+
+def granularity_max_variables() -> int:
+    return settings().granularity_max_variables
+
+
+def lns_round_ms() -> int:
+    return settings().lns_round_ms
+
+
+def lns_parallel() -> int:
+    return settings().lns_parallel
+
+
+def solver_portfolio() -> tuple[str, ...]:
+    return settings().solver_portfolio
+
+
+def solver_portfolio_min_variables() -> int:
+    return settings().solver_portfolio_min_variables
+
+
+def frontier_store_max() -> int:
+    return settings().frontier_store_max
+
+
+def frontier_parallel() -> int:
+    return settings().frontier_parallel
+
+
+def scenario_parallel() -> int:
+    return settings().scenario_parallel
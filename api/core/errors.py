@@ -28,6 +28,7 @@ def _problem(
     *,
     type_: str = "about:blank",
     extras: dict[str, Any] | None = None,
+    headers: dict[str, str] | None = None,
 ) -> JSONResponse:
     body: dict[str, Any] = {
         "type": type_,
@@ -37,7 +38,7 @@ def _problem(
     }
     if extras:
         body.update(extras)
-    return JSONResponse(status_code=status, content=body)
+    return JSONResponse(status_code=status, content=body, headers=headers)
 
 
 def install_exception_handlers(app: FastAPI) -> None:
@@ -116,6 +117,7 @@ def install_exception_handlers(app: FastAPI) -> None:
             detail or title,
             type_=f"https://httpstatuses.com/{status_code}",
             extras=extras,
+            headers=getattr(exc, "headers", None),
         )
 
     @app.exception_handler(Exception)
@@ -20,6 +20,13 @@ def _import_prom() -> tuple[Any | None, Any | None, Any | None, Any | None]:
         return None, None, None, None
 
 
+def _cpu_budget_value(field: str) -> float:
+    # Read at scrape time; lib.cpu_budget has no heavy imports
+    from lib.cpu_budget import get_budget
+
+    return float(get_budget().snapshot()[field])
+
+
 class Metrics:
     def __init__(self) -> None:
         Counter, Histogram, _, _ = _import_prom()
@@ -27,6 +34,10 @@ class Metrics:
             self.enabled = False
             self.req_count = None
             self.req_latency = None
+            self.result_cache_lookups = None
+            self.cpu_budget_gauges = None
+            self.admission_rejections = None
+            self.admission_gauges = None
         else:
             self.enabled = True
             self.req_count = Counter(
@@ -40,6 +51,61 @@ class Metrics:
                 labelnames=("method", "path"),
                 buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2, 5),
             )
+            self.result_cache_lookups = Counter(
+                "result_cache_lookups_total",
+                "Optimization result cache lookups",
+                labelnames=("outcome",),
+            )
+            self.cpu_budget_gauges = self._cpu_budget_gauges()
+            self.admission_rejections = Counter(
+                "admission_rejections_total",
+                "Sync optimize requests turned away by admission control",
+                labelnames=("reason",),
+            )
+            self.admission_gauges = self._admission_gauges()
+
+    @staticmethod
+    def _cpu_budget_gauges() -> tuple[Any, ...] | None:
+        try:
+            from prometheus_client import Gauge
+        except Exception:
+            return None
+        gauges = []
+        for field, name, doc in (
+            ("total", "cp_cpu_budget", "CPU budget shared by CP-SAT solves"),
+            ("in_flight", "cp_solves_in_flight", "CP-SAT solves currently running"),
+            ("workers", "cp_workers_allocated", "CP-SAT workers currently leased"),
+        ):
+            gauge = Gauge(name, doc)
+            gauge.set_function(lambda field=field: _cpu_budget_value(field))
+            gauges.append(gauge)
+        return tuple(gauges)
+
+    @staticmethod
+    def _admission_gauges() -> tuple[Any, Any] | None:
+        try:
+            from prometheus_client import Gauge
+        except Exception:
+            return None
+        return (
+            Gauge("admission_slots_in_use", "Sync optimize slots currently held"),
+            Gauge("admission_queue_depth", "Sync optimize requests waiting for a slot"),
+        )
+
+    def set_admission(self, in_use: int, queued: int) -> None:
+        if self.admission_gauges is not None:
+            self.admission_gauges[0].set(in_use)
+            self.admission_gauges[1].set(queued)
+
+    def record_admission_rejection(self, reason: str) -> None:
+        """reason: queue_full | timeout"""
+        if self.admission_rejections is not None:
+            self.admission_rejections.labels(reason=reason).inc()
+
+    def record_result_cache(self, outcome: str) -> None:
+        """outcome: hit_memory | hit_storage | miss"""
+        if self.result_cache_lookups is not None:
+            self.result_cache_lookups.labels(outcome=outcome).inc()
 
     async def middleware(self, request: Request, call_next) -> Response:  # type: ignore[no-untyped-def]
         start = time.perf_counter()
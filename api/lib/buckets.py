@@ -0,0 +1,116 @@
+"""Time bucketings: contiguous groups of days used as model time units.
+
+A bucketing splits a horizon of ``num_days`` days (0-based, starting at
+``start_date``) into consecutive buckets. Calendar bucketings follow day,
+ISO week, third (旬) or month boundaries; aligned bucketings cut at given
+days (e.g. event window endpoints) and keep every bucket close to a nominal
+length. Like ``lib.thirds`` this module does not depend on API schemas.
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+from datetime import date, timedelta
+
+from .thirds import period_key as third_period_key
+
+CALENDAR_KINDS = ("day", "week", "third", "month")
+
+# Days represented by one time unit when rounding day-valued lags and
+# frequencies (a third counts as 10 days, a month as 30)
+NOMINAL_DAYS = {"day": 1, "week": 7, "third": 10, "month": 30}
+
+
+def _week_key(d: date) -> str:
+    year, week, _ = d.isocalendar()
+    return f"{year:04d}-W{week:02d}"
+
+
+CALENDAR_KEYS: dict[str, Callable[[date], str]] = {
+    "day": lambda d: d.isoformat(),
+    "week": _week_key,
+    "third": third_period_key,
+    "month": lambda d: f"{d.year:04d}-{d.month:02d}",
+}
+
+
+@dataclass(frozen=True)
+class Bucketing:
+    """Consecutive buckets over ``num_days`` days.
+
+    ``starts`` holds the first (0-based) day of each bucket in increasing
+    order, beginning with 0.
+    """
+
+    kind: str
+    start_date: date
+    num_days: int
+    starts: tuple[int, ...]
+    nominal_days: int
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def bounds(self, index: int) -> tuple[int, int]:
+        """First and last day (0-based, inclusive) of bucket ``index``."""
+        end = self.starts[index + 1] - 1 if index + 1 < len(self) else self.num_days - 1
+        return self.starts[index], end
+
+    def lengths(self) -> list[int]:
+        return [hi - lo + 1 for lo, hi in map(self.bounds, range(len(self)))]
+
+    def day_index(self) -> list[int]:
+        """0-based bucket index of every 0-based day."""
+        out: list[int] = []
+        for i, n in enumerate(self.lengths()):
+            out.extend([i] * n)
+        return out
+
+    def key(self, index: int) -> str:
+        """Stable label of bucket ``index``, e.g. ``2025-01:上旬``."""
+        lo, hi = self.bounds(index)
+        first = self.start_date + timedelta(days=lo)
+        if self.kind in CALENDAR_KEYS:
+            return CALENDAR_KEYS[self.kind](first)
+        last = self.start_date + timedelta(days=hi)
+        return f"{first.isoformat()}..{last.isoformat()}"
+
+
+def calendar_bucketing(kind: str, start_date: date, num_days: int) -> Bucketing:
+    """Buckets that change whenever the calendar ``kind`` key changes."""
+    key = CALENDAR_KEYS[kind]
+    starts: list[int] = []
+    prev: str | None = None
+    for d in range(num_days):
+        k = key(start_date + timedelta(days=d))
+        if k != prev:
+            starts.append(d)
+            prev = k
+    return Bucketing(kind, start_date, num_days, tuple(starts), NOMINAL_DAYS[kind])
+
+
+def aligned_bucketing(
+    start_date: date, num_days: int, cuts: Iterable[int], max_days: int
+) -> Bucketing:
+    """Irregular buckets starting at ``cuts`` where possible.
+
+    Segments between cuts are split evenly into buckets of at most
+    ``max_days`` days. A cut that would leave a bucket shorter than half of
+    ``max_days`` is dropped, so every bucket stays within a factor of two of
+    the nominal length that lags and frequencies are rounded with.
+    """
+    min_days = max(1, math.ceil(max_days / 2))
+    edges = [0]
+    for c in sorted({c for c in cuts if 0 < c < num_days}):
+        if c - edges[-1] >= min_days and num_days - c >= min_days:
+            edges.append(c)
+    edges.append(num_days)
+
+    starts: list[int] = []
+    for lo, hi in zip(edges, edges[1:], strict=False):
+        pieces = math.ceil((hi - lo) / max_days)
+        starts.extend(lo + (hi - lo) * i // pieces for i in range(pieces))
+    nominal = max(1, round(num_days / len(starts)))
+    return Bucketing("aligned", start_date, num_days, tuple(starts), nominal)
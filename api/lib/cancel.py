@@ -0,0 +1,103 @@
+"""Cooperative stop of running CP-SAT solves.
+
+A caller that may abandon a plan (``services.single_flight``) runs it under
+``stop_scope(token)``. ``solver.solve`` registers ``StopSearch`` with the
+current token, so ``token.stop()`` ends the running search at once instead
+of at the stage's time limit; the solve then raises ``SolveStopped`` and no
+later stage is built. Threads started inside a scope (LNS rounds, frontier
+chains, scenarios) inherit it when their function is wrapped with ``bind``.
+"""
+
+from __future__ import annotations
+
+import contextvars
+import itertools
+import logging
+import threading
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from typing import Any
+
+LOGGER = logging.getLogger(__name__)
+
+
+class SolveStopped(Exception):
+    """Raised by ``solver.solve`` once the current ``StopToken`` is stopped."""
+
+
+class StopToken:
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stopped = False
+        self._callbacks: dict[int, Callable[[], None]] = {}
+        self._ids = itertools.count()
+
+    @property
+    def stopped(self) -> bool:
+        with self._lock:
+            return self._stopped
+
+    def stop(self) -> None:
+        """Stop every registered search; later ``check`` calls raise."""
+        with self._lock:
+            if self._stopped:
+                return
+            self._stopped = True
+            callbacks = list(self._callbacks.values())
+        for cb in callbacks:
+            try:
+                cb()
+            except Exception:
+                LOGGER.exception("stop callback failed")
+
+    def check(self) -> None:
+        if self.stopped:
+            raise SolveStopped()
+
+    @contextmanager
+    def on_stop(self, cb: Callable[[], None]) -> Iterator[None]:
+        """Call ``cb`` when the token is stopped while the body runs (at once
+        if it already is)."""
+        with self._lock:
+            stopped = self._stopped
+            key = next(self._ids)
+            if not stopped:
+                self._callbacks[key] = cb
+        if stopped:
+            cb()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._callbacks.pop(key, None)
+
+
+_CURRENT: contextvars.ContextVar[StopToken | None] = contextvars.ContextVar(
+    "stop_token", default=None
+)
+
+
+@contextmanager
+def stop_scope(token: StopToken) -> Iterator[StopToken]:
+    """Make ``token`` the current token of the body's solves."""
+    reset = _CURRENT.set(token)
+    try:
+        yield token
+    finally:
+        _CURRENT.reset(reset)
+
+
+def current_token() -> StopToken | None:
+    return _CURRENT.get()
+
+
+def bind[T](fn: Callable[..., T]) -> Callable[..., T]:
+    """``fn`` running in a copy of the caller's context (its stop token
+    included), for use from pool threads."""
+    ctx = contextvars.copy_context()
+
+    def run(*args: Any, **kwargs: Any) -> T:
+        # A context can be entered by one thread at a time
+        return ctx.copy().run(fn, *args, **kwargs)
+
+    return run
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import io
+import json
+import time
+import zipfile
+from collections.abc import Callable
+from typing import Any
+
+from ortools.sat.python import cp_model
+
+CAPTURE_FORMAT_VERSION = 1
+
+_MODEL_FILE = "model.pbtxt"
+_PARAMS_FILE = "params.pbtxt"
+_META_FILE = "meta.json"
+
+
+def parse_text(message: Any, text: str) -> None:
+    """Replace ``message`` (a model or parameters proto) with text-format
+    ``text``."""
+    # Native protos (OR-Tools >= 9.15) parse themselves; older releases use
+    # regular protobuf messages.
+    if hasattr(message, "parse_text_format"):
+        message.parse_text_format(text)
+    else:
+        from google.protobuf import text_format
+
+        text_format.Parse(text, message)
+
+
+def prefixed(
+    capture: Callable[[str, bytes], None], prefix: str
+) -> Callable[[str, bytes], None]:
+    """``capture`` with ``prefix`` in front of every label, for several
+    ``plan`` calls sharing one capture id (rolling windows, refine attempts)."""
+
+    def write(label: str, artifact: bytes) -> None:
+        capture(prefix + label, artifact)
+
+    return write
+
+
+def build_artifact(model: cp_model.CpModel, parameters: Any, meta: dict) -> bytes:
+    """Zip the model proto (objective and solution hint included), the solver
+    parameters and ``meta`` into one artifact.
+
+    Protos are stored in text format, which every supported OR-Tools release
+    can read back.
+    """
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", compression=zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr(_MODEL_FILE, str(model.Proto()))
+        zf.writestr(_PARAMS_FILE, str(parameters))
+        zf.writestr(
+            _META_FILE,
+            json.dumps(
+                {"format": CAPTURE_FORMAT_VERSION, **meta},
+                ensure_ascii=False,
+                indent=2,
+            ),
+        )
+    return buf.getvalue()
+
+
+def load_artifact(data: bytes) -> tuple[cp_model.CpModel, str, dict]:
+    """Return (model, parameters in text format, meta) from an artifact."""
+    with zipfile.ZipFile(io.BytesIO(data)) as zf:
+        model_text = zf.read(_MODEL_FILE).decode("utf-8")
+        params_text = zf.read(_PARAMS_FILE).decode("utf-8")
+        meta = json.loads(zf.read(_META_FILE).decode("utf-8"))
+    model = cp_model.CpModel()
+    parse_text(model.Proto(), model_text)
+    return model, params_text, meta
+
+
+def apply_parameters(parameters: Any, text: str) -> None:
+    """Merge text-format ``text`` into ``CpSolver.parameters``."""
+    if not text.strip():
+        return
+    if hasattr(parameters, "merge_text_format"):
+        parameters.merge_text_format(text)
+    else:
+        from google.protobuf import text_format
+
+        text_format.Merge(text, parameters)
+
+
+def replay_artifact(data: bytes, overrides: str = "") -> dict:
+    """Solve a captured model again with its parameters merged with
+    ``overrides`` (text format, e.g. ``"num_workers: 1 relative_gap_limit: 0"``).
+    """
+    model, params_text, meta = load_artifact(data)
+    solver = cp_model.CpSolver()
+    apply_parameters(solver.parameters, params_text)
+    apply_parameters(solver.parameters, overrides)
+    t0 = time.perf_counter()
+    status = solver.Solve(model)
+    solve_ms = (time.perf_counter() - t0) * 1000.0
+    has_solution = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+    return {
+        "label": meta.get("label"),
+        "captured_status": meta.get("status"),
+        "captured_solve_ms": meta.get("solve_ms"),
+        "captured_objective": meta.get("objective_value"),
+        "status": solver.StatusName(status),
+        "solve_ms": solve_ms,
+        "objective_value": solver.ObjectiveValue() if has_solution else None,
+        "best_objective_bound": solver.BestObjectiveBound() if has_solution else None,
+        "deterministic_time": solver.ResponseProto().deterministic_time,
+    }
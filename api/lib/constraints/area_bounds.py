@@ -43,9 +43,13 @@ class AreaBoundsConstraint(Constraint):
             hi = None if bnd.max_area is None else int(round(bnd.max_area * scale))
 
             if lo is not None:
-                model.Add(total_base >= lo)
+                model.Add(total_base >= lo).OnlyEnforceIf(
+                    ctx.guard(f"crop_area_min:{c_id}")
+                )
             if hi is not None:
-                model.Add(total_base <= hi)
+                model.Add(total_base <= hi).OnlyEnforceIf(
+                    ctx.guard(f"crop_area_max:{c_id}")
+                )
 
             # If crop is used (any z=1), force at least one day of occupancy
             # use_c variable (shared container)
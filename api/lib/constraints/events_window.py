@@ -12,6 +12,7 @@ class EventsWindowConstraint(Constraint):
     def apply(self, ctx: BuildContext) -> None:
         model = ctx.model
         H = ctx.request.horizon.num_days
+        periods = ctx.periods
 
         for ev in ctx.request.events:
             start_set = (
@@ -40,9 +41,10 @@ class EventsWindowConstraint(Constraint):
                     rt = ctx.variables.r_event_by_e_t[(ev.id, t)]
                     # Prevent two consecutive activations closer than f by:
                     # r[t] + r[t+1] + ... + r[t+f-1] <= 1
+                    # (merged periods: those always closer than f days)
                     window_vars = [
                         ctx.variables.r_event_by_e_t[(ev.id, tau)]
-                        for tau in range(t, min(H, t + f - 1) + 1)
+                        for tau in periods.frequency_window(t, f)
                     ]
                     if len(window_vars) > 1:
                         model.Add(sum(window_vars) <= 1)
@@ -50,37 +52,34 @@ class EventsWindowConstraint(Constraint):
             # Lag dependency: e can only occur Lmin..Lmax days after predecessor p,
             # and must be at least Lmin days after the MOST RECENT p.
             if ev.preceding_event_id and (ev.lag_min_days or ev.lag_max_days):
+                lag_guard = ctx.guard(f"event_lag:{ev.id}")
                 p = ev.preceding_event_id
                 Lmin = int(ev.lag_min_days or 0)
                 Lmax = int(ev.lag_max_days or Lmin)
                 for t in range(1, H + 1):
                     rt = ctx.variables.r_event_by_e_t[(ev.id, t)]
-                    # If not enough days have elapsed to satisfy Lmin, forbid rt
-                    if Lmin > 0 and (t - Lmin) < 1:
-                        model.Add(rt == 0)
-                        continue
-                    from_t = max(1, t - Lmax)
-                    to_t = t - Lmin
-                    if to_t < from_t:
-                        model.Add(rt == 0)
+                    # Predecessor days t-Lmax..t-Lmin; none (e.g. not enough
+                    # days elapsed for Lmin) forbids rt
+                    pred_days = periods.lag_predecessors(t, Lmin, Lmax)
+                    if not pred_days:
+                        model.Add(rt == 0).OnlyEnforceIf(lag_guard)
                         continue
                     preds = [
                         ctx.variables.r_event_by_e_t.setdefault(
                             (p, tau), model.NewBoolVar(f"r_{p}_{tau}")
                         )
-                        for tau in range(from_t, to_t + 1)
+                        for tau in pred_days
                     ]
                     # Require at least one predecessor in the window
-                    model.Add(rt <= sum(preds))
+                    model.Add(rt <= sum(preds)).OnlyEnforceIf(lag_guard)
                     # Additionally, enforce "no predecessor in the last Lmin days"
                     # so that the lag is computed from the most recent p.
                     if Lmin > 0:
-                        recent_from = max(1, t - Lmin + 1)
-                        for tau in range(recent_from, t + 1):
+                        for tau in periods.recent_predecessors(t, Lmin):
                             pvar = ctx.variables.r_event_by_e_t.setdefault(
                                 (p, tau), model.NewBoolVar(f"r_{p}_{tau}")
                             )
-                            model.Add(rt + pvar <= 1)
+                            model.Add(rt + pvar <= 1).OnlyEnforceIf(lag_guard)
 
         # Occupancy derivation per crop based on uses_land events.
         occ = ctx.variables.occ_by_c_t
@@ -39,4 +39,6 @@ class FixedAreaConstraint(Constraint):
                     base_terms.append(ctx.variables.x_area_by_l_c[base_key])
                     # Per-day variables will be created as needed by other constraints
             if base_terms:
-                model.Add(sum(base_terms) >= target)
+                model.Add(sum(base_terms) >= target).OnlyEnforceIf(
+                    ctx.guard(f"fixed_area:{tag}/{fa.crop_id}")
+                )
@@ -14,11 +14,13 @@ class LaborConstraint(Constraint):
     - Total need per event is computed from x[l,c] and labor_total_per_area.
     - Daily cap per event: sum_w h[w,e,t] <= labor_daily_cap_e * r[e,t].
     - Worker per-day capacity and blocked days enforced.
+    - Capacities and daily caps scale with the days a merged period covers.
     """
 
     def apply(self, ctx: BuildContext) -> None:
         model = ctx.model
         H = ctx.request.horizon.num_days
+        periods = ctx.periods
 
         # Build map for easy lookups
         H = ctx.request.horizon.num_days
@@ -71,7 +73,7 @@ class LaborConstraint(Constraint):
                     if w.blocked_days and t in w.blocked_days:
                         continue
                     key = (w.id, ev.id, t)
-                    cap_w = int(
+                    cap_w = periods.length(t) * int(
                         round((w.capacity_per_day or 0.0) * TIME_SCALE_UNITS_PER_HOUR)
                     )
                     if key not in ctx.variables.h_time_by_w_e_t:
@@ -107,13 +109,16 @@ class LaborConstraint(Constraint):
 
                 # Daily cap per event when r=1 (hours scale)
                 if ev.labor_daily_cap is not None:
-                    cap_scaled = int(
+                    cap_scaled = periods.length(t) * int(
                         round(ev.labor_daily_cap * TIME_SCALE_UNITS_PER_HOUR)
                     )
-                    model.Add(daily_sum <= cap_scaled * r)
+                    model.Add(daily_sum <= cap_scaled * r).OnlyEnforceIf(
+                        ctx.guard(f"labor_daily_cap:{ev.id}")
+                    )
 
             # People requirement per active day: sum(assign) >= people_required
             if ev.people_required is not None and ev.people_required > 0:
+                people_guard = ctx.guard(f"people_required:{ev.id}")
                 for t in sorted(allowed_days):
                     r = ctx.variables.r_event_by_e_t.get((ev.id, t))
                     if r is None:
@@ -129,7 +134,7 @@ class LaborConstraint(Constraint):
                     if assigns:
                         model.Add(
                             sum(assigns) >= int(ev.people_required)
-                        ).OnlyEnforceIf(r)
+                        ).OnlyEnforceIf([r, *people_guard])
 
             # Total need over horizon (integer linearization with q * Σh >= p * Σx)
             horizon_sum_terms: list[cp_model.LinearExpr] = []
@@ -140,7 +145,9 @@ class LaborConstraint(Constraint):
                         horizon_sum_terms.append(v)
             if horizon_sum_terms:
                 # Exact total equality in scaled space
-                model.Add(q * sum(horizon_sum_terms) == total_need_num_expr)
+                model.Add(
+                    q * sum(horizon_sum_terms) == total_need_num_expr
+                ).OnlyEnforceIf(ctx.guard(f"labor_need:{ev.id}"))
 
         # Worker per-day capacity across events
         for w in ctx.request.workers:
@@ -152,4 +159,6 @@ class LaborConstraint(Constraint):
                     if v is not None:
                         day_terms.append(v)
                 if day_terms:
-                    model.Add(sum(day_terms) <= cap)
+                    model.Add(sum(day_terms) <= periods.length(t) * cap).OnlyEnforceIf(
+                        ctx.guard(f"worker_capacity:{w.id}")
+                    )
@@ -8,6 +8,7 @@ class LinkAreaUseConstraint(Constraint):
     """Link per-day area to binary use flag (rotation-friendly).
 
     - x[l,c,t] <= area_l * z[l,c]
+    - z[l,c] == 0 when c is not in the land's allowed crops (if restricted)
     """
 
     def apply(self, ctx: BuildContext) -> None:
@@ -35,6 +36,9 @@ class LinkAreaUseConstraint(Constraint):
                 base = ctx.variables.x_area_by_l_c[key]
                 # base must be 0 when the land-crop is not used
                 model.Add(base <= cap * ctx.variables.z_use_by_l_c[key])
+                allowed = (ctx.request.allowed_crops_by_land or {}).get(land.id)
+                if allowed is not None and crop.id not in allowed:
+                    model.Add(ctx.variables.z_use_by_l_c[key] == 0)
                 crop_uses_land = crop.id in uses_land_crops
                 blocked = land.blocked_days or set()
                 # Per-day creation:
@@ -8,7 +8,8 @@ from lib.model_builder import BuildContext
 class ResourcesConstraint(Constraint):
     """Resource capacity and linkage to event work time (partial).
 
-    - Create u[r,e,t] with per-day caps and blocked days.
+    - Create u[r,e,t] with per-day caps (times the days of a merged period)
+      and blocked days.
     - For events that require resources, enforce Σ_r u[r,e,t] >= Σ_w h[w,e,t].
     """
 
@@ -18,8 +19,11 @@ class ResourcesConstraint(Constraint):
 
         # Capacity per resource per day (sparse by event allowed days)
         for res in ctx.request.resources:
-            cap = int(round((res.capacity_per_day or 0.0) * TIME_SCALE_UNITS_PER_HOUR))
+            per_day = int(
+                round((res.capacity_per_day or 0.0) * TIME_SCALE_UNITS_PER_HOUR)
+            )
             for t in range(1, H + 1):
+                cap = ctx.periods.length(t) * per_day
                 day_terms = []
                 for ev in ctx.request.events:
                     allowed = ctx.allowed_days_by_event.get(ev.id)
@@ -36,7 +40,9 @@ class ResourcesConstraint(Constraint):
                         )
                     day_terms.append(ctx.variables.u_time_by_r_e_t[key])
                 if day_terms and cap > 0:
-                    model.Add(sum(day_terms) <= cap)
+                    model.Add(sum(day_terms) <= cap).OnlyEnforceIf(
+                        ctx.guard(f"resource_capacity:{res.id}")
+                    )
 
         # Link to events' daily work time if the event requires resources.
         # Σ_r u[r,e,t] >= Σ_w h[w,e,t]
@@ -64,4 +70,6 @@ class ResourcesConstraint(Constraint):
                     if h is not None:
                         rhs_terms.append(h)
                 if lhs_terms and rhs_terms:
-                    ctx.model.Add(sum(lhs_terms) >= sum(rhs_terms))
+                    ctx.model.Add(sum(lhs_terms) >= sum(rhs_terms)).OnlyEnforceIf(
+                        ctx.guard(f"resources:{ev.id}")
+                    )
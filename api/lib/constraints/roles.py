@@ -33,6 +33,7 @@ class RolesConstraint(Constraint):
             if not ev.required_roles:
                 continue
 
+            guard = ctx.guard(f"roles:{ev.id}")
             allowed_days = ctx.allowed_days_by_event.get(ev.id, set(range(1, H + 1)))
             for t in sorted(allowed_days):
                 # Ensure r[e,t] exists
@@ -56,7 +57,7 @@ class RolesConstraint(Constraint):
                     if (w.blocked_days and t in w.blocked_days) or not (
                         (w.roles or set()) & req_roles
                     ):
-                        model.Add(assign == 0)
+                        model.Add(assign == 0).OnlyEnforceIf(guard)
                     else:
                         assigns_all.append((w.id, assign))
 
@@ -72,7 +73,7 @@ class RolesConstraint(Constraint):
                         if role in worker_roles.get(wid, set()):
                             role_assigns.append(assign)
                     if role_assigns:
-                        model.Add(sum(role_assigns) >= 1).OnlyEnforceIf(r)
+                        model.Add(sum(role_assigns) >= 1).OnlyEnforceIf([r, *guard])
                     else:
                         # No worker has the role -> impossible when r=1
-                        model.Add(r == 0)
+                        model.Add(r == 0).OnlyEnforceIf(guard)
@@ -0,0 +1,178 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections.abc import Iterator
+from contextlib import contextmanager
+from typing import Any
+
+from .cancel import current_token
+
+# CP-SAT below this many workers drops most of its portfolio (LNS, core-based
+# and LP workers); a small oversubscribed portfolio beats a single sequential
+# worker even on one core.
+DEFAULT_MIN_WORKERS = 4
+# How often a solve waiting for a free worker re-checks the budget
+_WAIT_S = 0.05
+
+
+def host_cpus() -> int:
+    """CPUs this process may run on (respects affinity / container cpusets)."""
+    try:
+        return len(os.sched_getaffinity(0))
+    except (AttributeError, OSError):  # pragma: no cover - non-Linux
+        return os.cpu_count() or 1
+
+
+class _LocalCounters:
+    """[solves in flight, workers allocated] for this process only."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._values = [0, 0]
+
+    def add(self, solves: int, workers: int) -> tuple[int, int]:
+        with self._lock:
+            self._values[0] += solves
+            self._values[1] += workers
+            return self._values[0], self._values[1]
+
+    def take(self, want: int, total: int) -> int:
+        """Allocate up to ``want`` of the workers left below ``total``."""
+        with self._lock:
+            got = max(0, min(want, total - self._values[1]))
+            self._values[1] += got
+            return got
+
+
+class _SharedCounters:
+    """Same counters in a ``multiprocessing.Array("i", 2)`` shared by processes.
+
+    ``held`` (a lock-free array of the same shape) records this process's own
+    part, so a parent that kills the process can return it (``drop_held``).
+    """
+
+    def __init__(self, array: Any, held: Any | None = None) -> None:
+        self._array = array
+        self._held = held
+
+    def add(self, solves: int, workers: int) -> tuple[int, int]:
+        with self._array.get_lock():
+            self._array[0] += solves
+            self._array[1] += workers
+            if self._held is not None:
+                self._held[0] += solves
+                self._held[1] += workers
+            return self._array[0], self._array[1]
+
+    def take(self, want: int, total: int) -> int:
+        with self._array.get_lock():
+            got = max(0, min(want, total - self._array[1]))
+            self._array[1] += got
+            if self._held is not None:
+                self._held[1] += got
+            return got
+
+
+def drop_held(array: Any, held: Any) -> None:
+    """Return the leases recorded in ``held`` to ``array``, for a process that
+    was killed inside ``CpuBudget.lease``."""
+    with array.get_lock():
+        array[0] -= held[0]
+        array[1] -= held[1]
+        held[0] = held[1] = 0
+
+
+class CpuBudget:
+    """Split a host-wide CPU budget between concurrent CP-SAT solves.
+
+    Each solve leases ``max(min_workers, total // solves_in_flight)`` workers
+    when it starts, cut to what the other leases left of the budget. A solve
+    that finds no worker left waits for one, so the leases never add up to
+    more than the budget. Leases are taken per stage, so a multi-stage plan
+    picks up a larger share as soon as concurrent solves finish (CP-SAT
+    cannot resize a running search).
+
+    The budget is at least ``min_workers``: on a host with fewer CPUs one
+    solve still runs a small portfolio, and a second one waits for it.
+    """
+
+    def __init__(
+        self,
+        total: int,
+        *,
+        min_workers: int = DEFAULT_MIN_WORKERS,
+        shared: Any | None = None,
+    ) -> None:
+        self.min_workers = max(1, min_workers)
+        self.total = max(total, self.min_workers)
+        self._counters: _LocalCounters | _SharedCounters = (
+            _SharedCounters(shared) if shared is not None else _LocalCounters()
+        )
+
+    def share(self, array: Any, held: Any | None = None) -> None:
+        """Count solves in other processes holding the same ``array`` too."""
+        self._counters = _SharedCounters(array, held)
+
+    def snapshot(self) -> dict[str, int]:
+        solves, workers = self._counters.add(0, 0)
+        return {"total": self.total, "in_flight": solves, "workers": workers}
+
+    @contextmanager
+    def lease(self, fixed: int | None = None) -> Iterator[int]:
+        """Yield the worker count for one solve; ``fixed`` bypasses sizing and
+        waiting but is still accounted for.
+
+        Raises ``SolveStopped`` if the current stop token is stopped while
+        waiting for a worker.
+        """
+        solves, _ = self._counters.add(1, 0)
+        if fixed:
+            workers = fixed
+            self._counters.add(0, fixed)
+        else:
+            try:
+                workers = self._take(solves)
+            except BaseException:
+                self._counters.add(-1, 0)
+                raise
+        try:
+            yield workers
+        finally:
+            self._counters.add(-1, -workers)
+
+    def _take(self, solves: int) -> int:
+        share = max(self.min_workers, self.total // max(1, solves))
+        token = current_token()
+        while not (workers := self._counters.take(share, self.total)):
+            if token is not None:
+                token.check()
+            time.sleep(_WAIT_S)
+        return workers
+
+
+_budget: CpuBudget | None = None
+_budget_lock = threading.Lock()
+
+
+def get_budget() -> CpuBudget:
+    """Process-wide budget sized by CP_CPU_BUDGET / CP_MIN_WORKERS."""
+    global _budget
+    with _budget_lock:
+        if _budget is None:
+            try:
+                from core import config as _cfg
+
+                total = _cfg.cp_cpu_budget() or host_cpus()
+                min_workers = _cfg.cp_min_workers()
+            except Exception:
+                total, min_workers = host_cpus(), DEFAULT_MIN_WORKERS
+            _budget = CpuBudget(total, min_workers=min_workers)
+        return _budget
+
+
+def reset_budget() -> None:
+    global _budget
+    with _budget_lock:
+        _budget = None
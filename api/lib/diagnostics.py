@@ -1,7 +1,11 @@
 from __future__ import annotations
 
-from .interfaces import DiagnosticsProvider
-from .solver import SolveContext
+from collections.abc import Callable
+
+from .interfaces import Constraint, DiagnosticsProvider
+from .model_builder import build_model
+from .schemas import PlanRequest
+from .solver import SolveContext, solve
 
 
 class BasicDiagnostics(DiagnosticsProvider):
@@ -17,3 +21,21 @@ class BasicDiagnostics(DiagnosticsProvider):
             "num_workers": len(req.workers),
             "num_resources": len(req.resources),
         }
+
+
+def explain_infeasibility(
+    request: PlanRequest,
+    constraints: list[Constraint],
+    *,
+    capture: Callable[[str, bytes], None] | None = None,
+) -> SolveContext:
+    """Re-solve the constraints alone with every constraint family guarded by
+    an assumption literal (see ``BuildContext.guard``).
+
+    When the model is infeasible, ``assumption_core`` lists a conflicting set
+    of families as returned by CP-SAT's sufficient assumptions: dropping any
+    one of them may restore feasibility. Unguarded structure (land capacity,
+    windows, occupancy) is always enforced.
+    """
+    ctx = build_model(request, constraints, [], explain=True)
+    return solve(ctx, capture=capture, capture_label="explain")
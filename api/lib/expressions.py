@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+from ortools.sat.python import cp_model
+
+# Largest objective span we let CP-SAT see. Objective values are also handled
+# as doubles internally, so stay within the exactly representable integer range.
+MAX_OBJECTIVE_SPAN: int = 2**53
+
+
+def flatten_expr(expr: cp_model.LinearExpr | int) -> tuple[list[tuple[int, int]], int]:
+    """Return ([(var_index, coeff), ...], offset) for an integer linear expression.
+
+    Plain integers (e.g. the ``0`` returned by expression builders when there are
+    no terms) flatten to an empty term list.
+    """
+    if isinstance(expr, int):
+        return [], int(expr)
+    flat = cp_model.FlatIntExpr(expr)
+    terms = [
+        (int(v.index), int(c)) for v, c in zip(flat.vars, flat.coeffs, strict=True)
+    ]
+    return terms, int(flat.offset)
+
+
+def _domain_min_max(model: cp_model.CpModel, idx: int) -> tuple[int, int]:
+    # Proto repeated fields do not support negative indexing here
+    domain = model.Proto().variables[idx].domain
+    return int(domain[0]), int(domain[len(domain) - 1])
+
+
+def expr_bounds(
+    model: cp_model.CpModel, expr: cp_model.LinearExpr | int
+) -> tuple[int, int]:
+    """Trivial [lo, hi] bounds of an expression from its variable domains."""
+    terms, offset = flatten_expr(expr)
+    lo = hi = offset
+    for idx, coeff in terms:
+        vmin, vmax = _domain_min_max(model, idx)
+        if coeff >= 0:
+            lo += coeff * vmin
+            hi += coeff * vmax
+        else:
+            lo += coeff * vmax
+            hi += coeff * vmin
+    return lo, hi
+
+
+def expr_magnitude(model: cp_model.CpModel, expr: cp_model.LinearExpr | int) -> int:
+    """Upper bound of |expr| term by term (what CP-SAT checks for overflow)."""
+    terms, offset = flatten_expr(expr)
+    total = abs(offset)
+    for idx, coeff in terms:
+        vmin, vmax = _domain_min_max(model, idx)
+        total += abs(coeff) * max(abs(vmin), abs(vmax))
+    return total
+
+
+def is_constant(expr: cp_model.LinearExpr | int) -> bool:
+    terms, _ = flatten_expr(expr)
+    return all(coeff == 0 for _idx, coeff in terms)
+
+
+def evaluate_expr(
+    expr: cp_model.LinearExpr | int, values_by_index: dict[int, int]
+) -> int | None:
+    """Evaluate an expression from known variable values.
+
+    Returns None when a variable of the expression has no known value.
+    """
+    terms, offset = flatten_expr(expr)
+    total = offset
+    for idx, coeff in terms:
+        value = values_by_index.get(idx)
+        if value is None:
+            return None
+        total += coeff * value
+    return total
@@ -0,0 +1,192 @@
+"""Pareto frontier of two stage objectives by epsilon-constraint solves.
+
+Comparing plans by re-running the whole lexicographic plan with another
+``stage_order`` or tolerance costs a full multi-stage solve per try.
+``frontier`` instead computes up to ``points`` non-dominated plans for a pair
+of stages (profit vs labor by default):
+
+- two anchors: the pair solved lexicographically in both orders;
+- between them, the primary stage solved with the secondary stage bounded
+  (``StageBound``) on an even grid of values, then the secondary stage with
+  the primary locked, so every point is non-dominated.
+
+Each grid point is hinted with its neighbour's plan (``replan.Incumbent``).
+The grid is split into ``parallel`` chains that walk inwards from the
+anchors and run in threads (CP-SAT releases the GIL while solving).
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from .cancel import bind
+from .interfaces import Constraint
+from .model_builder import BuildContext
+from .planner import STAGE_BUILDERS, STAGE_SENSES, plan
+from .replan import Incumbent
+from .schemas import PlanRequest, PlanResponse
+
+
+@dataclass
+class StageBound(Constraint):
+    """Keep stage ``name`` at ``bound`` or better (model units)."""
+
+    name: str
+    bound: int
+
+    def apply(self, ctx: BuildContext) -> None:
+        expr = STAGE_BUILDERS[self.name](ctx)
+        guard = ctx.guard(f"bound:{self.name}")
+        if STAGE_SENSES[self.name] == "max":
+            ctx.model.Add(expr >= self.bound).OnlyEnforceIf(guard)
+        else:
+            ctx.model.Add(expr <= self.bound).OnlyEnforceIf(guard)
+
+
+@dataclass
+class FrontierPoint:
+    # Bound on the secondary stage; None for the anchors
+    epsilon: int | None
+    response: PlanResponse
+    # Stage values in model units, keyed by stage name
+    values: dict[str, int]
+    ms: float
+
+    @property
+    def feasible(self) -> bool:
+        return self.response.diagnostics.feasible
+
+
+def _stage_values(resp: PlanResponse) -> dict[str, int]:
+    return {row["name"]: int(row["value"]) for row in resp.diagnostics.stages}
+
+
+def _grid(lo: int, hi: int, n: int) -> list[int]:
+    """Up to ``n`` distinct integers strictly between ``lo`` and ``hi``,
+    ordered from ``lo`` to ``hi``."""
+    if n <= 0 or abs(hi - lo) < 2:
+        return []
+    step = (hi - lo) / (n + 1)
+    values = [round(lo + step * (i + 1)) for i in range(n)]
+    seen: set[int] = set()
+    out = []
+    for v in values:
+        if v not in seen and v not in (lo, hi):
+            seen.add(v)
+            out.append(v)
+    return out
+
+
+def _dominates(a: dict[str, int], b: dict[str, int], pair: tuple[str, str]) -> bool:
+    """``a`` is at least as good as ``b`` on both stages and better on one."""
+
+    def ge(name: str) -> bool:
+        if STAGE_SENSES[name] == "max":
+            return a[name] >= b[name]
+        return a[name] <= b[name]
+
+    return all(ge(n) for n in pair) and any(a[n] != b[n] for n in pair)
+
+
+def frontier(
+    request: PlanRequest,
+    constraints: list[Constraint] | None = None,
+    *,
+    objectives: tuple[str, str] = ("profit", "labor"),
+    points: int = 5,
+    parallel: int = 1,
+    progress_cb: Callable[[float, str], None] | None = None,
+    **plan_kwargs,
+) -> list[FrontierPoint]:
+    """Non-dominated plans trading ``objectives[0]`` against ``objectives[1]``.
+
+    Returns at most ``points`` feasible points ordered from the best
+    ``objectives[0]`` to the best ``objectives[1]`` (fewer when the grid
+    collapses or points coincide); empty when the request is infeasible.
+    ``plan_kwargs`` go to every ``plan`` call (``stage_order`` is set here).
+    """
+    primary, secondary = objectives
+    for name in objectives:
+        if name not in STAGE_BUILDERS:
+            raise ValueError(f"unknown stage: {name}")
+    if primary == secondary:
+        raise ValueError("frontier needs two different stages")
+    plan_kwargs.pop("stage_order", None)
+    plan_kwargs.pop("hint", None)
+    base = list(constraints or [])
+    total = max(2, points)
+    done = [0]
+
+    def solve_point(
+        order: list[str], extra: list[Constraint], hint: PlanResponse | None
+    ) -> FrontierPoint:
+        t0 = time.perf_counter()
+        resp = plan(
+            request,
+            [*base, *extra],
+            stage_order=order,
+            hint=Incumbent.of(hint).hint(request) if hint is not None else None,
+            **plan_kwargs,
+        )
+        done[0] += 1
+        if progress_cb is not None:
+            progress_cb(done[0] / total, "frontier")
+        values = _stage_values(resp) if resp.diagnostics.feasible else {}
+        ms = (time.perf_counter() - t0) * 1000.0
+        return FrontierPoint(epsilon=None, response=resp, values=values, ms=ms)
+
+    workers = max(1, parallel)
+    with ThreadPoolExecutor(workers, thread_name_prefix="frontier") as pool:
+        first, last = pool.map(
+            bind(lambda order: solve_point(order, [], None)),
+            [[primary, secondary], [secondary, primary]],
+        )
+        if not (first.feasible and last.feasible):
+            return []
+        grid = _grid(first.values[secondary], last.values[secondary], total - 2)
+
+        def chain(epsilons: list[int], start: FrontierPoint) -> list[FrontierPoint]:
+            out: list[FrontierPoint] = []
+            prev = start
+            for eps in epsilons:
+                pt = solve_point(
+                    [primary, secondary],
+                    [StageBound(secondary, eps)],
+                    prev.response,
+                )
+                pt.epsilon = eps
+                out.append(pt)
+                if pt.feasible:
+                    prev = pt
+            return out
+
+        # Contiguous chains; the first half walks from the primary anchor,
+        # the second half from the secondary anchor towards the middle
+        size = -(-len(grid) // workers) if grid else 0
+        chunks = [grid[i : i + size] for i in range(0, len(grid), size or 1)]
+        futures = []
+        for i, chunk in enumerate(chunks):
+            if i < (len(chunks) + 1) // 2:
+                futures.append((False, pool.submit(bind(chain), chunk, first)))
+            else:
+                futures.append((True, pool.submit(bind(chain), chunk[::-1], last)))
+        inner: list[FrontierPoint] = []
+        for reverse, fut in futures:
+            pts = fut.result()
+            inner.extend(pts[::-1] if reverse else pts)
+
+    result: list[FrontierPoint] = []
+    for pt in [first, *inner, last]:
+        if not pt.feasible:
+            continue
+        if any(
+            _dominates(q.values, pt.values, objectives) or q.values == pt.values
+            for q in result
+        ):
+            continue
+        result = [q for q in result if not _dominates(pt.values, q.values, objectives)]
+        result.append(pt)
+    return result
@@ -0,0 +1,473 @@
+"""Greedy constructive planner.
+
+Builds a complete plan in model units without CP-SAT: crops take land in
+order of price density, events run on the earliest feasible days of their
+windows and labor is filled greedily from worker capacity. The result is a
+``SolveContext`` keyed like the model variables, so ``solve(prev=...)`` hints
+every variable family with it.
+
+The construction follows the model's rules (windows, lags, frequency, roles,
+headcount, daily caps, worker/resource capacity, occupancy and land capacity)
+but is not guaranteed feasible, e.g. when minimum areas do not fit. CP-SAT
+repairs the hint, or rejects it when used as a fallback.
+"""
+
+from __future__ import annotations
+
+import math
+import time
+from dataclasses import dataclass, field
+from fractions import Fraction
+
+from .constants import AREA_SCALE_UNITS_PER_A, TIME_SCALE_UNITS_PER_HOUR
+from .model_builder import event_windows
+from .periods import Periods
+from .schemas import Crop, Event, Land, PlanRequest
+from .solver import SolveContext
+
+# Rounds of shrinking a crop's area until labor and land both fit
+_MAX_ROUNDS = 12
+
+
+def _units(value: float | None, scale: int) -> int:
+    return int(round((value or 0.0) * scale))
+
+
+def _labor_per_unit(ev: Event) -> Fraction:
+    """Time units per area unit (LaborConstraint's p/q)."""
+    return (
+        Fraction(str(ev.labor_total_per_area or 0.0))
+        * TIME_SCALE_UNITS_PER_HOUR
+        / AREA_SCALE_UNITS_PER_A
+    )
+
+
+@dataclass
+class _Schedule:
+    """Tentative event days and work for one crop at a given area."""
+
+    days: dict[str, list[int]] = field(default_factory=dict)
+    hours: dict[tuple[str, str, int], int] = field(default_factory=dict)
+    assign: set[tuple[str, str, int]] = field(default_factory=set)
+    usage: dict[tuple[str, str, int], int] = field(default_factory=dict)
+    # Smallest share of an event's labor need that could be scheduled
+    met: Fraction = Fraction(1)
+
+
+class _Builder:
+    def __init__(self, request: PlanRequest) -> None:
+        self.req = request
+        self.H = request.horizon.num_days
+        self.windows = event_windows(request)
+        self.periods = Periods.of(request.horizon)
+        ts = TIME_SCALE_UNITS_PER_HOUR
+        self.worker_left = {
+            (w.id, t): self.periods.length(t) * _units(w.capacity_per_day, ts)
+            for w in request.workers
+            for t in range(1, self.H + 1)
+            if not (w.blocked_days and t in w.blocked_days)
+        }
+        self.resource_left = {
+            (r.id, t): self.periods.length(t) * _units(r.capacity_per_day, ts)
+            for r in request.resources
+            for t in range(1, self.H + 1)
+            if not (r.blocked_days and t in r.blocked_days)
+        }
+        self.land_used = {ld.id: [0] * (self.H + 1) for ld in request.lands}
+        self.events_by_crop: dict[str, list[Event]] = {}
+        # A lagged successor may only follow the most recent predecessor day,
+        # so predecessor days are spaced to leave each one a successor slot
+        self.min_gap: dict[str, int] = {}
+        for ev in request.events:
+            self.events_by_crop.setdefault(ev.crop_id, []).append(ev)
+            if ev.preceding_event_id and ev.lag_min_days:
+                pid = ev.preceding_event_id
+                gap = int(ev.lag_min_days) + 1
+                self.min_gap[pid] = max(self.min_gap.get(pid, 0), gap)
+        # Committed results
+        self.event_days: dict[str, list[int]] = {}
+        self.area: dict[tuple[str, str], int] = {}
+        self.occ_days: dict[str, set[int]] = {}
+        self.hours: dict[tuple[str, str, int], int] = {}
+        self.assign: set[tuple[str, str, int]] = set()
+        self.usage: dict[tuple[str, str, int], int] = {}
+
+    # -- events -----------------------------------------------------------
+
+    def _ordered(self, events: list[Event]) -> list[Event]:
+        # Predecessors first; cycles keep their input order
+        ids = {ev.id for ev in events}
+        placed: set[str] = set()
+        ordered: list[Event] = []
+        pending = list(events)
+        while pending:
+            ready = [
+                ev
+                for ev in pending
+                if ev.preceding_event_id not in ids or ev.preceding_event_id in placed
+            ] or pending[:1]
+            for ev in ready:
+                ordered.append(ev)
+                placed.add(ev.id)
+                pending.remove(ev)
+        return ordered
+
+    def _has_labor_terms(self, ev: Event) -> bool:
+        # The labor equality exists only when some worker can work in the window
+        return any(
+            (w.id, t) in self.worker_left
+            for w in self.req.workers
+            for t in self.windows.get(ev.id, ())
+        )
+
+    def _candidate_days(self, ev: Event, sched: _Schedule) -> list[int]:
+        days = sorted(self.windows.get(ev.id, ()))
+        if not (ev.preceding_event_id and (ev.lag_min_days or ev.lag_max_days)):
+            return days
+        pid = ev.preceding_event_id
+        pred = sched.days.get(pid, self.event_days.get(pid, []))
+        lmin = int(ev.lag_min_days or 0)
+        lmax = int(ev.lag_max_days or lmin)
+        out: list[int] = []
+        for t in days:
+            span = self.periods.lag_predecessors(t, lmin, lmax)
+            if not any(d in span for d in pred):
+                continue
+            # The lag counts from the most recent predecessor
+            recent = self.periods.recent_predecessors(t, lmin)
+            if lmin > 0 and any(d in recent for d in pred):
+                continue
+            out.append(t)
+        return out
+
+    def _fill(
+        self,
+        ev: Event,
+        need: int,
+        sched: _Schedule,
+        taken_w: dict[tuple[str, int], int],
+        taken_r: dict[tuple[str, int], int],
+    ) -> int:
+        """Schedule up to ``need`` time units of ``ev``; returns the amount."""
+        roles = ev.required_roles or set()
+        cats = ev.required_resource_categories or set()
+        people = int(ev.people_required or 0)
+        freq = max(int(ev.frequency_days or 0), self.min_gap.get(ev.id, 0))
+        daily_cap = (
+            None
+            if ev.labor_daily_cap is None
+            else _units(ev.labor_daily_cap, TIME_SCALE_UNITS_PER_HOUR)
+        )
+        remaining = need
+        last: int | None = None
+        days = sched.days.setdefault(ev.id, [])
+        for t in self._candidate_days(ev, sched):
+            if remaining <= 0:
+                break
+            if freq > 1 and last is not None and self.periods.gap(last, t) < freq:
+                continue
+            eligible = [
+                w
+                for w in self.req.workers
+                if (w.id, t) in self.worker_left
+                and (not roles or (w.roles or set()) & roles)
+            ]
+            if len(eligible) < people or any(
+                not any(role in (w.roles or set()) for w in eligible) for role in roles
+            ):
+                continue
+            left = {
+                w.id: self.worker_left[(w.id, t)] - taken_w.get((w.id, t), 0)
+                for w in eligible
+            }
+            amount = min(remaining, sum(left.values()))
+            if daily_cap is not None:
+                amount = min(amount, self.periods.length(t) * daily_cap)
+            res_left: dict[str, int] = {}
+            if cats:
+                res_left = {
+                    r.id: self.resource_left[(r.id, t)] - taken_r.get((r.id, t), 0)
+                    for r in self.req.resources
+                    if r.category in cats and (r.id, t) in self.resource_left
+                }
+                if res_left:
+                    amount = min(amount, sum(res_left.values()))
+            if amount < 1:
+                continue
+            # Hours: fill workers in order; then cover roles and headcount with
+            # zero-hour assignments
+            assigned: list[str] = []
+            rest = amount
+            for w in eligible:
+                h = min(rest, left[w.id])
+                if h <= 0:
+                    continue
+                sched.hours[(w.id, ev.id, t)] = h
+                taken_w[(w.id, t)] = taken_w.get((w.id, t), 0) + h
+                assigned.append(w.id)
+                rest -= h
+                if rest == 0:
+                    break
+            roles_by_worker = {w.id: w.roles or set() for w in eligible}
+            for role in sorted(roles):
+                if not any(role in roles_by_worker[wid] for wid in assigned):
+                    assigned.append(
+                        next(w.id for w in eligible if role in roles_by_worker[w.id])
+                    )
+            for w in eligible:
+                if len(assigned) >= people:
+                    break
+                if w.id not in assigned:
+                    assigned.append(w.id)
+            sched.assign.update((wid, ev.id, t) for wid in assigned)
+            rest = amount
+            for rid, cap in res_left.items():
+                u = min(rest, cap)
+                if u <= 0:
+                    continue
+                sched.usage[(rid, ev.id, t)] = u
+                taken_r[(rid, t)] = taken_r.get((rid, t), 0) + u
+                rest -= u
+                if rest == 0:
+                    break
+            days.append(t)
+            remaining -= amount
+            last = t
+        return need - remaining
+
+    def _schedule(self, crop: Crop, units: int) -> _Schedule:
+        sched = _Schedule()
+        taken_w: dict[tuple[str, int], int] = {}
+        taken_r: dict[tuple[str, int], int] = {}
+        for ev in self._ordered(self.events_by_crop.get(crop.id, [])):
+            need = _labor_per_unit(ev) * units
+            # Without labor terms, or with zero need, the event cannot be active
+            if need <= 0 or not self._has_labor_terms(ev):
+                sched.days[ev.id] = []
+                continue
+            done = self._fill(ev, int(need), sched, taken_w, taken_r)
+            if done < need:
+                sched.met = min(sched.met, Fraction(done) / need)
+        return sched
+
+    # -- land ---------------------------------------------------------------
+
+    def _free(self, land: Land, window: set[int], uses_land: bool) -> int:
+        cap = _units(land.area, AREA_SCALE_UNITS_PER_A)
+        blocked = land.blocked_days or set()
+        used = self.land_used[land.id]
+        if uses_land:
+            # Occupancy must hold on every day of the crop's window
+            if blocked & window:
+                return 0
+            days = window
+        else:
+            days = {t for t in range(1, self.H + 1) if t not in blocked}
+        return cap - max((used[t] for t in days), default=0)
+
+    def _allocate(
+        self, crop: Crop, units: int, window: set[int], uses_land: bool
+    ) -> dict[str, int]:
+        allowed = self.req.allowed_crops_by_land or {}
+        free = {
+            ld.id: self._free(ld, window, uses_land)
+            if crop.id in allowed.get(ld.id, {crop.id})
+            else 0
+            for ld in self.req.lands
+        }
+        alloc: dict[str, int] = {}
+
+        def take(land_ids: list[str], amount: int) -> int:
+            for lid in sorted(land_ids, key=lambda i: -free[i]):
+                if amount <= 0:
+                    break
+                x = min(amount, free[lid])
+                if x > 0:
+                    alloc[lid] = alloc.get(lid, 0) + x
+                    free[lid] -= x
+                    amount -= x
+            return amount
+
+        budget = units
+        for fa in self.req.fixed_areas or []:
+            if fa.crop_id != crop.id or not fa.land_tag:
+                continue
+            tagged = [ld.id for ld in self.req.lands if fa.land_tag in (ld.tags or ())]
+            have = sum(alloc.get(lid, 0) for lid in tagged)
+            target = min(budget, _units(fa.area, AREA_SCALE_UNITS_PER_A) - have)
+            if target > 0:
+                budget -= target - take(tagged, target)
+        take([ld.id for ld in self.req.lands], budget)
+        return alloc
+
+    # -- crops --------------------------------------------------------------
+
+    def _bounds(self, crop: Crop) -> tuple[int, int]:
+        scale = AREA_SCALE_UNITS_PER_A
+        lo = 0
+        hi = sum(_units(ld.area, scale) for ld in self.req.lands)
+        for b in self.req.crop_area_bounds or []:
+            if b.crop_id != crop.id:
+                continue
+            if b.min_area is not None:
+                lo = max(lo, _units(b.min_area, scale))
+            if b.max_area is not None:
+                hi = min(hi, _units(b.max_area, scale))
+        for fa in self.req.fixed_areas or []:
+            tagged = [ld for ld in self.req.lands if fa.land_tag in (ld.tags or ())]
+            if fa.crop_id == crop.id and fa.land_tag and tagged:
+                lo = max(lo, _units(fa.area, scale))
+        return lo, hi
+
+    def _step(self, crop: Crop) -> int:
+        # Labor needs p*X/q must be whole time units
+        step = 1
+        for ev in self.events_by_crop.get(crop.id, []):
+            step = math.lcm(step, _labor_per_unit(ev).denominator)
+        return step
+
+    def place(self, crop: Crop) -> None:
+        lo, hi = self._bounds(crop)
+        if hi <= 0 or (lo == 0 and (crop.price_per_area or 0.0) <= 0.0):
+            return
+        step = self._step(crop)
+        uses_land = any(ev.uses_land for ev in self.events_by_crop.get(crop.id, []))
+        units = hi - hi % step
+        for _ in range(_MAX_ROUNDS):
+            if units <= 0:
+                return
+            sched = self._schedule(crop, units)
+            if sched.met < 1:
+                shrunk = math.floor(units * sched.met)
+                units = min(units - step, shrunk - shrunk % step)
+                continue
+            window: set[int] = set(range(1, self.H + 1))
+            if uses_land:
+                use_days = [
+                    t
+                    for ev in self.events_by_crop[crop.id]
+                    if ev.uses_land
+                    for t in sched.days.get(ev.id, [])
+                ]
+                if not use_days:
+                    # Area on a uses_land crop needs occupancy
+                    return
+                window = set(range(min(use_days), max(use_days) + 1))
+            alloc = self._allocate(crop, units, window, uses_land)
+            total = sum(alloc.values())
+            if total < units:
+                units = min(units - step, total - total % step)
+                continue
+            self._commit(crop, alloc, sched, window if uses_land else set())
+            return
+
+    def _commit(
+        self,
+        crop: Crop,
+        alloc: dict[str, int],
+        sched: _Schedule,
+        occ_window: set[int],
+    ) -> None:
+        for land in self.req.lands:
+            x = alloc.get(land.id, 0)
+            if x <= 0:
+                continue
+            self.area[(land.id, crop.id)] = x
+            blocked = land.blocked_days or set()
+            days = occ_window or set(range(1, self.H + 1))
+            used = self.land_used[land.id]
+            for t in days:
+                if t not in blocked:
+                    used[t] += x
+        self.occ_days[crop.id] = occ_window
+        self.event_days.update(sched.days)
+        for key, h in sched.hours.items():
+            w_id, _e, t = key
+            self.worker_left[(w_id, t)] -= h
+        for key, u in sched.usage.items():
+            r_id, _e, t = key
+            self.resource_left[(r_id, t)] -= u
+        self.hours.update(sched.hours)
+        self.assign |= sched.assign
+        self.usage.update(sched.usage)
+
+    def _priority(self, crop: Crop) -> tuple:
+        lo, _hi = self._bounds(crop)
+        labor = sum(
+            float(ev.labor_total_per_area or 0.0)
+            for ev in self.events_by_crop.get(crop.id, [])
+        )
+        # Bound-forced crops first, then price per area, then lighter labor
+        return (lo == 0, -(crop.price_per_area or 0.0), labor)
+
+    def result(self) -> SolveContext:
+        req, H = self.req, self.H
+        days = range(1, H + 1)
+        sc = SolveContext(build=None, status="FEASIBLE")
+        sc.x_area_by_l_c_values = {
+            (ld.id, c.id): self.area.get((ld.id, c.id), 0)
+            for ld in req.lands
+            for c in req.crops
+        }
+        sc.z_use_by_l_c_values = {
+            key: int(x > 0) for key, x in sc.x_area_by_l_c_values.items()
+        }
+        x_lct: dict[tuple[str, str, int], int] = {}
+        occ_lct: dict[tuple[str, str, int], int] = {}
+        for ld in req.lands:
+            blocked = ld.blocked_days or set()
+            for c in req.crops:
+                x = self.area.get((ld.id, c.id), 0)
+                window = self.occ_days.get(c.id)
+                for t in days:
+                    on = x > 0 and t not in blocked and (not window or t in window)
+                    x_lct[(ld.id, c.id, t)] = x if on else 0
+                    occ_lct[(ld.id, c.id, t)] = int(on and bool(window))
+        sc.x_area_by_l_c_t_values = x_lct
+        sc.occ_by_l_c_t_values = occ_lct
+        sc.occ_by_c_t_values = {
+            (c.id, t): int(t in (self.occ_days.get(c.id) or ()))
+            for c in req.crops
+            for t in days
+        }
+        active = {(e_id, t) for e_id, ds in self.event_days.items() for t in ds}
+        sc.r_event_by_e_t_values = {
+            (ev.id, t): int((ev.id, t) in active) for ev in req.events for t in days
+        }
+        sc.h_time_by_w_e_t_values = {}
+        sc.assign_by_w_e_t_values = {}
+        for ev in req.events:
+            for t in self.windows.get(ev.id, ()):
+                for w in req.workers:
+                    key = (w.id, ev.id, t)
+                    sc.h_time_by_w_e_t_values[key] = self.hours.get(key, 0)
+                    sc.assign_by_w_e_t_values[key] = int(key in self.assign)
+        sc.u_time_by_r_e_t_values = {
+            (r.id, ev.id, t): self.usage.get((r.id, ev.id, t), 0)
+            for r in req.resources
+            for ev in req.events
+            for t in self.windows.get(ev.id, ())
+        }
+        price = {
+            c.id: int(round((c.price_per_area or 0.0) / AREA_SCALE_UNITS_PER_A))
+            for c in req.crops
+        }
+        sc.objective_value = float(
+            sum(price[c] * x for (_l, c), x in self.area.items())
+        )
+        return sc
+
+
+def construct(request: PlanRequest) -> SolveContext:
+    """Greedy plan as a hint-ready ``SolveContext`` (``build`` is None).
+
+    ``objective_value`` is the profit in model units (see
+    ``build_profit_expr``) and ``solve_ms`` the construction time.
+    """
+    t0 = time.perf_counter()
+    builder = _Builder(request)
+    for crop in sorted(request.crops, key=builder._priority):
+        builder.place(crop)
+    sc = builder.result()
+    sc.solve_ms = (time.perf_counter() - t0) * 1000.0
+    return sc
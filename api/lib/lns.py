@@ -0,0 +1,234 @@
+"""Structured large-neighbourhood search (LNS) over lands, crops and time.
+
+CP-SAT's own LNS picks neighbourhoods without knowing the farm structure, and
+on large instances the profit and dispersion stages often stop at a feasible
+but unproven plan. ``improve`` continues such a stage with rounds that relax
+one part of the farm and pin everything else to the incumbent:
+
+- ``lands``: every variable on a random subset of the lands;
+- ``crops``: one crop family (crops sharing a ``category``) on all lands;
+- ``window``: all lands and crops on a random run of time indices.
+
+Events (and their worker/resource hours) are relaxed with the crops and days
+of the neighbourhood on any land. Each round rebuilds the stage's model (with
+the earlier stages' locks), adds ``Pinned`` and re-solves it with a short
+time limit, hinted with the incumbent, so the incumbent is always feasible.
+The rounds of a batch run in parallel threads from the same incumbent
+(CP-SAT releases the GIL while solving; workers come from the CPU budget)
+and the best improvement of the batch becomes the next incumbent.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from collections.abc import Callable, Iterator
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from ortools.sat.python import cp_model
+
+from .cancel import bind
+from .interfaces import Constraint
+from .model_builder import BuildContext
+from .schemas import PlanRequest
+from .solver import SolveContext, solve
+from .solver_profiles import SolverProfile
+
+# Share of the lands / of the horizon relaxed by one round, at first and at
+# most; a batch whose rounds all prove their neighbourhood without improving
+# it grows the share by RELAX_GROWTH, one that times out shrinks it
+RELAX_FRACTION = 0.3
+RELAX_MAX = 0.8
+RELAX_GROWTH = 1.5
+
+
+@dataclass(frozen=True)
+class LnsOptions:
+    """LNS rounds run after a stage that ends without an optimality proof."""
+
+    rounds: int
+    # Time limit of one round
+    round_s: float = 1.0
+    # Rounds solved at the same time (from the same incumbent)
+    parallel: int = 1
+    seed: int = 0
+
+
+@dataclass
+class Pinned(Constraint):
+    """Fix areas, events and hours to ``values`` where ``free`` is False.
+
+    ``free(land_id, crop_id, t)`` decides per variable; events and hours are
+    not land-specific and are asked with ``land_id=None``. Variables without
+    a value in ``values`` are pinned to 0.
+    """
+
+    values: SolveContext
+    free: Callable[[str | None, str, int], bool]
+    label: str = "pinned"
+
+    def apply(self, ctx: BuildContext) -> None:
+        model, v, vals = ctx.model, ctx.variables, self.values
+        crop_of = {ev.id: ev.crop_id for ev in ctx.request.events}
+        guard = ctx.guard(self.label)
+        x = vals.x_area_by_l_c_t_values or {}
+        for (land_id, crop_id, t), var in v.x_area_by_l_c_t.items():
+            if not self.free(land_id, crop_id, t):
+                model.Add(var == x.get((land_id, crop_id, t), 0)).OnlyEnforceIf(guard)
+        for values, variables in (
+            (vals.r_event_by_e_t_values, v.r_event_by_e_t),
+            (vals.h_time_by_w_e_t_values, v.h_time_by_w_e_t),
+            (vals.u_time_by_r_e_t_values, v.u_time_by_r_e_t),
+        ):
+            values = values or {}
+            for key, var in variables.items():
+                e, t = key[-2], key[-1]
+                if not self.free(None, crop_of[e], t):
+                    model.Add(var == values.get(key, 0)).OnlyEnforceIf(guard)
+
+
+@dataclass(frozen=True)
+class Neighborhood:
+    """Relaxed part of the plan; None relaxes the whole dimension."""
+
+    kind: str
+    lands: frozenset[str] | None = None
+    crops: frozenset[str] | None = None
+    days: tuple[int, int] | None = None
+
+    def free(self, land_id: str | None, crop_id: str, t: int) -> bool:
+        return (
+            (land_id is None or self.lands is None or land_id in self.lands)
+            and (self.crops is None or crop_id in self.crops)
+            and (self.days is None or self.days[0] <= t <= self.days[1])
+        )
+
+    def describe(self) -> str:
+        if self.lands is not None:
+            return ",".join(sorted(self.lands))
+        if self.crops is not None:
+            return ",".join(sorted(self.crops))
+        if self.days is not None:
+            return f"{self.days[0]}-{self.days[1]}"
+        return "all"
+
+
+def neighborhoods(
+    request: PlanRequest,
+    rng: random.Random,
+    fraction: Callable[[], float] = lambda: RELAX_FRACTION,
+) -> Iterator[Neighborhood]:
+    """Endless cycle of land, crop-family and time-window neighbourhoods.
+
+    ``fraction()`` is the share of the lands and of the horizon relaxed by
+    the next land or window neighbourhood. Kinds that would relax the whole
+    plan (one land, one family, a short horizon) are left out; with none
+    left, the whole plan is the only one.
+    """
+    lands = sorted(land.id for land in request.lands)
+    families: dict[str, set[str]] = {}
+    for crop in request.crops:
+        families.setdefault(crop.category or crop.id, set()).add(crop.id)
+    H = request.horizon.num_days
+    n_days = max(2, round(H * RELAX_FRACTION))
+
+    kinds: list[Callable[[], Neighborhood]] = []
+    if len(lands) > 1:
+
+        def some_lands() -> Neighborhood:
+            n = min(len(lands) - 1, max(1, round(len(lands) * fraction())))
+            return Neighborhood("lands", lands=frozenset(rng.sample(lands, n)))
+
+        kinds.append(some_lands)
+    if len(families) > 1:
+        groups = [frozenset(g) for _, g in sorted(families.items())]
+        kinds.append(lambda: Neighborhood("crops", crops=rng.choice(groups)))
+    if H > n_days:
+
+        def window() -> Neighborhood:
+            n = min(H - 1, max(2, round(H * fraction())))
+            lo = rng.randint(1, H - n + 1)
+            return Neighborhood("window", days=(lo, lo + n - 1))
+
+        kinds.append(window)
+    if not kinds:
+        kinds.append(lambda: Neighborhood("all"))
+    while True:
+        for make in kinds:
+            yield make()
+
+
+def _better(sense: str, value: int, than: int) -> bool:
+    return value > than if sense == "max" else value < than
+
+
+def improve(
+    request: PlanRequest,
+    rebuild: Callable[[list[Constraint]], tuple[BuildContext, cp_model.LinearExpr]],
+    incumbent: SolveContext,
+    sense: str,
+    options: LnsOptions,
+    *,
+    profile: SolverProfile | None = None,
+    progress_cb: Callable[[float, str], None] | None = None,
+) -> tuple[SolveContext, list[dict]]:
+    """Improve a stage's ``incumbent`` with ``options.rounds`` LNS rounds.
+
+    ``rebuild(extra)`` returns a fresh model of the stage (locks applied,
+    ``extra`` constraints added) and its objective expression. Returns the
+    best solution, whose ``objective_value`` is the stage value, and one row
+    per round (neighbourhood, status, value, whether it improved, time).
+    """
+    rng = random.Random(options.seed)
+    share = [RELAX_FRACTION]
+    hoods = neighborhoods(request, rng, lambda: share[0])
+    best, best_value = incumbent, int(incumbent.objective_value or 0)
+    rows: list[dict] = []
+
+    def run(nb: Neighborhood, base: SolveContext) -> tuple[SolveContext, float]:
+        t0 = time.perf_counter()
+        ctx, expr = rebuild([Pinned(base, nb.free, label="lns")])
+        if sense == "max":
+            ctx.model.Maximize(expr)
+        else:
+            ctx.model.Minimize(expr)
+        res = solve(ctx, prev=base, profile=profile, time_limit_s=options.round_s)
+        return res, (time.perf_counter() - t0) * 1000.0
+
+    parallel = max(1, options.parallel)
+    with ThreadPoolExecutor(parallel, thread_name_prefix="lns") as pool:
+        while len(rows) < options.rounds:
+            size = min(parallel, options.rounds - len(rows))
+            batch = [next(hoods) for _ in range(size)]
+            timed = list(pool.map(bind(run), batch, [best] * len(batch)))
+            results = [res for res, _ in timed]
+            start = best_value
+            for nb, (res, ms) in zip(batch, timed, strict=True):
+                value = None
+                if res.status in ("FEASIBLE", "OPTIMAL"):
+                    value = int(res.objective_value or 0)
+                improved = value is not None and _better(sense, value, start)
+                rows.append(
+                    {
+                        "kind": nb.kind,
+                        "relaxed": nb.describe(),
+                        "status": res.status,
+                        "value": value,
+                        "improved": improved,
+                        "ms": ms,
+                    }
+                )
+                if improved and _better(sense, value, best_value):
+                    best, best_value = res, value
+            statuses = {res.status for res in results}
+            if statuses == {"OPTIMAL"} and best_value == start:
+                share[0] = min(RELAX_MAX, share[0] * RELAX_GROWTH)
+            elif "OPTIMAL" not in statuses:
+                share[0] = max(RELAX_FRACTION, share[0] / RELAX_GROWTH)
+            if progress_cb is not None:
+                progress_cb(len(rows) / options.rounds, "lns")
+    if best is not incumbent:
+        # Optimal within a neighbourhood proves nothing about the stage
+        best.status = incumbent.status
+    return best, rows
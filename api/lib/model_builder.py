@@ -6,6 +6,7 @@ from ortools.sat.python import cp_model
 
 from .constants import AREA_SCALE_UNITS_PER_A
 from .interfaces import Constraint, Objective
+from .periods import Periods
 from .schemas import PlanRequest
 from .variables import Variables, create_empty_variables
 
@@ -26,19 +27,32 @@ class BuildContext:
     allowed_days_by_event: dict[str, set[int]] = field(default_factory=dict)
     # Crop ID -> possible occupancy days (continuous span covering any uses)
     occ_days_by_crop: dict[str, set[int]] = field(default_factory=dict)
+    # Original extent of each time index (all 1 unless periods are merged)
+    periods: Periods = field(default_factory=lambda: Periods((), (), ()))
+    # Explain mode: constraint family label -> assumption literal (see guard)
+    assumptions: dict[str, cp_model.IntVar] | None = None
 
+    def guard(self, label: str) -> list[cp_model.IntVar]:
+        """Enforcement literals for the constraint family ``label``.
 
-def build_model(
-    request: PlanRequest, constraints: list[Constraint], objectives: list[Objective]
-) -> BuildContext:
-    model = cp_model.CpModel()
-    variables = create_empty_variables()
-    ctx = BuildContext(request=request, variables=variables, model=model)
+        Empty outside explain mode. In explain mode every family gets one
+        assumption literal, e.g. ``crop_area_min:C1`` or ``roles:E1``, so an
+        infeasible model reports which families conflict.
+        """
+        if self.assumptions is None:
+            return []
+        lit = self.assumptions.get(label)
+        if lit is None:
+            lit = self.model.NewBoolVar(f"assume_{label}")
+            self.assumptions[label] = lit
+        return [lit]
 
-    # Precompute coarse allowed windows per event and occupancy windows per crop
+
+def event_windows(request: PlanRequest) -> dict[str, set[int]]:
+    """Coarse allowed days per event: earliest start to latest end."""
     H = request.horizon.num_days
     all_days = set(range(1, H + 1))
-    # Event windows
+    windows: dict[str, set[int]] = {}
     for ev in request.events:
         start_set = ev.start_cond if ev.start_cond is not None else all_days
         end_set = ev.end_cond if ev.end_cond is not None else all_days
@@ -48,7 +62,31 @@ def build_model(
             allowed = set(range(max(1, lo), min(H, hi) + 1))
         else:
             allowed = set(all_days)
-        ctx.allowed_days_by_event[ev.id] = allowed
+        windows[ev.id] = allowed
+    return windows
+
+
+def build_model(
+    request: PlanRequest,
+    constraints: list[Constraint],
+    objectives: list[Objective],
+    *,
+    explain: bool = False,
+) -> BuildContext:
+    model = cp_model.CpModel()
+    variables = create_empty_variables()
+    ctx = BuildContext(
+        request=request,
+        variables=variables,
+        model=model,
+        periods=Periods.of(request.horizon),
+    )
+    if explain:
+        ctx.assumptions = {}
+
+    # Precompute coarse allowed windows per event and occupancy windows per crop
+    H = request.horizon.num_days
+    ctx.allowed_days_by_event.update(event_windows(request))
     # Crop occupancy windows: span between earliest and latest possible use day
     uses_by_crop: dict[str, list[int]] = {}
     for ev in request.events:
@@ -73,6 +111,8 @@ def build_model(
     for c in constraints:
         if getattr(c, "enabled", True):
             c.apply(ctx)
+    if ctx.assumptions:
+        model.AddAssumptions(list(ctx.assumptions.values()))
 
     # Only first objective is applied per solve
     if objectives:
@@ -129,9 +129,10 @@ def build_event_span_expr(ctx: BuildContext) -> cp_model.LinearExpr:
 
 
 def build_occupancy_span_expr(ctx: BuildContext) -> cp_model.LinearExpr:
-    """Minimize total crop occupancy days Σ_{c,t} occ[c,t]."""
+    """Minimize total crop occupancy days Σ_{c,t} occ[c,t] (in days when
+    periods are merged)."""
     occ = ctx.variables.occ_by_c_t
-    terms = list(occ.values())
+    terms = [ctx.periods.length(t) * v for (_c, t), v in occ.items()]
     return sum(terms) if terms else 0
 
 
@@ -157,7 +158,8 @@ def build_earliness_expr(ctx: BuildContext) -> cp_model.LinearExpr:
     terms: list[cp_model.LinearExpr] = []
     for (_e_id, t), r in ctx.variables.r_event_by_e_t.items():
         if 1 <= t <= H:
-            terms.append(t * r)
+            # First day of t (t itself unless periods are merged)
+            terms.append(ctx.periods.firsts[t - 1] * r)
     return sum(terms) if terms else 0
 
 
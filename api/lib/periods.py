@@ -0,0 +1,250 @@
+"""Model time periods and merging of equivalent periods.
+
+A request's time index t (1..H) stands for one original period unless
+``horizon.period_lengths`` says otherwise: then index t covers
+``period_lengths[t - 1]`` consecutive original periods. Per-period
+capacities (workers, resources, event daily caps) scale with the days the
+index covers: its length, or the sum of ``horizon.period_days`` over its
+original periods when those are buckets of days.
+Lags and frequencies stay in original periods and are checked between the
+first original periods of the indices. Events with a lag or frequency keep
+one-period indices in their windows, so an expanded plan keeps them.
+
+``merge_equivalent_periods`` builds such a request from runs of periods that
+no constraint can tell apart; ``expand_response`` maps a plan for it back to
+the original indices.
+"""
+
+from __future__ import annotations
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+
+from .schemas import (
+    EventAssignment,
+    Horizon,
+    Land,
+    PlanRequest,
+    PlanResponse,
+    Resource,
+    Worker,
+)
+
+
+@dataclass(frozen=True)
+class Periods:
+    """Original extent of every time index of a horizon."""
+
+    # First and last original period (1-based) of index t at position t - 1
+    firsts: tuple[int, ...]
+    lasts: tuple[int, ...]
+    # Days covered by index t at position t - 1
+    days: tuple[int, ...]
+
+    @classmethod
+    def of(cls, horizon: Horizon) -> Periods:
+        lengths = horizon.period_lengths or [1] * horizon.num_days
+        firsts: list[int] = []
+        lasts: list[int] = []
+        day = 1
+        for n in lengths:
+            firsts.append(day)
+            day += n
+            lasts.append(day - 1)
+        days = lengths
+        if horizon.period_days is not None:
+            per_period = horizon.period_days
+            days = [
+                sum(per_period[first - 1 : last])
+                for first, last in zip(firsts, lasts, strict=True)
+            ]
+        return cls(tuple(firsts), tuple(lasts), tuple(days))
+
+    @property
+    def total(self) -> int:
+        """Number of original periods."""
+        return self.lasts[-1] if self.lasts else 0
+
+    @property
+    def total_days(self) -> int:
+        return sum(self.days)
+
+    def length(self, t: int) -> int:
+        """Days of index ``t``, the factor of its per-day capacities."""
+        return self.days[t - 1]
+
+    def gap(self, s: int, t: int) -> int:
+        """Original periods from the first one of ``s`` to the first of ``t``."""
+        return self.firsts[t - 1] - self.firsts[s - 1]
+
+    def lag_predecessors(self, t: int, lag_min: int, lag_max: int) -> range:
+        """Indices s that ``t`` lies ``lag_min..lag_max`` periods after."""
+        first = self.firsts[t - 1]
+        lo = bisect_left(self.firsts, first - lag_max) + 1
+        hi = bisect_right(self.firsts, first - lag_min)
+        return range(lo, hi + 1)
+
+    def recent_predecessors(self, t: int, lag_min: int) -> range:
+        """Indices s <= t closer than ``lag_min`` to ``t``."""
+        hi = bisect_right(self.firsts, self.firsts[t - 1] - lag_min)
+        return range(hi + 1, t + 1)
+
+    def frequency_window(self, t: int, frequency: int) -> range:
+        """Indices from ``t`` on that lie within ``frequency`` of ``t``."""
+        hi = bisect_right(self.firsts, self.firsts[t - 1] + frequency - 1)
+        return range(t, max(t, hi) + 1)
+
+
+def merge_equivalent_periods(request: PlanRequest) -> PlanRequest:
+    """Request whose runs of equivalent periods form one index each.
+
+    Periods are equivalent when no event window opens or closes between them
+    and the same lands, workers and resources are blocked in both. Within the
+    window of an event with a frequency or a lag (either side of it) every
+    period stays separate: the gap between two events in one merged period
+    is unknown. The result is ``request`` itself when nothing merges or it is
+    already merged.
+    """
+    H = request.horizon.num_days
+    if request.horizon.period_lengths is not None:
+        return request
+    cuts = {1}
+    timed: set[str] = set()
+    for ev in request.events:
+        if ev.frequency_days and ev.frequency_days > 1:
+            timed.add(ev.id)
+        if ev.preceding_event_id and (ev.lag_min_days or ev.lag_max_days):
+            timed.update((ev.id, ev.preceding_event_id))
+    for ev in request.events:
+        first = min(ev.start_cond) if ev.start_cond else 1
+        last = max(ev.end_cond) if ev.end_cond else H
+        if ev.id in timed:
+            cuts.update(range(first, last + 2))
+        else:
+            cuts.update((first, last + 1))
+    blocked = [
+        item.blocked_days or set()
+        for item in (*request.lands, *request.workers, *request.resources)
+    ]
+    for t in range(2, H + 1):
+        if any((t in b) != (t - 1 in b) for b in blocked):
+            cuts.add(t)
+    starts = sorted(c for c in cuts if 1 <= c <= H)
+    if len(starts) >= H:
+        return request
+    n = len(starts)
+
+    def index(t: int) -> int:
+        # Days outside the horizon keep their distance to it
+        if t < 1:
+            return t
+        if t > H:
+            return n + t - H
+        return bisect_right(starts, t)
+
+    def remap(days: set[int] | None, *, clip: bool) -> set[int] | None:
+        if days is None:
+            return None
+        return {index(t) for t in days if not clip or 1 <= t <= H}
+
+    def reblock(item: Land | Worker | Resource) -> Land | Worker | Resource:
+        return item.model_copy(
+            update={"blocked_days": remap(item.blocked_days, clip=True)}
+        )
+
+    lengths = [nxt - s for s, nxt in zip(starts, [*starts[1:], H + 1], strict=True)]
+    return request.model_copy(
+        update={
+            "horizon": Horizon(
+                num_days=n,
+                period_lengths=lengths,
+                period_days=request.horizon.period_days,
+            ),
+            "events": [
+                ev.model_copy(
+                    update={
+                        "start_cond": remap(ev.start_cond, clip=False),
+                        "end_cond": remap(ev.end_cond, clip=False),
+                    }
+                )
+                for ev in request.events
+            ],
+            "lands": [reblock(ld) for ld in request.lands],
+            "workers": [reblock(w) for w in request.workers],
+            "resources": [reblock(r) for r in request.resources],
+        }
+    )
+
+
+def _spread(ea: EventAssignment, first: int, days: list[int]) -> list[EventAssignment]:
+    """``ea`` on the original periods from ``first`` on, its hours shared out
+    in proportion to their ``days``."""
+    worked = any(w.used_time_hours for w in ea.assigned_workers) or any(
+        r.used_time_hours for r in ea.resource_usage
+    )
+    if len(days) == 1 or not worked:
+        return [ea.model_copy(update={"index": first})]
+    total = sum(days)
+    out: list[EventAssignment] = []
+    for i, n in enumerate(days):
+        share = n / total
+        workers = [
+            w.model_copy(update={"used_time_hours": w.used_time_hours * share})
+            if w.used_time_hours is not None
+            else w
+            for w in ea.assigned_workers
+        ]
+        resources = [
+            r.model_copy(update={"used_time_hours": r.used_time_hours * share})
+            for r in ea.resource_usage
+        ]
+        out.append(
+            ea.model_copy(
+                update={
+                    "index": first + i,
+                    "assigned_workers": workers,
+                    "resource_usage": resources,
+                }
+            )
+        )
+    return out
+
+
+def expand_response(resp: PlanResponse, horizon: Horizon) -> PlanResponse:
+    """``resp`` for a merged ``horizon`` with indices of the original periods.
+
+    Areas repeat on every original period of a merged index. Work done in a
+    merged index is spread over its original periods in proportion to their
+    days (``horizon.period_days``): every period keeps the same workers and
+    resources, and stays within the per-day capacities the merged index was
+    solved with.
+    """
+    periods = Periods.of(horizon)
+    per_period = horizon.period_days
+
+    def days(t: int) -> range:
+        return range(periods.firsts[t - 1], periods.lasts[t - 1] + 1)
+
+    by_land = {
+        land_id: {d: dict(crops) for t, crops in per_t.items() for d in days(t)}
+        for land_id, per_t in resp.assignment.crop_area_by_land_t.items()
+    }
+    events = None
+    if resp.event_assignments is not None:
+        events = [
+            spread
+            for ea in resp.event_assignments
+            for spread in _spread(
+                ea,
+                periods.firsts[ea.index - 1],
+                [per_period[d - 1] if per_period else 1 for d in days(ea.index)],
+            )
+        ]
+    return resp.model_copy(
+        update={
+            "assignment": resp.assignment.model_copy(
+                update={"crop_area_by_land_t": by_land}
+            ),
+            "event_assignments": events,
+        }
+    )
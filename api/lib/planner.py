@@ -4,6 +4,8 @@ import math
 import time
 from collections.abc import Callable
 
+from ortools.sat.python import cp_model
+
 from .constraints import (
     AreaBoundsConstraint,
     EventsWindowConstraint,
@@ -16,8 +18,18 @@ from .constraints import (
     ResourcesConstraint,
     RolesConstraint,
 )
+from .diagnostics import explain_infeasibility
+from .expressions import (
+    MAX_OBJECTIVE_SPAN,
+    evaluate_expr,
+    expr_bounds,
+    expr_magnitude,
+    is_constant,
+)
+from .greedy import construct
 from .interfaces import Constraint, Objective
-from .model_builder import build_model
+from .lns import LnsOptions, improve
+from .model_builder import BuildContext, build_model
 from .objectives import (
     build_dispersion_expr,
     build_diversity_expr,
@@ -27,6 +39,8 @@ from .objectives import (
     build_occupancy_span_expr,
     build_profit_expr,
 )
+from .periods import expand_response, merge_equivalent_periods
+from .portfolio import PortfolioOptions
 from .schemas import (
     EventAssignment,
     PlanAssignment,
@@ -34,9 +48,210 @@ from .schemas import (
     PlanRequest,
     PlanResponse,
     ResourceUsageRef,
+    ScreeningIssue,
     WorkerRef,
 )
-from .solver import solve
+from .screening import screen
+from .solver import SolveContext, solve
+from .solver_profiles import resolve_profile
+
+PLAN_MODES = ("lexicographic", "weighted")
+
+# Objective sense per stage name
+STAGE_SENSES: dict[str, str] = {
+    "profit": "max",
+    "labor": "min",
+    "dispersion": "min",
+    "event_span": "min",
+    "earliness": "min",
+    "occ_span": "min",
+    "diversity": "max",
+}
+
+STAGE_BUILDERS: dict[str, Callable[[BuildContext], cp_model.LinearExpr]] = {
+    "profit": build_profit_expr,
+    "labor": build_labor_hours_expr,
+    "dispersion": build_dispersion_expr,
+    "event_span": build_event_span_expr,
+    "earliness": build_earliness_expr,
+    "occ_span": build_occupancy_span_expr,
+    "diversity": build_diversity_expr,
+}
+
+# The greedy fallback only checks a fixed plan: a share of the stage limit,
+# capped in seconds
+GREEDY_CHECK_SHARE = 0.1
+GREEDY_CHECK_MAX_S = 1.0
+
+# Stages whose optimum is re-imposed on later stages
+_LOCKED_STAGES = {"profit", "labor", "dispersion", "diversity"}
+
+
+def _apply_locks(
+    ctx: BuildContext,
+    locks: list[tuple[str, str, int]],
+    tol: float,
+    lock_tolerance_by: dict[str, float] | None,
+) -> None:
+    for lname, lsense, val in locks:
+        if lname not in _LOCKED_STAGES:
+            continue
+        expr = STAGE_BUILDERS[lname](ctx)
+        # Apply tolerance (per-stage override > global > 0)
+        stage_tol = tol
+        if lock_tolerance_by and lname in lock_tolerance_by:
+            stage_tol = float(lock_tolerance_by[lname] or 0.0)
+        if lsense == "max":
+            bound = int(math.floor(val * (1.0 - stage_tol)))
+            ctx.model.Add(expr >= bound)
+        else:
+            bound = int(math.ceil(val * (1.0 + stage_tol)))
+            ctx.model.Add(expr <= bound)
+
+
+def _stage_model(
+    request: PlanRequest,
+    constraints: list[Constraint],
+    locks: list[tuple[str, str, int]],
+    tol: float,
+    lock_tolerance_by: dict[str, float] | None,
+    name: str,
+) -> Callable[[list[Constraint]], tuple[BuildContext, cp_model.LinearExpr]]:
+    """Builder of fresh models of stage ``name`` with extra constraints."""
+
+    def rebuild(extra: list[Constraint]) -> tuple[BuildContext, cp_model.LinearExpr]:
+        ctx = build_model(request, [*constraints, *extra], [])
+        _apply_locks(ctx, locks, tol, lock_tolerance_by)
+        return ctx, STAGE_BUILDERS[name](ctx)
+
+    return rebuild
+
+
+def _sub_progress(
+    report: Callable[[float, str], None], lo: float, hi: float, phase: str
+) -> Callable[[float, str], None]:
+    def cb(p: float, _phase: str) -> None:
+        report(lo + (hi - lo) * p, phase)
+
+    return cb
+
+
+def _partition_weighted(
+    ctx: BuildContext,
+    stage_defs: list[tuple[str, str]],
+    exprs: dict[str, cp_model.LinearExpr],
+) -> list[list[tuple[str, str]]]:
+    """Group consecutive stages into weighted-hierarchy blocks.
+
+    Inside a block, stage i is weighted by prod_{j>i}(range_j + 1) so that one
+    unit on stage i outweighs any change of the later stages. A stage opens a
+    new block when adding it would push the weighted objective past
+    MAX_OBJECTIVE_SPAN.
+    """
+    blocks: list[list[tuple[str, str]]] = []
+    current: list[tuple[str, str]] = []
+    total = 0
+    for name, sense in stage_defs:
+        lo, hi = expr_bounds(ctx.model, exprs[name])
+        magnitude = expr_magnitude(ctx.model, exprs[name])
+        grown = total * (hi - lo + 1) + magnitude
+        if current and grown <= MAX_OBJECTIVE_SPAN:
+            current.append((name, sense))
+            total = grown
+        else:
+            if current:
+                blocks.append(current)
+            current = [(name, sense)]
+            total = magnitude
+    if current:
+        blocks.append(current)
+    return blocks
+
+
+def _weighted_objective(
+    ctx: BuildContext,
+    block: list[tuple[str, str]],
+    exprs: dict[str, cp_model.LinearExpr],
+) -> cp_model.LinearExpr:
+    """Minimization objective ordering ``block`` lexicographically."""
+    terms: list[cp_model.LinearExpr] = []
+    weight = 1
+    for name, sense in reversed(block):
+        expr = exprs[name]
+        terms.append(weight * (-expr if sense == "max" else expr))
+        lo, hi = expr_bounds(ctx.model, expr)
+        weight *= hi - lo + 1
+    return sum(terms)
+
+
+def _incumbent_values(ctx: BuildContext, res: SolveContext) -> dict[int, int]:
+    """Map variable indices of a freshly built ``ctx`` to a previous solution."""
+    v = ctx.variables
+    families = (
+        (v.x_area_by_l_c, res.x_area_by_l_c_values),
+        (v.x_area_by_l_c_t, res.x_area_by_l_c_t_values),
+        (v.z_use_by_l_c, res.z_use_by_l_c_values),
+        (v.r_event_by_e_t, res.r_event_by_e_t_values),
+        (v.h_time_by_w_e_t, res.h_time_by_w_e_t_values),
+        (v.assign_by_w_e_t, res.assign_by_w_e_t_values),
+        (v.u_time_by_r_e_t, res.u_time_by_r_e_t_values),
+        (v.occ_by_c_t, res.occ_by_c_t_values),
+        (v.occ_by_l_c_t, res.occ_by_l_c_t_values),
+    )
+    values: dict[int, int] = {}
+    for variables, known in families:
+        if not known:
+            continue
+        for key, var in variables.items():
+            if key in known:
+                values[var.Index()] = int(known[key])
+    # use[c] is always linked as OR_l z[l,c]
+    if res.z_use_by_l_c_values is not None:
+        used = {c for (_l, c), z in res.z_use_by_l_c_values.items() if z > 0}
+        for crop_id, var in v.use_by_c.items():
+            values[var.Index()] = int(crop_id in used)
+    return values
+
+
+def _skip_reason(
+    ctx: BuildContext,
+    sense: str,
+    expr: cp_model.LinearExpr,
+    prev: SolveContext | None,
+) -> tuple[str, int] | None:
+    """Return (reason, value) when solving this stage cannot change anything.
+
+    The previous incumbent satisfies every lock, so it is optimal for the stage
+    when the objective is constant or already sits at its trivial bound.
+    """
+    if prev is None or prev.status not in ("FEASIBLE", "OPTIMAL"):
+        return None
+    if is_constant(expr):
+        return "constant objective", int(evaluate_expr(expr, {}) or 0)
+    value = evaluate_expr(expr, _incumbent_values(ctx, prev))
+    if value is None:
+        return None
+    lo, hi = expr_bounds(ctx.model, expr)
+    if (sense == "max" and value >= hi) or (sense == "min" and value <= lo):
+        return "incumbent at bound", value
+    return None
+
+
+def _screened_response(
+    issues: list[ScreeningIssue], stage_order: list[str], mode: str
+) -> PlanResponse:
+    return PlanResponse(
+        diagnostics=PlanDiagnostics(
+            feasible=False,
+            reason=f"screening: {issues[0].message}",
+            violated_constraints=sorted({i.code for i in issues}),
+            stage_order=stage_order,
+            mode=mode,
+            screening=issues,
+        ),
+        assignment=PlanAssignment(),
+        constraint_hints=[i.message for i in issues],
+    )
 
 
 def plan(
@@ -48,8 +263,66 @@ def plan(
     stage_order: list[str] | None = None,
     lock_tolerance_pct: float | None = None,
     lock_tolerance_by: dict[str, float] | None = None,
+    mode: str = "lexicographic",
+    solver_profile: str | None = None,
+    solver_profile_by: dict[str, str] | None = None,
+    capture: Callable[[str, bytes], None] | None = None,
     progress_cb: Callable[[float, str], None] | None = None,
+    screening: bool = True,
+    explain: bool = False,
+    greedy: bool = True,
+    merge_periods: bool = False,
+    hint: SolveContext | None = None,
+    lns: LnsOptions | None = None,
+    portfolio: PortfolioOptions | None = None,
 ) -> PlanResponse:
+    """Plan with staged objectives.
+
+    ``mode="lexicographic"`` solves one CP-SAT model per stage and locks each
+    optimum before the next. ``mode="weighted"`` folds consecutive stages into a
+    single big-M weighted objective (one solve when the weights fit into
+    MAX_OBJECTIVE_SPAN). It needs zero lock tolerances; otherwise the planner
+    falls back to lexicographic stages and records why in the diagnostics.
+
+    Each solve uses a named solver profile (see ``solver_profiles``):
+    ``solver_profile_by[stage]`` > ``solver_profile`` > a size-based default.
+    A weighted block uses the profile of its leading stage.
+
+    ``capture(label, artifact)`` receives every solved model as a replayable
+    artifact (see ``capture.build_artifact``).
+
+    With ``screening`` the request first goes through ``screening.screen``;
+    proven infeasibility is returned without building any model.
+
+    With ``explain``, an INFEASIBLE stage triggers one more solve of the
+    constraints with assumption literals (``diagnostics.explain_infeasibility``);
+    the conflicting constraint families become ``violated_constraints``.
+
+    With ``greedy``, ``greedy.construct`` seeds the first solve as a complete
+    hint; if that solve times out without an incumbent and CP-SAT accepts the
+    greedy plan, it is returned as a FEASIBLE result and later stages are
+    skipped.
+
+    With ``merge_periods``, runs of equivalent days are solved as single
+    periods (``periods.merge_equivalent_periods``) and the plan is mapped
+    back to the original days, with the work of a merged period spread over
+    its days; screening still sees the original request.
+
+    ``hint`` is a complete earlier plan (see ``replan.Incumbent``) that seeds
+    the first solve in place of the greedy plan and serves as its fallback
+    in the same way. Periods are not merged when a hint is given.
+
+    With ``lns``, a single-objective stage that ends FEASIBLE (no optimality
+    proof) is continued with structured LNS rounds (``lns.improve``) before
+    its value is locked; the stage row lists the rounds under ``lns``.
+
+    With ``portfolio``, stage solves of large enough models race variants of
+    their profile in separate processes (``portfolio.race_profiles``); the
+    stage row's ``solver.portfolio`` names the winner.
+    """
+    if mode not in PLAN_MODES:
+        raise ValueError(f"unknown plan mode: {mode}")
+
     def _report(p: float, phase: str) -> None:
         if progress_cb is None:
             return
@@ -75,20 +348,11 @@ def plan(
         base_constraints.extend(constraints)
 
     # Lexicographic stages
-    sense_map = {
-        "profit": "max",
-        "labor": "min",
-        "dispersion": "min",
-        "event_span": "min",
-        "earliness": "min",
-        "occ_span": "min",
-        "diversity": "max",
-    }
     if stage_order:
         stage_defs: list[tuple[str, str]] = [
-            (name, sense_map.get(name, "min"))
+            (name, STAGE_SENSES.get(name, "min"))
             for name in stage_order
-            if name in sense_map
+            if name in STAGE_SENSES
         ]
         if not stage_defs:
             stage_defs = [("profit", "max"), ("dispersion", "min")]
@@ -108,77 +372,205 @@ def plan(
         if extra_stages:
             for k in extra_stages:
                 if k not in {name for name, _ in stage_defs}:
-                    stage_defs.append((k, sense_map.get(k, "min")))
+                    stage_defs.append((k, STAGE_SENSES.get(k, "min")))
+    # Unknown extra stages are listed in the diagnostics but never solved
+    runnable = [(name, sense) for name, sense in stage_defs if name in STAGE_BUILDERS]
+
+    if screening:
+        issues = screen(request)
+        if issues:
+            _report(1.0, "screening:infeasible")
+            return _screened_response(issues, [name for name, _ in stage_defs], mode)
+
+    if merge_periods and hint is None:
+        merged = merge_equivalent_periods(request)
+        if merged is not request:
+            resp = plan(
+                merged,
+                constraints,
+                objectives,
+                extra_stages=extra_stages,
+                stage_order=stage_order,
+                lock_tolerance_pct=lock_tolerance_pct,
+                lock_tolerance_by=lock_tolerance_by,
+                mode=mode,
+                solver_profile=solver_profile,
+                solver_profile_by=solver_profile_by,
+                capture=capture,
+                progress_cb=progress_cb,
+                screening=False,
+                explain=explain,
+                greedy=greedy,
+                lns=lns,
+                portfolio=portfolio,
+            )
+            resp.diagnostics.period_merge = {
+                "periods": request.horizon.num_days,
+                "merged": merged.horizon.num_days,
+            }
+            return expand_response(resp, merged.horizon)
+
+    seed = hint
+    if seed is None and greedy and runnable:
+        seed = construct(request)
 
     locks: list[tuple[str, str, int]] = []
     stage_summaries: list[dict] = []
     last_ctx = None
     last_res = None
     reason = None
+    failed_stage = None
+    mode_note = None
     tol = float(lock_tolerance_pct or 0.0)
     n_stages = max(1, len(stage_defs))
-    for i, (name, sense) in enumerate(stage_defs):
+
+    if mode == "weighted" and (
+        tol > 0.0
+        or any(float(v or 0.0) > 0.0 for v in (lock_tolerance_by or {}).values())
+    ):
+        mode = "lexicographic"
+        mode_note = "weighted mode needs zero lock tolerances; ran lexicographic"
+
+    # The first weighted block reuses the model built to size the weights.
+    prebuilt: tuple[BuildContext, dict[str, cp_model.LinearExpr], float] | None = None
+    if mode == "weighted" and runnable:
         t_build0 = time.perf_counter()
-        ctx = build_model(request, base_constraints, [])
-        t_build1 = time.perf_counter()
-        # Apply previous locks
-        for lname, lsense, val in locks:
-            if lname == "profit":
-                expr = build_profit_expr(ctx)
-            elif lname == "labor":
-                expr = build_labor_hours_expr(ctx)
-            elif lname == "dispersion":
-                expr = build_dispersion_expr(ctx)
-            elif lname == "diversity":
-                expr = build_diversity_expr(ctx)
-            else:
+        ctx0 = build_model(request, base_constraints, [])
+        exprs0 = {name: STAGE_BUILDERS[name](ctx0) for name, _ in runnable}
+        blocks = _partition_weighted(ctx0, runnable, exprs0)
+        prebuilt = (ctx0, exprs0, (time.perf_counter() - t_build0) * 1000.0)
+        if len(blocks) > 1:
+            mode_note = f"weights exceed 2^53; split into {len(blocks)} weighted blocks"
+    else:
+        blocks = [[stage] for stage in runnable]
+
+    done = 0
+    for block in blocks:
+        if prebuilt is not None:
+            ctx, exprs, build_ms = prebuilt
+            prebuilt = None
+        else:
+            t_build0 = time.perf_counter()
+            ctx = build_model(request, base_constraints, [])
+            # Apply previous locks
+            _apply_locks(ctx, locks, tol, lock_tolerance_by)
+            exprs = {name: STAGE_BUILDERS[name](ctx) for name, _ in block}
+            build_ms = (time.perf_counter() - t_build0) * 1000.0
+
+        if len(block) == 1:
+            name, sense = block[0]
+            skip = _skip_reason(ctx, sense, exprs[name], last_res)
+            if skip is not None:
+                # The incumbent is already optimal: keep it and its locks
+                skip_reason, val = skip
+                locks.append((name, sense, val))
+                stage_summaries.append(
+                    {
+                        "name": name,
+                        "sense": sense,
+                        "value": val,
+                        "build_ms": build_ms,
+                        "solve_ms": 0.0,
+                        "skipped": True,
+                        "skip_reason": skip_reason,
+                    }
+                )
+                done += 1
+                _report(0.8 * done / n_stages, f"stage:{name}")
                 continue
-            # Apply tolerance (per-stage override > global > 0)
-            stage_tol = tol
-            if lock_tolerance_by and lname in lock_tolerance_by:
-                stage_tol = float(lock_tolerance_by[lname] or 0.0)
-            if lsense == "max":
-                bound = int(math.floor(val * (1.0 - stage_tol)))
-                ctx.model.Add(expr >= bound)
-            else:
-                bound = int(math.ceil(val * (1.0 + stage_tol)))
-                ctx.model.Add(expr <= bound)
 
         # Register current objective
-        if name == "profit":
-            obj_expr = build_profit_expr(ctx)
-            ctx.model.Maximize(obj_expr)
-        elif name == "labor":
-            obj_expr = build_labor_hours_expr(ctx)
-            ctx.model.Minimize(obj_expr)
-        elif name == "dispersion":
-            obj_expr = build_dispersion_expr(ctx)
-            ctx.model.Minimize(obj_expr)
-        elif name == "event_span":
-            obj_expr = build_event_span_expr(ctx)
-            ctx.model.Minimize(obj_expr)
-        elif name == "earliness":
-            obj_expr = build_earliness_expr(ctx)
-            ctx.model.Minimize(obj_expr)
-        elif name == "occ_span":
-            obj_expr = build_occupancy_span_expr(ctx)
-            ctx.model.Minimize(obj_expr)
-        elif name == "diversity":
-            obj_expr = build_diversity_expr(ctx)
-            ctx.model.Maximize(obj_expr)
+        watch = None
+        if len(block) == 1:
+            name, sense = block[0]
+            if sense == "max":
+                ctx.model.Maximize(exprs[name])
+            else:
+                ctx.model.Minimize(exprs[name])
         else:
-            # Unknown extra stage; skip
-            continue
+            ctx.model.Minimize(_weighted_objective(ctx, block, exprs))
+            watch = {name: exprs[name] for name, _ in block}
 
-        res = solve(ctx, prev=last_res)
+        profile = resolve_profile(
+            block[0][0], ctx.model, solver_profile, solver_profile_by
+        )
+        label = f"{done:02d}-" + "+".join(name for name, _ in block)
+        res = solve(
+            ctx,
+            prev=last_res if last_res is not None else seed,
+            watch=watch,
+            profile=profile,
+            capture=capture,
+            capture_label=label,
+            portfolio=portfolio.profiles(profile, ctx.model) if portfolio else None,
+        )
+        fallback = None
+        if res.status == "UNKNOWN" and last_res is None and seed is not None:
+            # No incumbent within the limit: keep the greedy plan if CP-SAT
+            # accepts it with every hinted variable pinned
+            stage_s = (res.params or {}).get("max_time_in_seconds") or 5.0
+            fallback = solve(
+                ctx,
+                prev=seed,
+                watch=watch,
+                profile=profile,
+                capture=capture,
+                capture_label=f"{label}-greedy",
+                fix_hints=True,
+                time_limit_s=min(GREEDY_CHECK_MAX_S, GREEDY_CHECK_SHARE * stage_s),
+            )
+            if fallback.status in ("FEASIBLE", "OPTIMAL"):
+                fallback.status = "FEASIBLE"
+                res = fallback
+            else:
+                fallback = None
         last_ctx = ctx
         last_res = res
         if res.status not in ("FEASIBLE", "OPTIMAL"):
-            reason = f"stage '{name}' status={res.status}"
+            names = "+".join(name for name, _ in block)
+            reason = f"stage '{names}' status={res.status}"
+            failed_stage = {
+                "name": names,
+                "status": res.status,
+                "build_ms": build_ms,
+                "solve_ms": res.solve_ms,
+                "solver": res.params,
+                "search": res.search_stats,
+            }
             break
-        # lock value and record summary
-        val = int(res.objective_value or 0)
-        locks.append((name, sense, val))
+        lns_info = None
+        if (
+            lns is not None
+            and lns.rounds > 0
+            and watch is None
+            and fallback is None
+            and res.status == "FEASIBLE"
+        ):
+            name, sense = block[0]
+            t_lns0 = time.perf_counter()
+            start_value = int(res.objective_value or 0)
+            res, rounds = improve(
+                request,
+                _stage_model(
+                    request, base_constraints, list(locks), tol, lock_tolerance_by, name
+                ),
+                res,
+                sense,
+                lns,
+                profile=profile,
+                progress_cb=_sub_progress(
+                    _report,
+                    0.8 * done / n_stages,
+                    0.8 * (done + 1) / n_stages,
+                    f"lns:{name}",
+                ),
+            )
+            last_res = res
+            lns_info = {
+                "start": start_value,
+                "rounds": rounds,
+                "ms": (time.perf_counter() - t_lns0) * 1000.0,
+            }
         # quick variable counts
         vars_count = {
             "x_lct": len(ctx.variables.x_area_by_l_c_t),
@@ -191,26 +583,64 @@ def plan(
             "occ_ct": len(ctx.variables.occ_by_c_t),
             "occ_lct": len(ctx.variables.occ_by_l_c_t),
         }
-        stage_summaries.append(
-            {
+        for name, sense in block:
+            # lock value and record summary
+            if watch is None:
+                val = int(res.objective_value or 0)
+            else:
+                val = (res.expr_values or {}).get(name, 0)
+            locks.append((name, sense, val))
+            summary_row: dict = {
                 "name": name,
                 "sense": sense,
+                "status": res.status,
                 "value": val,
                 "vars": vars_count,
-                "build_ms": (t_build1 - t_build0) * 1000.0,
+                "build_ms": build_ms,
                 "solve_ms": res.solve_ms,
+                "solver": res.params,
+                "search": res.search_stats,
             }
-        )
-        # Report stage progress up to 80%
-        _report(0.8 * (i + 1) / n_stages, f"stage:{name}")
+            if watch is not None:
+                summary_row["weighted_block"] = [n for n, _ in block]
+            if hint is not None and done == 0:
+                summary_row["hint"] = "incumbent"
+            elif seed is not None and done == 0:
+                summary_row["greedy_ms"] = seed.solve_ms
+            if fallback is not None:
+                summary_row["fallback"] = "greedy" if hint is None else "incumbent"
+            if lns_info is not None:
+                summary_row["lns"] = lns_info
+            stage_summaries.append(summary_row)
+            done += 1
+            # Report stage progress up to 80%
+            _report(0.8 * done / n_stages, f"stage:{name}")
+        if fallback is not None:
+            # The time budget is spent; later stages would time out as well
+            break
 
     feasible = bool(last_res and last_res.status in ("FEASIBLE", "OPTIMAL"))
+    violated: list[str] = []
+    if explain and failed_stage is not None and failed_stage["status"] == "INFEASIBLE":
+        _report(0.85, "explain")
+        exp = explain_infeasibility(request, base_constraints, capture=capture)
+        violated = exp.assumption_core or []
+        # FEASIBLE here means only the locks of earlier stages conflict
+        failed_stage["explain"] = {
+            "status": exp.status,
+            "solve_ms": exp.solve_ms,
+            "assumptions": len(exp.build.assumptions or {}),
+            "core": violated,
+        }
     diagnostics = PlanDiagnostics(
         feasible=feasible,
         reason=None if feasible else reason,
-        violated_constraints=[],
+        violated_constraints=violated,
         stages=stage_summaries,
+        failed_stage=failed_stage,
         stage_order=[name for name, _ in stage_defs],
+        mode=mode,
+        mode_note=mode_note,
         lock_tolerance_pct=float(lock_tolerance_pct or 0.0),
         lock_tolerance_by={k: float(v) for k, v in (lock_tolerance_by or {}).items()}
         if lock_tolerance_by
@@ -375,7 +805,7 @@ def plan(
         # Numeric summaries
         total_worker_capacity = (
             sum(float(w.capacity_per_day or 0.0) for w in request.workers)
-            * request.horizon.num_days
+            * last_ctx.periods.total_days
         )
         assigned_res_units = float(
             sum((last_res.u_time_by_r_e_t_values or {}).values())
@@ -383,7 +813,7 @@ def plan(
         assigned_res = assigned_res_units / float(_TS)
         total_res_capacity = (
             sum(float(r.capacity_per_day or 0.0) for r in request.resources)
-            * request.horizon.num_days
+            * last_ctx.periods.total_days
         )
         summary = {
             "workers.capacity_total_h": round(total_worker_capacity, 3),
@@ -392,6 +822,7 @@ def plan(
             "resources.assigned_total_h": assigned_res,
         }
     else:
+        hints.extend(f"conflict: {label}" for label in violated)
         # Heuristic hints on infeasibility
         required_roles = set().union(
             *[e.required_roles or set() for e in request.events]
@@ -0,0 +1,236 @@
+"""Race differently-parameterised CP-SAT solves of one model.
+
+One parameter set is fragile: on some farm shapes another search branching
+or LP level is several times faster. ``race_profiles`` solves the same model
+(hints, assumptions and limits included) once per profile, each in its own
+process so the searches do not share the GIL, and splits the caller's
+CP-SAT workers between them (at least ``MEMBER_WORKERS`` each: one CP-SAT
+worker runs a single strategy and is far slower than two). The first member
+to prove its result (optimal or infeasible) wins and the others are killed;
+otherwise the best objective at the time limit wins. Every race is logged
+with the winner so the default profiles can be tuned from the logs.
+
+Model and parameters cross the pipe in protobuf text format, which every
+supported OR-Tools release reads back (see ``lib.capture``).
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import logging
+import multiprocessing as mp
+import time
+from contextlib import nullcontext
+from dataclasses import dataclass
+from multiprocessing.connection import Connection, wait
+from typing import Any
+
+from ortools.sat.python import cp_model
+
+from .cancel import current_token
+from .capture import parse_text
+from .solver import SolveOutcome
+from .solver_profiles import SolverProfile
+
+LOGGER = logging.getLogger(__name__)
+
+# Variants of a stage's profile raced against it (keep its gap and presolve)
+VARIANTS: dict[str, dict[str, Any]] = {
+    "lp0": {"linearization_level": 0},
+    "lp2": {"linearization_level": 2},
+    "lp_search": {"search_branching": "LP_SEARCH"},
+    "pseudo_cost": {"search_branching": "PSEUDO_COST_SEARCH"},
+    "quick_restart": {"search_branching": "PORTFOLIO_WITH_QUICK_RESTART_SEARCH"},
+    "fixed": {"search_branching": "FIXED_SEARCH"},
+}
+
+# CP-SAT workers per member; ``solve`` races no more members than fit
+MEMBER_WORKERS = 2
+
+# Time past the members' limit for process start-up and model parsing
+START_GRACE_S = 10.0
+
+_PROVEN = ("OPTIMAL", "INFEASIBLE", "MODEL_INVALID")
+
+
+def members(profile: SolverProfile, variants: list[str]) -> list[SolverProfile]:
+    """``profile`` followed by its ``variants`` (names from ``VARIANTS``)."""
+    out = [profile]
+    for name in variants:
+        if name not in VARIANTS:
+            raise ValueError(f"unknown portfolio variant: {name}")
+        out.append(
+            dataclasses.replace(
+                profile, name=f"{profile.name}+{name}", **VARIANTS[name]
+            )
+        )
+    return out
+
+
+@dataclass(frozen=True)
+class PortfolioOptions:
+    """Race stage solves over ``variants`` of their profile."""
+
+    variants: tuple[str, ...]
+    # Smaller models are solved in-process: starting the members costs about
+    # a second (OR-Tools is imported in every process)
+    min_variables: int = 0
+
+    def __post_init__(self) -> None:
+        unknown = [name for name in self.variants if name not in VARIANTS]
+        if unknown:
+            raise ValueError(f"unknown portfolio variants: {', '.join(unknown)}")
+
+    def profiles(
+        self, profile: SolverProfile, model: cp_model.CpModel
+    ) -> list[SolverProfile] | None:
+        """Members racing for ``model``, or None to solve it in-process.
+
+        Daemonic processes (the ``JOB_BACKEND=process`` workers) cannot
+        start members and always solve in-process.
+        """
+        if not self.variants or len(model.Proto().variables) < self.min_variables:
+            return None
+        if mp.current_process().daemon:
+            return None
+        return members(profile, list(self.variants))
+
+
+@dataclass
+class Member:
+    profile: SolverProfile
+    parameters: Any
+    process: Any = None
+    conn: Connection | None = None
+    outcome: SolveOutcome | None = None
+    ms: float | None = None
+
+
+def _member_main(conn: Connection, model_text: str, params_text: str) -> None:
+    model = cp_model.CpModel()
+    parse_text(model.Proto(), model_text)
+    solver = cp_model.CpSolver()
+    parse_text(solver.parameters, params_text)
+    status = solver.Solve(model)
+    conn.send(SolveOutcome.of(solver, model, status))
+    conn.close()
+
+
+def _better(out: SolveOutcome, than: SolveOutcome | None, maximize: bool) -> bool:
+    if than is None or not than.solved:
+        return out.solved or than is None
+    if not out.solved:
+        return False
+    assert out.objective_value is not None and than.objective_value is not None
+    if maximize:
+        return out.objective_value > than.objective_value
+    return out.objective_value < than.objective_value
+
+
+def race_profiles(
+    model: cp_model.CpModel,
+    parameters: Any,
+    profiles: list[SolverProfile],
+    *,
+    start_method: str = "spawn",
+) -> tuple[Member, SolveOutcome, dict]:
+    """Solve ``model`` with ``parameters`` and each of ``profiles`` at once.
+
+    ``parameters.num_workers`` is split evenly between the members. Returns
+    the winning member, its outcome and a summary of the race (winner and
+    each member's status, objective and time).
+    """
+    from .solver_profiles import apply_profile
+
+    ctx = mp.get_context(start_method)
+    model_text = str(model.Proto())
+    maximize = model.Proto().objective.scaling_factor < 0
+    per_member = max(1, parameters.num_workers // len(profiles))
+    racers: list[Member] = []
+    for profile in profiles:
+        solver = cp_model.CpSolver()
+        parse_text(solver.parameters, str(parameters))
+        apply_profile(solver.parameters, profile)
+        solver.parameters.num_workers = per_member
+        racers.append(Member(profile, solver.parameters))
+
+    def kill_all() -> None:
+        for m in racers:
+            if m.process is not None and m.process.pid is not None:
+                m.process.kill()
+
+    token = current_token()
+    t0 = time.perf_counter()
+    deadline = t0 + parameters.max_time_in_seconds + START_GRACE_S
+    try:
+        # A stopped token ends the race like the time limit does
+        with token.on_stop(kill_all) if token else nullcontext():
+            for m in racers:
+                reader, writer = ctx.Pipe(duplex=False)
+                m.process = ctx.Process(
+                    target=_member_main,
+                    args=(writer, model_text, str(m.parameters)),
+                    name=f"portfolio-{m.profile.name}",
+                    daemon=True,
+                )
+                m.process.start()
+                writer.close()
+                m.conn = reader
+            pending = {m.conn: m for m in racers}
+            while pending and not (token is not None and token.stopped):
+                ready = wait(
+                    list(pending), timeout=max(0.0, deadline - time.perf_counter())
+                )
+                if not ready:
+                    break
+                for conn in ready:
+                    m = pending.pop(conn)  # type: ignore[arg-type]
+                    m.ms = (time.perf_counter() - t0) * 1000.0
+                    try:
+                        m.outcome = conn.recv()  # type: ignore[union-attr]
+                    except (EOFError, OSError):
+                        m.outcome = SolveOutcome(status="UNKNOWN")
+                if any(m.outcome and m.outcome.status in _PROVEN for m in racers):
+                    break
+    finally:
+        for m in racers:
+            if m.process is not None and m.process.pid is not None:
+                if m.process.is_alive():
+                    m.process.kill()
+                m.process.join()
+            if m.conn is not None:
+                m.conn.close()
+
+    winner: Member | None = None
+    for m in racers:
+        if m.outcome is None:
+            continue
+        if m.outcome.status in _PROVEN:
+            winner = m
+            break
+        if winner is None or _better(m.outcome, winner.outcome, maximize):
+            winner = m
+    if winner is None:
+        # No member answered in time
+        winner = racers[0]
+        winner.outcome = SolveOutcome(status="UNKNOWN")
+    assert winner.outcome is not None
+    info = {
+        "winner": winner.profile.name,
+        "members": [
+            {
+                "profile": m.profile.name,
+                "status": m.outcome.status if m.outcome else "CANCELED",
+                "objective": m.outcome.objective_value if m.outcome else None,
+                "ms": m.ms,
+            }
+            for m in racers
+        ],
+    }
+    LOGGER.info(
+        "portfolio winner=%s status=%s members=%s",
+        info["winner"],
+        winner.outcome.status,
+        info["members"],
+    )
+    return winner, winner.outcome, info
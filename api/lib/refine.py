@@ -0,0 +1,93 @@
+"""Restrict a fine-grained request to the neighbourhood of a coarse solution.
+
+Hierarchical solving: the plan is first solved on a compressed time axis (e.g.
+thirds of a month), then the fine (day) model is rebuilt with each event's
+window cut down to the periods the coarse solution used and each land limited
+to the crops it grew there. The refined model is a fraction of the direct
+fine-grained model and keeps the coarse plan's structure; it may still be
+infeasible when rounding in the coarse model hid a conflict, so callers keep
+the coarse result as a fallback.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping, Sequence
+
+from .model_builder import event_windows
+from .schemas import PlanRequest, PlanResponse
+
+
+def _used_crops_by_land(coarse: PlanResponse) -> dict[str, set[str]]:
+    used: dict[str, set[str]] = {}
+    for land_id, by_t in coarse.assignment.crop_area_by_land_t.items():
+        for per_crop in by_t.values():
+            used.setdefault(land_id, set()).update(
+                c for c, area in per_crop.items() if area > 0
+            )
+    return used
+
+
+def _active_periods(coarse: PlanResponse) -> dict[str, tuple[int, int]]:
+    spans: dict[str, tuple[int, int]] = {}
+    for ea in coarse.event_assignments or []:
+        lo, hi = spans.get(ea.event_id, (ea.index, ea.index))
+        spans[ea.event_id] = (min(lo, ea.index), max(hi, ea.index))
+    return spans
+
+
+def restrict_to_solution(
+    request: PlanRequest,
+    coarse: PlanResponse,
+    days_by_period: Mapping[int, Sequence[int]],
+    *,
+    margin: int | None = 1,
+) -> PlanRequest:
+    """Fine request limited to the structure of ``coarse``.
+
+    ``days_by_period`` maps each coarse period (1-based, as in ``coarse``) to
+    the fine days it covers. Events active in the coarse plan may only run
+    from ``margin`` periods before their first active period to ``margin``
+    periods after their last one (within their original window); events that
+    were inactive, and all events when ``margin`` is None, keep their window.
+    Each land may only grow the crops it had in the coarse plan, and events of
+    crops grown nowhere are dropped along with their dependents.
+    """
+    used = _used_crops_by_land(coarse)
+    grown = set().union(*used.values()) if used else set()
+    periods = sorted(days_by_period)
+    first, last = periods[0], periods[-1]
+    original = event_windows(request)
+    active = _active_periods(coarse)
+
+    dropped = {ev.id for ev in request.events if ev.crop_id not in grown}
+    changed = True
+    while changed:
+        changed = False
+        for ev in request.events:
+            if ev.id not in dropped and ev.preceding_event_id in dropped:
+                dropped.add(ev.id)
+                changed = True
+
+    events = []
+    for ev in request.events:
+        if ev.id in dropped:
+            continue
+        span = active.get(ev.id)
+        window = original.get(ev.id)
+        if margin is not None and span is not None and window:
+            lo_p = max(first, span[0] - margin)
+            hi_p = min(last, span[1] + margin)
+            lo = max(min(window), min(days_by_period[lo_p]))
+            hi = min(max(window), max(days_by_period[hi_p]))
+            if lo <= hi:
+                ev = ev.model_copy(update={"start_cond": {lo}, "end_cond": {hi}})
+        events.append(ev)
+
+    return request.model_copy(
+        update={
+            "events": events,
+            "allowed_crops_by_land": {
+                land.id: used.get(land.id, set()) for land in request.lands
+            },
+        }
+    )
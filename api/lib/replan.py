@@ -0,0 +1,207 @@
+"""Incremental re-planning from a previous plan.
+
+A re-plan takes the request of an earlier plan with a few edits (a worker's
+blocked days, a crop price, ...) together with that plan. The previous plan
+seeds CP-SAT as a complete hint, decisions on time indices before
+``freeze_before`` are pinned to it, and only the crops the edits can affect
+are re-solved first: every other crop keeps its areas, events and hours.
+When that neighbourhood has no feasible plan (an undetected interaction with
+a frozen crop), the whole request is solved again, still hinted and frozen
+before ``freeze_before``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable
+from dataclasses import dataclass, field
+
+from pydantic import BaseModel
+
+from .constants import AREA_SCALE_UNITS_PER_A, TIME_SCALE_UNITS_PER_HOUR
+from .interfaces import Constraint
+from .lns import Pinned
+from .model_builder import event_windows
+from .planner import plan
+from .rolling import crop_groups
+from .schemas import PlanRequest, PlanResponse
+from .solver import SolveContext
+
+
+@dataclass
+class Incumbent:
+    """A previous plan in model units, keyed like the model variables."""
+
+    areas: dict[tuple[str, str, int], int] = field(default_factory=dict)
+    events: set[tuple[str, int]] = field(default_factory=set)
+    hours: dict[tuple[str, str, int], int] = field(default_factory=dict)
+    usage: dict[tuple[str, str, int], int] = field(default_factory=dict)
+
+    @classmethod
+    def of(cls, resp: PlanResponse) -> Incumbent:
+        inc = cls()
+        for land_id, per_t in resp.assignment.crop_area_by_land_t.items():
+            for t, per_crop in per_t.items():
+                for crop_id, area in per_crop.items():
+                    units = int(round(area * AREA_SCALE_UNITS_PER_A))
+                    if units > 0:
+                        inc.areas[(land_id, crop_id, t)] = units
+        for ea in resp.event_assignments or []:
+            inc.events.add((ea.event_id, ea.index))
+            for taken, refs in (
+                (inc.hours, ea.assigned_workers),
+                (inc.usage, ea.resource_usage),
+            ):
+                for ref in refs:
+                    units = int(
+                        round((ref.used_time_hours or 0.0) * TIME_SCALE_UNITS_PER_HOUR)
+                    )
+                    key = (ref.id, ea.event_id, ea.index)
+                    taken[key] = taken.get(key, 0) + units
+        return inc
+
+    def hint(self, request: PlanRequest) -> SolveContext:
+        """Complete hint for a model of ``request``: unused keys hint 0."""
+        days = range(1, request.horizon.num_days + 1)
+        windows = event_windows(request)
+        sc = SolveContext(build=None, status="FEASIBLE")
+        sc.x_area_by_l_c_t_values = {
+            (ld.id, c.id, t): self.areas.get((ld.id, c.id, t), 0)
+            for ld in request.lands
+            for c in request.crops
+            for t in days
+        }
+        peak: dict[tuple[str, str], int] = {}
+        for (land_id, crop_id, _t), units in sc.x_area_by_l_c_t_values.items():
+            key = (land_id, crop_id)
+            peak[key] = max(peak.get(key, 0), units)
+        sc.x_area_by_l_c_values = peak
+        sc.z_use_by_l_c_values = {key: int(x > 0) for key, x in peak.items()}
+        sc.occ_by_l_c_t_values = {
+            key: int(x > 0) for key, x in sc.x_area_by_l_c_t_values.items()
+        }
+        occ: dict[tuple[str, int], int] = {}
+        for (_l, crop_id, t), on in sc.occ_by_l_c_t_values.items():
+            occ[(crop_id, t)] = max(occ.get((crop_id, t), 0), on)
+        sc.occ_by_c_t_values = occ
+        sc.r_event_by_e_t_values = {
+            (ev.id, t): int((ev.id, t) in self.events)
+            for ev in request.events
+            for t in windows.get(ev.id, ())
+        }
+        for taken, items, attr in (
+            (self.hours, request.workers, "h_time_by_w_e_t_values"),
+            (self.usage, request.resources, "u_time_by_r_e_t_values"),
+        ):
+            setattr(
+                sc,
+                attr,
+                {
+                    (item.id, e, t): taken.get((item.id, e, t), 0)
+                    for item in items
+                    for (e, t) in sc.r_event_by_e_t_values
+                },
+            )
+        sc.assign_by_w_e_t_values = {
+            key: int(h > 0) for key, h in (sc.h_time_by_w_e_t_values or {}).items()
+        }
+        return sc
+
+
+def _changed(old: Iterable[BaseModel], new: Iterable[BaseModel]) -> set[str]:
+    """Ids of items that were added, removed or edited."""
+    before = {item.id: item for item in old}  # type: ignore[attr-defined]
+    after = {item.id: item for item in new}  # type: ignore[attr-defined]
+    return {i for i in before.keys() | after.keys() if before.get(i) != after.get(i)}
+
+
+def affected_crops(
+    base_request: PlanRequest, request: PlanRequest, base: PlanResponse
+) -> set[str] | None:
+    """Crops of ``request`` whose plan the edits since ``base_request`` can
+    change, or None when the edits are global (a different horizon).
+
+    A crop is affected when it, one of its events, area bounds or fixed
+    areas changed, when it grew on a changed land or used a changed worker
+    or resource in ``base``, or when it is linked to an affected crop by a
+    predecessor event.
+    """
+    if base_request.horizon != request.horizon:
+        return None
+    crops = _changed(base_request.crops, request.crops)
+    event_crop = {ev.id: ev.crop_id for ev in (*base_request.events, *request.events)}
+    crops |= {event_crop[e] for e in _changed(base_request.events, request.events)}
+    for attr in ("crop_area_bounds", "fixed_areas"):
+        old = getattr(base_request, attr) or []
+        new = getattr(request, attr) or []
+        crops |= {item.crop_id for item in old if item not in new}
+        crops |= {item.crop_id for item in new if item not in old}
+
+    lands = _changed(base_request.lands, request.lands)
+    for land_id in lands:
+        for per_crop in base.assignment.crop_area_by_land_t.get(land_id, {}).values():
+            crops.update(c for c, area in per_crop.items() if area > 0)
+    tags = {
+        tag
+        for land in (*base_request.lands, *request.lands)
+        if land.id in lands
+        for tag in land.tags or ()
+    }
+    crops |= {fa.crop_id for fa in request.fixed_areas or [] if fa.land_tag in tags}
+    items = _changed(base_request.workers, request.workers)
+    items |= _changed(base_request.resources, request.resources)
+    for ea in base.event_assignments or []:
+        refs = {r.id for r in (*ea.assigned_workers, *ea.resource_usage)}
+        if refs & items and ea.event_id in event_crop:
+            crops.add(event_crop[ea.event_id])
+
+    current = {c.id for c in request.crops}
+    affected: set[str] = set()
+    for group in crop_groups(request):
+        if group.crop_ids & crops:
+            affected |= group.crop_ids
+    return affected & current
+
+
+def replan(
+    request: PlanRequest,
+    base_request: PlanRequest,
+    base: PlanResponse,
+    *,
+    freeze_before: int | None = None,
+    **plan_kwargs,
+) -> PlanResponse:
+    """Plan ``request``, an edit of ``base_request``, starting from ``base``.
+
+    Time indices before ``freeze_before`` (1-based) keep ``base``'s areas,
+    events and hours. The crops from ``affected_crops`` are solved first with
+    all others frozen; when none are affected or they have no feasible plan,
+    every crop is solved. ``plan_kwargs`` go to ``plan`` (periods are never
+    merged, since the hint is on the original indices).
+    ``diagnostics.replan`` records the scope that was solved.
+    """
+    plan_kwargs.pop("merge_periods", None)
+    hint = Incumbent.of(base).hint(request)
+    before = max(1, freeze_before or 1)
+
+    def freeze(crop_ids: set[str]) -> Constraint:
+        return Pinned(
+            hint,
+            lambda _land, crop_id, t: t >= before and crop_id not in crop_ids,
+            label="replan_frozen",
+        )
+
+    current = {c.id for c in request.crops}
+    affected = affected_crops(base_request, request, base)
+    info: dict = {
+        "frozen_before": before,
+        "crops": sorted(affected) if affected is not None else None,
+    }
+    if affected and affected != current:
+        resp = plan(request, [freeze(current - affected)], hint=hint, **plan_kwargs)
+        if resp.diagnostics.feasible:
+            resp.diagnostics.replan = {**info, "scope": "neighborhood"}
+            return resp
+        info["neighborhood_reason"] = resp.diagnostics.reason
+    resp = plan(request, [freeze(set())], hint=hint, **plan_kwargs)
+    resp.diagnostics.replan = {**info, "scope": "full"}
+    return resp
@@ -0,0 +1,368 @@
+"""Rolling-horizon planning for long (multi-season) horizons.
+
+The monolithic model grows with the horizon in every constraint family. The
+rolling planner instead solves overlapping windows in time order. Crops are
+grouped with the crops their events depend on (``preceding_event_id``) and
+each group spans its events' windows. Window k starts at day ``a`` and
+decides the groups that start before ``a + step_days``; groups starting
+later within ``window_days`` are solved alongside as lookahead but left
+open. A window's model covers only its groups, on days ``a`` to the end of
+the latest one, re-indexed to start at 1.
+
+Decided groups are frozen: their land area and worker/resource hours are
+reserved on every day they use, and later windows only plan in the capacity
+left over. Occupancy and lags therefore never cross a window boundary
+unresolved, since a group is always solved as a whole.
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from .capture import prefixed
+from .constants import AREA_SCALE_UNITS_PER_A, TIME_SCALE_UNITS_PER_HOUR
+from .interfaces import Constraint
+from .model_builder import BuildContext, event_windows
+from .periods import Periods
+from .planner import plan
+from .schemas import (
+    EventAssignment,
+    Horizon,
+    PlanAssignment,
+    PlanDiagnostics,
+    PlanRequest,
+    PlanResponse,
+)
+
+
+@dataclass
+class _Group:
+    crop_ids: set[str]
+    start: int
+    end: int
+
+
+@dataclass
+class _Reserved(Constraint):
+    """Capacity taken by frozen crops, keyed by (id, day of the window)."""
+
+    land: dict[tuple[str, int], int] = field(default_factory=dict)
+    workers: dict[tuple[str, int], int] = field(default_factory=dict)
+    resources: dict[tuple[str, int], int] = field(default_factory=dict)
+
+    def apply(self, ctx: BuildContext) -> None:
+        model, v = ctx.model, ctx.variables
+        crops = [c.id for c in ctx.request.crops]
+        events = [ev.id for ev in ctx.request.events]
+        for land in ctx.request.lands:
+            cap = int(round(land.area * ctx.scale_area))
+            for t in range(1, ctx.request.horizon.num_days + 1):
+                taken = self.land.get((land.id, t), 0)
+                terms = [
+                    v.x_area_by_l_c_t[(land.id, c, t)]
+                    for c in crops
+                    if (land.id, c, t) in v.x_area_by_l_c_t
+                ]
+                if taken and terms:
+                    model.Add(sum(terms) <= max(0, cap - taken)).OnlyEnforceIf(
+                        ctx.guard(f"land_capacity:{land.id}")
+                    )
+        for items, reserved, hours, family in (
+            (ctx.request.workers, self.workers, v.h_time_by_w_e_t, "worker"),
+            (ctx.request.resources, self.resources, v.u_time_by_r_e_t, "resource"),
+        ):
+            for item in items:
+                per_day = int(
+                    round((item.capacity_per_day or 0.0) * TIME_SCALE_UNITS_PER_HOUR)
+                )
+                for t in range(1, ctx.request.horizon.num_days + 1):
+                    taken = reserved.get((item.id, t), 0)
+                    terms = [
+                        hours[(item.id, e, t)]
+                        for e in events
+                        if (item.id, e, t) in hours
+                    ]
+                    if taken and terms:
+                        cap = ctx.periods.length(t) * per_day
+                        model.Add(sum(terms) <= max(0, cap - taken)).OnlyEnforceIf(
+                            ctx.guard(f"{family}_capacity:{item.id}")
+                        )
+
+
+def crop_groups(request: PlanRequest) -> list[_Group]:
+    """Crops linked by predecessor events, with the days their events span,
+    ordered by start. Crops without windowed events span the horizon."""
+    H = request.horizon.num_days
+    crop_of = {ev.id: ev.crop_id for ev in request.events}
+    parent = {c.id: c.id for c in request.crops}
+
+    def find(c: str) -> str:
+        while parent[c] != c:
+            parent[c] = parent[parent[c]]
+            c = parent[c]
+        return c
+
+    for ev in request.events:
+        pred = crop_of.get(ev.preceding_event_id or "")
+        if pred is not None and ev.crop_id in parent and pred in parent:
+            parent[find(ev.crop_id)] = find(pred)
+
+    windows = event_windows(request)
+    spans: dict[str, tuple[int, int]] = {}
+    for ev in request.events:
+        days = windows.get(ev.id)
+        if not days or ev.crop_id not in parent:
+            continue
+        lo, hi = spans.get(ev.crop_id, (min(days), max(days)))
+        spans[ev.crop_id] = (min(lo, min(days)), max(hi, max(days)))
+
+    groups: dict[str, _Group] = {}
+    for crop in request.crops:
+        lo, hi = spans.get(crop.id, (1, H))
+        g = groups.setdefault(find(crop.id), _Group(set(), lo, hi))
+        g.crop_ids.add(crop.id)
+        g.start, g.end = min(g.start, lo), max(g.end, hi)
+    return sorted(groups.values(), key=lambda g: (g.start, sorted(g.crop_ids)))
+
+
+def _window_request(
+    request: PlanRequest, first: int, last: int, crop_ids: set[str]
+) -> PlanRequest:
+    """``request`` limited to ``crop_ids`` on days ``first..last`` (re-indexed
+    to start at 1)."""
+    shift = first - 1
+    n = last - first + 1
+
+    def days(values: set[int] | None, *, clip: bool) -> set[int] | None:
+        if values is None:
+            return None
+        return {d - shift for d in values if not clip or first <= d <= last}
+
+    def reblock(item):
+        return item.model_copy(
+            update={"blocked_days": days(item.blocked_days, clip=True)}
+        )
+
+    lengths = request.horizon.period_lengths
+    period_days = request.horizon.period_days
+    if period_days is not None:
+        # Days of the original periods the window covers
+        periods = Periods.of(request.horizon)
+        period_days = period_days[
+            periods.firsts[first - 1] - 1 : periods.lasts[last - 1]
+        ]
+    return request.model_copy(
+        update={
+            "horizon": Horizon(
+                num_days=n,
+                period_lengths=lengths[first - 1 : last] if lengths else None,
+                period_days=period_days,
+            ),
+            "crops": [c for c in request.crops if c.id in crop_ids],
+            "events": [
+                ev.model_copy(
+                    update={
+                        "start_cond": days(ev.start_cond, clip=False),
+                        "end_cond": days(ev.end_cond, clip=False),
+                    }
+                )
+                for ev in request.events
+                if ev.crop_id in crop_ids
+            ],
+            "lands": [reblock(ld) for ld in request.lands],
+            "workers": [reblock(w) for w in request.workers],
+            "resources": [reblock(r) for r in request.resources],
+            "crop_area_bounds": [
+                b for b in request.crop_area_bounds or [] if b.crop_id in crop_ids
+            ]
+            or None,
+            "fixed_areas": [
+                fa for fa in request.fixed_areas or [] if fa.crop_id in crop_ids
+            ]
+            or None,
+        }
+    )
+
+
+def _objectives(
+    request: PlanRequest,
+    by_land: dict[str, dict[int, dict[str, float]]],
+    events: list[EventAssignment],
+) -> tuple[dict[str, float], dict[str, float]]:
+    """Objectives and summary of the assembled plan (as ``plan`` reports)."""
+    price = {c.id: float(c.price_per_area or 0.0) for c in request.crops}
+    area: dict[tuple[str, str], float] = {}
+    for land_id, per_t in by_land.items():
+        for per_crop in per_t.values():
+            for crop_id, a in per_crop.items():
+                key = (land_id, crop_id)
+                area[key] = max(area.get(key, 0.0), a)
+    labor = sum(w.used_time_hours or 0.0 for ea in events for w in ea.assigned_workers)
+    used = sum(r.used_time_hours for ea in events for r in ea.resource_usage)
+    days = Periods.of(request.horizon).total_days
+    objectives = {
+        "profit": round(sum(price.get(c, 0.0) * a for (_l, c), a in area.items()), 3),
+        "dispersion": float(sum(1 for a in area.values() if a > 0)),
+        "labor": labor,
+        "diversity": float(len({c for (_l, c), a in area.items() if a > 0})),
+    }
+    summary = {
+        "workers.capacity_total_h": round(
+            sum(float(w.capacity_per_day or 0.0) for w in request.workers) * days, 3
+        ),
+        "workers.assigned_total_h": labor,
+        "resources.capacity_total_h": round(
+            sum(float(r.capacity_per_day or 0.0) for r in request.resources) * days, 3
+        ),
+        "resources.assigned_total_h": used,
+    }
+    return objectives, summary
+
+
+def _scaled(
+    cb: Callable[[float, str], None], lo: float, hi: float, prefix: str
+) -> Callable[[float, str], None]:
+    def report(p: float, phase: str) -> None:
+        cb(lo + (hi - lo) * p, f"{prefix}:{phase}")
+
+    return report
+
+
+def plan_rolling(
+    request: PlanRequest,
+    *,
+    window_days: int,
+    step_days: int,
+    progress_cb: Callable[[float, str], None] | None = None,
+    **plan_kwargs,
+) -> PlanResponse:
+    """Plan ``request`` window by window (see module docstring).
+
+    ``plan_kwargs`` go to every window's ``plan`` call. The result is one
+    ``PlanResponse`` on the original days; ``diagnostics.rolling_windows``
+    lists each window (days, decided and lookahead crops, profit of the
+    decided crops, time) and ``diagnostics.stages`` the stages of all
+    windows, tagged with the window index. A window without a feasible plan
+    stops the run and makes the whole response infeasible. Periods are never
+    merged, since the reservations are per original day.
+    """
+    if step_days < 1 or window_days < step_days:
+        raise ValueError("rolling windows need 1 <= step_days <= window_days")
+    plan_kwargs.pop("merge_periods", None)
+    H = request.horizon.num_days
+    pending = crop_groups(request)
+    reserved = _Reserved()
+    by_land: dict[str, dict[int, dict[str, float]]] = {}
+    events: list[EventAssignment] = []
+    rows: list[dict] = []
+    stages: list[dict] = []
+    last: PlanResponse | None = None
+    feasible, reason = True, None
+    start = 1
+
+    while pending:
+        start = max(start, pending[0].start)
+        decide = [g for g in pending if g.start < start + step_days]
+        ahead = [
+            g for g in pending if start + step_days <= g.start < start + window_days
+        ]
+        crop_ids = set().union(*(g.crop_ids for g in decide + ahead))
+        end = min(H, max(start + window_days - 1, *(g.end for g in decide + ahead)))
+        shift = start - 1
+        sub = _window_request(request, start, end, crop_ids)
+        local = _Reserved(
+            *(
+                {(i, d - shift): u for (i, d), u in taken.items() if start <= d <= end}
+                for taken in (reserved.land, reserved.workers, reserved.resources)
+            )
+        )
+
+        window_cb = None
+        if progress_cb is not None:
+            window_cb = _scaled(
+                progress_cb,
+                (start - 1) / H,
+                min(H, start + step_days - 1) / H,
+                f"window:{len(rows)}",
+            )
+
+        kwargs = dict(plan_kwargs)
+        if kwargs.get("capture") is not None:
+            kwargs["capture"] = prefixed(kwargs["capture"], f"w{len(rows):02d}-")
+        t0 = time.perf_counter()
+        last = plan(sub, [local], progress_cb=window_cb, **kwargs)
+        decided = set().union(*(g.crop_ids for g in decide))
+        row = {
+            "start_day": start,
+            "end_day": end,
+            "decided": sorted(decided),
+            "lookahead": sorted(crop_ids - decided),
+            "feasible": last.diagnostics.feasible,
+            "ms": (time.perf_counter() - t0) * 1000.0,
+        }
+        stages.extend({**s, "window": len(rows)} for s in last.diagnostics.stages)
+        rows.append(row)
+        if not last.diagnostics.feasible:
+            feasible = False
+            reason = f"window {start}-{end}: {last.diagnostics.reason}"
+            break
+
+        event_crop = {ev.id: ev.crop_id for ev in request.events}
+        profit = 0.0
+        price = {c.id: float(c.price_per_area or 0.0) for c in request.crops}
+        for land_id, per_t in last.assignment.crop_area_by_land_t.items():
+            peak: dict[str, float] = {}
+            for t, per_crop in per_t.items():
+                for crop_id, area in per_crop.items():
+                    if crop_id not in decided:
+                        continue
+                    by_land.setdefault(land_id, {}).setdefault(t + shift, {})[
+                        crop_id
+                    ] = area
+                    units = int(round(area * AREA_SCALE_UNITS_PER_A))
+                    key = (land_id, t + shift)
+                    reserved.land[key] = reserved.land.get(key, 0) + units
+                    peak[crop_id] = max(peak.get(crop_id, 0.0), area)
+            profit += sum(price[c] * a for c, a in peak.items())
+        row["profit"] = round(profit, 3)
+        for ea in last.event_assignments or []:
+            if event_crop.get(ea.event_id) not in decided:
+                continue
+            day = ea.index + shift
+            events.append(ea.model_copy(update={"index": day}))
+            for taken, refs in (
+                (reserved.workers, ea.assigned_workers),
+                (reserved.resources, ea.resource_usage),
+            ):
+                for ref in refs:
+                    units = int(
+                        round((ref.used_time_hours or 0.0) * TIME_SCALE_UNITS_PER_HOUR)
+                    )
+                    taken[(ref.id, day)] = taken.get((ref.id, day), 0) + units
+        pending = [g for g in pending if g not in decide]
+        start += step_days
+
+    events.sort(key=lambda ea: (ea.index, ea.event_id))
+    objectives: dict[str, float] = {}
+    summary: dict[str, float] = {}
+    if feasible:
+        objectives, summary = _objectives(request, by_land, events)
+    base = last.diagnostics if last is not None else PlanDiagnostics(feasible=True)
+    diagnostics = base.model_copy(
+        update={
+            "feasible": feasible,
+            "reason": reason,
+            "stages": stages,
+            "rolling_windows": rows,
+        }
+    )
+    return PlanResponse(
+        diagnostics=diagnostics,
+        assignment=PlanAssignment(crop_area_by_land_t=by_land if feasible else {}),
+        event_assignments=events if feasible else [],
+        objectives=objectives,
+        summary=summary,
+        constraint_hints=last.constraint_hints if last is not None else [],
+    )
@@ -0,0 +1,239 @@
+"""Batches of what-if scenarios over one plan.
+
+Planners compare many variants of one plan that differ only in crop prices,
+worker capacities or crop area bounds. Solving each as an independent job
+repeats the API conversion and starts every search from scratch. Instead,
+``run_scenarios`` patches one converted request per ``Scenario`` (those
+fields only, so every variant has the same variables) and solves:
+
+- the base request first, without a hint;
+- then the scenarios, closest to the base first, in ``parallel`` threads
+  (CP-SAT releases the GIL while solving). Each one is hinted
+  (``replan.Incumbent``) with the plan of the nearest scenario already
+  solved, by the relative size of the changes (``Scenario.shifts``).
+
+The planner still builds a CP-SAT model per stage and scenario: the stage
+locks depend on the previous stage's value, so one model cannot be shared.
+Building is small next to solving, and the warm start is where the time goes.
+
+A ``deadline`` bounds the batch: at that time the running solves are
+stopped (``lib.cancel``) and the scenarios not started yet are skipped; their
+runs have no response, and the finished ones are still returned.
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Callable, Mapping
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+
+from .cancel import SolveStopped, StopToken, bind, current_token, stop_scope
+from .interfaces import Constraint
+from .planner import plan
+from .replan import Incumbent
+from .schemas import CropAreaBound, PlanRequest, PlanResponse
+
+BASE = "base"
+
+
+@dataclass(frozen=True)
+class Scenario:
+    """Overrides of ``name`` on the base request (domain units).
+
+    Area bounds replace the base bound of their crop; ``None`` removes that
+    side of the bound.
+    """
+
+    name: str
+    price_per_area: Mapping[str, float] = field(default_factory=dict)
+    capacity_per_day: Mapping[str, float] = field(default_factory=dict)
+    area_bounds: Mapping[str, tuple[float | None, float | None]] = field(
+        default_factory=dict
+    )
+
+    def apply(self, request: PlanRequest) -> PlanRequest:
+        """``request`` with the overrides; raises ValueError for unknown ids."""
+        crop_ids = {c.id for c in request.crops}
+        worker_ids = {w.id for w in request.workers}
+        unknown = sorted(
+            ({*self.price_per_area, *self.area_bounds} - crop_ids)
+            | (set(self.capacity_per_day) - worker_ids)
+        )
+        if unknown:
+            raise ValueError(f"scenario {self.name}: unknown ids: {', '.join(unknown)}")
+        crops = [
+            c.model_copy(update={"price_per_area": self.price_per_area[c.id]})
+            if c.id in self.price_per_area
+            else c
+            for c in request.crops
+        ]
+        workers = [
+            w.model_copy(update={"capacity_per_day": self.capacity_per_day[w.id]})
+            if w.id in self.capacity_per_day
+            else w
+            for w in request.workers
+        ]
+        bounds = request.crop_area_bounds
+        if self.area_bounds:
+            bounds = [b for b in bounds or [] if b.crop_id not in self.area_bounds]
+            bounds += [
+                CropAreaBound(crop_id=crop_id, min_area=lo, max_area=hi)
+                for crop_id, (lo, hi) in self.area_bounds.items()
+            ]
+        return request.model_copy(
+            update={"crops": crops, "workers": workers, "crop_area_bounds": bounds}
+        )
+
+    def shifts(self, request: PlanRequest) -> dict[str, float]:
+        """Relative change of each overridden value against ``request``."""
+
+        def rel(new: float | None, old: float | None) -> float:
+            if new == old:
+                return 0.0
+            if new is None or old is None:
+                return 1.0
+            return abs(new - old) / max(abs(old), 1e-9)
+
+        prices = {c.id: c.price_per_area for c in request.crops}
+        caps = {w.id: w.capacity_per_day for w in request.workers}
+        bounds = {
+            b.crop_id: (b.min_area, b.max_area) for b in request.crop_area_bounds or []
+        }
+        out = {
+            f"price:{k}": rel(v, prices.get(k)) for k, v in self.price_per_area.items()
+        }
+        out.update(
+            (f"capacity:{k}", rel(v, caps.get(k)))
+            for k, v in self.capacity_per_day.items()
+        )
+        for k, (lo, hi) in self.area_bounds.items():
+            old_lo, old_hi = bounds.get(k, (None, None))
+            out[f"min_area:{k}"] = rel(lo, old_lo)
+            out[f"max_area:{k}"] = rel(hi, old_hi)
+        return {k: v for k, v in out.items() if v > 0}
+
+
+def _distance(a: dict[str, float], b: dict[str, float]) -> float:
+    return sum(abs(a.get(k, 0.0) - b.get(k, 0.0)) for k in {*a, *b})
+
+
+@dataclass
+class ScenarioRun:
+    name: str
+    # None when the deadline stopped or skipped the solve
+    response: PlanResponse | None
+    # Name of the run whose plan hinted this one (None for the base)
+    hint_from: str | None
+    ms: float
+
+    @property
+    def stopped(self) -> bool:
+        return self.response is None
+
+    @property
+    def feasible(self) -> bool:
+        return self.response is not None and self.response.diagnostics.feasible
+
+
+def crop_areas(resp: PlanResponse) -> dict[str, float]:
+    """Planted area per crop: each land's peak area, summed over lands."""
+    peak: dict[tuple[str, str], float] = {}
+    for land_id, per_t in resp.assignment.crop_area_by_land_t.items():
+        for per_crop in per_t.values():
+            for crop_id, area in per_crop.items():
+                key = (land_id, crop_id)
+                peak[key] = max(peak.get(key, 0.0), area)
+    out: dict[str, float] = {}
+    for (_land_id, crop_id), area in peak.items():
+        out[crop_id] = round(out.get(crop_id, 0.0) + area, 6)
+    return out
+
+
+def run_scenarios(
+    request: PlanRequest,
+    scenarios: list[Scenario],
+    constraints: list[Constraint] | None = None,
+    *,
+    parallel: int = 1,
+    deadline: float | None = None,
+    progress_cb: Callable[[float, str], None] | None = None,
+    **plan_kwargs,
+) -> tuple[ScenarioRun, list[ScenarioRun]]:
+    """Solve ``request`` and each of ``scenarios`` applied to it.
+
+    Returns the base run and the scenario runs in the order given.
+    ``deadline`` is a ``time.monotonic()`` value (see module docstring).
+    ``plan_kwargs`` go to every ``plan`` call. Raises ValueError when a
+    scenario names an unknown crop or worker, or two share a name, and
+    ``SolveStopped`` when the caller's own stop token is stopped.
+    """
+    names = [s.name for s in scenarios]
+    if len(set(names)) != len(names) or BASE in names:
+        raise ValueError(f"scenario names must be unique and not {BASE!r}")
+    requests = {s.name: s.apply(request) for s in scenarios}
+    shifts = {s.name: s.shifts(request) for s in scenarios}
+    shifts[BASE] = {}
+    plan_kwargs.pop("hint", None)
+    total = len(scenarios) + 1
+    lock = threading.Lock()
+    finished: dict[str, ScenarioRun] = {}
+    # Stopped at the deadline, and with the caller's token
+    parent = current_token()
+    token = StopToken()
+
+    def solve(name: str, req: PlanRequest) -> ScenarioRun:
+        with lock:
+            donors = [run for run in finished.values() if run.feasible]
+        donor = min(
+            donors,
+            key=lambda run: _distance(shifts[run.name], shifts[name]),
+            default=None,
+        )
+        t0 = time.perf_counter()
+        resp: PlanResponse | None = None
+        try:
+            token.check()
+            resp = plan(
+                req,
+                constraints,
+                hint=Incumbent.of(donor.response).hint(req) if donor else None,
+                **plan_kwargs,
+            )
+        except SolveStopped:
+            if parent is not None and parent.stopped:
+                raise
+        run = ScenarioRun(
+            name=name,
+            response=resp,
+            hint_from=donor.name if donor and resp is not None else None,
+            ms=(time.perf_counter() - t0) * 1000.0,
+        )
+        with lock:
+            finished[name] = run
+            done = len(finished)
+        if progress_cb is not None:
+            progress_cb(done / total, f"scenario:{name}")
+        return run
+
+    timer = None
+    if deadline is not None:
+        timer = threading.Timer(max(0.0, deadline - time.monotonic()), token.stop)
+        timer.daemon = True
+        timer.start()
+    linked = parent.on_stop(token.stop) if parent is not None else nullcontext()
+    try:
+        with linked, stop_scope(token):
+            base = solve(BASE, request)
+            # Closest first, so later scenarios find a near neighbour solved
+            order = sorted(names, key=lambda n: _distance(shifts[n], {}))
+            with ThreadPoolExecutor(
+                max(1, parallel), thread_name_prefix="scenario"
+            ) as pool:
+                list(pool.map(bind(lambda n: solve(n, requests[n])), order))
+    finally:
+        if timer is not None:
+            timer.cancel()
+    return base, [finished[n] for n in names]
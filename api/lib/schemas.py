@@ -73,6 +73,12 @@ class Horizon(BaseModel):
     # Period is represented as discrete days; see tech.md.
     # We use day index, extendable.
     num_days: int
+    # Original days per index when equivalent days are merged (see periods.py)
+    period_lengths: list[int] | None = None
+    # Calendar days of each original period when those are buckets of days
+    # (weeks, thirds, ...), one each when None. Merging leaves it as is: the
+    # days of an index follow from period_lengths (see periods.py)
+    period_days: list[int] | None = None
 
 
 class PlanRequest(BaseModel):
@@ -84,6 +90,21 @@ class PlanRequest(BaseModel):
     resources: list[Resource]
     crop_area_bounds: list[CropAreaBound] | None = None
     fixed_areas: list[FixedArea] | None = None
+    # Land ID -> crops it may grow; lands not listed are unrestricted
+    allowed_crops_by_land: dict[str, set[str]] | None = None
+
+
+class ScreeningIssue(BaseModel):
+    # Proven infeasibility found before the model is built (see lib.screening)
+    code: str  # area_bounds/land_area/fixed_area/missing_role/labor_capacity
+    message: str
+    crop_id: str | None = None
+    event_id: str | None = None
+    land_tag: str | None = None
+    roles: list[str] | None = None
+    window: list[int] | None = None  # [first day, last day]
+    required: float | None = None
+    available: float | None = None
 
 
 class PlanDiagnostics(BaseModel):
@@ -92,9 +113,22 @@ class PlanDiagnostics(BaseModel):
     violated_constraints: list[str] | None = None
     # Optional: lexicographic stages summary
     stages: list[dict] = Field(default_factory=list)
+    # Summary (status, solver params, search stats) of the stage that failed
+    failed_stage: dict | None = None
     stage_order: list[str] | None = None
+    # "lexicographic" or "weighted"; mode_note explains fallbacks/splits
+    mode: str | None = None
+    mode_note: str | None = None
     lock_tolerance_pct: float | None = None
     lock_tolerance_by: dict[str, float] | None = None
+    # Reasons found by pre-solve screening (no model was built)
+    screening: list[ScreeningIssue] | None = None
+    # Time indices before/after merging equivalent periods (merge_periods)
+    period_merge: dict[str, int] | None = None
+    # Per-window summary of a rolling-horizon plan (see rolling.py)
+    rolling_windows: list[dict] | None = None
+    # Scope of an incremental re-plan (see replan.py)
+    replan: dict | None = None
 
 
 class PlanAssignment(BaseModel):
@@ -0,0 +1,228 @@
+"""Aggregate-capacity screening run before any CP-SAT model is built.
+
+Every check is a relaxation of the model's own constraints, evaluated in the
+same integer units, so a reported issue proves the plan infeasible. Plans that
+pass may still be infeasible; the solver remains the final judge.
+"""
+
+from __future__ import annotations
+
+from fractions import Fraction
+
+from .constants import AREA_SCALE_UNITS_PER_A, TIME_SCALE_UNITS_PER_HOUR
+from .model_builder import event_windows
+from .periods import Periods
+from .schemas import Event, PlanRequest, ScreeningIssue, Worker
+
+
+def _area_units(area: float) -> int:
+    return int(round(area * AREA_SCALE_UNITS_PER_A))
+
+
+def _time_units(hours: float) -> int:
+    return int(round(hours * TIME_SCALE_UNITS_PER_HOUR))
+
+
+def _hours(units: float) -> float:
+    return round(float(units) / TIME_SCALE_UNITS_PER_HOUR, 3)
+
+
+def _forced_area_units(request: PlanRequest) -> dict[str, int]:
+    """Lower bound of the planted (base) area per crop, in area units."""
+    crop_ids = {c.id for c in request.crops}
+    forced: dict[str, int] = {}
+    for b in request.crop_area_bounds or []:
+        if b.crop_id in crop_ids and b.min_area is not None:
+            forced[b.crop_id] = max(forced.get(b.crop_id, 0), _area_units(b.min_area))
+    for fa in request.fixed_areas or []:
+        tagged = [ld for ld in request.lands if fa.land_tag in (ld.tags or set())]
+        if fa.crop_id in crop_ids and fa.land_tag and tagged:
+            forced[fa.crop_id] = max(forced.get(fa.crop_id, 0), _area_units(fa.area))
+    return forced
+
+
+def _check_areas(request: PlanRequest) -> list[ScreeningIssue]:
+    issues: list[ScreeningIssue] = []
+    total_land = sum(_area_units(ld.area) for ld in request.lands)
+    crop_ids = {c.id for c in request.crops}
+    for b in request.crop_area_bounds or []:
+        if b.crop_id not in crop_ids:
+            continue
+        lo = None if b.min_area is None else _area_units(b.min_area)
+        hi = None if b.max_area is None else _area_units(b.max_area)
+        if lo is not None and hi is not None and lo > hi:
+            issues.append(
+                ScreeningIssue(
+                    code="area_bounds",
+                    message=(
+                        f"crop {b.crop_id} min_area {b.min_area} > "
+                        f"max_area {b.max_area}"
+                    ),
+                    crop_id=b.crop_id,
+                    required=b.min_area,
+                    available=b.max_area,
+                )
+            )
+        elif lo is not None and lo > total_land:
+            issues.append(
+                ScreeningIssue(
+                    code="land_area",
+                    message=(
+                        f"crop {b.crop_id} min_area {b.min_area} > total land "
+                        f"{total_land / AREA_SCALE_UNITS_PER_A}"
+                    ),
+                    crop_id=b.crop_id,
+                    required=b.min_area,
+                    available=total_land / AREA_SCALE_UNITS_PER_A,
+                )
+            )
+    for fa in request.fixed_areas or []:
+        tagged = [ld for ld in request.lands if fa.land_tag in (ld.tags or set())]
+        if not fa.land_tag or not tagged:
+            continue  # the model ignores fixed areas without matching lands
+        available = sum(_area_units(ld.area) for ld in tagged)
+        if _area_units(fa.area) > available:
+            issues.append(
+                ScreeningIssue(
+                    code="fixed_area",
+                    message=(
+                        f"fixed area {fa.area} for tag:{fa.land_tag}/{fa.crop_id} "
+                        f"> tagged land area {available / AREA_SCALE_UNITS_PER_A}"
+                    ),
+                    crop_id=fa.crop_id,
+                    land_tag=fa.land_tag,
+                    required=fa.area,
+                    available=available / AREA_SCALE_UNITS_PER_A,
+                )
+            )
+    return issues
+
+
+def _works(w: Worker, t: int) -> bool:
+    return not (w.blocked_days and t in w.blocked_days)
+
+
+def _eligible(ev: Event, w: Worker) -> bool:
+    # RolesConstraint pins assign (and so hours) to 0 for workers without any
+    # required role
+    return not ev.required_roles or bool((w.roles or set()) & ev.required_roles)
+
+
+def _labor_need(ev: Event, area_units: int) -> Fraction:
+    """Exact labor need in time units (LaborConstraint's q*sum(h) == p*sum(x))."""
+    per_unit = (
+        Fraction(str(ev.labor_total_per_area or 0.0))
+        * TIME_SCALE_UNITS_PER_HOUR
+        / AREA_SCALE_UNITS_PER_A
+    )
+    return per_unit * area_units
+
+
+def _check_labor(request: PlanRequest) -> list[ScreeningIssue]:
+    forced = _forced_area_units(request)
+    windows = event_windows(request)
+    periods = Periods.of(request.horizon)
+    caps = {w.id: _time_units(w.capacity_per_day or 0.0) for w in request.workers}
+    have_roles = set().union(*(w.roles or set() for w in request.workers))
+    issues: list[ScreeningIssue] = []
+    # (window, need) of events whose labor is enforced, for the shared check
+    enforced: list[tuple[set[int], Fraction]] = []
+    for ev in request.events:
+        need = _labor_need(ev, forced.get(ev.crop_id, 0))
+        window = windows.get(ev.id, set())
+        # The labor equality only exists when some worker can work in the window
+        if need <= 0 or not any(_works(w, t) for w in request.workers for t in window):
+            continue
+        enforced.append((window, need))
+        lo, hi = (min(window), max(window)) if window else (None, None)
+        missing = sorted((ev.required_roles or set()) - have_roles)
+        if missing:
+            issues.append(
+                ScreeningIssue(
+                    code="missing_role",
+                    message=(
+                        f"event {ev.id} needs role(s) {', '.join(missing)} "
+                        f"that no worker has"
+                    ),
+                    event_id=ev.id,
+                    crop_id=ev.crop_id,
+                    roles=missing,
+                )
+            )
+            continue
+        available = 0
+        daily_cap = (
+            None if ev.labor_daily_cap is None else _time_units(ev.labor_daily_cap)
+        )
+        for t in window:
+            day = sum(
+                caps[w.id] for w in request.workers if _works(w, t) and _eligible(ev, w)
+            )
+            day = day if daily_cap is None else min(day, daily_cap)
+            available += periods.length(t) * day
+        if need > available:
+            issues.append(
+                ScreeningIssue(
+                    code="labor_capacity",
+                    message=(
+                        f"event {ev.id} needs {_hours(need)} h for the minimum "
+                        f"area of crop {ev.crop_id} but at most "
+                        f"{_hours(available)} h is available in days {lo}-{hi}"
+                    ),
+                    event_id=ev.id,
+                    crop_id=ev.crop_id,
+                    window=[lo, hi] if lo is not None else None,
+                    required=_hours(need),
+                    available=_hours(available),
+                )
+            )
+    if len(enforced) > 1 and not issues:
+        issues.extend(_check_shared_labor(request, enforced, caps))
+    return issues
+
+
+def _check_shared_labor(
+    request: PlanRequest,
+    enforced: list[tuple[set[int], Fraction]],
+    caps: dict[str, int],
+) -> list[ScreeningIssue]:
+    """Events whose windows fall inside [a, b] share the workers' daily
+    capacity on those days."""
+    H = request.horizon.num_days
+    periods = Periods.of(request.horizon)
+    day_cap = [0] * (H + 2)
+    for t in range(1, H + 1):
+        day_cap[t] = periods.length(t) * sum(
+            caps[w.id] for w in request.workers if _works(w, t)
+        )
+    prefix = [0] * (H + 2)
+    for t in range(1, H + 1):
+        prefix[t] = prefix[t - 1] + day_cap[t]
+    spans = [(min(win), max(win), need) for win, need in enforced if win]
+    starts = sorted({a for a, _, _ in spans})
+    ends = sorted({b for _, b, _ in spans})
+    for a in starts:
+        for b in ends:
+            if b < a:
+                continue
+            need = sum(n for lo, hi, n in spans if a <= lo and hi <= b)
+            available = prefix[b] - prefix[a - 1]
+            if need > available:
+                return [
+                    ScreeningIssue(
+                        code="labor_capacity",
+                        message=(
+                            f"events in days {a}-{b} need {_hours(need)} h in "
+                            f"total but workers have {_hours(available)} h"
+                        ),
+                        window=[a, b],
+                        required=_hours(need),
+                        available=_hours(available),
+                    )
+                ]
+    return []
+
+
+def screen(request: PlanRequest) -> list[ScreeningIssue]:
+    """Return proven infeasibility reasons (empty when none were found)."""
+    return _check_areas(request) + _check_labor(request)
@@ -1,20 +1,33 @@
 from __future__ import annotations
 
+import logging
+import math
 import time
-from dataclasses import dataclass
+from collections.abc import Callable, Sequence
+from contextlib import nullcontext
+from dataclasses import dataclass, field
 
 from ortools.sat.python import cp_model
 
+from .cancel import current_token
+from .capture import build_artifact
+from .cpu_budget import get_budget
+from .expressions import evaluate_expr
 from .model_builder import BuildContext
+from .solver_profiles import SolverProfile, apply_profile
+
+LOGGER = logging.getLogger(__name__)
 
 
 @dataclass
 class SolveContext:
-    build: BuildContext
+    # None for plans constructed without CP-SAT (see ``greedy.construct``)
+    build: BuildContext | None
     # In full impl, this may include solver status, objective value, etc.
     status: str = "UNKNOWN"
     objective_value: float | None = None
     x_area_by_l_c_t_values: dict[tuple[str, str, int], int] | None = None
+    x_area_by_l_c_values: dict[tuple[str, str], int] | None = None
     z_use_by_l_c_values: dict[tuple[str, str], int] | None = None
     r_event_by_e_t_values: dict[tuple[str, int], int] | None = None
     h_time_by_w_e_t_values: dict[tuple[str, str, int], int] | None = None
@@ -22,11 +35,142 @@ class SolveContext:
     u_time_by_r_e_t_values: dict[tuple[str, str, int], int] | None = None
     occ_by_c_t_values: dict[tuple[str, int], int] | None = None
     occ_by_l_c_t_values: dict[tuple[str, str, int], int] | None = None
+    # Values of caller-supplied expressions (see ``watch``)
+    expr_values: dict[str, int] | None = None
+    # Effective solver parameters (profile + limits)
+    params: dict | None = None
+    # CP-SAT search statistics and presolve summary (JSON-safe)
+    search_stats: dict | None = None
+    # Explain mode: labels of a conflicting set of guarded constraint families
+    assumption_core: list[str] | None = None
     # timings
     solve_ms: float | None = None
 
 
-def solve(ctx: BuildContext, prev: SolveContext | None = None) -> SolveContext:
+def _finite(value: float) -> float | None:
+    return float(value) if math.isfinite(value) else None
+
+
+_STATUS_NAMES = {
+    cp_model.OPTIMAL: "OPTIMAL",
+    cp_model.FEASIBLE: "FEASIBLE",
+    cp_model.INFEASIBLE: "INFEASIBLE",
+    cp_model.MODEL_INVALID: "MODEL_INVALID",
+    cp_model.UNKNOWN: "UNKNOWN",
+}
+
+
+def _search_stats(
+    solver: cp_model.CpSolver, model: cp_model.CpModel, has_solution: bool
+) -> dict:
+    """Collect response statistics; bound/gap only when a solution exists."""
+    r = solver.ResponseProto()
+    proto = model.Proto()
+    stats: dict = {
+        "best_objective_bound": None,
+        "gap": None,
+        "num_branches": int(r.num_branches),
+        "num_conflicts": int(r.num_conflicts),
+        "num_restarts": int(r.num_restarts),
+        "num_lp_iterations": int(r.num_lp_iterations),
+        "wall_time_s": _finite(r.wall_time),
+        "user_time_s": _finite(r.user_time),
+        "deterministic_time": _finite(r.deterministic_time),
+        "gap_integral": _finite(r.gap_integral),
+        "solution_info": r.solution_info or None,
+        # Original model size vs what the search actually loaded after presolve
+        "presolve": {
+            "model_variables": len(proto.variables),
+            "model_constraints": len(proto.constraints),
+            "num_booleans": int(r.num_booleans),
+            "num_integers": int(r.num_integers),
+            "num_fixed_booleans": int(r.num_fixed_booleans),
+        },
+    }
+    if has_solution and model.HasObjective():
+        obj = float(r.objective_value)
+        bound = _finite(r.best_objective_bound)
+        stats["best_objective_bound"] = bound
+        if bound is not None:
+            stats["gap"] = abs(obj - bound) / max(1.0, abs(obj))
+    return stats
+
+
+@dataclass
+class SolveOutcome:
+    """The parts of a CP-SAT response that ``solve`` uses.
+
+    Plain data, so portfolio members (``lib.portfolio``) can send it back
+    from their process.
+    """
+
+    status: str
+    objective_value: float | None = None
+    # Variable values by model index (empty without a solution)
+    solution: list[int] = field(default_factory=list)
+    search_stats: dict | None = None
+    # Explain mode: indices of a sufficient set of failing assumptions
+    core: list[int] = field(default_factory=list)
+
+    @classmethod
+    def of(
+        cls, solver: cp_model.CpSolver, model: cp_model.CpModel, status: int
+    ) -> SolveOutcome:
+        solved = status in (cp_model.OPTIMAL, cp_model.FEASIBLE)
+        out = cls(
+            status=_STATUS_NAMES.get(status, "UNKNOWN"),
+            search_stats=_search_stats(solver, model, solved),
+        )
+        if (
+            status == cp_model.OPTIMAL
+            and solver.parameters.relative_gap_limit > 0
+            and (out.search_stats.get("gap") or 0.0) > 0
+        ):
+            # CP-SAT reports OPTIMAL once the gap limit is met; that is not
+            # a proof, so caches and races must not treat it as one
+            out.status = "FEASIBLE"
+            out.search_stats["gap_limited"] = True
+        if solved:
+            out.objective_value = solver.ObjectiveValue()
+            out.solution = list(solver.ResponseProto().solution)
+        if status == cp_model.INFEASIBLE and model.Proto().assumptions:
+            out.core = list(solver.SufficientAssumptionsForInfeasibility())
+        return out
+
+    @property
+    def solved(self) -> bool:
+        return self.status in ("OPTIMAL", "FEASIBLE")
+
+
+def solve(
+    ctx: BuildContext,
+    prev: SolveContext | None = None,
+    *,
+    watch: dict[str, cp_model.LinearExpr] | None = None,
+    profile: SolverProfile | None = None,
+    capture: Callable[[str, bytes], None] | None = None,
+    capture_label: str = "model",
+    fix_hints: bool = False,
+    time_limit_s: float | None = None,
+    portfolio: Sequence[SolverProfile] | None = None,
+) -> SolveContext:
+    """Solve ``ctx``, hinting every variable that ``prev`` has a value for.
+
+    ``fix_hints`` pins the hinted variables, turning the solve into a
+    feasibility check of ``prev`` (only unhinted helpers stay free).
+    ``time_limit_s`` replaces the configured sync timeout as the limit.
+    ``portfolio`` (the stage profile first, then its variants) races as
+    many of the profiles as the leased workers allow, each in its own
+    process; the first proven result (else the best at the limit) wins and
+    ``params["portfolio"]`` names it. With room for one, ``portfolio[0]``
+    is solved in-process.
+
+    Raises ``cancel.SolveStopped`` when the current stop token is stopped
+    before or during the search.
+    """
+    token = current_token()
+    if token is not None:
+        token.check()
     solver = cp_model.CpSolver()
     # Configure from env if available
     try:
@@ -38,85 +182,114 @@ def solve(ctx: BuildContext, prev: SolveContext | None = None) -> SolveContext:
         mt = 5000
         nw = 0
     solver.parameters.max_time_in_seconds = max(0.1, (mt or 5000) / 1000.0)
-    if isinstance(nw, int) and nw >= 0:
-        solver.parameters.num_search_workers = nw
+    if time_limit_s is not None:
+        solver.parameters.max_time_in_seconds = max(0.01, time_limit_s)
+    # CP_NUM_WORKERS > 0 pins the worker count; 0 sizes it from the CPU budget
+    fixed_workers = nw if isinstance(nw, int) and nw > 0 else None
+    if portfolio:
+        profile = portfolio[0]
+    if profile is not None:
+        apply_profile(solver.parameters, profile)
 
     # Warm start with hints from previous solution
     if prev is not None:
-        # Per-t areas
-        if prev.x_area_by_l_c_t_values is not None:
-            for key, var in ctx.variables.x_area_by_l_c_t.items():
-                if key in prev.x_area_by_l_c_t_values:
-                    try:
-                        ctx.model.AddHint(var, int(prev.x_area_by_l_c_t_values[key]))
-                    except AttributeError:
-                        pass
-        # Use flags
-        if prev.z_use_by_l_c_values is not None:
-            for key, var in ctx.variables.z_use_by_l_c.items():
-                if key in prev.z_use_by_l_c_values:
-                    try:
-                        ctx.model.AddHint(var, int(prev.z_use_by_l_c_values[key]))
-                    except AttributeError:
-                        pass
-        # Event actives
-        if prev.r_event_by_e_t_values is not None:
-            for key, var in ctx.variables.r_event_by_e_t.items():
-                if key in prev.r_event_by_e_t_values:
-                    try:
-                        ctx.model.AddHint(var, int(prev.r_event_by_e_t_values[key]))
-                    except AttributeError:
-                        pass
-
-    t0 = time.perf_counter()
-    status = solver.Solve(ctx.model)
-    t1 = time.perf_counter()
-
-    status_map = {
-        cp_model.OPTIMAL: "OPTIMAL",
-        cp_model.FEASIBLE: "FEASIBLE",
-        cp_model.INFEASIBLE: "INFEASIBLE",
-        cp_model.MODEL_INVALID: "MODEL_INVALID",
-        cp_model.UNKNOWN: "UNKNOWN",
-    }
+        ctx.model.ClearHints()
+        v = ctx.variables
+        for values, variables in (
+            (prev.x_area_by_l_c_t_values, v.x_area_by_l_c_t),
+            (prev.x_area_by_l_c_values, v.x_area_by_l_c),
+            (prev.z_use_by_l_c_values, v.z_use_by_l_c),
+            (prev.r_event_by_e_t_values, v.r_event_by_e_t),
+            (prev.h_time_by_w_e_t_values, v.h_time_by_w_e_t),
+            (prev.assign_by_w_e_t_values, v.assign_by_w_e_t),
+            (prev.u_time_by_r_e_t_values, v.u_time_by_r_e_t),
+            (prev.occ_by_c_t_values, v.occ_by_c_t),
+            (prev.occ_by_l_c_t_values, v.occ_by_l_c_t),
+        ):
+            if not values:
+                continue
+            for key, var in variables.items():
+                if key in values:
+                    ctx.model.AddHint(var, int(values[key]))
+    if fix_hints:
+        solver.parameters.fix_variables_to_their_hinted_value = True
+
+    parameters = solver.parameters
+    race_info = None
+    with get_budget().lease(fixed_workers) as workers:
+        solver.parameters.num_workers = workers
+        racers: list[SolverProfile] = []
+        if portfolio:
+            from .portfolio import MEMBER_WORKERS, race_profiles
+
+            racers = list(portfolio)[: workers // MEMBER_WORKERS]
+        t0 = time.perf_counter()
+        if len(racers) > 1:
+            winner, out, race_info = race_profiles(ctx.model, solver.parameters, racers)
+            profile = winner.profile
+            parameters = winner.parameters
+        else:
+            stop = token.on_stop(solver.StopSearch) if token else nullcontext()
+            with stop:
+                status = solver.Solve(ctx.model)
+            out = SolveOutcome.of(solver, ctx.model, status)
+        t1 = time.perf_counter()
+    if token is not None:
+        token.check()
 
-    sc = SolveContext(build=ctx, status=status_map.get(status, "UNKNOWN"))
+    sc = SolveContext(build=ctx, status=out.status)
     sc.solve_ms = (t1 - t0) * 1000.0
-    if status in (cp_model.OPTIMAL, cp_model.FEASIBLE):
-        sc.objective_value = solver.ObjectiveValue()
+    sc.search_stats = out.search_stats
+    if ctx.assumptions and out.status == "INFEASIBLE":
+        label_by_index = {lit.Index(): label for label, lit in ctx.assumptions.items()}
+        sc.assumption_core = sorted(
+            label_by_index[i] for i in out.core if i in label_by_index
+        )
+    if capture is not None:
+        # Model (with hints and objective) + parameters for offline replay
+        meta = {
+            "label": capture_label,
+            "status": sc.status,
+            "solve_ms": sc.solve_ms,
+            "objective_value": out.objective_value,
+            "search": sc.search_stats,
+            "profile": profile.name if profile is not None else None,
+        }
+        try:
+            artifact = build_artifact(ctx.model, parameters, meta)
+        except Exception:
+            # Like the sink's write errors: a capture never fails the solve
+            LOGGER.exception("Failed to build solver capture %s", capture_label)
+        else:
+            capture(capture_label, artifact)
+    sc.params = {
+        **(profile.as_dict() if profile is not None else {}),
+        "max_time_in_seconds": parameters.max_time_in_seconds,
+        "num_search_workers": parameters.num_workers,
+    }
+    if race_info is not None:
+        sc.params["portfolio"] = race_info
+    if out.solved:
+        sc.objective_value = out.objective_value
         # Extract variable values
-        xa_lct: dict[tuple[str, str, int], int] = {}
-        za: dict[tuple[str, str], int] = {}
-        rvals: dict[tuple[str, int], int] = {}
-        hvals: dict[tuple[str, str, int], int] = {}
-        avals: dict[tuple[str, str, int], int] = {}
-        uvals: dict[tuple[str, str, int], int] = {}
-        occvals: dict[tuple[str, int], int] = {}
-        occ_land_vals: dict[tuple[str, str, int], int] = {}
-        for key, var in ctx.variables.x_area_by_l_c_t.items():
-            xa_lct[key] = int(solver.Value(var))
-        for key, var in ctx.variables.z_use_by_l_c.items():
-            za[key] = int(solver.Value(var))
-        for key, var in ctx.variables.r_event_by_e_t.items():
-            rvals[key] = int(solver.Value(var))
-        for key, var in ctx.variables.h_time_by_w_e_t.items():
-            hvals[key] = int(solver.Value(var))
-        for key, var in ctx.variables.assign_by_w_e_t.items():
-            avals[key] = int(solver.Value(var))
-        for key, var in ctx.variables.u_time_by_r_e_t.items():
-            # resource time values
-            aval = int(solver.Value(var))
-            uvals[key] = aval
-        for key, var in ctx.variables.occ_by_c_t.items():
-            occvals[key] = int(solver.Value(var))
-        for key, var in ctx.variables.occ_by_l_c_t.items():
-            occ_land_vals[key] = int(solver.Value(var))
-        sc.x_area_by_l_c_t_values = xa_lct
-        sc.z_use_by_l_c_values = za
-        sc.r_event_by_e_t_values = rvals
-        sc.h_time_by_w_e_t_values = hvals
-        sc.assign_by_w_e_t_values = avals
-        sc.u_time_by_r_e_t_values = uvals
-        sc.occ_by_c_t_values = occvals
-        sc.occ_by_l_c_t_values = occ_land_vals
+        sol = out.solution
+
+        def values(variables: dict) -> dict:
+            return {key: sol[var.Index()] for key, var in variables.items()}
+
+        v = ctx.variables
+        sc.x_area_by_l_c_t_values = values(v.x_area_by_l_c_t)
+        sc.x_area_by_l_c_values = values(v.x_area_by_l_c)
+        sc.z_use_by_l_c_values = values(v.z_use_by_l_c)
+        sc.r_event_by_e_t_values = values(v.r_event_by_e_t)
+        sc.h_time_by_w_e_t_values = values(v.h_time_by_w_e_t)
+        sc.assign_by_w_e_t_values = values(v.assign_by_w_e_t)
+        sc.u_time_by_r_e_t_values = values(v.u_time_by_r_e_t)
+        sc.occ_by_c_t_values = values(v.occ_by_c_t)
+        sc.occ_by_l_c_t_values = values(v.occ_by_l_c_t)
+        if watch:
+            by_index = dict(enumerate(sol))
+            sc.expr_values = {
+                name: evaluate_expr(expr, by_index) or 0 for name, expr in watch.items()
+            }
     return sc
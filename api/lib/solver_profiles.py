@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass
+from typing import Any
+
+from ortools.sat.python import cp_model
+
+
+@dataclass(frozen=True)
+class SolverProfile:
+    """Named CP-SAT parameter set applied on top of the time/worker limits.
+
+    ``None`` keeps the CP-SAT default for that parameter.
+    """
+
+    name: str
+    relative_gap_limit: float = 0.0
+    linearization_level: int | None = None
+    search_branching: str | None = None
+    # False skips presolve entirely; max_presolve_iterations bounds its effort
+    cp_model_presolve: bool = True
+    max_presolve_iterations: int | None = None
+
+    def as_dict(self) -> dict:
+        return asdict(self)
+
+
+PROFILES: dict[str, SolverProfile] = {
+    # Prove optimality (CP-SAT defaults)
+    "exact": SolverProfile(name="exact"),
+    # Near-optimal primary stages on large models
+    "balanced": SolverProfile(
+        name="balanced",
+        relative_gap_limit=0.005,
+        max_presolve_iterations=2,
+    ),
+    # Tie-breakers: a small gap is fine, keep LP and presolve light
+    "fast": SolverProfile(
+        name="fast",
+        relative_gap_limit=0.02,
+        linearization_level=0,
+        max_presolve_iterations=1,
+    ),
+    # Small but hard models: stronger LP relaxation, LP-guided search
+    "deep": SolverProfile(
+        name="deep",
+        linearization_level=2,
+        search_branching="LP_SEARCH",
+    ),
+}
+
+# Stages that only break ties between optima of the earlier stages
+TIE_BREAKER_STAGES = frozenset({"event_span", "earliness", "occ_span", "diversity"})
+
+# Models above this many CP-SAT variables use "balanced" for primary stages
+LARGE_MODEL_VARIABLES = 20000
+
+
+def default_profile(stage: str, num_variables: int) -> str:
+    """Profile used when the request does not pick one for ``stage``."""
+    if stage in TIE_BREAKER_STAGES:
+        return "fast"
+    if num_variables > LARGE_MODEL_VARIABLES:
+        return "balanced"
+    return "exact"
+
+
+def resolve_profile(
+    stage: str,
+    model: cp_model.CpModel,
+    default: str | None = None,
+    by_stage: dict[str, str] | None = None,
+) -> SolverProfile:
+    """Pick the profile for ``stage``: per-stage > request default > size-based."""
+    name = (by_stage or {}).get(stage) or default
+    if name is None:
+        name = default_profile(stage, len(model.Proto().variables))
+    if name not in PROFILES:
+        raise ValueError(f"unknown solver profile: {name}")
+    return PROFILES[name]
+
+
+def apply_profile(parameters: Any, profile: SolverProfile) -> None:
+    """Set ``profile`` on ``CpSolver.parameters``.
+
+    Depending on the OR-Tools release the parameters are a protobuf message or
+    a native wrapper; both expose the enum on their type.
+    """
+    parameters.relative_gap_limit = profile.relative_gap_limit
+    if profile.linearization_level is not None:
+        parameters.linearization_level = profile.linearization_level
+    if profile.search_branching is not None:
+        branching = type(parameters).SearchBranching
+        parameters.search_branching = getattr(branching, profile.search_branching)
+    parameters.cp_model_presolve = profile.cp_model_presolve
+    if profile.max_presolve_iterations is not None:
+        parameters.max_presolve_iterations = profile.max_presolve_iterations
@@ -0,0 +1,102 @@
+from __future__ import annotations
+
+import argparse
+import json
+from pathlib import Path
+
+from demo.print_utils import color, print_table
+from lib.capture import replay_artifact
+
+
+def _artifact_paths(targets: list[str]) -> list[Path]:
+    paths: list[Path] = []
+    for raw in targets:
+        p = Path(raw)
+        if p.is_dir():
+            paths.extend(sorted(p.rglob("*.zip")))
+        else:
+            paths.append(p)
+    return paths
+
+
+def _fmt(value: float | None, spec: str = ".1f") -> str:
+    return "-" if value is None else format(value, spec)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(
+        description="Replay captured CP-SAT stage models (SOLVER_CAPTURE artifacts)"
+    )
+    parser.add_argument(
+        "paths", nargs="+", help="Artifact .zip files or capture directories"
+    )
+    parser.add_argument(
+        "--param",
+        action="append",
+        default=[],
+        help='Parameter override in text format, e.g. "relative_gap_limit: 0.02"',
+    )
+    parser.add_argument(
+        "--time-limit", type=float, default=None, help="max_time_in_seconds override"
+    )
+    parser.add_argument(
+        "--workers", type=int, default=None, help="num_workers override"
+    )
+    parser.add_argument(
+        "--repeat", type=int, default=1, help="Solve each artifact N times"
+    )
+    parser.add_argument("--json", action="store_true", help="Output JSON lines")
+    args = parser.parse_args()
+
+    overrides = list(args.param)
+    if args.time_limit is not None:
+        overrides.append(f"max_time_in_seconds: {args.time_limit}")
+    if args.workers is not None:
+        overrides.append(f"num_workers: {args.workers}")
+    override_text = "\n".join(overrides)
+
+    rows: list[list[str]] = []
+    for path in _artifact_paths(args.paths):
+        data = path.read_bytes()
+        for run in range(max(1, args.repeat)):
+            out = replay_artifact(data, override_text)
+            out["artifact"] = str(path)
+            out["run"] = run
+            if args.json:
+                print(json.dumps(out, ensure_ascii=False))
+                continue
+            rows.append(
+                [
+                    str(path.parent.name),
+                    str(out["label"]),
+                    str(run),
+                    f"{out['captured_status']} / {out['status']}",
+                    f"{_fmt(out['captured_solve_ms'])} / {_fmt(out['solve_ms'])}",
+                    f"{_fmt(out['captured_objective'], 'g')} / "
+                    f"{_fmt(out['objective_value'], 'g')}",
+                    _fmt(out["best_objective_bound"], "g"),
+                    _fmt(out["deterministic_time"], ".3f"),
+                ]
+            )
+    if not args.json:
+        if override_text:
+            print(
+                color("overrides: " + override_text.replace("\n", ", "), kind="title")
+            )
+        print_table(
+            [
+                "capture",
+                "stage",
+                "run",
+                "status (captured / replay)",
+                "solve_ms",
+                "objective",
+                "bound",
+                "det_time",
+            ],
+            rows,
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,30 @@
 from __future__ import annotations
 
+import time
+from functools import partial
 from typing import Annotated
 
 from fastapi import APIRouter, Depends, Header, HTTPException, Request, status
+from fastapi.responses import JSONResponse
+from pydantic import ValidationError
 
 from core.auth import require_auth
 from core.config import Settings
-from schemas import JobInfo, OptimizationRequest, OptimizationResult
+from schemas import (
+    FrontierRequest,
+    FrontierResult,
+    JobInfo,
+    OptimizationEstimate,
+    OptimizationRequest,
+    OptimizationResult,
+    ReplanRequest,
+    ScenarioBatchRequest,
+    ScenarioBatchResult,
+)
 from services import job_runner
+from services.admission import AdmissionController, AdmissionRejected
+from services.cost_estimator import estimate
+from services.job_backend import IdempotencyConflict
 
 router = APIRouter(
     prefix="/v1",
@@ -22,13 +39,56 @@ def _resolve_timeout(settings: Settings, request_timeout: int | None) -> int | N
     return settings.sync_timeout_ms
 
 
+def _enqueue(request_model: OptimizationRequest) -> JobInfo:
+    try:
+        # A repeated idempotency key returns the existing job
+        return job_runner.enqueue(request_model)
+    except IdempotencyConflict as err:
+        raise HTTPException(
+            status_code=409,
+            detail={
+                "message": "idempotency key was already used for a different request"
+            },
+        ) from err
+
+
+def _redirect_to_job(request_model: OptimizationRequest) -> JSONResponse:
+    # Hand the request to the job queue; 303 points at the new job
+    job = _enqueue(request_model)
+    return JSONResponse(
+        status_code=status.HTTP_303_SEE_OTHER,
+        content=job.model_dump(mode="json"),
+        headers={"Location": f"/v1/jobs/{job.job_id}"},
+    )
+
+
+def _rejected(rej: AdmissionRejected) -> HTTPException:
+    return HTTPException(
+        status_code=503,
+        detail={
+            "message": "too many concurrent optimizations; retry later",
+            "reason": rej.reason,
+            "retry_after": rej.retry_after_s,
+        },
+        headers={"Retry-After": str(rej.retry_after_s)},
+    )
+
+
+def _overflow(
+    settings: Settings, request_model: OptimizationRequest, rej: AdmissionRejected
+) -> JSONResponse:
+    if settings.admission_overflow == "async":
+        return _redirect_to_job(request_model)
+    raise _rejected(rej) from rej
+
+
 @router.post("/optimize", response_model=OptimizationResult)
 def optimize_sync(
     request_model: OptimizationRequest,
     request: Request,
     idem_key: Annotated[str | None, Header(alias="Idempotency-Key")] = None,
     idem_key_alt: Annotated[str | None, Header(alias="X-Idempotency-Key")] = None,
-) -> OptimizationResult:
+) -> OptimizationResult | JSONResponse:
     if request_model.idempotency_key is None:
         request_model.idempotency_key = idem_key or idem_key_alt
 
@@ -50,7 +110,191 @@ def optimize_sync(
                 "reason": str(getattr(exc, "__class__", type(exc)).__name__),
             },
         ) from exc
-    return _solve_sync_with_timeout(request_model, timeout_ms)
+    admission: AdmissionController = request.app.state.admission
+    if settings.sync_cost_routing != "off" and request_model.plan is not None:
+        # Plans predicted to outlast the sync timeout go to the job queue
+        est = estimate(
+            request_model.plan, timeout_ms, admission.cost(request_model.plan)
+        )
+        # The built-in placeholder (no calibration samples) does not route
+        if est.recommended == "async" and est.model_samples > 0:
+            request_model.timeout_ms = timeout_ms
+            if settings.sync_cost_routing == "async":
+                return _redirect_to_job(request_model)
+            raise HTTPException(
+                status_code=413,
+                detail={
+                    "message": (
+                        "plan is predicted to exceed the sync timeout; "
+                        "use /v1/optimize/async"
+                    ),
+                    "estimate": est.model_dump(mode="json"),
+                },
+            )
+    try:
+        # Bounded concurrency; large plans take several slots, held by the
+        # solve until it ends (also past the timeout) and once per shared solve
+        return _solve_sync_with_timeout(
+            request_model,
+            timeout_ms,
+            admit=partial(admission.admit, admission.cost(request_model.plan)),
+        )
+    except AdmissionRejected as rej:
+        request_model.timeout_ms = timeout_ms
+        return _overflow(settings, request_model, rej)
+
+
+@router.post("/optimize/replan", response_model=OptimizationResult)
+def optimize_replan(body: ReplanRequest, request: Request) -> OptimizationResult:
+    """Re-plan a finished job with ``body.delta`` applied, starting from its
+    result (sync only: small edits solve in seconds)."""
+    try:
+        snap = job_runner.snapshot(body.base_job_id)
+    except KeyError as err:
+        raise HTTPException(
+            status_code=404, detail={"message": "job not found"}
+        ) from err
+    if snap.req is None or snap.req.plan is None or snap.result is None:
+        raise HTTPException(
+            status_code=409, detail={"message": "base job has no plan and result"}
+        )
+    if snap.result.status != "ok":
+        raise HTTPException(
+            status_code=409,
+            detail={"message": "base job has no feasible result"},
+        )
+    try:
+        plan = body.delta.apply(snap.req.plan)
+    except ValidationError as err:
+        raise HTTPException(
+            status_code=422,
+            detail={
+                "message": "delta does not apply to the base plan",
+                "errors": err.errors(
+                    include_url=False, include_context=False, include_input=False
+                ),
+            },
+        ) from err
+
+    settings: Settings = request.app.state.settings
+    timeout_ms = _resolve_timeout(settings, body.timeout_ms)
+    try:
+        from services.optimizer_adapter import ReplanBase, solve_sync_with_timeout
+    except Exception as exc:  # pragma: no cover - deployment without solver stack
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "message": "replan is unavailable on this deployment",
+                "reason": str(getattr(exc, "__class__", type(exc)).__name__),
+            },
+        ) from exc
+    base = ReplanBase(
+        job_id=body.base_job_id,
+        plan=snap.req.plan,
+        result=snap.result,
+        freeze_before_day=body.freeze_before_day,
+    )
+    admission: AdmissionController = request.app.state.admission
+    try:
+        return solve_sync_with_timeout(
+            OptimizationRequest(plan=plan),
+            timeout_ms,
+            base=base,
+            admit=partial(admission.admit, admission.cost(plan)),
+        )
+    except AdmissionRejected as rej:
+        raise _rejected(rej) from rej
+
+
+@router.post("/optimize/frontier", response_model=FrontierResult)
+def optimize_frontier(body: FrontierRequest, request: Request) -> FrontierResult:
+    """Pareto frontier of two stage objectives (sync, bounded by the sync
+    timeout). Points are returned as summaries; each point's full plan is
+    fetched separately."""
+    try:
+        from services.optimizer_adapter import solve_frontier_with_timeout
+    except Exception as exc:  # pragma: no cover - deployment without solver stack
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "message": "frontier is unavailable on this deployment",
+                "reason": str(getattr(exc, "__class__", type(exc)).__name__),
+            },
+        ) from exc
+    settings: Settings = request.app.state.settings
+    timeout_ms = _resolve_timeout(settings, body.timeout_ms)
+    admission: AdmissionController = request.app.state.admission
+    try:
+        return solve_frontier_with_timeout(
+            body,
+            timeout_ms,
+            admit=partial(admission.admit, admission.cost(body.plan)),
+        )
+    except AdmissionRejected as rej:
+        raise _rejected(rej) from rej
+
+
+@router.get(
+    "/optimize/frontier/{frontier_id}/points/{index}",
+    response_model=OptimizationResult,
+)
+def get_frontier_point(frontier_id: str, index: int) -> OptimizationResult:
+    """Full plan (timeline included) of one frontier point."""
+    from services.optimizer_adapter import frontier_point
+
+    try:
+        return frontier_point(frontier_id, index)
+    except KeyError as err:
+        raise HTTPException(
+            status_code=404, detail={"message": "frontier point not found"}
+        ) from err
+
+
+@router.post("/optimize/scenarios", response_model=ScenarioBatchResult)
+def optimize_scenarios(
+    body: ScenarioBatchRequest, request: Request
+) -> ScenarioBatchResult:
+    """What-if batch (sync): the plan and each price/capacity/area-bound
+    override of it, solved together into a comparison table. Runs past the
+    sync timeout are stopped and reported as "timeout" rows."""
+    try:
+        from services.optimizer_adapter import solve_scenarios
+    except Exception as exc:  # pragma: no cover - deployment without solver stack
+        raise HTTPException(
+            status_code=503,
+            detail={
+                "message": "scenario batches are unavailable on this deployment",
+                "reason": str(getattr(exc, "__class__", type(exc)).__name__),
+            },
+        ) from exc
+    settings: Settings = request.app.state.settings
+    admission: AdmissionController = request.app.state.admission
+    timeout_ms = _resolve_timeout(settings, body.timeout_ms)
+    # From arrival, so waiting for admission counts against the timeout
+    deadline = time.monotonic() + timeout_ms / 1000.0 if timeout_ms else None
+    # Up to SCENARIO_PARALLEL scenarios are solved at once
+    running = min(settings.scenario_parallel, len(body.scenarios))
+    try:
+        with admission.admit(admission.cost(body.plan) * running):
+            return solve_scenarios(body, deadline=deadline)
+    except AdmissionRejected as rej:
+        raise _rejected(rej) from rej
+
+
+@router.post("/optimize/estimate", response_model=OptimizationEstimate)
+def optimize_estimate(
+    request_model: OptimizationRequest, request: Request
+) -> OptimizationEstimate:
+    """Dry run: predicted solve cost and sync/async recommendation."""
+    if request_model.plan is None:
+        raise HTTPException(status_code=422, detail={"message": "plan is required"})
+    settings: Settings = request.app.state.settings
+    admission: AdmissionController = request.app.state.admission
+    return estimate(
+        request_model.plan,
+        _resolve_timeout(settings, request_model.timeout_ms),
+        admission.cost(request_model.plan),
+    )
 
 
 @router.post(
@@ -58,11 +302,19 @@ def optimize_sync(
     response_model=JobInfo,
     status_code=status.HTTP_202_ACCEPTED,
 )
-def optimize_async(request_model: OptimizationRequest, request: Request) -> JobInfo:
+def optimize_async(
+    request_model: OptimizationRequest,
+    request: Request,
+    idem_key: Annotated[str | None, Header(alias="Idempotency-Key")] = None,
+    idem_key_alt: Annotated[str | None, Header(alias="X-Idempotency-Key")] = None,
+) -> JobInfo:
+    if request_model.idempotency_key is None:
+        request_model.idempotency_key = idem_key or idem_key_alt
+
     settings: Settings = request.app.state.settings
     timeout_ms = _resolve_timeout(settings, request_model.timeout_ms)
     request_model.timeout_ms = timeout_ms
-    return job_runner.enqueue(request_model)
+    return _enqueue(request_model)
 
 
 @router.get("/jobs/{job_id}", response_model=JobInfo)
@@ -6,17 +6,28 @@ from .optimization import (
     ApiHorizon,
     ApiLand,
     ApiPlan,
+    ApiPlanDelta,
     ApiResource,
     ApiWorker,
+    FrontierPoint,
+    FrontierRequest,
+    FrontierResult,
     GanttEventItem,
     GanttLandSpan,
     JobInfo,
+    OptimizationEstimate,
     OptimizationRequest,
     OptimizationResult,
     OptimizationStagesConfig,
     OptimizationTimeline,
+    ReplanRequest,
+    ScenarioBatchRequest,
+    ScenarioBatchResult,
+    ScenarioOverride,
+    ScenarioRow,
     StatusJob,
     StatusResult,
+    TimelinePeriod,
 )
 from .templates import (
     CropCatalogItem,
@@ -30,10 +41,12 @@ from .templates import (
 __all__ = [
     "OptimizationRequest",
     "OptimizationResult",
+    "OptimizationEstimate",
     "JobInfo",
     "StatusResult",
     "StatusJob",
     "ApiPlan",
+    "ApiPlanDelta",
     "ApiHorizon",
     "ApiCrop",
     "ApiEvent",
@@ -43,7 +56,16 @@ __all__ = [
     "ApiCropAreaBound",
     "ApiFixedArea",
     "OptimizationStagesConfig",
+    "ReplanRequest",
+    "FrontierRequest",
+    "FrontierPoint",
+    "FrontierResult",
+    "ScenarioOverride",
+    "ScenarioBatchRequest",
+    "ScenarioRow",
+    "ScenarioBatchResult",
     "OptimizationTimeline",
+    "TimelinePeriod",
     "GanttLandSpan",
     "GanttEventItem",
     "TemplateListItem",
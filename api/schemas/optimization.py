@@ -33,7 +33,7 @@ class OptimizationRequest(BaseModel):
     - plan: API向けの厳格スキーマ（推奨）
     - params: ドメイン固有の入力パラメータ（自由形式の辞書、非推奨）
     - timeout_ms: 同期実行のタイムアウト（ミリ秒）
-    - priority: 実行優先度（小さいほど高優先度など、実装側の取り決め）
+    - priority: 実行優先度（小さいほど高優先度。未指定は 5）
     """
 
     model_config = ConfigDict(extra="forbid", frozen=False)
@@ -56,7 +56,10 @@ class OptimizationRequest(BaseModel):
     )
     priority: int | None = Field(
         default=None,
-        description="ジョブ優先度。小さいほど高優先度など、実装依存。",
+        description=(
+            "ジョブ優先度。小さいほど先に実行（未指定は 5）。"
+            "待ち時間に応じて優先度が繰り上がる（エージング）。"
+        ),
         examples=[0, 5, 10],
     )
 
@@ -92,6 +95,12 @@ class OptimizationResult(BaseModel):
         default=None,
         description="ガントチャート向けの時系列データ（任意）。",
     )
+    day_timeline: OptimizationTimeline | None = Field(
+        default=None,
+        description=(
+            "日単位の時系列データ（refine_days 指定時のみ。index は 0 始まりの日）。"
+        ),
+    )
 
 
 class JobInfo(BaseModel):
@@ -115,6 +124,30 @@ class JobInfo(BaseModel):
     )
 
 
+class OptimizationEstimate(BaseModel):
+    """求解コストの事前推定（CP-SAT モデルは構築しない）。"""
+
+    model_config = ConfigDict(extra="forbid")
+
+    features: dict[str, int] = Field(
+        description="推定に使った規模特徴量（土地×作物×期間など）。"
+    )
+    predicted_ms: float = Field(
+        description="全段のビルド＋求解時間の予測（中央値, ms）。"
+    )
+    predicted_p90_ms: float = Field(description="同 90 パーセンタイル（ms）。")
+    timeout_ms: int | None = Field(
+        default=None, description="適用される同期タイムアウト。"
+    )
+    recommended: Literal["sync", "async"] = Field(
+        description="p90 が同期タイムアウトを超える場合は async。"
+    )
+    admission_slots: int = Field(description="同期 API で消費する同時実行枠の数。")
+    model_samples: int = Field(
+        description="推定モデルの較正サンプル数（0 は組み込み既定値）。"
+    )
+
+
 # ========================= Strict API models ========================= #
 
 
@@ -291,6 +324,9 @@ class ApiHorizon(BaseModel):
     num_days: int = Field(gt=0)
 
 
+SolverProfileName = Literal["exact", "balanced", "fast", "deep"]
+
+
 class OptimizationStagesConfig(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -307,6 +343,80 @@ class OptimizationStagesConfig(BaseModel):
     step_tolerance_by: dict[str, float] | None = Field(
         default=None, description="段（サブステップ）ごとの許容率（0..1）"
     )
+    mode: Literal["lexicographic", "weighted"] = Field(
+        default="lexicographic",
+        description=(
+            "lexicographic: 段ごとに求解してロック。"
+            "weighted: 許容率0のとき重み付き単一目的で一括求解"
+            "（重みが溢れる場合は分割）。"
+        ),
+    )
+    solver_profile: SolverProfileName | None = Field(
+        default=None,
+        description=(
+            "全段のソルバープロファイル（未指定時はモデル規模と段の種類から自動選択："
+            "タイブレーク段は fast、その他は exact／大規模時 balanced）"
+        ),
+    )
+    solver_profile_by: dict[str, SolverProfileName] | None = Field(
+        default=None,
+        description="段ごとのソルバープロファイル（solver_profile より優先）",
+    )
+    explain_infeasible: bool = Field(
+        default=False,
+        description=(
+            "段が INFEASIBLE のとき、制約群を仮定リテラルで囲んで再求解し、"
+            "矛盾する制約群を violated_constraints に返す（求解 1 回分追加）"
+        ),
+    )
+    granularity: Literal["third", "day", "week", "month", "aligned", "auto"] = Field(
+        default="third",
+        description=(
+            "求解の時間単位。third: 旬、day/week/month: 日・ISO 週・月、"
+            "aligned: イベント期間の端で区切った約 10 日の不規則区間、"
+            "auto: 予測変数数が GRANULARITY_MAX_VARIABLES 以下の最も細かい単位"
+        ),
+    )
+    merge_periods: bool = Field(
+        default=False,
+        description=(
+            "イベント期間の端がなく、圃場・作業者・資源の停止日も同じ連続期間を"
+            "1 期間にまとめて求解する（容量は期間長倍。ラグ・頻度のあるイベントの"
+            "期間内は統合しない）。"
+            "結果は元の期間に展開して返す"
+        ),
+    )
+    rolling_window_days: int | None = Field(
+        default=None,
+        ge=1,
+        description=(
+            "指定すると期間を重ねながら時系列順に分割して解く（ローリングホライズン）。"
+            "各窓で開始日が rolling_step_days 以内の作物を確定し、以降の窓では"
+            "確定分の面積・作業時間を差し引いた容量で解く（merge_periods は適用しない）"
+        ),
+    )
+    rolling_step_days: int | None = Field(
+        default=None,
+        ge=1,
+        description="ローリングホライズンの確定幅（日、未指定時は窓幅の半分）",
+    )
+    refine_days: bool = Field(
+        default=False,
+        description=(
+            "旬単位で求解した後、その解で各イベントの期間と各圃場の作物を絞った"
+            "日単位モデルを再求解して日精度の計画を返す（day_timeline に出力）。"
+            "再求解が実行不能・時間切れのときは旬単位の解を返す"
+        ),
+    )
+    lns_rounds: int = Field(
+        default=0,
+        ge=0,
+        le=200,
+        description=(
+            "最適性が証明されずに終わった段階を、圃場・作物系統・期間の一部だけを"
+            "解放した近傍の再求解（構造化 LNS）で指定回数まで改善してから固定する"
+        ),
+    )
 
     @model_validator(mode="after")
     def _check_tolerances(self):
@@ -318,6 +428,13 @@ class OptimizationStagesConfig(BaseModel):
                     raise ValueError("tolerance は 0..1 の範囲で指定してください")
 
         check_map(self.step_tolerance_by, "step_tolerance_by")
+        if self.rolling_step_days is not None and (
+            self.rolling_window_days is None
+            or self.rolling_step_days > self.rolling_window_days
+        ):
+            raise ValueError(
+                "rolling_step_days は rolling_window_days 以下で指定してください"
+            )
         return self
 
 
@@ -395,6 +512,251 @@ class ApiPlan(BaseModel):
         return self
 
 
+class ApiPlanDelta(BaseModel):
+    """基準計画への差分。
+
+    一覧の要素は id が一致する既存要素を置き換え、なければ追加する。
+    crop_area_bounds / fixed_areas / stages は指定時に丸ごと置き換える。
+    期間（horizon）は変更できない。
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    crops: list[ApiCrop] = Field(default_factory=list)
+    events: list[ApiEvent] = Field(default_factory=list)
+    lands: list[ApiLand] = Field(default_factory=list)
+    workers: list[ApiWorker] = Field(default_factory=list)
+    resources: list[ApiResource] = Field(default_factory=list)
+    remove_ids: set[str] = Field(
+        default_factory=set,
+        description="削除する作物・イベント・圃場・作業者・資源の id（作物の削除で"
+        "そのイベントも削除）",
+    )
+    crop_area_bounds: list[ApiCropAreaBound] | None = None
+    fixed_areas: list[ApiFixedArea] | None = None
+    stages: OptimizationStagesConfig | None = None
+
+    def apply(self, plan: ApiPlan) -> ApiPlan:
+        """差分を適用した計画（整合性チェックをやり直す）。"""
+
+        def merge(items: list, updates: list) -> list:
+            by_id = {item.id: item for item in items if item.id not in self.remove_ids}
+            by_id.update((item.id, item) for item in updates)
+            return list(by_id.values())
+
+        events = merge(plan.events, self.events)
+        return ApiPlan.model_validate(
+            {
+                "horizon": plan.horizon,
+                "crops": merge(plan.crops, self.crops),
+                "events": [e for e in events if e.crop_id not in self.remove_ids],
+                "lands": merge(plan.lands, self.lands),
+                "workers": merge(plan.workers, self.workers),
+                "resources": merge(plan.resources, self.resources),
+                "crop_area_bounds": self.crop_area_bounds
+                if self.crop_area_bounds is not None
+                else plan.crop_area_bounds,
+                "fixed_areas": self.fixed_areas
+                if self.fixed_areas is not None
+                else plan.fixed_areas,
+                "stages": self.stages if self.stages is not None else plan.stages,
+            }
+        )
+
+
+class ReplanRequest(BaseModel):
+    """再計画要求。
+
+    完了済みジョブの計画に差分を適用し、その結果を初期解として解き直す。
+    差分が影響する作物だけを先に解き、その他の作物は結果のまま固定する。
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    base_job_id: str = Field(description="基準とする完了済みジョブの ID。")
+    delta: ApiPlanDelta = Field(default_factory=ApiPlanDelta)
+    freeze_before_day: int | None = Field(
+        default=None,
+        ge=0,
+        description=(
+            "この日（0 始まり）より前に終わる期間の面積・作業・作業時間を"
+            "基準計画のまま固定する（実施済みの作業）。"
+        ),
+    )
+    timeout_ms: int | None = Field(
+        default=None,
+        ge=1,
+        description="同期呼び出しの最大許容時間（ミリ秒）。未指定でサービス既定値を使用。",
+    )
+
+
+StageName = Literal[
+    "profit", "labor", "dispersion", "event_span", "earliness", "occ_span", "diversity"
+]
+
+
+class FrontierRequest(BaseModel):
+    """パレートフロンティア要求。
+
+    2 つの段の目的（既定は利益と作業時間）のトレードオフを、一方を制約
+    （ε 制約）にした求解で ``points`` 点まで求める。各点の計画全体は
+    ``GET /v1/optimize/frontier/{frontier_id}/points/{index}`` で取得する。
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    plan: ApiPlan
+    objectives: tuple[StageName, StageName] = Field(
+        default=("profit", "labor"),
+        description="主目的と副目的（副目的を ε 制約にする）。",
+    )
+    points: int = Field(
+        default=5, ge=2, le=20, description="求める点の数（両端を含む）。"
+    )
+    timeout_ms: int | None = Field(
+        default=None,
+        ge=1,
+        description="同期呼び出しの最大許容時間（ミリ秒）。未指定でサービス既定値を使用。",
+    )
+
+    @model_validator(mode="after")
+    def _check_objectives(self):
+        if self.objectives[0] == self.objectives[1]:
+            raise ValueError("objectives には異なる 2 つの段を指定してください")
+        return self
+
+
+class FrontierPoint(BaseModel):
+    """フロンティア上の 1 点の要約。"""
+
+    model_config = ConfigDict(extra="forbid")
+
+    index: int = Field(ge=0, description="点の番号（主目的が最良の端から 0 始まり）。")
+    epsilon: int | None = Field(
+        default=None, description="副目的の制約値（モデル単位、両端は None）。"
+    )
+    values: dict[str, int] = Field(description="2 つの段の値（モデル単位）。")
+    objectives: dict[str, float] = Field(
+        default_factory=dict, description="計画の目的値（利益・作業時間など）。"
+    )
+    solve_ms: float = Field(description="この点の求解時間（ms）。")
+
+
+class FrontierResult(BaseModel):
+    """パレートフロンティアの結果（点ごとの要約）。"""
+
+    model_config = ConfigDict(extra="forbid")
+
+    status: StatusResult
+    frontier_id: str | None = Field(
+        default=None, description="各点の計画を取得するための ID。"
+    )
+    objectives: list[str]
+    points: list[FrontierPoint] = Field(default_factory=list)
+    stats: dict[str, Any] = Field(default_factory=dict)
+    warnings: list[str] = Field(default_factory=list)
+
+
+class ScenarioOverride(BaseModel):
+    """シナリオ 1 件（基準計画に対する価格・作業者能力・面積上下限の上書き）。"""
+
+    model_config = ConfigDict(extra="forbid")
+
+    name: str = Field(min_length=1, description="シナリオ名（一括内で一意）。")
+    price_per_a: dict[str, float] = Field(
+        default_factory=dict, description="作物 id → 価格（円/a）。"
+    )
+    capacity_per_day: dict[str, float] = Field(
+        default_factory=dict, description="作業者 id → 1 日の作業可能時間（h）。"
+    )
+    crop_area_bounds: list[ApiCropAreaBound] = Field(
+        default_factory=list,
+        description="作物ごとに置き換える面積上下限（指定のない作物は基準のまま）。",
+    )
+
+    @model_validator(mode="after")
+    def _check_values(self):
+        if any(v < 0 for v in self.price_per_a.values()):
+            raise ValueError("price_per_a は 0 以上で指定してください")
+        if any(v <= 0 for v in self.capacity_per_day.values()):
+            raise ValueError("capacity_per_day は正の値で指定してください")
+        return self
+
+
+class ScenarioBatchRequest(BaseModel):
+    """シナリオ一括要求。
+
+    基準計画 ``plan`` と、それに対する上書き ``scenarios`` をまとめて解き、
+    目的値の比較表を返す。各シナリオは最も近い解決済みシナリオの計画を
+    初期解にする。
+    """
+
+    model_config = ConfigDict(extra="forbid")
+
+    plan: ApiPlan
+    scenarios: list[ScenarioOverride] = Field(min_length=1, max_length=100)
+    timeout_ms: int | None = Field(
+        default=None,
+        ge=1,
+        description=(
+            "同期呼び出しの最大許容時間（ミリ秒）。未指定でサービス既定値を使用。"
+            "超えた分のシナリオは status=timeout の行になる。"
+        ),
+    )
+
+    @model_validator(mode="after")
+    def _check_scenarios(self):
+        names = [s.name for s in self.scenarios]
+        if len(set(names)) != len(names) or "base" in names:
+            raise ValueError("シナリオ名は一意で、base 以外にしてください")
+        crop_ids = {c.id for c in self.plan.crops}
+        worker_ids = {w.id for w in self.plan.workers}
+        for sc in self.scenarios:
+            unknown = (
+                ({*sc.price_per_a, *(b.crop_id for b in sc.crop_area_bounds)})
+                - crop_ids
+            ) | (set(sc.capacity_per_day) - worker_ids)
+            if unknown:
+                raise ValueError(
+                    f"シナリオ {sc.name}: 未知の id: {', '.join(sorted(unknown))}"
+                )
+        return self
+
+
+class ScenarioRow(BaseModel):
+    """比較表の 1 行（基準計画または 1 シナリオ）。"""
+
+    model_config = ConfigDict(extra="forbid")
+
+    name: str
+    status: StatusResult
+    objectives: dict[str, float] = Field(
+        default_factory=dict, description="計画の目的値（利益・作業時間など）。"
+    )
+    profit_delta: float | None = Field(
+        default=None, description="基準計画からの利益の差。"
+    )
+    crop_area_a: dict[str, float] = Field(
+        default_factory=dict, description="作物ごとの作付面積（a）。"
+    )
+    hint_from: str | None = Field(
+        default=None, description="初期解に使ったシナリオ名（基準計画は None）。"
+    )
+    solve_ms: float = Field(description="このシナリオの求解時間（ms）。")
+
+
+class ScenarioBatchResult(BaseModel):
+    """シナリオ一括の結果（比較表）。"""
+
+    model_config = ConfigDict(extra="forbid")
+
+    status: StatusResult
+    base: ScenarioRow
+    scenarios: list[ScenarioRow] = Field(default_factory=list)
+    stats: dict[str, Any] = Field(default_factory=dict)
+    warnings: list[str] = Field(default_factory=list)
+
+
 __all__ = [
     "OptimizationRequest",
     "OptimizationResult",
@@ -411,7 +773,16 @@ __all__ = [
     "ApiResource",
     "ApiCropAreaBound",
     "ApiFixedArea",
+    "ApiPlanDelta",
     "OptimizationStagesConfig",
+    "ReplanRequest",
+    "FrontierRequest",
+    "FrontierPoint",
+    "FrontierResult",
+    "ScenarioOverride",
+    "ScenarioBatchRequest",
+    "ScenarioRow",
+    "ScenarioBatchResult",
 ]
 
 
@@ -455,6 +826,15 @@ class GanttEventItem(BaseModel):
     event_name: str | None = None
 
 
+class TimelinePeriod(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    key: str
+    # 0 始まりの日（両端を含む）
+    start_day: int = Field(ge=0)
+    end_day: int = Field(ge=0)
+
+
 class OptimizationTimeline(BaseModel):
     model_config = ConfigDict(extra="forbid")
 
@@ -464,3 +844,7 @@ class OptimizationTimeline(BaseModel):
     entity_names: dict[str, dict[str, str]] = Field(default_factory=dict)
     # 計画の基準日（0日目が指すISO日付）。クライアントのthirdスケール等で使用。
     start_date: date | None = Field(default=None)
+    # index の時間単位。day 以外では periods[index] が対応する日の範囲
+    # （periods が空の旧結果は旬とみなす）
+    granularity: Literal["third", "day", "week", "month", "aligned"] = "third"
+    periods: list[TimelinePeriod] = Field(default_factory=list)
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+import math
+import threading
+import time
+from collections import deque
+from collections.abc import Iterator
+from contextlib import contextmanager
+
+from core.config import Settings
+from core.metrics import metrics
+from lib.cpu_budget import host_cpus
+from schemas import ApiPlan
+
+from .cost_estimator import plan_features
+
+_RETRY_AFTER_MAX_S = 60
+
+
+class AdmissionRejected(Exception):
+    """No capacity for a sync solve right now; retry after ``retry_after_s``."""
+
+    def __init__(self, reason: str, retry_after_s: int) -> None:
+        super().__init__(reason)
+        self.reason = reason
+        self.retry_after_s = retry_after_s
+
+
+class AdmissionController:
+    """Bounded admission for sync solves: ``slots`` run at once, up to
+    ``max_queue`` wait (FIFO) for at most ``queue_timeout_s``.
+
+    A request costs ``ceil(estimated variables / slot_variables)`` slots,
+    capped at ``slots`` so one huge plan can still run alone.
+    """
+
+    def __init__(
+        self,
+        slots: int,
+        *,
+        max_queue: int = 8,
+        queue_timeout_s: float = 2.0,
+        slot_variables: int = 20000,
+        enabled: bool = True,
+    ) -> None:
+        self.slots = max(1, slots)
+        self.max_queue = max(0, max_queue)
+        self.queue_timeout_s = max(0.0, queue_timeout_s)
+        self.slot_variables = max(1, slot_variables)
+        self.enabled = enabled
+        self._cond = threading.Condition()
+        self._in_use = 0
+        self._waiting: deque[tuple[object, int]] = deque()
+        # Smoothed seconds a slot is held; feeds Retry-After
+        self._hold_s = 1.0
+
+    @classmethod
+    def from_settings(cls, settings: Settings) -> AdmissionController:
+        return cls(
+            settings.admission_max_slots or host_cpus(),
+            max_queue=settings.admission_queue,
+            queue_timeout_s=settings.admission_queue_timeout_ms / 1000.0,
+            slot_variables=settings.admission_slot_variables,
+            enabled=settings.admission_enabled,
+        )
+
+    def cost(self, plan: ApiPlan | None) -> int:
+        if plan is None:
+            return 1
+        variables = plan_features(plan)["variables"]
+        slots = math.ceil(variables / self.slot_variables)
+        return max(1, min(slots, self.slots))
+
+    def snapshot(self) -> dict[str, int]:
+        with self._cond:
+            return {
+                "slots": self.slots,
+                "in_use": self._in_use,
+                "queued": len(self._waiting),
+            }
+
+    def _publish(self) -> None:
+        # Caller holds self._cond
+        metrics.set_admission(self._in_use, len(self._waiting))
+
+    def _retry_after(self, cost: int) -> int:
+        # Caller holds self._cond
+        backlog = sum(c for _, c in self._waiting) + cost
+        seconds = math.ceil(self._hold_s * backlog / self.slots)
+        return max(1, min(seconds, _RETRY_AFTER_MAX_S))
+
+    def _reject(self, reason: str, cost: int) -> AdmissionRejected:
+        metrics.record_admission_rejection(reason)
+        return AdmissionRejected(reason, self._retry_after(cost))
+
+    @contextmanager
+    def admit(self, cost: int = 1) -> Iterator[None]:
+        """Hold ``cost`` slots for the body; raise AdmissionRejected when the
+        queue is full or the wait times out."""
+        if not self.enabled:
+            yield
+            return
+        cost = max(1, min(cost, self.slots))
+        with self._cond:
+            if self._waiting or self._in_use + cost > self.slots:
+                self._wait_turn(cost)
+            self._in_use += cost
+            self._publish()
+        t0 = time.monotonic()
+        try:
+            yield
+        finally:
+            held = time.monotonic() - t0
+            with self._cond:
+                self._in_use -= cost
+                self._hold_s = 0.8 * self._hold_s + 0.2 * held
+                self._publish()
+                self._cond.notify_all()
+
+    def _wait_turn(self, cost: int) -> None:
+        # Caller holds self._cond; returns once this request heads the queue
+        # and fits, otherwise raises
+        if len(self._waiting) >= self.max_queue:
+            raise self._reject("queue_full", cost)
+        entry = (object(), cost)
+        self._waiting.append(entry)
+        self._publish()
+        deadline = time.monotonic() + self.queue_timeout_s
+        while self._waiting[0] is not entry or self._in_use + cost > self.slots:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                self._waiting.remove(entry)
+                self._publish()
+                # The next request in line may fit now
+                self._cond.notify_all()
+                raise self._reject("timeout", cost)
+            self._cond.wait(remaining)
+        self._waiting.popleft()
+        # Let the new head re-check its turn
+        self._cond.notify_all()
@@ -0,0 +1,218 @@
+from __future__ import annotations
+
+import json
+import logging
+import math
+import threading
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from core import config
+from schemas import ApiPlan, OptimizationEstimate, OptimizationStagesConfig
+
+from .granularity import choose_bucketing, predicted_variables
+
+LOGGER = logging.getLogger(__name__)
+
+# One-sided z for the 90th percentile of the log-normal residual
+_Z_P90 = 1.2816
+_RIDGE = 1e-3
+
+COST_MODEL_VERSION = 1
+FEATURE_NAMES = (
+    "bias",
+    "log_land_crop_periods",
+    "log_event_periods",
+    "log_assignment_terms",
+    "lag_depth",
+    "log_stages",
+)
+
+
+def _lag_depth(plan: ApiPlan) -> int:
+    """Longest ``preceding_event_id`` chain (1 for an event without one)."""
+    parent = {e.id: e.preceding_event_id for e in plan.events}
+    depth: dict[str, int] = {}
+    for event_id in parent:
+        chain: list[str] = []
+        node: str | None = event_id
+        while node is not None and node not in depth and node not in chain:
+            chain.append(node)
+            node = parent.get(node)
+        base = depth.get(node, 0) if node is not None else 0
+        for offset, item in enumerate(reversed(chain), start=1):
+            depth[item] = base + offset
+    return max(depth.values(), default=0)
+
+
+def plan_features(plan: ApiPlan) -> dict[str, int]:
+    """Size features of ``plan`` that drive build and search time; no model
+    is built."""
+    periods = math.ceil(plan.horizon.num_days / choose_bucketing(plan).nominal_days) + 1
+    stages = (plan.stages or OptimizationStagesConfig()).stage_order
+    features = {
+        "periods": periods,
+        "lands": len(plan.lands),
+        "crops": len(plan.crops),
+        "events": len(plan.events),
+        "workers": len(plan.workers),
+        "resources": len(plan.resources),
+        "stages": len(stages),
+        "lag_depth": _lag_depth(plan),
+        "land_crop_periods": len(plan.lands) * len(plan.crops) * periods,
+        "event_periods": len(plan.events) * periods,
+        "assignment_terms": len(plan.events)
+        * periods
+        * (len(plan.workers) + len(plan.resources)),
+    }
+    features["variables"] = predicted_variables(plan, periods)
+    return features
+
+
+def _regressors(features: dict[str, int]) -> list[float]:
+    return [
+        1.0,
+        math.log1p(features["land_crop_periods"]),
+        math.log1p(features["event_periods"]),
+        math.log1p(features["assignment_terms"]),
+        float(features["lag_depth"]),
+        math.log1p(features["stages"]),
+    ]
+
+
+@dataclass(frozen=True)
+class CostModel:
+    """log(total build+solve ms) as a linear function of the regressors."""
+
+    coef: tuple[float, ...]
+    sigma: float
+    samples: int = 0
+    version: int = COST_MODEL_VERSION
+
+    def predict(self, features: dict[str, int]) -> tuple[float, float]:
+        """(median ms, 90th percentile ms)"""
+        mu = sum(c * x for c, x in zip(self.coef, _regressors(features), strict=True))
+        return math.exp(mu), math.exp(mu + _Z_P90 * self.sigma)
+
+    def to_json(self) -> dict[str, Any]:
+        return {**asdict(self), "features": list(FEATURE_NAMES)}
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> CostModel:
+        if data.get("version") != COST_MODEL_VERSION:
+            raise ValueError(f"unsupported cost model version: {data.get('version')}")
+        coef = tuple(float(c) for c in data["coef"])
+        if len(coef) != len(FEATURE_NAMES):
+            raise ValueError("cost model has the wrong number of coefficients")
+        return cls(
+            coef=coef,
+            sigma=float(data["sigma"]),
+            samples=int(data.get("samples", 0)),
+        )
+
+
+# Placeholder, not a fit: hand-set so the estimate grows with every feature.
+# Fitted on 33 synthetic plans, the same regressors gave negative weights to
+# events and lag depth and sigma 1.7 (p90 ~9x the median): solve time there
+# was driven by how hard the plan was, not its size. ``samples=0`` marks it;
+# SYNC_COST_ROUTING only acts on a model calibrated from job logs
+# (COST_MODEL_PATH, see calibrate_cost.py).
+DEFAULT_MODEL = CostModel(
+    coef=(-2.0, 0.5, 0.5, 0.25, 0.25, 1.0),
+    sigma=1.5,
+)
+
+
+def total_ms(stats: dict[str, Any] | None) -> float | None:
+    """Build + solve time over all stages of a logged result."""
+    rows = (stats or {}).get("stages") or []
+    total = 0.0
+    for row in rows:
+        total += float(row.get("build_ms") or 0.0) + float(row.get("solve_ms") or 0.0)
+    return total if rows else None
+
+
+def _solve_linear(a: list[list[float]], b: list[float]) -> list[float]:
+    # Gaussian elimination with partial pivoting; ``a`` is small and square
+    n = len(b)
+    m = [row[:] + [b[i]] for i, row in enumerate(a)]
+    for col in range(n):
+        pivot = max(range(col, n), key=lambda r: abs(m[r][col]))
+        m[col], m[pivot] = m[pivot], m[col]
+        if abs(m[col][col]) < 1e-12:
+            raise ValueError("singular calibration system")
+        for r in range(n):
+            if r != col:
+                f = m[r][col] / m[col][col]
+                for k in range(col, n + 1):
+                    m[r][k] -= f * m[col][k]
+    return [m[i][n] / m[i][i] for i in range(n)]
+
+
+def fit(samples: list[tuple[dict[str, int], float]]) -> CostModel:
+    """Ridge least squares of log(ms) on the regressors."""
+    if len(samples) < len(FEATURE_NAMES):
+        raise ValueError(
+            f"need at least {len(FEATURE_NAMES)} samples, got {len(samples)}"
+        )
+    xs = [_regressors(f) for f, _ in samples]
+    ys = [math.log(max(1.0, ms)) for _, ms in samples]
+    k = len(FEATURE_NAMES)
+    xtx = [[sum(x[i] * x[j] for x in xs) for j in range(k)] for i in range(k)]
+    for i in range(1, k):
+        xtx[i][i] += _RIDGE * len(xs)
+    xty = [sum(x[i] * y for x, y in zip(xs, ys, strict=True)) for i in range(k)]
+    coef = _solve_linear(xtx, xty)
+    residuals = [
+        y - sum(c * v for c, v in zip(coef, x, strict=True))
+        for x, y in zip(xs, ys, strict=True)
+    ]
+    dof = max(1, len(xs) - k)
+    sigma = math.sqrt(sum(r * r for r in residuals) / dof)
+    return CostModel(coef=tuple(coef), sigma=sigma, samples=len(xs))
+
+
+def estimate(
+    plan: ApiPlan, timeout_ms: int | None, admission_slots: int = 1
+) -> OptimizationEstimate:
+    """Predict the solve cost of ``plan`` and whether it fits a sync call."""
+    model = get_model()
+    features = plan_features(plan)
+    median, p90 = model.predict(features)
+    over = bool(timeout_ms) and p90 > float(timeout_ms or 0)
+    return OptimizationEstimate(
+        features=features,
+        predicted_ms=round(median, 1),
+        predicted_p90_ms=round(p90, 1),
+        timeout_ms=timeout_ms,
+        recommended="async" if over else "sync",
+        admission_slots=admission_slots,
+        model_samples=model.samples,
+    )
+
+
+_model: CostModel | None = None
+_model_lock = threading.Lock()
+
+
+def get_model() -> CostModel:
+    """Model from COST_MODEL_PATH, or the built-in placeholder."""
+    global _model
+    with _model_lock:
+        if _model is None:
+            _model = DEFAULT_MODEL
+            path = config.cost_model_path()
+            if path:
+                try:
+                    data = json.loads(Path(path).read_text(encoding="utf-8"))
+                    _model = CostModel.from_json(data)
+                except Exception:
+                    LOGGER.exception("Failed to load cost model from %s", path)
+        return _model
+
+
+def reset_model() -> None:
+    global _model
+    with _model_lock:
+        _model = None
@@ -3,12 +3,12 @@ from __future__ import annotations
 import csv
 import io
 import zipfile
-from datetime import date
+from datetime import date, timedelta
 
 from fastapi import HTTPException
 
 from schemas.export import ExportSummary
-from schemas.optimization import OptimizationResult
+from schemas.optimization import OptimizationResult, OptimizationTimeline
 
 
 def _third_name(day_of_month: int) -> str:
@@ -38,6 +38,20 @@ def _label_for_third(start_date: date, index: int) -> str:
     return f"{cur.month}月{_third_name(cur.day)}"
 
 
+def _period_label(
+    timeline: OptimizationTimeline | None, start_date: date | None, index: int
+) -> str:
+    granularity = timeline.granularity if timeline is not None else "third"
+    if start_date is not None and granularity == "third":
+        return _label_for_third(start_date, index)
+    if start_date is not None and granularity == "day":
+        return (start_date + timedelta(days=index)).isoformat()
+    periods = timeline.periods if timeline is not None else []
+    if index < len(periods):
+        return periods[index].key
+    return f"期間#{index}"
+
+
 def render_zip_csv(summary: ExportSummary, *, result: OptimizationResult) -> bytes:
     """ExportSummary を複数のCSVに分けZIPで返す。
 
@@ -146,10 +160,8 @@ def render_zip_csv(summary: ExportSummary, *, result: OptimizationResult) -> byt
                     elif isinstance(start_date_iso, date):
                         start_date_obj = start_date_iso
                     for row in summary.worker_period_rows:
-                        label = (
-                            _label_for_third(start_date_obj, row.period_index)
-                            if start_date_obj is not None
-                            else f"期間#{row.period_index}"
+                        label = _period_label(
+                            result.timeline, start_date_obj, row.period_index
                         )
                         writer.writerow(
                             [
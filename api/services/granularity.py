@@ -0,0 +1,67 @@
+from __future__ import annotations
+
+from core import config
+from lib.buckets import (
+    CALENDAR_KINDS,
+    NOMINAL_DAYS,
+    Bucketing,
+    aligned_bucketing,
+    calendar_bucketing,
+)
+from schemas import ApiPlan
+
+
+def predicted_variables(plan: ApiPlan, periods: int) -> int:
+    """Rough upper bound of CP-SAT variables at ``periods`` time units
+    (area/occupancy, event flags, worker hours/assignments, resource usage)."""
+    lands_crops = len(plan.lands) * len(plan.crops)
+    events = len(plan.events)
+    return periods * (
+        lands_crops * 2
+        + events * 2
+        + events * (len(plan.workers) * 2 + len(plan.resources))
+    )
+
+
+def window_cuts(plan: ApiPlan) -> set[int]:
+    """Days (0-based) on which some event window opens or has just closed."""
+    cuts: set[int] = set()
+    for e in plan.events:
+        if e.start_min_day is not None:
+            cuts.add(e.start_min_day)
+        if e.end_max_day is not None:
+            cuts.add(e.end_max_day + 1)
+    return cuts
+
+
+def choose_bucketing(plan: ApiPlan) -> Bucketing:
+    """Time units ``plan`` is solved at (``plan.stages.granularity``).
+
+    ``auto`` takes the finest calendar kind (day, week, third, month) whose
+    predicted model fits ``GRANULARITY_MAX_VARIABLES``; month is the last
+    resort. When that kind would blur event window endpoints, buckets aligned
+    to the endpoints are used instead if they still fit.
+    """
+    granularity = plan.stages.granularity if plan.stages is not None else "third"
+    start, num_days = plan.horizon.start_date, int(plan.horizon.num_days)
+    if granularity == "aligned":
+        return aligned_bucketing(
+            start, num_days, window_cuts(plan), NOMINAL_DAYS["third"]
+        )
+    if granularity != "auto":
+        return calendar_bucketing(granularity, start, num_days)
+
+    budget = config.granularity_max_variables()
+    for kind in CALENDAR_KINDS:
+        chosen = calendar_bucketing(kind, start, num_days)
+        if predicted_variables(plan, len(chosen)) <= budget:
+            break
+    if chosen.kind == "day":
+        return chosen
+    cuts = window_cuts(plan)
+    if cuts <= set(chosen.starts) | {num_days}:
+        return chosen
+    aligned = aligned_bucketing(start, num_days, cuts, NOMINAL_DAYS[chosen.kind])
+    if predicted_variables(plan, len(aligned)) <= budget:
+        return aligned
+    return chosen
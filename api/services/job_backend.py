@@ -2,16 +2,25 @@ from __future__ import annotations
 
 import threading
 import uuid
-from concurrent.futures import Future, ThreadPoolExecutor
-from datetime import UTC, datetime
+from collections.abc import Callable
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FuturesTimeout
+from datetime import UTC, datetime, timedelta
 from typing import Protocol, runtime_checkable
 
 from pydantic import BaseModel
 
 from schemas import JobInfo, OptimizationRequest, OptimizationResult
 
+from .job_scheduler import PriorityScheduler
+from .result_cache import canonical_hash
+from .single_flight import FlightAbandoned
+
 _OA = None  # lazy import placeholder
 
+# How often a job waiting on a shared solve checks its own cancel flag
+_CANCEL_POLL_S = 0.2
+
 
 class JobCanceled(Exception):
     """Raised to cooperatively cancel a running optimization job."""
@@ -19,6 +28,20 @@ class JobCanceled(Exception):
     pass
 
 
+class IdempotencyConflict(Exception):
+    """The idempotency key was already used for a different request."""
+
+
+# Jobs in these states are not reused for a repeated idempotency key
+NON_REUSABLE_STATUSES = {"failed", "canceled"}
+
+
+def request_fingerprint(req: OptimizationRequest) -> str:
+    """Stable hash of a request body, ignoring the idempotency key itself
+    (same encoding as the result cache key)."""
+    return canonical_hash(req.model_dump(mode="python", exclude={"idempotency_key"}))
+
+
 @runtime_checkable
 class JobBackend(Protocol):
     def enqueue(self, req: OptimizationRequest) -> JobInfo: ...
@@ -45,6 +68,7 @@ class InMemoryJobBackend:
             "completed_at",
             "future",
             "cancel_flag",
+            "fingerprint",
         )
 
         def __init__(self, req: OptimizationRequest) -> None:
@@ -56,12 +80,27 @@ class InMemoryJobBackend:
             self.completed_at: datetime | None = None
             self.future: Future | None = None
             self.cancel_flag = False
-
-    def __init__(self, max_workers: int = 2) -> None:
+            self.fingerprint = ""
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        idempotency_window_s: int = 0,
+        *,
+        priority_aging_s: float = 60.0,
+        priority_limits: dict[int, int] | None = None,
+    ) -> None:
         self._lock = threading.Lock()
         self._jobs: dict[str, InMemoryJobBackend._State] = {}
-        self._executor = ThreadPoolExecutor(
-            max_workers=max_workers, thread_name_prefix="job-runner"
+        # idempotency key -> job id
+        self._idem: dict[str, str] = {}
+        self._idem_window = timedelta(seconds=max(0, idempotency_window_s))
+        # Smaller OptimizationRequest.priority runs first (with aging)
+        self._executor = PriorityScheduler(
+            max_workers,
+            aging_s=priority_aging_s,
+            limits=priority_limits,
+            thread_name_prefix="job-runner",
         )
 
     def _to_model(self, job_id: str, st: _State) -> JobInfo:
@@ -74,18 +113,56 @@ class InMemoryJobBackend:
             completed_at=st.completed_at,
         )
 
+    def _find_idempotent(self, key: str, fingerprint: str) -> str | None:
+        # Caller holds self._lock
+        job_id = self._idem.get(key)
+        st = self._jobs.get(job_id) if job_id is not None else None
+        if st is None or st.status in NON_REUSABLE_STATUSES:
+            return None
+        if datetime.now(UTC) - st.submitted_at > self._idem_window:
+            return None
+        if st.fingerprint != fingerprint:
+            raise IdempotencyConflict(key)
+        return job_id
+
+    def _is_canceled(self, st: _State) -> bool:
+        with self._lock:
+            return st.cancel_flag
+
+    def _execute(
+        self, st: _State, progress_cb: Callable[[float, str], None]
+    ) -> OptimizationResult:
+        """Solve ``st.req``; raise JobCanceled once the job is canceled."""
+        global _OA  # lazy load to avoid heavy deps at import time
+        if _OA is None:
+            from . import optimizer_adapter as _oa  # type: ignore
+
+            _OA = _oa
+        # Identical running jobs share one solve; progress is fanned out
+        ticket = _OA.join_solve(st.req, progress_cb=progress_cb)
+        while True:
+            try:
+                return ticket.wait(timeout=_CANCEL_POLL_S)
+            except FuturesTimeout:
+                if self._is_canceled(st):
+                    ticket.leave()
+                    raise JobCanceled() from None
+
     def enqueue(self, req: OptimizationRequest) -> JobInfo:
         job_id = str(uuid.uuid4())
         st = InMemoryJobBackend._State(req)
+        idem_key = req.idempotency_key if self._idem_window else None
+        if idem_key:
+            st.fingerprint = request_fingerprint(req)
         with self._lock:
+            if idem_key:
+                existing = self._find_idempotent(idem_key, st.fingerprint)
+                if existing is not None:
+                    return self._to_model(existing, self._jobs[existing])
+                self._idem[idem_key] = job_id
             self._jobs[job_id] = st
 
         def _run() -> None:
-            global _OA  # lazy load to avoid heavy deps at import time
-            if _OA is None:
-                from . import optimizer_adapter as _oa  # type: ignore
-
-                _OA = _oa
             with self._lock:
                 if st.cancel_flag:
                     st.status = "canceled"
@@ -108,15 +185,13 @@ class InMemoryJobBackend:
                             raise JobCanceled()
                         st.progress = max(0.0, min(1.0, float(pct)))
 
-                # Resolve at call time so test monkeypatching works
-                # Call adapter with progress callback
-                res = _OA.solve_sync(st.req, progress_cb=_progress_cb)
+                res = self._execute(st, _progress_cb)
                 with self._lock:
                     st.result = res
                     st.status = "succeeded" if res.status == "ok" else res.status  # type: ignore[assignment]
                     st.progress = 1.0
                     st.completed_at = datetime.now(UTC)
-            except JobCanceled:
+            except (JobCanceled, FlightAbandoned):
                 with self._lock:
                     st.status = "canceled"  # type: ignore[assignment]
                     st.progress = 1.0
@@ -127,7 +202,7 @@ class InMemoryJobBackend:
                     st.progress = 1.0
                     st.completed_at = datetime.now(UTC)
 
-        fut = self._executor.submit(_run)
+        fut = self._executor.submit(_run, priority=req.priority)
         with self._lock:
             st.future = fut
         return self._to_model(job_id, st)
@@ -8,13 +8,20 @@ from decimal import Decimal
 from typing import Any
 
 import boto3
-from boto3.dynamodb.conditions import Attr
+from boto3.dynamodb.conditions import Attr, Key
 from botocore.exceptions import ClientError
 
 from core import config
 from schemas import JobInfo, OptimizationRequest, OptimizationResult
 
-from .job_backend import JobBackend, JobSnapshot
+from .job_backend import (
+    NON_REUSABLE_STATUSES,
+    IdempotencyConflict,
+    JobBackend,
+    JobSnapshot,
+    request_fingerprint,
+)
+from .job_scheduler import DEFAULT_PRIORITY
 
 LOGGER = logging.getLogger(__name__)
 
@@ -55,6 +62,10 @@ class DynamoJobBackend(JobBackend):
         bucket_name: str,
         queue_url: str,
         jobs_ttl_days: int,
+        idem_index_name: str | None = None,
+        idempotency_window_s: int = 0,
+        priority_queue_url: str | None = None,
+        priority_threshold: int = 2,
         dynamodb_resource: Any | None = None,
         s3_client: Any | None = None,
         sqs_client: Any | None = None,
@@ -75,12 +86,27 @@ class DynamoJobBackend(JobBackend):
         self._bucket = bucket_name
         self._queue_url = queue_url
         self._ttl_days = max(1, jobs_ttl_days)
+        # Idempotent enqueue needs the GSI (idem_key, submitted_at)
+        self._idem_index = idem_index_name
+        self._idem_window = timedelta(seconds=max(0, idempotency_window_s))
+        # Jobs with priority <= threshold go to a separate queue whose workers
+        # are not occupied by batch replans
+        self._priority_queue_url = priority_queue_url
+        self._priority_threshold = priority_threshold
 
     # ------------------ JobBackend API ------------------ #
 
     def enqueue(self, req: OptimizationRequest) -> JobInfo:
+        fingerprint = None
+        if req.idempotency_key and self._idem_index and self._idem_window:
+            fingerprint = request_fingerprint(req)
+            existing = self._find_idempotent(req.idempotency_key, fingerprint)
+            if existing is not None:
+                return self._item_to_job_info(existing, include_result=True)
+
         job_id = str(uuid.uuid4())
         submitted_at = datetime.now(UTC)
+        priority = DEFAULT_PRIORITY if req.priority is None else req.priority
         expires_at = int((submitted_at + timedelta(days=self._ttl_days)).timestamp())
 
         request_key = f"requests/{job_id}.json"
@@ -95,9 +121,12 @@ class DynamoJobBackend(JobBackend):
             "cancel_flag": False,
             "expires_at": expires_at,
             "request_ref": {"s3": request_key},
+            "priority": priority,
         }
         if req.idempotency_key:
             item["idem_key"] = req.idempotency_key
+        if fingerprint:
+            item["request_fp"] = fingerprint
 
         try:
             self._table.put_item(
@@ -109,8 +138,11 @@ class DynamoJobBackend(JobBackend):
             raise RuntimeError("failed to enqueue job") from exc
 
         self._sqs.send_message(
-            QueueUrl=self._queue_url,
+            QueueUrl=self._queue_for(priority),
             MessageBody=json.dumps({"job_id": job_id}),
+            MessageAttributes={
+                "priority": {"DataType": "Number", "StringValue": str(priority)}
+            },
         )
 
         return JobInfo(
@@ -172,6 +204,36 @@ class DynamoJobBackend(JobBackend):
 
     # ------------------ Helpers ------------------ #
 
+    def _queue_for(self, priority: int) -> str:
+        if self._priority_queue_url and priority <= self._priority_threshold:
+            return self._priority_queue_url
+        return self._queue_url
+
+    def _find_idempotent(self, key: str, fingerprint: str) -> dict[str, Any] | None:
+        """Latest reusable job for ``key`` submitted within the window.
+
+        The index is eventually consistent, so two enqueues racing within
+        milliseconds may still both create a job.
+        """
+        cutoff = (datetime.now(UTC) - self._idem_window).isoformat()
+        try:
+            resp = self._table.query(
+                IndexName=self._idem_index,
+                KeyConditionExpression=Key("idem_key").eq(key)
+                & Key("submitted_at").gte(cutoff),
+                ScanIndexForward=False,
+            )
+        except ClientError:
+            LOGGER.exception("Idempotency lookup failed for key %s", key)
+            return None
+        for item in resp.get("Items", []):
+            if item.get("status") in NON_REUSABLE_STATUSES:
+                continue
+            if item.get("request_fp") != fingerprint:
+                raise IdempotencyConflict(key)
+            return item
+        return None
+
     def _get_item(self, job_id: str) -> dict[str, Any]:
         resp = self._table.get_item(Key={"job_id": job_id})
         item = resp.get("Item")
@@ -243,4 +305,8 @@ def create_backend_from_env() -> DynamoJobBackend:
         bucket_name=config.job_payload_bucket() or "",
         queue_url=config.job_queue_url() or "",
         jobs_ttl_days=config.jobs_ttl_days(),
+        idem_index_name=config.jobs_idem_index_name(),
+        idempotency_window_s=config.idempotency_window_s(),
+        priority_queue_url=config.job_priority_queue_url(),
+        priority_threshold=config.job_priority_threshold(),
     )
@@ -0,0 +1,262 @@
+from __future__ import annotations
+
+import logging
+import multiprocessing as mp
+import os
+import queue
+import threading
+import time
+from collections.abc import Callable
+from multiprocessing.connection import Connection
+from typing import Any
+
+from lib.cpu_budget import drop_held, get_budget
+from schemas import OptimizationRequest, OptimizationResult
+
+from .job_backend import InMemoryJobBackend, JobCanceled
+
+LOGGER = logging.getLogger(__name__)
+
+# How often the dispatcher checks the job's cancel flag while waiting
+_POLL_S = 0.2
+# Cancel is cooperative (checked at progress reports); a worker that does not
+# stop within this window is killed and replaced
+_CANCEL_GRACE_S = 5.0
+
+
+def _set_memory_limit(memory_mb: int) -> None:
+    if memory_mb <= 0:
+        return
+    try:
+        import resource
+    except ImportError:  # pragma: no cover - not available on Windows
+        return
+    limit = memory_mb * 1024 * 1024
+    resource.setrlimit(resource.RLIMIT_AS, (limit, limit))
+
+
+def _worker_main(
+    conn: Connection,
+    memory_mb: int,
+    cpu_shared: Any = None,
+    cpu_held: Any = None,
+) -> None:
+    """Worker process loop: receive serialized requests, solve, reply.
+
+    Messages from the parent: ``("solve", request_json)``, ``("cancel",)`` and
+    ``("stop",)``. Replies: ``("progress", pct, phase)`` and
+    ``("done", result_json)`` / ``("canceled",)`` / ``("error", message)``.
+    """
+    _set_memory_limit(memory_mb)
+    if cpu_shared is not None:
+        # Size CP-SAT workers against solves in every process of the pool;
+        # ``cpu_held`` lets the parent return this process's leases if it
+        # has to kill it mid-solve
+        get_budget().share(cpu_shared, cpu_held)
+    # Preload OR-Tools and the model builder so the first job starts warm
+    from . import optimizer_adapter
+
+    while True:
+        try:
+            msg = conn.recv()
+        except (EOFError, OSError):
+            return
+        if msg[0] == "stop":
+            return
+        if msg[0] != "solve":
+            continue  # e.g. a late cancel for a job that already finished
+
+        def _progress_cb(pct: float, phase: str) -> None:
+            while conn.poll():
+                if conn.recv()[0] == "cancel":
+                    raise JobCanceled()
+            conn.send(("progress", float(pct), phase))
+
+        try:
+            req = OptimizationRequest.model_validate_json(msg[1])
+            res = optimizer_adapter.solve_sync(req, progress_cb=_progress_cb)
+            reply: tuple = ("done", res.model_dump_json())
+        except JobCanceled:
+            reply = ("canceled",)
+        except MemoryError:
+            reply = ("error", "memory limit exceeded")
+        except Exception as exc:
+            LOGGER.exception("Job failed in worker process")
+            reply = ("error", repr(exc))
+        try:
+            conn.send(reply)
+        except (BrokenPipeError, OSError):
+            return
+
+
+class _Worker:
+    """One warm worker process and the parent's end of its pipe."""
+
+    def __init__(self, ctx: Any, memory_mb: int, cpu_shared: Any, name: str) -> None:
+        self.conn, child_conn = ctx.Pipe()
+        # [solves, CP-SAT workers] this process holds in ``cpu_shared``
+        self.cpu_held = ctx.Array("i", 2, lock=False)
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(child_conn, memory_mb, cpu_shared, self.cpu_held),
+            name=name,
+            daemon=True,
+        )
+        self.process.start()
+        child_conn.close()
+
+    def stop(self, timeout: float = 1.0) -> None:
+        try:
+            self.conn.send(("stop",))
+        except (BrokenPipeError, OSError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+
+
+class ProcessJobBackend(InMemoryJobBackend):
+    """In-memory job registry whose solves run in a pool of worker processes.
+
+    Each process imports OR-Tools once and then serves jobs one at a time, so
+    concurrent jobs use separate cores without sharing the GIL, and a job that
+    exceeds ``memory_mb`` (RLIMIT_AS) fails alone instead of taking the API
+    down. Requests and results cross the pipe as JSON; progress and cancel
+    travel over the same pipe. Scheduling (priority, aging, limits) and
+    idempotency are inherited from InMemoryJobBackend.
+    """
+
+    def __init__(
+        self,
+        processes: int = 0,
+        memory_mb: int = 0,
+        idempotency_window_s: int = 0,
+        *,
+        priority_aging_s: float = 60.0,
+        priority_limits: dict[int, int] | None = None,
+        start_method: str = "spawn",
+    ) -> None:
+        n = processes if processes > 0 else (os.cpu_count() or 1)
+        self._ctx = mp.get_context(start_method)
+        self._memory_mb = memory_mb
+        # Solves in flight / CP-SAT workers leased, shared with the workers and
+        # the API process (sync requests) so the CPU budget is host-wide
+        self._cpu_shared = self._ctx.Array("i", 2)
+        get_budget().share(self._cpu_shared)
+        self._idle: queue.SimpleQueue[_Worker] = queue.SimpleQueue()
+        self._workers: list[_Worker] = []
+        self._workers_lock = threading.Lock()
+        self._spawned = 0
+        self._closed = False
+        for _ in range(n):
+            self._idle.put(self._spawn())
+        # One scheduler thread per process: a dispatched job always finds an
+        # idle worker
+        super().__init__(
+            max_workers=n,
+            idempotency_window_s=idempotency_window_s,
+            priority_aging_s=priority_aging_s,
+            priority_limits=priority_limits,
+        )
+
+    @property
+    def processes(self) -> int:
+        with self._workers_lock:
+            return len(self._workers)
+
+    def _spawn(self) -> _Worker:
+        with self._workers_lock:
+            self._spawned += 1
+            worker = _Worker(
+                self._ctx,
+                self._memory_mb,
+                self._cpu_shared,
+                f"job-proc-{self._spawned}",
+            )
+            self._workers.append(worker)
+        return worker
+
+    def _replace(self, worker: _Worker) -> _Worker:
+        with self._workers_lock:
+            if worker in self._workers:
+                self._workers.remove(worker)
+            closed = self._closed
+        worker.process.kill()
+        worker.process.join()
+        worker.conn.close()
+        # A killed worker never reaches the end of its CPU leases
+        drop_held(self._cpu_shared, worker.cpu_held)
+        return worker if closed else self._spawn()
+
+    def _execute(
+        self,
+        st: InMemoryJobBackend._State,
+        progress_cb: Callable[[float, str], None],
+    ) -> OptimizationResult:
+        worker = self._idle.get()
+        try:
+            worker.conn.send(("solve", st.req.model_dump_json()))
+            return self._await(worker, st, progress_cb)
+        except (_CanceledInWorker, _FailedInWorker):
+            raise
+        except BaseException:
+            # The worker may still be busy with (or dead from) this job
+            worker = self._replace(worker)
+            raise
+        finally:
+            self._idle.put(worker)
+
+    def _await(
+        self,
+        worker: _Worker,
+        st: InMemoryJobBackend._State,
+        progress_cb: Callable[[float, str], None],
+    ) -> OptimizationResult:
+        cancel_sent_at: float | None = None
+        while True:
+            if cancel_sent_at is None and self._is_canceled(st):
+                worker.conn.send(("cancel",))
+                cancel_sent_at = time.monotonic()
+            if (
+                cancel_sent_at is not None
+                and time.monotonic() - cancel_sent_at > _CANCEL_GRACE_S
+            ):
+                raise JobCanceled()
+            if not worker.conn.poll(_POLL_S):
+                if not worker.process.is_alive():
+                    raise RuntimeError(
+                        f"worker process exited with code {worker.process.exitcode}"
+                    )
+                continue
+            msg = worker.conn.recv()
+            kind = msg[0]
+            if kind == "progress":
+                try:
+                    progress_cb(msg[1], msg[2])
+                except JobCanceled:
+                    continue  # picked up by the cancel check above
+            elif kind == "done":
+                return OptimizationResult.model_validate_json(msg[1])
+            elif kind == "canceled":
+                raise _CanceledInWorker()
+            elif kind == "error":
+                raise _FailedInWorker(msg[1])
+
+    def shutdown(self, wait: bool = False) -> None:
+        super().shutdown(wait=wait)
+        with self._workers_lock:
+            self._closed = True
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.stop()
+
+
+class _CanceledInWorker(JobCanceled):
+    """The worker stopped cooperatively and can take the next job."""
+
+
+class _FailedInWorker(RuntimeError):
+    """The job failed but the worker replied and can take the next job."""
@@ -5,6 +5,8 @@ from schemas import JobInfo, OptimizationRequest
 
 from .job_backend import InMemoryJobBackend, JobBackend, JobSnapshot
 from .job_backend_dynamo import DynamoJobBackend
+from .job_backend_process import ProcessJobBackend
+from .job_scheduler import parse_priority_limits
 
 _BACKEND: JobBackend | None = None
 
@@ -15,10 +17,26 @@ def _require(name: str, value: str | None) -> str:
     raise RuntimeError(f"{name} must be configured when using Dynamo job backend")
 
 
+def _inmemory(settings: Settings) -> InMemoryJobBackend:
+    return InMemoryJobBackend(
+        idempotency_window_s=settings.idempotency_window_s,
+        priority_aging_s=float(settings.job_priority_aging_s),
+        priority_limits=parse_priority_limits(settings.job_priority_limits),
+    )
+
+
 def create_backend(settings: Settings) -> JobBackend:
     backend = settings.job_backend
     if backend == "inmemory":
-        return InMemoryJobBackend()
+        return _inmemory(settings)
+    if backend == "process":
+        return ProcessJobBackend(
+            processes=settings.job_process_workers,
+            memory_mb=settings.job_process_memory_mb,
+            idempotency_window_s=settings.idempotency_window_s,
+            priority_aging_s=float(settings.job_priority_aging_s),
+            priority_limits=parse_priority_limits(settings.job_priority_limits),
+        )
     if backend == "dynamo":
         table_name = _require("JOBS_TABLE_NAME", settings.jobs_table_name)
         bucket_name = _require("JOB_PAYLOAD_BUCKET", settings.job_payload_bucket)
@@ -28,8 +46,12 @@ def create_backend(settings: Settings) -> JobBackend:
             bucket_name=bucket_name,
             queue_url=queue_url,
             jobs_ttl_days=settings.jobs_ttl_days,
+            idem_index_name=settings.jobs_idem_index_name,
+            idempotency_window_s=settings.idempotency_window_s,
+            priority_queue_url=settings.job_priority_queue_url,
+            priority_threshold=settings.job_priority_threshold,
         )
-    return InMemoryJobBackend()
+    return _inmemory(settings)
 
 
 def configure(backend: JobBackend) -> None:
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import itertools
+import threading
+import time
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any
+
+# OptimizationRequest.priority: smaller runs first; unset requests use this
+DEFAULT_PRIORITY = 5
+
+
+def parse_priority_limits(raw: str) -> dict[int, int]:
+    """Parse ``"10:1,20:1"`` (priority:max concurrent jobs); bad parts are skipped."""
+    limits: dict[int, int] = {}
+    for part in raw.split(","):
+        if ":" not in part:
+            continue
+        prio, limit = part.split(":", 1)
+        try:
+            limits[int(prio.strip())] = max(1, int(limit.strip()))
+        except ValueError:
+            continue
+    return limits
+
+
+class _Task:
+    __slots__ = ("seq", "priority", "enqueued_at", "fn", "future")
+
+    def __init__(
+        self, seq: int, priority: int, fn: Callable[[], Any], future: Future
+    ) -> None:
+        self.seq = seq
+        self.priority = priority
+        self.enqueued_at = time.monotonic()
+        self.fn = fn
+        self.future = future
+
+
+class PriorityScheduler:
+    """Fixed worker pool that runs the most urgent runnable task first.
+
+    - Smaller priority values run first; ties run in submission order.
+    - Aging: every ``aging_s`` seconds of waiting lowers a task's effective
+      priority by one, so batch work cannot starve.
+    - ``limits`` caps how many tasks of one priority level run at once, which
+      keeps slots free for interactive work.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        *,
+        aging_s: float = 60.0,
+        limits: dict[int, int] | None = None,
+        thread_name_prefix: str = "job-runner",
+    ) -> None:
+        self._cond = threading.Condition()
+        self._pending: list[_Task] = []
+        self._running: dict[int, int] = {}
+        self._limits = dict(limits or {})
+        self._aging_s = aging_s
+        self._seq = itertools.count()
+        self._shutdown = False
+        self._threads = [
+            threading.Thread(
+                target=self._worker, name=f"{thread_name_prefix}_{i}", daemon=True
+            )
+            for i in range(max(1, max_workers))
+        ]
+        for t in self._threads:
+            t.start()
+
+    def submit(self, fn: Callable[[], Any], *, priority: int | None = None) -> Future:
+        fut: Future = Future()
+        prio = DEFAULT_PRIORITY if priority is None else int(priority)
+        with self._cond:
+            if self._shutdown:
+                raise RuntimeError("cannot schedule new tasks after shutdown")
+            self._pending.append(_Task(next(self._seq), prio, fn, fut))
+            self._cond.notify()
+        return fut
+
+    def pending_count(self) -> int:
+        with self._cond:
+            return len(self._pending)
+
+    def _effective(self, task: _Task, now: float) -> float:
+        if self._aging_s <= 0:
+            return task.priority
+        return task.priority - (now - task.enqueued_at) / self._aging_s
+
+    def _pick(self) -> _Task | None:
+        # Caller holds self._cond
+        now = time.monotonic()
+        best: _Task | None = None
+        best_key: tuple[float, int] | None = None
+        for task in self._pending:
+            limit = self._limits.get(task.priority)
+            if limit is not None and self._running.get(task.priority, 0) >= limit:
+                continue
+            key = (self._effective(task, now), task.seq)
+            if best_key is None or key < best_key:
+                best, best_key = task, key
+        if best is not None:
+            self._pending.remove(best)
+        return best
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                task = self._pick()
+                while task is None:
+                    if self._shutdown and not self._pending:
+                        return
+                    self._cond.wait()
+                    task = self._pick()
+                self._running[task.priority] = self._running.get(task.priority, 0) + 1
+            try:
+                if task.future.set_running_or_notify_cancel():
+                    try:
+                        task.future.set_result(task.fn())
+                    except BaseException as exc:  # noqa: BLE001 - kept on the future
+                        task.future.set_exception(exc)
+            finally:
+                with self._cond:
+                    self._running[task.priority] -= 1
+                    # A limited priority level may have become runnable
+                    self._cond.notify_all()
+
+    def shutdown(self, wait: bool = False, cancel_futures: bool = False) -> None:
+        with self._cond:
+            self._shutdown = True
+            if cancel_futures:
+                for task in self._pending:
+                    task.future.cancel()
+                self._pending.clear()
+            self._cond.notify_all()
+        if wait:
+            for t in self._threads:
+                t.join()
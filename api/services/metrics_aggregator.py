@@ -1,10 +1,10 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from datetime import date, timedelta
+from datetime import date
 
-from lib.thirds import period_key as third_period_key
-from schemas import ApiPlan
+from lib.buckets import calendar_bucketing
+from schemas import ApiPlan, OptimizationTimeline
 from schemas.metrics import (
     EventMetric,
     LandMetric,
@@ -17,29 +17,24 @@ from schemas.metrics import (
 from . import job_runner
 
 
-def _third_sequence_with_counts(
-    base_date: date, horizon_days: int
+def _period_sequence(
+    timeline: OptimizationTimeline, base_date: date, horizon_days: int
 ) -> list[tuple[str, int]]:
-    """Return ordered (period_key, day_count) sequence covering the horizon days.
+    """Return ordered (period_key, day_count) per timeline index.
 
-    Example: starting 2025-01-08 for 25 days ->
+    Uses the periods recorded with the timeline; day timelines and results
+    stored before periods were recorded (always thirds) are rebuilt from the
+    calendar. Example for thirds starting 2025-01-08 for 25 days ->
     [ ("2025-01:上旬", 3), ("2025-01:中旬", 10), ("2025-01:下旬", 10),
       ("2025-02:上旬", 2) ]
     """
-    seq: list[tuple[str, int]] = []
-    cur_key: str | None = None
-    cur_count = 0
-    for d in range(horizon_days):
-        k = third_period_key(base_date + timedelta(days=d))
-        if k != cur_key:
-            if cur_key is not None:
-                seq.append((cur_key, cur_count))
-            cur_key, cur_count = k, 1
-        else:
-            cur_count += 1
-    if cur_key is not None:
-        seq.append((cur_key, cur_count))
-    return seq
+    if timeline.periods:
+        return [(p.key, p.end_day - p.start_day + 1) for p in timeline.periods]
+    kind = "day" if timeline.granularity == "day" else "third"
+    buckets = calendar_bucketing(kind, base_date, horizon_days)
+    return list(
+        zip(map(buckets.key, range(len(buckets))), buckets.lengths(), strict=True)
+    )
 
 
 def aggregate(
@@ -47,7 +42,7 @@ def aggregate(
     *,
     base_date_iso: str | None = None,
 ) -> TimelineResponse:
-    """Aggregate worker/land utilization per day or decade from a completed job.
+    """Aggregate worker/land utilization per timeline period of a completed job.
 
     - Uses job_backend snapshot (no re-optimization)
     - Reads capacities from plan; usage from timeline spans/events
@@ -84,7 +79,7 @@ def aggregate(
         return TimelineResponse(records=[])
 
     for span in timeline.land_spans:
-        # Timeline indices are per-third (0-based) after compression
+        # Timeline indices are per period (0-based) after compression
         s = max(0, span.start_index)
         e = max(s, span.end_index)
         for d in range(s, e + 1):
@@ -101,31 +96,30 @@ def aggregate(
             if wu.hours > 0:
                 labor_used_by_worker_t[wu.worker_id][d] += wu.hours
 
-    # Build records (third-native)
-    # Require base_date for precise thirds/labels and day-count per third
+    # Build records (period-native)
+    # Require base_date for precise labels and day-count per period
     if not base_date_iso:
-        raise ValueError("base_date_iso is required for bucket 'third'")
+        raise ValueError("base_date_iso is required for period labels")
     try:
         y, m, dd = [int(x) for x in base_date_iso.split("T")[0].split("-")]
         base_d = date(y, m, dd)
     except Exception:
         raise ValueError("base_date_iso must be ISO date 'YYYY-MM-DD'") from None
 
-    # Determine number of thirds actually present in the timeline by inspecting keys
-    third_indices_seen: set[int] = set()
+    # Determine number of periods actually present in the timeline by inspecting keys
+    indices_seen: set[int] = set()
     for by_d in labor_used_by_worker_t.values():
-        third_indices_seen.update(by_d.keys())
+        indices_seen.update(by_d.keys())
     for by_d in land_used_by_land_t.values():
-        third_indices_seen.update(by_d.keys())
+        indices_seen.update(by_d.keys())
     for ev in timeline.events or []:
-        third_indices_seen.add(int(ev.index))
-    T = (max(third_indices_seen) + 1) if third_indices_seen else 0
+        indices_seen.add(int(ev.index))
+    T = (max(indices_seen) + 1) if indices_seen else 0
 
-    thirds_seq = _third_sequence_with_counts(base_d, plan.horizon.num_days)
-    thirds_seq = thirds_seq[:T]
+    periods_seq = _period_sequence(timeline, base_d, plan.horizon.num_days)[:T]
 
     records: list[PeriodRecord] = []
-    for t, (key, day_count) in enumerate(thirds_seq):
+    for t, (key, day_count) in enumerate(periods_seq):
         # Workers
         worker_metrics: list[WorkerMetric] = []
         for wid, w in workers_by.items():
@@ -139,7 +133,7 @@ def aggregate(
         land_metrics: list[LandMetric] = []
         for lid, land in lands_by.items():
             used_area = float(land_used_by_land_t[lid][t])
-            # Convert to area-thirds by multiplying with actual days in this third
+            # Convert to area-days by multiplying with actual days in this period
             used = used_area * float(day_count)
             cap = float(land_cap_by[lid]) * float(day_count)
             land_metrics.append(
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import logging
+import uuid
+from collections.abc import Callable
+from datetime import UTC, datetime
+from pathlib import Path
+
+from core import config
+
+LOGGER = logging.getLogger(__name__)
+
+CaptureSink = Callable[[str, bytes], None]
+
+
+def new_capture_id() -> str:
+    return f"{datetime.now(UTC):%Y%m%dT%H%M%SZ}-{uuid.uuid4().hex[:8]}"
+
+
+def capture_sink(capture_id: str) -> CaptureSink | None:
+    """Writer for solver capture artifacts, per ``SOLVER_CAPTURE``.
+
+    - unset: capture disabled (None)
+    - ``s3``: ``s3://$JOB_PAYLOAD_BUCKET/captures/<capture_id>/<label>.zip``
+    - otherwise a local directory: ``<dir>/<capture_id>/<label>.zip``
+
+    Write errors are logged and never fail the solve.
+    """
+    target = config.solver_capture()
+    if not target:
+        return None
+
+    write: CaptureSink
+    if target.lower() == "s3":
+        bucket = config.job_payload_bucket()
+        if not bucket:
+            LOGGER.warning("SOLVER_CAPTURE=s3 requires JOB_PAYLOAD_BUCKET")
+            return None
+        import boto3  # lazy import
+
+        s3 = boto3.client("s3")
+
+        def write(label: str, data: bytes) -> None:
+            s3.put_object(
+                Bucket=bucket,
+                Key=f"captures/{capture_id}/{label}.zip",
+                Body=data,
+                ContentType="application/zip",
+            )
+
+    else:
+        base = Path(target) / capture_id
+
+        def write(label: str, data: bytes) -> None:
+            base.mkdir(parents=True, exist_ok=True)
+            (base / f"{label}.zip").write_bytes(data)
+
+    def _safe_write(label: str, data: bytes) -> None:
+        try:
+            write(label, data)
+        except Exception:
+            LOGGER.exception("Failed to write solver capture %s/%s", capture_id, label)
+
+    return _safe_write
@@ -1,88 +1,121 @@
 from __future__ import annotations
 
 import math
+import threading
+import time
+import uuid
+from collections import OrderedDict
 from collections.abc import Callable
-from concurrent.futures import ThreadPoolExecutor
 from concurrent.futures import TimeoutError as FuturesTimeout
-from datetime import timedelta
+from contextlib import nullcontext
+from dataclasses import dataclass
 
+from core import config
+from lib.buckets import Bucketing
+from lib.capture import prefixed
+from lib.cpu_budget import host_cpus
+from lib.frontier import frontier
+from lib.lns import LnsOptions
 from lib.planner import plan as run_plan
+from lib.portfolio import PortfolioOptions
+from lib.refine import restrict_to_solution
+from lib.replan import replan
+from lib.rolling import plan_rolling
+from lib.scenarios import Scenario, ScenarioRun, crop_areas, run_scenarios
 from lib.schemas import (
     Crop,
     CropAreaBound,
     Event,
+    EventAssignment,
     FixedArea,
     Horizon,
     Land,
+    PlanAssignment,
+    PlanDiagnostics,
     PlanRequest,
     PlanResponse,
     Resource,
+    ResourceUsageRef,
     Worker,
+    WorkerRef,
 )
-from lib.thirds import period_key as third_period_key
 from schemas.optimization import (
     ApiPlan,
+    FrontierPoint,
+    FrontierRequest,
+    FrontierResult,
     GanttEventItem,
     GanttLandSpan,
     OptimizationRequest,
     OptimizationResult,
     OptimizationTimeline,
     ResourceUsage,
+    ScenarioBatchRequest,
+    ScenarioBatchResult,
+    ScenarioOverride,
+    ScenarioRow,
+    TimelinePeriod,
     WorkerUsage,
 )
 
+from .granularity import choose_bucketing
+from .model_capture import capture_sink, new_capture_id
+from .result_cache import canonical_hash, get_cache, is_cacheable, request_key
+from .single_flight import Admit, SingleFlight, Ticket
 
-def _compress_api_plan_to_third(api: ApiPlan) -> PlanRequest:
-    """Compress an ApiPlan (day-indexed) into a third-indexed PlanRequest.
+# Identical concurrent solves (double clicks, retry storms) share one execution
+_flights: SingleFlight | None = None
+_flights_lock = threading.Lock()
 
-    Policy (coarse but fast):
-    - Horizon: each calendar third becomes one time unit (1-based index).
-    - Workers/Resources capacity_per_day: scaled by 10x (average days/third).
-      Blocked thirds: if all days of the third are blocked, mark that third blocked.
-    - Lands: area unchanged; blocked thirds only when fully blocked in original.
-    - Events: start/end windows mapped to third indices;
-      frequency/lag days -> ceil(/10).
-      labor_total_per_area unchanged; labor_daily_cap scaled by 10x.
+
+def get_flights() -> SingleFlight:
+    """Process-wide flights; at most SOLVE_MAX_CONCURRENT (0 = CPU count)
+    sync and in-memory job solves run at once."""
+    global _flights
+    with _flights_lock:
+        if _flights is None:
+            limit = config.solve_max_concurrent() or host_cpus()
+            _flights = SingleFlight(limit, thread_name_prefix="solve")
+        return _flights
+
+
+def _compress_api_plan(api: ApiPlan, bucketing: Bucketing) -> PlanRequest:
+    """Compress an ApiPlan (day-indexed) into a bucket-indexed PlanRequest.
+
+    Policy (coarse but fast), with n = ``bucketing.nominal_days``:
+    - Horizon: each bucket becomes one time unit (1-based index); its days
+      are ``period_days``, so per-day capacities (workers, resources,
+      labor_daily_cap) scale with each bucket's own length.
+    - Workers/Resources: blocked buckets only when all their days are blocked.
+    - Lands: area unchanged; blocked buckets only when fully blocked in original.
+    - Events: start/end windows mapped to bucket indices;
+      frequency/lag days -> ceil(/n).
     """
 
-    start = api.horizon.start_date
     num_days = int(api.horizon.num_days)
-    # Build day -> third index mapping in chronological order
-    third_keys: list[str] = []
-    third_index_by_key: dict[str, int] = {}
-    day_to_third_idx: list[int] = []  # 0-based day -> 1-based third index
-    for d in range(num_days):
-        dt = start + timedelta(days=d)
-        key = third_period_key(dt)
-        if not third_keys or third_keys[-1] != key:
-            third_keys.append(key)
-            third_index_by_key[key] = len(third_keys)
-        day_to_third_idx.append(third_index_by_key[key])
-
-    T = len(third_keys)
-
-    # Helper to map a single 0-based day index to third index set (1-based)
+    # 0-based day -> 1-based bucket index
+    day_to_bucket = [b + 1 for b in bucketing.day_index()]
+    T = len(bucketing)
+    # Lags and frequencies count buckets
+    scale = float(bucketing.nominal_days)
+
+    # Helper to map a single 0-based day index to bucket index set (1-based)
     def map_day_endpoint(day0: int | None) -> set[int] | None:
         if day0 is None:
             return None
         if 0 <= day0 < num_days:
-            return {day_to_third_idx[day0]}
+            return {day_to_bucket[day0]}
         return None
 
-    # Count days per third and per-third fully-blocked markers per entity
-    days_in_third: list[int] = [0] * (T + 1)  # 1..T
-    for d in range(num_days):
-        days_in_third[day_to_third_idx[d]] += 1
-
-    def fully_blocked_thirds(blocked_days: set[int] | None) -> set[int] | None:
+    def fully_blocked_buckets(blocked_days: set[int] | None) -> set[int] | None:
         if not blocked_days:
             return None
         blk = {int(x) for x in blocked_days}
         fb: set[int] = set()
         for t in range(1, T + 1):
-            # all days of the third are blocked
-            day_indices = [i for i in range(num_days) if day_to_third_idx[i] == t]
-            if day_indices and all((i in blk) for i in day_indices):
+            # all days of the bucket are blocked
+            lo, hi = bucketing.bounds(t - 1)
+            if all(i in blk for i in range(lo, hi + 1)):
                 fb.add(t)
         return fb or None
 
@@ -108,12 +141,12 @@ def _compress_api_plan_to_third(api: ApiPlan) -> PlanRequest:
         end_set_th = map_day_endpoint(e.end_max_day)
         freq_th = None
         if e.frequency_days and e.frequency_days > 0:
-            freq_th = int(math.ceil(e.frequency_days / 10.0))
+            freq_th = int(math.ceil(e.frequency_days / scale))
         lag_min_th = (
-            int(math.ceil((e.lag_min_days or 0) / 10.0)) if e.lag_min_days else None
+            int(math.ceil((e.lag_min_days or 0) / scale)) if e.lag_min_days else None
         )
         lag_max_th = (
-            int(math.ceil((e.lag_max_days or 0) / 10.0)) if e.lag_max_days else None
+            int(math.ceil((e.lag_max_days or 0) / scale)) if e.lag_max_days else None
         )
         events.append(
             Event(
@@ -129,11 +162,7 @@ def _compress_api_plan_to_third(api: ApiPlan) -> PlanRequest:
                 lag_max_days=lag_max_th,
                 people_required=e.people_required,
                 labor_total_per_area=e.labor_total_per_a,
-                labor_daily_cap=(
-                    (e.labor_daily_cap * 10.0)
-                    if e.labor_daily_cap is not None
-                    else None
-                ),
+                labor_daily_cap=e.labor_daily_cap,
                 required_roles=e.required_roles,
                 required_resource_categories=getattr(
                     e, "required_resource_categories", None
@@ -149,7 +178,7 @@ def _compress_api_plan_to_third(api: ApiPlan) -> PlanRequest:
             name=land.name,
             area=land.normalized_area_a(),
             tags=land.tags,
-            blocked_days=fully_blocked_thirds(land.blocked_days),
+            blocked_days=fully_blocked_buckets(land.blocked_days),
         )
         for land in api.lands
     ]
@@ -162,8 +191,8 @@ def _compress_api_plan_to_third(api: ApiPlan) -> PlanRequest:
                 id=w.id,
                 name=w.name,
                 roles=set(w.roles) if w.roles else set(),
-                capacity_per_day=float(w.capacity_per_day) * 10.0,
-                blocked_days=fully_blocked_thirds(w.blocked_days),
+                capacity_per_day=float(w.capacity_per_day),
+                blocked_days=fully_blocked_buckets(w.blocked_days),
             )
         )
 
@@ -175,10 +204,10 @@ def _compress_api_plan_to_third(api: ApiPlan) -> PlanRequest:
                 id=r.id,
                 name=r.name,
                 category=r.category,
-                capacity_per_day=(float(r.capacity_per_day) * 10.0)
+                capacity_per_day=float(r.capacity_per_day)
                 if r.capacity_per_day
                 else None,
-                blocked_days=fully_blocked_thirds(r.blocked_days),
+                blocked_days=fully_blocked_buckets(r.blocked_days),
             )
         )
 
@@ -207,7 +236,7 @@ def _compress_api_plan_to_third(api: ApiPlan) -> PlanRequest:
         ]
 
     return PlanRequest(
-        horizon=Horizon(num_days=T),
+        horizon=Horizon(num_days=T, period_days=bucketing.lengths()),
         crops=crops,
         events=events,
         lands=lands,
@@ -331,8 +360,14 @@ def to_domain_plan(api: ApiPlan) -> PlanRequest:
 
 
 def _build_timeline(
-    resp: PlanResponse, req: PlanRequest, *, start_date_iso: str | None = None
+    resp: PlanResponse,
+    req: PlanRequest,
+    *,
+    start_date_iso: str | None = None,
+    bucketing: Bucketing | None = None,
 ) -> OptimizationTimeline:
+    """Gantt timeline of ``resp``; indices are 0-based buckets of
+    ``bucketing`` (days when None)."""
     spans: list[GanttLandSpan] = []
     by_land_any = (
         getattr(resp.assignment, "crop_area_by_land_t", None)
@@ -469,12 +504,219 @@ def _build_timeline(
             "events": event_names,
         },
         start_date=start_date_iso,
+        granularity=bucketing.kind if bucketing is not None else "day",
+        periods=_timeline_periods(bucketing) if bucketing is not None else [],
+    )
+
+
+def _timeline_periods(bucketing: Bucketing) -> list[TimelinePeriod]:
+    if bucketing.kind == "day":
+        # The index is the day itself
+        return []
+    return [
+        TimelinePeriod(key=bucketing.key(i), start_day=lo, end_day=hi)
+        for i, (lo, hi) in enumerate(map(bucketing.bounds, range(len(bucketing))))
+    ]
+
+
+def _timeline_to_buckets(
+    timeline: OptimizationTimeline, bucketing: Bucketing
+) -> OptimizationTimeline:
+    """Project a day-indexed timeline onto the (0-based) buckets."""
+    day_to_bucket = bucketing.day_index()
+    spans: list[GanttLandSpan] = []
+    for span in timeline.land_spans:
+        start = day_to_bucket[span.start_index]
+        end = day_to_bucket[span.end_index]
+        last = spans[-1] if spans else None
+        if (
+            last is not None
+            and (last.land_id, last.crop_id) == (span.land_id, span.crop_id)
+            and abs(last.area_a - span.area_a) < 1e-9
+            and start <= last.end_index + 1
+        ):
+            last.end_index = max(last.end_index, end)
+            continue
+        spans.append(span.model_copy(update={"start_index": start, "end_index": end}))
+    events = [
+        ev.model_copy(update={"index": day_to_bucket[ev.index]})
+        for ev in timeline.events
+    ]
+    return timeline.model_copy(
+        update={
+            "land_spans": spans,
+            "events": events,
+            "granularity": bucketing.kind,
+            "periods": _timeline_periods(bucketing),
+        }
     )
 
 
+# Event windows of the day-level refinement: +-N buckets around the coarse
+# schedule, widened while it pays off; None keeps the original windows
+REFINE_MARGINS: tuple[int | None, ...] = (1, 3, None)
+
+
+def _refine_to_days(
+    api: ApiPlan,
+    coarse: PlanResponse,
+    bucketing: Bucketing,
+    plan_kwargs: dict,
+    progress_cb: Callable[[float, str], None] | None,
+) -> tuple[PlanResponse, PlanRequest, dict]:
+    """Re-solve at day granularity around the bucket-level solution.
+
+    Windows start narrow and are widened when the previous attempt was
+    infeasible, or while it was solved to optimality, fell short of the
+    coarse profit and still improved on the attempt before it. Returns the
+    best day-level response.
+    """
+    days_by_bucket: dict[int, list[int]] = {}
+    for day0, bucket in enumerate(bucketing.day_index()):
+        days_by_bucket.setdefault(bucket + 1, []).append(day0 + 1)
+    day_plan = to_domain_plan(api)
+    target = coarse.objectives.get("profit")
+
+    t0 = time.perf_counter()
+    best: tuple[PlanResponse, PlanRequest] | None = None
+    attempts: list[dict] = []
+    for margin in REFINE_MARGINS:
+        day_req = restrict_to_solution(day_plan, coarse, days_by_bucket, margin=margin)
+        kwargs = dict(plan_kwargs)
+        if kwargs.get("capture") is not None:
+            # Keep the coarse solve's artifacts under the same capture id
+            label = "full" if margin is None else margin
+            kwargs["capture"] = prefixed(kwargs["capture"], f"refine-m{label}-")
+        resp = run_plan(day_req, progress_cb=progress_cb, **kwargs)
+        profit = resp.objectives.get("profit") if resp.diagnostics.feasible else None
+        attempts.append({"margin": margin, "profit": profit})
+        prev = best[0].objectives.get("profit") if best is not None else None
+        if profit is None:
+            # Narrow windows can cut off every day-level plan; widen them
+            continue
+        if prev is None or profit > prev:
+            best = (resp, day_req)
+        proven = all(
+            row.get("skipped") or row.get("status") == "OPTIMAL"
+            for row in resp.diagnostics.stages
+        )
+        if not proven or target is None or profit >= target:
+            break
+        if prev is not None and profit <= prev:
+            break
+
+    stats = {
+        "applied": best is not None,
+        "solve_ms": int((time.perf_counter() - t0) * 1000),
+        "coarse_profit": target,
+        "attempts": attempts,
+    }
+    if best is None:
+        stats["reason"] = resp.diagnostics.reason
+        return resp, day_req, stats
+    stats["day_profit"] = best[0].objectives.get("profit")
+    return best[0], best[1], stats
+
+
+@dataclass(frozen=True)
+class ReplanBase:
+    """Finished job a re-plan starts from."""
+
+    job_id: str
+    plan: ApiPlan
+    result: OptimizationResult
+    # Periods ending before this (0-based) day keep the job's plan
+    freeze_before_day: int | None = None
+
+
+def _timeline_response(timeline: OptimizationTimeline) -> PlanResponse:
+    """Domain plan of a timeline (1-based indices, as the planner reports)."""
+    by_land: dict[str, dict[int, dict[str, float]]] = {}
+    for span in timeline.land_spans:
+        per_t = by_land.setdefault(span.land_id, {})
+        for i in range(span.start_index, span.end_index + 1):
+            per_t.setdefault(i + 1, {})[span.crop_id] = span.area_a
+    events = [
+        EventAssignment(
+            index=ev.index + 1,
+            event_id=ev.event_id,
+            assigned_workers=[
+                WorkerRef(id=u.worker_id, name=u.worker_id, used_time_hours=u.hours)
+                for u in ev.worker_usages
+            ],
+            resource_usage=[
+                ResourceUsageRef(id=u.resource_id, used_time_hours=u.quantity)
+                for u in ev.resource_usages
+            ],
+            land_ids=list(ev.land_ids),
+        )
+        for ev in timeline.events
+    ]
+    return PlanResponse(
+        diagnostics=PlanDiagnostics(feasible=True),
+        assignment=PlanAssignment(crop_area_by_land_t=by_land),
+        event_assignments=events,
+    )
+
+
+def _base_timeline(
+    base: ReplanBase, bucketing: Bucketing
+) -> OptimizationTimeline | None:
+    """The base job's timeline on the periods of ``bucketing``, if it has one."""
+    timeline = base.result.timeline
+    if (
+        timeline is not None
+        and timeline.granularity == bucketing.kind
+        and timeline.periods == _timeline_periods(bucketing)
+    ):
+        return timeline
+    if bucketing.kind == "day":
+        return base.result.day_timeline
+    return None
+
+
+def _freeze_index(bucketing: Bucketing, day0: int | None) -> int | None:
+    """First (1-based) period that does not end before ``day0``."""
+    if day0 is None:
+        return None
+    ends = (bucketing.bounds(i)[1] for i in range(len(bucketing)))
+    return 1 + sum(1 for end in ends if end < day0)
+
+
+def _start_date_iso(api: ApiPlan) -> str | None:
+    try:
+        if api.horizon and getattr(api.horizon, "start_date", None):
+            return str(api.horizon.start_date)
+    except Exception:
+        return None
+    return None
+
+
+def _request_key(api: ApiPlan, bucketing: Bucketing, domain_req: PlanRequest) -> str:
+    """Cache key of ``api`` solved as ``domain_req``; a day-level refinement
+    also depends on the days hidden by the buckets."""
+    day_req = None
+    if api.stages is not None and api.stages.refine_days and bucketing.kind != "day":
+        day_req = to_domain_plan(api)
+    return request_key(domain_req, api.stages, _start_date_iso(api), day_req)
+
+
+def request_hash(req: OptimizationRequest) -> str | None:
+    """Canonical hash of what determines the result (None without a plan)."""
+    if req.plan is None:
+        return None
+    bucketing = choose_bucketing(req.plan)
+    return _request_key(req.plan, bucketing, _compress_api_plan(req.plan, bucketing))
+
+
 def solve_sync(
-    req: OptimizationRequest, progress_cb: Callable[[float, str], None] | None = None
+    req: OptimizationRequest,
+    progress_cb: Callable[[float, str], None] | None = None,
+    *,
+    base: ReplanBase | None = None,
 ) -> OptimizationResult:
+    """Solve ``req.plan``; with ``base``, re-plan it from that job's result
+    (see ``lib.replan``)."""
     if req.plan is None:
         return OptimizationResult(
             status="error",
@@ -484,23 +726,141 @@ def solve_sync(
             warnings=[],
         )
 
-    # Convert to third-granularity domain plan
-    domain_req = _compress_api_plan_to_third(req.plan)
+    # Convert to a bucket-granularity domain plan (thirds unless configured)
+    bucketing = choose_bucketing(req.plan)
+    domain_req = _compress_api_plan(req.plan, bucketing)
+    # Pass through plan.horizon.start_date (if provided on API) to timeline.start_date
+    start_date_iso = _start_date_iso(req.plan)
+
+    # Identical requests (retries, UI refreshes) reuse a proven result; a
+    # re-plan also depends on its base job
+    cache = get_cache() if base is None else None
+    cache_key = ""
+    if cache is not None:
+        cache_key = _request_key(req.plan, bucketing, domain_req)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            cached.stats = {**(cached.stats or {}), "cache": "hit"}
+            if progress_cb:
+                progress_cb(1.0, "done")
+            return cached
 
     stage_order = None
     lock_by = None
+    mode = "lexicographic"
+    solver_profile = None
+    solver_profile_by = None
+    explain = False
+    merge = False
+    rolling = None
+    refine = False
     if req.plan.stages is not None:
         stage_order = req.plan.stages.stage_order
         lock_by = req.plan.stages.step_tolerance_by
+        mode = req.plan.stages.mode
+        solver_profile = req.plan.stages.solver_profile
+        solver_profile_by = req.plan.stages.solver_profile_by
+        explain = req.plan.stages.explain_infeasible
+        merge = req.plan.stages.merge_periods
+        if req.plan.stages.rolling_window_days is not None:
+            window = req.plan.stages.rolling_window_days
+            step = req.plan.stages.rolling_step_days or max(1, window // 2)
+            # Days to solve-granularity periods
+            rolling = {
+                "window_days": math.ceil(window / bucketing.nominal_days),
+                "step_days": math.ceil(step / bucketing.nominal_days),
+            }
+        refine = req.plan.stages.refine_days
 
-    resp = run_plan(
-        domain_req,
-        extra_stages=None,
-        stage_order=stage_order,
-        lock_tolerance_pct=None,
-        lock_tolerance_by=lock_by,
-        progress_cb=progress_cb,
-    )
+    warnings: list[str] = []
+    incumbent = None
+    if base is not None:
+        base_timeline = _base_timeline(base, bucketing)
+        if base_timeline is None:
+            warnings.append("base job has no plan on this granularity; solved anew")
+        else:
+            incumbent = (
+                _compress_api_plan(base.plan, bucketing),
+                _timeline_response(base_timeline),
+            )
+            if merge or rolling is not None or refine:
+                warnings.append(
+                    "merge_periods, rolling_window_days and refine_days "
+                    "are not applied to re-plans"
+                )
+            merge, rolling, refine = False, None, False
+    if merge and rolling is not None:
+        warnings.append("merge_periods is not applied with rolling_window_days")
+        merge = False
+
+    capture_id = new_capture_id()
+    capture = capture_sink(capture_id)
+
+    plan_kwargs = {
+        "extra_stages": None,
+        "stage_order": stage_order,
+        "lock_tolerance_pct": None,
+        "lock_tolerance_by": lock_by,
+        "mode": mode,
+        "solver_profile": solver_profile,
+        "solver_profile_by": solver_profile_by,
+        "capture": capture,
+        "explain": explain,
+        "greedy": config.greedy_hint(),
+    }
+    if config.solver_portfolio():
+        plan_kwargs["portfolio"] = PortfolioOptions(
+            config.solver_portfolio(),
+            min_variables=config.solver_portfolio_min_variables(),
+        )
+    lns_rounds = req.plan.stages.lns_rounds if req.plan.stages is not None else 0
+    if lns_rounds > 0:
+        plan_kwargs["lns"] = LnsOptions(
+            lns_rounds,
+            round_s=config.lns_round_ms() / 1000.0,
+            parallel=config.lns_parallel(),
+        )
+    coarse_cb = progress_cb
+    if refine and progress_cb is not None:
+        # The coarse solve reports the first half of the progress
+        def coarse_cb(p: float, phase: str) -> None:
+            progress_cb(0.5 * p, phase)
+
+    # Refinement stays day-accurate, so only the coarse solve merges periods
+    if incumbent is not None:
+        resp = replan(
+            domain_req,
+            *incumbent,
+            freeze_before=_freeze_index(bucketing, base.freeze_before_day),
+            progress_cb=coarse_cb,
+            **plan_kwargs,
+        )
+    elif rolling is not None:
+        resp = plan_rolling(
+            domain_req,
+            progress_cb=coarse_cb,
+            **rolling,
+            **plan_kwargs,
+        )
+    else:
+        resp = run_plan(
+            domain_req, progress_cb=coarse_cb, merge_periods=merge, **plan_kwargs
+        )
+    period_merge = resp.diagnostics.period_merge
+    period_rolling = resp.diagnostics.rolling_windows
+    day_resp = day_req = refine_stats = None
+    if refine and bucketing.kind != "day" and resp.diagnostics.feasible:
+        refine_cb = None
+        if progress_cb is not None:
+
+            def refine_cb(p: float, phase: str) -> None:
+                progress_cb(0.5 + 0.45 * p, f"refine:{phase}")
+
+        day_resp, day_req, refine_stats = _refine_to_days(
+            req.plan, resp, bucketing, plan_kwargs, refine_cb
+        )
+        if refine_stats["applied"]:
+            resp = day_resp
 
     status = "ok" if resp.diagnostics.feasible else "infeasible"
     result = OptimizationResult(
@@ -509,44 +869,369 @@ def solve_sync(
         solution={"summary": resp.summary, "constraint_hints": resp.constraint_hints},
         stats={
             "stages": resp.diagnostics.stages,
+            "failed_stage": resp.diagnostics.failed_stage,
+            "violated_constraints": resp.diagnostics.violated_constraints or None,
             "stage_order": resp.diagnostics.stage_order,
+            "mode": resp.diagnostics.mode,
+            "mode_note": resp.diagnostics.mode_note,
+            "granularity": {"kind": bucketing.kind, "periods": len(bucketing)},
+            "period_merge": period_merge,
+            "screening": [
+                i.model_dump(exclude_none=True)
+                for i in resp.diagnostics.screening or []
+            ]
+            or None,
         },
-        warnings=[],
+        warnings=warnings,
     )
+    if capture is not None:
+        result.stats["capture_id"] = capture_id
+    if rolling is not None:
+        result.stats["rolling"] = period_rolling
+    if refine_stats is not None:
+        result.stats["refine"] = refine_stats
+    if base is not None:
+        result.stats["replan"] = {
+            "base_job_id": base.job_id,
+            **(resp.diagnostics.replan or {"scope": "anew"}),
+        }
     if progress_cb:
         progress_cb(0.95, "post:timeline_build")
-    # Pass through plan.horizon.start_date (if provided on API) to timeline.start_date
-    start_date_iso = None
-    try:
-        if (
-            req.plan
-            and req.plan.horizon
-            and getattr(req.plan.horizon, "start_date", None)
-        ):
-            start_date_iso = str(req.plan.horizon.start_date)
-    except Exception:
-        start_date_iso = None
-    result.timeline = _build_timeline(resp, domain_req, start_date_iso=start_date_iso)
+    if resp is day_resp:
+        result.day_timeline = _build_timeline(
+            resp, day_req, start_date_iso=start_date_iso
+        )
+        result.timeline = _timeline_to_buckets(result.day_timeline, bucketing)
+    else:
+        result.timeline = _build_timeline(
+            resp, domain_req, start_date_iso=start_date_iso, bucketing=bucketing
+        )
+    if cache is not None and is_cacheable(result):
+        cache.put(cache_key, result)
+        result.stats["cache"] = "miss"
     if progress_cb:
         progress_cb(1.0, "done")
     return result
 
 
+def join_solve(
+    req: OptimizationRequest,
+    progress_cb: Callable[[float, str], None] | None = None,
+    *,
+    base: ReplanBase | None = None,
+    admit: Admit | None = None,
+) -> Ticket:
+    """Run ``solve_sync`` for ``req`` or attach to an identical running solve.
+
+    ``progress_cb`` receives the shared progress; when it raises (e.g. the job
+    was canceled) this caller is detached. The solve itself stops once every
+    caller has left. ``admit`` (e.g. admission slots) is held by the solve
+    from start to end, once however many callers share it.
+    """
+    key = request_hash(req) or ""
+    kwargs = {}
+    if base is not None:
+        key = f"replan:{base.job_id}:{base.freeze_before_day}:{key}"
+        kwargs["base"] = base
+    return get_flights().join(
+        key,
+        # Resolve at call time so test monkeypatching works
+        lambda cb: solve_sync(req, progress_cb=cb, **kwargs),
+        progress_cb=progress_cb,
+        admit=admit,
+    )
+
+
 def solve_sync_with_timeout(
-    req: OptimizationRequest, timeout_ms: int | None
+    req: OptimizationRequest,
+    timeout_ms: int | None,
+    *,
+    base: ReplanBase | None = None,
+    admit: Admit | None = None,
 ) -> OptimizationResult:
+    """Solve ``req`` in a flight; after ``timeout_ms`` return a "timeout"
+    result and leave it. Raises what ``admit`` raises (e.g.
+    ``AdmissionRejected``) when this caller would start the solve."""
+    if req.plan is None:
+        with admit() if admit is not None else nullcontext():
+            return solve_sync(req)
+    ticket = join_solve(req, base=base, admit=admit)
     if not timeout_ms or timeout_ms <= 0:
-        return solve_sync(req)
-    timeout_s = timeout_ms / 1000.0
-    with ThreadPoolExecutor(max_workers=1, thread_name_prefix="sync-solver") as ex:
-        fut = ex.submit(solve_sync, req)
-        try:
-            return fut.result(timeout=timeout_s)
-        except FuturesTimeout:
-            return OptimizationResult(
-                status="timeout",
-                objective_value=None,
-                solution=None,
-                stats={"timeout_ms": timeout_ms},
-                warnings=["sync solve timed out"],
+        return ticket.wait()
+    try:
+        return ticket.wait(timeout=timeout_ms / 1000.0)
+    except FuturesTimeout:
+        ticket.leave()
+        return OptimizationResult(
+            status="timeout",
+            objective_value=None,
+            solution=None,
+            stats={"timeout_ms": timeout_ms},
+            warnings=["sync solve timed out"],
+        )
+
+
+@dataclass
+class _StoredFrontier:
+    domain_req: PlanRequest
+    bucketing: Bucketing
+    start_date_iso: str | None
+    responses: list[PlanResponse]
+
+
+class FrontierStore:
+    """Recent frontiers kept in memory so a point's full plan (timeline) is
+    built only when it is fetched."""
+
+    def __init__(self, max_entries: int) -> None:
+        self._max = max_entries
+        self._entries: OrderedDict[str, _StoredFrontier] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, stored: _StoredFrontier) -> str:
+        frontier_id = uuid.uuid4().hex
+        with self._lock:
+            self._entries[frontier_id] = stored
+            while len(self._entries) > self._max:
+                self._entries.popitem(last=False)
+        return frontier_id
+
+    def get(self, frontier_id: str) -> _StoredFrontier:
+        """Raises KeyError for unknown or evicted frontiers."""
+        with self._lock:
+            stored = self._entries[frontier_id]
+            self._entries.move_to_end(frontier_id)
+        return stored
+
+
+_frontiers: FrontierStore | None = None
+
+
+def get_frontier_store() -> FrontierStore:
+    global _frontiers
+    if _frontiers is None:
+        _frontiers = FrontierStore(config.frontier_store_max())
+    return _frontiers
+
+
+def solve_frontier(
+    req: FrontierRequest, progress_cb: Callable[[float, str], None] | None = None
+) -> FrontierResult:
+    """Pareto frontier of ``req.objectives`` (see ``lib.frontier``); the
+    points' plans are kept in the frontier store under ``frontier_id``."""
+    objectives = list(req.objectives)
+    bucketing = choose_bucketing(req.plan)
+    domain_req = _compress_api_plan(req.plan, bucketing)
+    stages = req.plan.stages
+    plan_kwargs = {
+        "solver_profile": stages.solver_profile if stages is not None else None,
+        "solver_profile_by": stages.solver_profile_by if stages is not None else None,
+        "greedy": config.greedy_hint(),
+    }
+    t0 = time.perf_counter()
+    points = frontier(
+        domain_req,
+        objectives=req.objectives,
+        points=req.points,
+        parallel=config.frontier_parallel(),
+        progress_cb=progress_cb,
+        **plan_kwargs,
+    )
+    stats = {
+        "granularity": {"kind": bucketing.kind, "periods": len(bucketing)},
+        "ms": (time.perf_counter() - t0) * 1000.0,
+    }
+    if not points:
+        return FrontierResult(
+            status="infeasible", objectives=objectives, stats=stats, warnings=[]
+        )
+    frontier_id = get_frontier_store().put(
+        _StoredFrontier(
+            domain_req=domain_req,
+            bucketing=bucketing,
+            start_date_iso=_start_date_iso(req.plan),
+            responses=[pt.response for pt in points],
+        )
+    )
+    warnings = []
+    if len(points) < req.points:
+        warnings.append(
+            f"{len(points)} distinct points found (the grid collapsed or points "
+            "coincided)"
+        )
+    return FrontierResult(
+        status="ok",
+        frontier_id=frontier_id,
+        objectives=objectives,
+        points=[
+            FrontierPoint(
+                index=i,
+                epsilon=pt.epsilon,
+                values={name: pt.values[name] for name in objectives},
+                objectives=pt.response.objectives,
+                solve_ms=pt.ms,
             )
+            for i, pt in enumerate(points)
+        ],
+        stats=stats,
+        warnings=warnings,
+    )
+
+
+def solve_frontier_with_timeout(
+    req: FrontierRequest, timeout_ms: int | None, *, admit: Admit | None = None
+) -> FrontierResult:
+    """``solve_frontier`` in a flight (identical requests share it); after
+    ``timeout_ms`` return a "timeout" result and leave it, which stops the
+    frontier once no other caller waits. Raises what ``admit`` raises."""
+    payload = req.model_dump(mode="python", exclude={"timeout_ms"})
+    ticket = get_flights().join(
+        f"frontier:{canonical_hash(payload)}",
+        lambda cb: solve_frontier(req, cb),
+        admit=admit,
+    )
+    if not timeout_ms or timeout_ms <= 0:
+        return ticket.wait()
+    try:
+        return ticket.wait(timeout=timeout_ms / 1000.0)
+    except FuturesTimeout:
+        ticket.leave()
+        return FrontierResult(
+            status="timeout",
+            objectives=list(req.objectives),
+            stats={"timeout_ms": timeout_ms},
+            warnings=["frontier timed out"],
+        )
+
+
+def frontier_point(frontier_id: str, index: int) -> OptimizationResult:
+    """Full result (timeline included) of one point of a stored frontier.
+
+    Raises KeyError when the frontier or the point is unknown.
+    """
+    stored = get_frontier_store().get(frontier_id)
+    if not 0 <= index < len(stored.responses):
+        raise KeyError(index)
+    resp = stored.responses[index]
+    result = OptimizationResult(
+        status="ok",
+        objective_value=resp.objectives.get("profit"),
+        solution={"summary": resp.summary, "constraint_hints": resp.constraint_hints},
+        stats={
+            "stages": resp.diagnostics.stages,
+            "stage_order": resp.diagnostics.stage_order,
+            "granularity": {
+                "kind": stored.bucketing.kind,
+                "periods": len(stored.bucketing),
+            },
+            "frontier": {"frontier_id": frontier_id, "index": index},
+        },
+        warnings=[],
+    )
+    result.timeline = _build_timeline(
+        resp,
+        stored.domain_req,
+        start_date_iso=stored.start_date_iso,
+        bucketing=stored.bucketing,
+    )
+    return result
+
+
+def _domain_scenario(sc: ScenarioOverride) -> Scenario:
+    """``sc`` in the units of ``_compress_api_plan``."""
+    return Scenario(
+        name=sc.name,
+        price_per_area=dict(sc.price_per_a),
+        capacity_per_day=dict(sc.capacity_per_day),
+        area_bounds={
+            b.crop_id: (b.normalized_min_area(), b.normalized_max_area())
+            for b in sc.crop_area_bounds
+        },
+    )
+
+
+def solve_scenarios(
+    req: ScenarioBatchRequest,
+    progress_cb: Callable[[float, str], None] | None = None,
+    *,
+    deadline: float | None = None,
+) -> ScenarioBatchResult:
+    """Solve ``req.plan`` and each scenario of ``req`` (see ``lib.scenarios``)
+    into a comparison table; the plan is converted once for all of them.
+
+    At ``deadline`` (``time.monotonic()``) the running solves are stopped and
+    the rest skipped; their rows have status "timeout", the others are kept.
+    """
+    bucketing = choose_bucketing(req.plan)
+    domain_req = _compress_api_plan(req.plan, bucketing)
+    stages = req.plan.stages
+    plan_kwargs = {"greedy": config.greedy_hint()}
+    warnings: list[str] = []
+    if stages is not None:
+        plan_kwargs.update(
+            stage_order=stages.stage_order,
+            lock_tolerance_by=stages.step_tolerance_by,
+            mode=stages.mode,
+            solver_profile=stages.solver_profile,
+            solver_profile_by=stages.solver_profile_by,
+        )
+        if (
+            stages.merge_periods
+            or stages.rolling_window_days is not None
+            or stages.refine_days
+            or stages.lns_rounds
+        ):
+            warnings.append(
+                "merge_periods, rolling_window_days, refine_days and lns_rounds "
+                "are not applied to scenario batches"
+            )
+    t0 = time.perf_counter()
+    base, runs = run_scenarios(
+        domain_req,
+        [_domain_scenario(sc) for sc in req.scenarios],
+        parallel=config.scenario_parallel(),
+        deadline=deadline,
+        progress_cb=progress_cb,
+        **plan_kwargs,
+    )
+    base_profit = base.response.objectives.get("profit") if base.feasible else None
+
+    def row(run) -> ScenarioRow:
+        objectives = run.response.objectives if run.feasible else {}
+        profit = objectives.get("profit")
+        return ScenarioRow(
+            name=run.name,
+            status=_run_status(run),
+            objectives=objectives,
+            profit_delta=(
+                round(profit - base_profit, 3)
+                if profit is not None and base_profit is not None
+                else None
+            ),
+            crop_area_a=crop_areas(run.response) if run.feasible else {},
+            hint_from=run.hint_from,
+            solve_ms=run.ms,
+        )
+
+    stats = {
+        "granularity": {"kind": bucketing.kind, "periods": len(bucketing)},
+        "parallel": config.scenario_parallel(),
+        "ms": (time.perf_counter() - t0) * 1000.0,
+    }
+    timed_out = sum(run.stopped for run in [base, *runs])
+    if timed_out:
+        stats["timed_out"] = timed_out
+        warnings.append(f"{timed_out} of {len(runs) + 1} runs timed out")
+    return ScenarioBatchResult(
+        status=_run_status(base),
+        base=row(base),
+        scenarios=[row(run) for run in runs],
+        stats=stats,
+        warnings=warnings,
+    )
+
+
+def _run_status(run: ScenarioRun) -> str:
+    if run.stopped:
+        return "timeout"
+    return "ok" if run.feasible else "infeasible"
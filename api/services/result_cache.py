@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any
+
+from core import config
+from core.metrics import metrics
+from lib.schemas import PlanRequest
+from schemas.optimization import OptimizationResult, OptimizationStagesConfig
+
+LOGGER = logging.getLogger(__name__)
+
+# Bump when the solver or result layout changes so stale entries are ignored
+CACHE_VERSION = 1
+
+_PERSIST_PREFIX = "result-cache"
+
+
+def _canonical_default(obj: Any) -> Any:
+    # Sets (start_cond, roles, tags, ...) have no stable iteration order
+    if isinstance(obj, set | frozenset):
+        return sorted(obj, key=repr)
+    return str(obj)
+
+
+def canonical_hash(payload: Any) -> str:
+    """SHA-256 of ``payload`` as canonical JSON (sorted keys and sets)."""
+    raw = json.dumps(
+        payload,
+        sort_keys=True,
+        separators=(",", ":"),
+        ensure_ascii=False,
+        default=_canonical_default,
+    )
+    return hashlib.sha256(raw.encode("utf-8")).hexdigest()
+
+
+def request_key(
+    domain_req: PlanRequest,
+    stages: OptimizationStagesConfig | None,
+    start_date: str | None,
+    day_req: PlanRequest | None = None,
+) -> str:
+    """Content hash of everything that determines an OptimizationResult.
+
+    ``day_req`` is the day-level plan when the result is refined to days;
+    bucket compression can hide differences inside a bucket.
+    """
+    payload = {
+        "v": CACHE_VERSION,
+        "plan": domain_req.model_dump(mode="python"),
+        "day_plan": day_req.model_dump(mode="python") if day_req is not None else None,
+        "stages": stages.model_dump(mode="python") if stages is not None else None,
+        "start_date": start_date,
+    }
+    return canonical_hash(payload)
+
+
+def is_cacheable(result: OptimizationResult) -> bool:
+    """Only proven outcomes are reusable; time-limited ones are not."""
+    stats = result.stats or {}
+    if stats.get("refine") and not stats["refine"].get("applied"):
+        # The day-level refinement fell back to the third-level plan
+        return False
+    if result.status == "ok":
+        stages = stats.get("stages") or []
+        return bool(stages) and all(
+            row.get("skipped") or row.get("status") == "OPTIMAL" for row in stages
+        )
+    if result.status == "infeasible":
+        if stats.get("screening"):
+            return True
+        failed = stats.get("failed_stage") or {}
+        return failed.get("status") == "INFEASIBLE"
+    return False
+
+
+class ResultCache:
+    """LRU of serialized results bounded by total size, with an optional
+    persistent tier in the job payload bucket."""
+
+    def __init__(
+        self,
+        *,
+        max_bytes: int,
+        bucket_name: str | None = None,
+        s3_client: Any | None = None,
+    ) -> None:
+        self._max_bytes = max_bytes
+        self._entries: OrderedDict[str, bytes] = OrderedDict()
+        self._size = 0
+        self._lock = threading.Lock()
+        self._bucket = bucket_name
+        self._s3 = s3_client
+        if self._bucket and self._s3 is None:
+            import boto3  # lazy import
+
+            self._s3 = boto3.client("s3")
+
+    @property
+    def size_bytes(self) -> int:
+        return self._size
+
+    def get(self, key: str) -> OptimizationResult | None:
+        with self._lock:
+            data = self._entries.get(key)
+            if data is not None:
+                self._entries.move_to_end(key)
+        if data is not None:
+            metrics.record_result_cache("hit_memory")
+            return OptimizationResult.model_validate_json(data)
+        data = self._load(key)
+        if data is None:
+            metrics.record_result_cache("miss")
+            return None
+        metrics.record_result_cache("hit_storage")
+        self._remember(key, data)
+        return OptimizationResult.model_validate_json(data)
+
+    def put(self, key: str, result: OptimizationResult) -> None:
+        data = result.model_dump_json().encode("utf-8")
+        self._remember(key, data)
+        self._store(key, data)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._size = 0
+
+    def _remember(self, key: str, data: bytes) -> None:
+        if len(data) > self._max_bytes:
+            return
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self._size -= len(old)
+            self._entries[key] = data
+            self._size += len(data)
+            while self._size > self._max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self._size -= len(evicted)
+
+    def _load(self, key: str) -> bytes | None:
+        if not self._bucket or self._s3 is None:
+            return None
+        try:
+            obj = self._s3.get_object(
+                Bucket=self._bucket, Key=f"{_PERSIST_PREFIX}/{key}.json"
+            )
+            return obj["Body"].read()
+        except Exception as exc:
+            code = getattr(exc, "response", {}).get("Error", {}).get("Code")
+            if code not in {"NoSuchKey", "404"}:
+                LOGGER.warning("Result cache read failed for %s: %s", key, exc)
+            return None
+
+    def _store(self, key: str, data: bytes) -> None:
+        if not self._bucket or self._s3 is None:
+            return
+        try:
+            self._s3.put_object(
+                Bucket=self._bucket,
+                Key=f"{_PERSIST_PREFIX}/{key}.json",
+                Body=data,
+                ContentType="application/json",
+            )
+        except Exception:
+            LOGGER.exception("Result cache write failed for %s", key)
+
+
+_cache: ResultCache | None = None
+_cache_lock = threading.Lock()
+
+
+def get_cache() -> ResultCache | None:
+    """Process-wide cache per RESULT_CACHE_* settings (None when disabled)."""
+    global _cache
+    if not config.result_cache_enabled():
+        return None
+    with _cache_lock:
+        if _cache is None:
+            bucket = (
+                config.job_payload_bucket() if config.result_cache_persist() else None
+            )
+            _cache = ResultCache(
+                max_bytes=config.result_cache_max_mb() * 1024 * 1024,
+                bucket_name=bucket,
+            )
+        return _cache
+
+
+def reset_cache() -> None:
+    global _cache
+    with _cache_lock:
+        _cache = None
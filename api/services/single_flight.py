@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import itertools
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import AbstractContextManager, ExitStack
+from typing import Any
+
+from lib.cancel import StopToken, stop_scope
+
+ProgressCallback = Callable[[float, str], None]
+# Entered once per flight, by its leader, and exited when the call ends
+# (e.g. ``AdmissionController.admit``)
+Admit = Callable[[], AbstractContextManager[Any]]
+
+
+class FlightAbandoned(Exception):
+    """Raised inside a flight once every caller has left it."""
+
+
+class _Flight:
+    __slots__ = ("key", "future", "members", "token", "permit")
+
+    def __init__(self, key: str, permit: ExitStack | None = None) -> None:
+        self.key = key
+        self.future: Future = Future()
+        # member id -> progress callback (None for callers without progress)
+        self.members: dict[int, ProgressCallback | None] = {}
+        # Stopped when the last member leaves (see ``lib.cancel``)
+        self.token = StopToken()
+        # The leader's admission, held until the call ends
+        self.permit = permit
+
+
+class Ticket:
+    """A caller's membership in a flight."""
+
+    def __init__(
+        self,
+        group: SingleFlight,
+        flight: _Flight,
+        member_id: int,
+        leader: bool,
+        fn: Callable[[ProgressCallback], Any],
+        progress_cb: ProgressCallback | None,
+        admit: Admit | None,
+    ) -> None:
+        self._group = group
+        self._flight = flight
+        self._member_id = member_id
+        self.leader = leader
+        self._fn = fn
+        self._progress_cb = progress_cb
+        self._admit = admit
+        self._left = False
+
+    def wait(self, timeout: float | None = None) -> Any:
+        """Result of the shared call; raises concurrent TimeoutError on timeout.
+
+        If the flight was abandoned while this caller was joining, a new
+        flight is started for it.
+        """
+        while True:
+            try:
+                return self._flight.future.result(timeout=timeout)
+            except FlightAbandoned:
+                if self._left or not self._group._is_member(
+                    self._flight, self._member_id
+                ):
+                    raise
+                fresh = self._group.join(
+                    self._flight.key,
+                    self._fn,
+                    progress_cb=self._progress_cb,
+                    admit=self._admit,
+                )
+                self._flight = fresh._flight
+                self._member_id = fresh._member_id
+                self.leader = fresh.leader
+
+    def leave(self) -> None:
+        """Stop waiting; the call is aborted when its last member leaves."""
+        self._left = True
+        self._group._leave(self._flight, self._member_id)
+
+
+class SingleFlight:
+    """Coalesce concurrent calls with the same key into one execution.
+
+    ``fn`` receives a progress callback; progress is fanned out to every
+    member. A member whose callback raises (e.g. its job was canceled) is
+    detached. Once no member is left the flight's stop token is stopped:
+    its running CP-SAT search ends at once (``lib.cancel``), a queued call
+    never starts, and the waiters' futures raise ``FlightAbandoned``.
+
+    At most ``max_workers`` calls run at a time; the others queue.
+
+    ``admit`` is entered by the caller that starts a flight, before the
+    flight exists (its exception, e.g. ``AdmissionRejected``, reaches that
+    caller), and exited when the call ends; callers joining a running flight
+    do not enter it. Capacity is thus held once per execution and for as
+    long as it runs, also after every caller has timed out.
+    """
+
+    def __init__(
+        self, max_workers: int = 4, thread_name_prefix: str = "single-flight"
+    ) -> None:
+        self._lock = threading.Lock()
+        self._flights: dict[str, _Flight] = {}
+        self._ids = itertools.count()
+        self._executor = ThreadPoolExecutor(
+            max(1, max_workers), thread_name_prefix=thread_name_prefix
+        )
+
+    def join(
+        self,
+        key: str,
+        fn: Callable[[ProgressCallback], Any],
+        *,
+        progress_cb: ProgressCallback | None = None,
+        admit: Admit | None = None,
+    ) -> Ticket:
+        permit: ExitStack | None = None
+        while True:
+            with self._lock:
+                flight = self._flights.get(key)
+                leader = flight is None
+                if leader and (admit is None or permit is not None):
+                    flight = _Flight(key, permit)
+                    self._flights[key] = flight
+                if flight is not None:
+                    member_id = next(self._ids)
+                    flight.members[member_id] = progress_cb
+                    break
+            # Nothing to join: wait for capacity outside the lock
+            permit = ExitStack()
+            permit.enter_context(admit())
+        if leader:
+            self._executor.submit(self._run, flight, fn)
+        elif permit is not None:
+            # An identical call started while this one waited
+            permit.close()
+        return Ticket(self, flight, member_id, leader, fn, progress_cb, admit)
+
+    def in_flight(self, key: str) -> bool:
+        with self._lock:
+            return key in self._flights
+
+    def _is_member(self, flight: _Flight, member_id: int) -> bool:
+        with self._lock:
+            return member_id in flight.members
+
+    def _leave(self, flight: _Flight, member_id: int) -> None:
+        with self._lock:
+            flight.members.pop(member_id, None)
+            abandoned = not flight.members
+            if abandoned and self._flights.get(flight.key) is flight:
+                # New callers with the same key start a fresh flight
+                del self._flights[flight.key]
+        if abandoned:
+            flight.token.stop()
+
+    def _progress(self, flight: _Flight, pct: float, phase: str) -> None:
+        with self._lock:
+            members = list(flight.members.items())
+        for member_id, cb in members:
+            if cb is None:
+                continue
+            try:
+                cb(pct, phase)
+            except Exception:
+                self._leave(flight, member_id)
+        with self._lock:
+            if not flight.members:
+                raise FlightAbandoned(flight.key)
+
+    def _run(self, flight: _Flight, fn: Callable[[ProgressCallback], Any]) -> None:
+        try:
+            flight.token.check()
+            with stop_scope(flight.token):
+                result = fn(lambda pct, phase: self._progress(flight, pct, phase))
+        except BaseException as exc:  # noqa: BLE001 - handed to the waiters
+            self._finish(flight)
+            stopped = flight.token.stopped
+            flight.future.set_exception(FlightAbandoned(flight.key) if stopped else exc)
+        else:
+            self._finish(flight)
+            flight.future.set_result(result)
+
+    def _finish(self, flight: _Flight) -> None:
+        with self._lock:
+            if self._flights.get(flight.key) is flight:
+                del self._flights[flight.key]
+        if flight.permit is not None:
+            flight.permit.close()
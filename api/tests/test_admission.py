@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import create_app
+from core import config
+from schemas import (
+    ApiCrop,
+    ApiEvent,
+    ApiHorizon,
+    ApiLand,
+    ApiPlan,
+    ApiWorker,
+    OptimizationRequest,
+    OptimizationResult,
+)
+from services.admission import AdmissionController, AdmissionRejected
+
+
+def _plan(lands: int = 1, workers: int = 0) -> ApiPlan:
+    return ApiPlan(
+        horizon=ApiHorizon(num_days=365, start_date=date(2025, 1, 1)),
+        crops=[ApiCrop(id="c1", name="作物", price_per_a=1000)],
+        events=[ApiEvent(id="e1", crop_id="c1", name="播種", uses_land=True)],
+        lands=[ApiLand(id=f"L{i}", name=f"畑{i}", area_a=10) for i in range(lands)],
+        workers=[
+            ApiWorker(id=f"W{i}", name=f"w{i}", capacity_per_day=8)
+            for i in range(workers)
+        ],
+        resources=[],
+    )
+
+
+def test_large_plans_take_more_slots() -> None:
+    admission = AdmissionController(4, slot_variables=1000)
+    assert admission.cost(_plan()) == 1
+    assert admission.cost(_plan(lands=30)) == 3
+    assert admission.cost(_plan(lands=500, workers=50)) == 4  # capped
+
+
+def test_queue_full_and_timeout_are_rejected() -> None:
+    admission = AdmissionController(2, max_queue=1, queue_timeout_s=0.2)
+    with admission.admit(2):
+        outcome: list[str] = []
+
+        def _queued() -> None:
+            try:
+                with admission.admit(1):
+                    outcome.append("admitted")
+            except AdmissionRejected as rej:
+                outcome.append(rej.reason)
+
+        waiter = threading.Thread(target=_queued)
+        waiter.start()
+        deadline = time.time() + 2
+        while admission.snapshot()["queued"] == 0 and time.time() < deadline:
+            time.sleep(0.01)
+        with pytest.raises(AdmissionRejected) as full:
+            with admission.admit(1):
+                pass
+        assert full.value.reason == "queue_full"
+        assert full.value.retry_after_s >= 1
+        waiter.join()
+        assert outcome == ["timeout"]  # the slots were held throughout
+    assert admission.snapshot() == {"slots": 2, "in_use": 0, "queued": 0}
+    with admission.admit(2):
+        pass
+
+
+@pytest.fixture
+def _app(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setenv("AUTH_MODE", "none")
+    monkeypatch.setenv("ADMISSION_MAX_SLOTS", "1")
+    monkeypatch.setenv("ADMISSION_QUEUE", "0")
+    config.reload_settings()
+
+    def _fake_solve(_req, *, progress_cb=None) -> OptimizationResult:
+        return OptimizationResult(
+            status="ok", objective_value=1.0, solution={}, stats={}, warnings=[]
+        )
+
+    monkeypatch.setattr("services.optimizer_adapter.solve_sync", _fake_solve)
+    yield create_app()
+    config.reload_settings()
+
+
+def test_sync_endpoint_returns_503_with_retry_after(_app) -> None:
+    client = TestClient(_app)
+    body = OptimizationRequest(plan=_plan()).model_dump(mode="json")
+    assert client.post("/v1/optimize", json=body).status_code == 200
+    with _app.state.admission.admit(1):
+        r = client.post("/v1/optimize", json=body)
+    assert r.status_code == 503
+    assert int(r.headers["Retry-After"]) >= 1
+    assert r.json()["reason"] == "queue_full"
+
+
+def test_overflow_can_redirect_to_async_job(
+    _app, monkeypatch: pytest.MonkeyPatch
+) -> None:
+    monkeypatch.setenv("ADMISSION_OVERFLOW", "async")
+    config.reload_settings()
+    app = create_app()
+    client = TestClient(app)
+    body = OptimizationRequest(plan=_plan()).model_dump(mode="json")
+    with app.state.admission.admit(1):
+        r = client.post("/v1/optimize", json=body, follow_redirects=False)
+    assert r.status_code == 303
+    assert r.headers["Location"] == f"/v1/jobs/{r.json()['job_id']}"
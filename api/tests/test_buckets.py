@@ -0,0 +1,38 @@
+from __future__ import annotations
+
+from datetime import date
+
+from lib.buckets import aligned_bucketing, calendar_bucketing
+
+
+def test_calendar_bucketings() -> None:
+    # 2025-01-27 is a Monday; 20 days reach 2025-02-15
+    start = date(2025, 1, 27)
+    thirds = calendar_bucketing("third", start, 20)
+    assert thirds.starts == (0, 5, 15)
+    assert [thirds.key(i) for i in range(3)] == [
+        "2025-01:下旬",
+        "2025-02:上旬",
+        "2025-02:中旬",
+    ]
+    assert thirds.lengths() == [5, 10, 5]
+    assert thirds.nominal_days == 10
+
+    weeks = calendar_bucketing("week", start, 20)
+    assert weeks.starts == (0, 7, 14)
+    assert weeks.key(1) == "2025-W06"
+    months = calendar_bucketing("month", start, 20)
+    assert [months.key(i) for i in range(len(months))] == ["2025-01", "2025-02"]
+    assert months.day_index()[4:6] == [0, 1]
+    assert len(calendar_bucketing("day", start, 20)) == 20
+
+
+def test_aligned_bucketing_cuts_at_window_edges() -> None:
+    start = date(2025, 4, 1)
+    b = aligned_bucketing(start, 40, cuts={12, 14, 30, 39}, max_days=10)
+    # 14 is too close to 12 and 39 too close to the end: at least 5 days each
+    assert b.starts == (0, 6, 12, 21, 30)
+    assert b.lengths() == [6, 6, 9, 9, 10]
+    assert b.bounds(4) == (30, 39)
+    assert b.key(0) == "2025-04-01..2025-04-06"
+    assert b.nominal_days == 8
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import json
+import math
+from datetime import date
+from pathlib import Path
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import create_app
+from core import config
+from schemas import (
+    ApiCrop,
+    ApiEvent,
+    ApiHorizon,
+    ApiLand,
+    ApiPlan,
+    OptimizationRequest,
+    OptimizationResult,
+)
+from services import cost_estimator
+from services.cost_estimator import CostModel, fit, plan_features
+
+
+def _plan(lands: int = 1) -> ApiPlan:
+    return ApiPlan(
+        horizon=ApiHorizon(num_days=30, start_date=date(2025, 1, 1)),
+        crops=[ApiCrop(id="c1", name="作物", price_per_a=1000)],
+        events=[
+            ApiEvent(id="e1", crop_id="c1", name="播種", uses_land=True),
+            ApiEvent(id="e2", crop_id="c1", name="定植", preceding_event_id="e1"),
+            ApiEvent(id="e3", crop_id="c1", name="収穫", preceding_event_id="e2"),
+        ],
+        lands=[ApiLand(id=f"L{i}", name=f"畑{i}", area_a=10) for i in range(lands)],
+        workers=[],
+        resources=[],
+    )
+
+
+def test_plan_features() -> None:
+    f = plan_features(_plan(lands=2))
+    assert f["periods"] == 4
+    assert f["land_crop_periods"] == 8
+    assert f["event_periods"] == 12
+    assert f["lag_depth"] == 3
+    assert f["stages"] == 6
+
+
+def test_fit_recovers_log_linear_costs() -> None:
+    truth = CostModel(coef=(1.0, 0.6, 0.3, 0.2, 0.1, 0.4), sigma=0.0)
+    samples = []
+    for lands in range(1, 9):
+        for events in range(1, 4):
+            f = {
+                "land_crop_periods": lands * 10,
+                "event_periods": events * 7 + lands,
+                "assignment_terms": lands * events,
+                "lag_depth": events,
+                "stages": 1 + (lands % 6),
+            }
+            samples.append((f, truth.predict(f)[0]))
+    model = fit(samples)
+    assert model.samples == len(samples)
+    assert model.sigma < 0.05
+    f = samples[5][0]
+    assert math.isclose(model.predict(f)[0], truth.predict(f)[0], rel_tol=0.05)
+
+
+@pytest.fixture
+def _slow_model(tmp_path: Path, monkeypatch: pytest.MonkeyPatch):
+    # Predicts ~e^12 ms (>2 min) for any plan
+    path = tmp_path / "cost_model.json"
+    model = CostModel(coef=(12.0, 0, 0, 0, 0, 0), sigma=0.1, samples=42)
+    path.write_text(json.dumps(model.to_json()), encoding="utf-8")
+    monkeypatch.setenv("AUTH_MODE", "none")
+    monkeypatch.setenv("COST_MODEL_PATH", str(path))
+    monkeypatch.setattr(
+        "services.optimizer_adapter.solve_sync",
+        lambda _req, *, progress_cb=None: OptimizationResult(status="ok"),
+    )
+    config.reload_settings()
+    cost_estimator.reset_model()
+    yield
+    config.reload_settings()
+    cost_estimator.reset_model()
+
+
+def test_estimate_endpoint_is_a_dry_run(_slow_model) -> None:
+    client = TestClient(create_app())
+    body = OptimizationRequest(plan=_plan(), timeout_ms=5000).model_dump(mode="json")
+    r = client.post("/v1/optimize/estimate", json=body)
+    assert r.status_code == 200
+    est = r.json()
+    assert est["recommended"] == "async"
+    assert est["predicted_ms"] > est["timeout_ms"] == 5000
+    assert est["model_samples"] == 42
+    assert est["features"]["lag_depth"] == 3
+
+
+@pytest.mark.parametrize(
+    ("routing", "expected"), [("off", 200), ("reject", 413), ("async", 303)]
+)
+def test_sync_endpoint_routes_predicted_slow_plans(
+    _slow_model, monkeypatch: pytest.MonkeyPatch, routing: str, expected: int
+) -> None:
+    monkeypatch.setenv("SYNC_COST_ROUTING", routing)
+    config.reload_settings()
+    client = TestClient(create_app())
+    body = OptimizationRequest(plan=_plan()).model_dump(mode="json")
+    r = client.post("/v1/optimize", json=body, follow_redirects=False)
+    assert r.status_code == expected
+    if expected == 413:
+        assert r.json()["estimate"]["recommended"] == "async"
+
+
+def test_placeholder_model_does_not_route(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("AUTH_MODE", "none")
+    monkeypatch.setenv("SYNC_COST_ROUTING", "reject")
+    monkeypatch.setattr(
+        "services.optimizer_adapter.solve_sync",
+        lambda _req, *, progress_cb=None: OptimizationResult(status="ok"),
+    )
+    config.reload_settings()
+    cost_estimator.reset_model()
+    try:
+        client = TestClient(create_app())
+        body = OptimizationRequest(plan=_plan(), timeout_ms=1).model_dump(mode="json")
+        est = client.post("/v1/optimize/estimate", json=body).json()
+        assert est["recommended"] == "async" and est["model_samples"] == 0
+        assert client.post("/v1/optimize", json=body).status_code == 200
+    finally:
+        config.reload_settings()
+        cost_estimator.reset_model()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+import threading
+import time
+
+import pytest
+
+from core import config
+from lib import cpu_budget
+from lib.cancel import SolveStopped, StopToken, stop_scope
+from lib.cpu_budget import CpuBudget, drop_held
+from lib.planner import plan
+from lib.schemas import Crop, Event, Horizon, Land, PlanRequest
+
+
+def test_concurrent_solves_split_the_budget() -> None:
+    budget = CpuBudget(16, min_workers=2)
+    with budget.lease(fixed=4) as fixed:
+        assert fixed == 4
+        with budget.lease() as second, budget.lease() as third:
+            # 16 // 2 = 8, then 16 // 3 = 5 cut to the 4 left
+            assert (second, third) == (8, 4)
+            assert budget.snapshot() == {"total": 16, "in_flight": 3, "workers": 16}
+        assert budget.snapshot()["in_flight"] == 1
+    assert budget.snapshot() == {"total": 16, "in_flight": 0, "workers": 0}
+
+
+def test_leases_wait_for_a_free_worker_instead_of_oversubscribing() -> None:
+    budget = CpuBudget(1, min_workers=2)
+    assert budget.total == 2
+    got: list[int] = []
+    with budget.lease() as first:
+        assert first == 2
+        waiter = threading.Thread(target=lambda: got.append(_lease_once(budget)))
+        waiter.start()
+        time.sleep(0.2)
+        assert got == [] and budget.snapshot()["workers"] == 2
+    waiter.join(5)
+    assert got == [2]
+
+    token = StopToken()
+    with budget.lease(), stop_scope(token):
+        threading.Timer(0.1, token.stop).start()
+        with pytest.raises(SolveStopped):
+            _lease_once(budget)
+    assert budget.snapshot() == {"total": 2, "in_flight": 0, "workers": 0}
+
+
+def _lease_once(budget: CpuBudget) -> int:
+    with budget.lease() as workers:
+        return workers
+
+
+def test_shared_counters_see_other_holders() -> None:
+    ctx = mp.get_context("spawn")
+    shared = ctx.Array("i", 2)
+    held = ctx.Array("i", 2, lock=False)
+    a = CpuBudget(8, min_workers=1, shared=shared)
+    b = CpuBudget(8, min_workers=1)
+    b.share(shared, held)
+    with a.lease(fixed=2) as first, b.lease() as second:
+        assert (first, second) == (2, 4)
+        assert b.snapshot()["workers"] == 6
+        assert list(held) == [1, 4]
+    assert a.snapshot()["in_flight"] == 0
+
+    # A holder killed inside its lease: the parent hands its part back
+    held[:] = [1, 4]
+    shared[:] = [2, 6]
+    drop_held(shared, held)
+    assert list(shared) == [1, 2] and list(held) == [0, 0]
+
+
+def test_stage_solves_lease_workers_from_budget(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("CP_CPU_BUDGET", "6")
+    monkeypatch.setenv("CP_MIN_WORKERS", "2")
+    config.reload_settings()
+    cpu_budget.reset_budget()
+    try:
+        req = PlanRequest(
+            horizon=Horizon(num_days=3),
+            crops=[Crop(id="C1", name="A", price_per_area=100.0)],
+            events=[Event(id="E1", crop_id="C1", name="plant", uses_land=True)],
+            lands=[Land(id="L1", name="F1", area=1.0)],
+            workers=[],
+            resources=[],
+        )
+        # Another solve in flight
+        with cpu_budget.get_budget().lease(fixed=3):
+            resp = plan(req, stage_order=["profit"])
+        assert resp.diagnostics.feasible
+        assert resp.diagnostics.stages[0]["solver"]["num_search_workers"] == 3
+    finally:
+        config.reload_settings()
+        cpu_budget.reset_budget()
@@ -0,0 +1,74 @@
+from __future__ import annotations
+
+from lib.planner import plan
+from lib.schemas import (
+    Crop,
+    CropAreaBound,
+    Event,
+    Horizon,
+    Land,
+    PlanRequest,
+    Worker,
+)
+
+
+def _request(**event_kw) -> PlanRequest:
+    return PlanRequest(
+        horizon=Horizon(num_days=4),
+        crops=[Crop(id="C1", name="A", price_per_area=100)],
+        events=[
+            Event(
+                id="E1",
+                crop_id="C1",
+                name="harvest",
+                labor_total_per_area=10.0,
+                start_cond={1, 2},
+                end_cond={1, 2},
+                uses_land=True,
+                **event_kw,
+            )
+        ],
+        lands=[Land(id="L1", name="F1", area=2.0)],
+        workers=[
+            Worker(id="W1", name="w1", capacity_per_day=8.0, roles={"harvester"}),
+            Worker(id="W2", name="w2", capacity_per_day=8.0),
+        ],
+        resources=[],
+        crop_area_bounds=[CropAreaBound(crop_id="C1", min_area=1.0)],
+    )
+
+
+def _explain(req: PlanRequest):
+    # Screening would reject some of these before the model is built
+    return plan(req, stage_order=["profit"], screening=False, explain=True)
+
+
+def test_core_names_conflicting_families() -> None:
+    # Three people per day but only two workers
+    resp = _explain(_request(people_required=3))
+    assert not resp.diagnostics.feasible
+    assert resp.diagnostics.violated_constraints == [
+        "crop_area_min:C1",
+        "people_required:E1",
+    ]
+    explain = resp.diagnostics.failed_stage["explain"]
+    assert explain["status"] == "INFEASIBLE"
+    assert explain["assumptions"] >= len(explain["core"])
+    assert "conflict: people_required:E1" in resp.constraint_hints
+
+    # 10 h in 2 days at most 3 h/day
+    resp = _explain(_request(labor_daily_cap=3.0))
+    assert set(resp.diagnostics.violated_constraints) >= {
+        "crop_area_min:C1",
+        "labor_daily_cap:E1",
+    }
+
+
+def test_explain_is_off_by_default_and_skipped_when_feasible() -> None:
+    resp = plan(_request(people_required=3), stage_order=["profit"], screening=False)
+    assert resp.diagnostics.violated_constraints == []
+    assert "explain" not in resp.diagnostics.failed_stage
+
+    resp = _explain(_request(required_roles={"harvester"}))
+    assert resp.diagnostics.feasible
+    assert resp.diagnostics.violated_constraints == []
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import threading
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import create_app
+from core import config
+from lib.cancel import current_token
+from lib.frontier import frontier
+from lib.schemas import Crop, Event, Horizon, Land, PlanRequest, Worker
+from schemas import ApiCrop, ApiEvent, ApiHorizon, ApiLand, ApiPlan, ApiWorker
+
+
+def _request() -> PlanRequest:
+    crops = [
+        Crop(id="A", name="A", price_per_area=1000),
+        Crop(id="B", name="B", price_per_area=600),
+    ]
+    return PlanRequest(
+        horizon=Horizon(num_days=10),
+        crops=crops,
+        events=[
+            Event(
+                id=f"{c.id}_sow",
+                crop_id=c.id,
+                name="sow",
+                start_cond={1, 2, 3},
+                end_cond={5},
+                # B earns less per area but needs less labor
+                labor_total_per_area=3.0 if c.id == "A" else 1.0,
+                uses_land=True,
+            )
+            for c in crops
+        ],
+        lands=[Land(id=f"L{i}", name=f"F{i}", area=2.0) for i in range(1, 4)],
+        workers=[Worker(id="W1", name="w1", capacity_per_day=8.0)],
+        resources=[],
+    )
+
+
+def test_frontier_points_are_ordered_and_non_dominated() -> None:
+    points = frontier(_request(), points=5, parallel=2)
+    assert 3 <= len(points) <= 5
+    profits = [pt.values["profit"] for pt in points]
+    labors = [pt.values["labor"] for pt in points]
+    # From the best profit to the least labor, strictly trading one for the other
+    assert profits == sorted(profits, reverse=True)
+    assert labors == sorted(labors, reverse=True)
+    assert len(set(profits)) == len(profits)
+    assert points[0].epsilon is None and points[-1].epsilon is None
+    for pt in points[1:-1]:
+        assert pt.values["labor"] <= pt.epsilon
+
+
+def test_frontier_rejects_a_single_stage() -> None:
+    with pytest.raises(ValueError):
+        frontier(_request(), objectives=("profit", "profit"))
+
+
+def _api_plan() -> ApiPlan:
+    return ApiPlan(
+        horizon=ApiHorizon(num_days=10, start_date=date(2025, 4, 1)),
+        crops=[
+            ApiCrop(id="c1", name="レタス", price_per_a=1000),
+            ApiCrop(id="c2", name="キャベツ", price_per_a=600),
+        ],
+        events=[
+            ApiEvent(
+                id=f"{crop}_sow",
+                crop_id=crop,
+                name="播種",
+                start_min_day=0,
+                end_max_day=4,
+                labor_total_per_a=labor,
+                uses_land=True,
+            )
+            for crop, labor in (("c1", 3.0), ("c2", 1.0))
+        ],
+        lands=[ApiLand(id=f"L{i}", name=f"畑{i}", area_a=2) for i in range(1, 4)],
+        workers=[ApiWorker(id="W1", name="w1", capacity_per_day=8.0)],
+        resources=[],
+    )
+
+
+def test_frontier_endpoint(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("AUTH_MODE", "none")
+    config.reload_settings()
+    client = TestClient(create_app())
+
+    body = {"plan": _api_plan().model_dump(mode="json"), "points": 3}
+    r = client.post("/v1/optimize/frontier", json=body)
+    assert r.status_code == 200, r.text
+    res = r.json()
+    assert res["status"] == "ok"
+    assert res["objectives"] == ["profit", "labor"]
+    assert [p["index"] for p in res["points"]] == list(range(len(res["points"])))
+    assert "timeline" not in res["points"][0]
+
+    last = res["points"][-1]["index"]
+    r = client.get(f"/v1/optimize/frontier/{res['frontier_id']}/points/{last}")
+    assert r.status_code == 200, r.text
+    point = r.json()
+    assert point["stats"]["frontier"]["index"] == last
+    assert point["objective_value"] == res["points"][-1]["objectives"]["profit"]
+    assert point["timeline"] is not None
+
+    missing = f"/v1/optimize/frontier/{res['frontier_id']}/points/99"
+    assert client.get(missing).status_code == 404
+    assert client.get("/v1/optimize/frontier/nope/points/0").status_code == 404
+    body["objectives"] = ["labor", "labor"]
+    assert client.post("/v1/optimize/frontier", json=body).status_code == 422
+    config.reload_settings()
+
+
+def test_frontier_endpoint_times_out_and_stops_the_frontier(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import services.optimizer_adapter as adapter
+
+    monkeypatch.setenv("AUTH_MODE", "none")
+    config.reload_settings()
+    stopped = threading.Event()
+
+    def slow_frontier(req, progress_cb=None):
+        token = current_token()
+        with token.on_stop(stopped.set):
+            stopped.wait(10)
+        token.check()
+
+    monkeypatch.setattr(adapter, "solve_frontier", slow_frontier)
+    client = TestClient(create_app())
+    body = {"plan": _api_plan().model_dump(mode="json"), "timeout_ms": 50}
+    r = client.post("/v1/optimize/frontier", json=body)
+    assert r.status_code == 200, r.text
+    res = r.json()
+    assert res["status"] == "timeout"
+    assert res["stats"] == {"timeout_ms": 50}
+    # The last caller left, so the running frontier was stopped
+    assert stopped.wait(5)
+    config.reload_settings()
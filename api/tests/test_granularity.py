@@ -0,0 +1,144 @@
+from __future__ import annotations
+
+from datetime import date
+
+import pytest
+
+from core import config
+from lib.periods import Periods
+from schemas import (
+    ApiCrop,
+    ApiEvent,
+    ApiHorizon,
+    ApiLand,
+    ApiPlan,
+    ApiWorker,
+    OptimizationRequest,
+    OptimizationStagesConfig,
+)
+from services.export_renderer import _period_label
+from services.granularity import choose_bucketing
+from services.optimizer_adapter import _compress_api_plan, solve_sync
+
+
+def _plan(granularity: str, num_days: int = 28) -> ApiPlan:
+    return ApiPlan(
+        # A Monday, so weeks start on day 0
+        horizon=ApiHorizon(num_days=num_days, start_date=date(2025, 3, 3)),
+        crops=[ApiCrop(id="c1", name="作物", price_per_a=1000)],
+        events=[
+            ApiEvent(
+                id="e1",
+                crop_id="c1",
+                name="播種",
+                start_min_day=5,
+                labor_total_per_a=1.0,
+                labor_daily_cap=4.0,
+                uses_land=True,
+            ),
+            ApiEvent(
+                id="e2",
+                crop_id="c1",
+                name="収穫",
+                preceding_event_id="e1",
+                lag_min_days=8,
+                labor_total_per_a=1.0,
+                uses_land=True,
+            ),
+        ],
+        lands=[ApiLand(id="L1", name="畑1", area_a=5, blocked_days=set(range(7)))],
+        workers=[ApiWorker(id="W1", name="w1", capacity_per_day=8.0)],
+        resources=[],
+        stages=OptimizationStagesConfig(
+            stage_order=["profit"], granularity=granularity
+        ),
+    )
+
+
+def test_weekly_compression_scales_by_seven() -> None:
+    plan = _plan("week")
+    req = _compress_api_plan(plan, choose_bucketing(plan))
+    assert req.horizon.num_days == 4
+    assert req.horizon.period_days == [7, 7, 7, 7]
+    periods = Periods.of(req.horizon)
+    assert [periods.length(t) for t in range(1, 5)] == [7, 7, 7, 7]
+    # Per-day capacities stay per day; the model scales them by bucket days
+    assert req.workers[0].capacity_per_day == 8.0
+    e1, e2 = req.events
+    assert (e1.start_cond, e1.labor_daily_cap) == ({1}, 4.0)
+    assert e2.lag_min_days == 2
+    assert req.lands[0].blocked_days == {1}
+
+
+def test_partial_bucket_scales_by_its_own_days() -> None:
+    plan = ApiPlan(
+        # A Sunday: the first week has one day
+        horizon=ApiHorizon(num_days=15, start_date=date(2025, 3, 2)),
+        crops=[ApiCrop(id="c1", name="作物", price_per_a=1000)],
+        events=[
+            ApiEvent(
+                id="e1",
+                crop_id="c1",
+                name="播種",
+                start_min_day=0,
+                end_max_day=0,
+                labor_total_per_a=4.0,
+                uses_land=True,
+            )
+        ],
+        lands=[ApiLand(id="L1", name="畑1", area_a=5)],
+        workers=[ApiWorker(id="W1", name="w1", capacity_per_day=8.0)],
+        resources=[],
+        stages=OptimizationStagesConfig(stage_order=["profit"], granularity="week"),
+    )
+    req = _compress_api_plan(plan, choose_bucketing(plan))
+    assert req.horizon.period_days == [1, 7, 7]
+
+    # 8 h on the single day of the first week sow 2 a, not 56 h for all 5 a
+    res = solve_sync(OptimizationRequest(plan=plan))
+    assert res.status == "ok"
+    assert res.objective_value == pytest.approx(2000.0)
+
+
+def test_auto_picks_the_finest_granularity_that_fits(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    assert choose_bucketing(_plan("auto")).kind == "day"
+
+    # 10 variables per period: days and weeks do not fit, thirds (7) do but
+    # blur the window start on day 5
+    monkeypatch.setenv("GRANULARITY_MAX_VARIABLES", "75")
+    config.reload_settings()
+    try:
+        b = choose_bucketing(_plan("auto", num_days=60))
+        assert (b.kind, len(b), b.starts[:2]) == ("aligned", 7, (0, 5))
+        monkeypatch.setenv("GRANULARITY_MAX_VARIABLES", "1")
+        config.reload_settings()
+        assert choose_bucketing(_plan("auto", num_days=60)).kind == "month"
+    finally:
+        monkeypatch.delenv("GRANULARITY_MAX_VARIABLES")
+        config.reload_settings()
+
+
+def test_timeline_records_periods() -> None:
+    res = solve_sync(OptimizationRequest(plan=_plan("week")))
+    assert res.status == "ok"
+    assert res.stats["granularity"] == {"kind": "week", "periods": 4}
+    timeline = res.timeline
+    assert timeline.granularity == "week"
+    assert [(p.key, p.start_day, p.end_day) for p in timeline.periods] == [
+        ("2025-W10", 0, 6),
+        ("2025-W11", 7, 13),
+        ("2025-W12", 14, 20),
+        ("2025-W13", 21, 27),
+    ]
+    assert {ev.index for ev in timeline.events} <= {1, 2, 3}
+    assert _period_label(timeline, date(2025, 3, 3), 2) == "2025-W12"
+
+    res = solve_sync(OptimizationRequest(plan=_plan("day")))
+    days: dict[str, int] = {}
+    for ev in res.timeline.events:
+        days[ev.event_id] = min(days.get(ev.event_id, ev.index), ev.index)
+    assert days["e1"] >= 7 and days["e2"] - days["e1"] >= 8
+    assert res.timeline.periods == []
+    assert _period_label(res.timeline, date(2025, 3, 3), 7) == "2025-03-10"
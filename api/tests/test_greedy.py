@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import pytest
+
+import lib.planner as planner
+from lib.greedy import construct
+from lib.planner import plan
+from lib.schemas import Crop, Event, Horizon, Land, PlanRequest, Worker
+from lib.solver import SolveContext
+
+
+def _request() -> PlanRequest:
+    # Sowing uses the land; harvest exactly 7 days after the latest sowing
+    events = []
+    for crop_id in ("C1", "C2"):
+        events += [
+            Event(
+                id=f"{crop_id}_sow",
+                crop_id=crop_id,
+                name="sow",
+                start_cond={5},
+                end_cond={30},
+                labor_total_per_area=1.0,
+                uses_land=True,
+            ),
+            Event(
+                id=f"{crop_id}_harvest",
+                crop_id=crop_id,
+                name="harvest",
+                preceding_event_id=f"{crop_id}_sow",
+                lag_min_days=7,
+                labor_total_per_area=1.0,
+                required_roles={"harvester"},
+            ),
+        ]
+    return PlanRequest(
+        horizon=Horizon(num_days=40),
+        crops=[
+            Crop(id="C1", name="A", price_per_area=1000),
+            Crop(id="C2", name="B", price_per_area=500),
+        ],
+        events=events,
+        lands=[Land(id="L1", name="F1", area=10.0), Land(id="L2", name="F2", area=5.0)],
+        workers=[
+            Worker(id="W1", name="w1", capacity_per_day=8.0, roles={"harvester"}),
+            Worker(id="W2", name="w2", capacity_per_day=8.0, blocked_days={5, 6}),
+        ],
+        resources=[],
+    )
+
+
+def test_greedy_plan_is_accepted_by_the_model(monkeypatch: pytest.MonkeyPatch) -> None:
+    req = _request()
+    seed = construct(req)
+    # Higher price first: C1 takes all of the land its labor allows
+    assert seed.x_area_by_l_c_values[("L1", "C1")] > 0
+    sow_days = [
+        t for (e, t), v in seed.r_event_by_e_t_values.items() if v and e == "C1_sow"
+    ]
+    harvest_days = [
+        t for (e, t), v in seed.r_event_by_e_t_values.items() if v and e == "C1_harvest"
+    ]
+    assert [t + 7 for t in sow_days] == harvest_days
+
+    # Simulate a first stage that times out without an incumbent
+    real_solve = planner.solve
+    calls: list[bool] = []
+    limits: list[float | None] = []
+
+    def timed_out_first(ctx, prev=None, **kw):
+        calls.append(kw.get("fix_hints", False))
+        limits.append(kw.get("time_limit_s"))
+        if len(calls) == 1:
+            return SolveContext(
+                build=ctx, status="UNKNOWN", params={"max_time_in_seconds": 30.0}
+            )
+        return real_solve(ctx, prev, **kw)
+
+    monkeypatch.setattr(planner, "solve", timed_out_first)
+    resp = plan(req, stage_order=["profit", "dispersion"])
+    assert calls == [False, True]
+    # The pinned check gets a short limit of its own, not the stage's
+    assert limits == [None, planner.GREEDY_CHECK_MAX_S]
+    assert resp.diagnostics.feasible
+    (row,) = resp.diagnostics.stages
+    assert row["fallback"] == "greedy"
+    assert row["status"] == "FEASIBLE"
+    assert row["value"] == seed.objective_value
+
+
+def test_greedy_hint_keeps_the_optimum() -> None:
+    req = _request()
+    with_hint = plan(req, stage_order=["profit"])
+    without = plan(req, stage_order=["profit"], greedy=False)
+    assert with_hint.diagnostics.stages[0]["status"] == "OPTIMAL"
+    assert with_hint.objectives["profit"] == without.objectives["profit"]
+    assert "greedy_ms" in with_hint.diagnostics.stages[0]
+    assert "greedy_ms" not in without.diagnostics.stages[0]
@@ -0,0 +1,151 @@
+from __future__ import annotations
+
+import time
+from datetime import date
+from typing import Any
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import create_app
+from core import config
+from schemas import (
+    ApiCrop,
+    ApiEvent,
+    ApiHorizon,
+    ApiLand,
+    ApiPlan,
+    OptimizationRequest,
+    OptimizationResult,
+)
+from services.job_backend import IdempotencyConflict, InMemoryJobBackend
+from services.job_backend_dynamo import DynamoJobBackend
+
+
+def _request(key: str | None, area: float = 10) -> OptimizationRequest:
+    return OptimizationRequest(
+        idempotency_key=key,
+        plan=ApiPlan(
+            horizon=ApiHorizon(num_days=2, start_date=date(2025, 1, 1)),
+            crops=[ApiCrop(id="c1", name="作物", price_per_a=1000)],
+            events=[ApiEvent(id="e1", crop_id="c1", name="播種", uses_land=True)],
+            lands=[ApiLand(id="L1", name="畑1", area_a=area)],
+            workers=[],
+            resources=[],
+        ),
+    )
+
+
+def _fake_solve(_req, *, progress_cb=None) -> OptimizationResult:
+    return OptimizationResult(
+        status="ok", objective_value=1.0, solution={}, stats={}, warnings=[]
+    )
+
+
+@pytest.fixture
+def _fake_solver(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr("services.optimizer_adapter.solve_sync", _fake_solve)
+
+
+def test_inmemory_repeated_key_returns_existing_job(_fake_solver) -> None:
+    backend = InMemoryJobBackend(idempotency_window_s=60)
+    try:
+        first = backend.enqueue(_request("k1"))
+        again = backend.enqueue(_request("k1"))
+        assert again.job_id == first.job_id
+        assert backend.enqueue(_request("k2")).job_id != first.job_id
+        assert backend.enqueue(_request(None)).job_id != first.job_id
+        with pytest.raises(IdempotencyConflict):
+            backend.enqueue(_request("k1", area=20))
+    finally:
+        backend.shutdown(wait=True)
+
+
+def test_inmemory_window_zero_disables_dedup(_fake_solver) -> None:
+    backend = InMemoryJobBackend(idempotency_window_s=0)
+    try:
+        a = backend.enqueue(_request("k1"))
+        b = backend.enqueue(_request("k1"))
+        assert a.job_id != b.job_id
+    finally:
+        backend.shutdown(wait=True)
+
+
+def test_async_endpoint_honors_idempotency_header(monkeypatch, _fake_solver) -> None:
+    monkeypatch.setenv("AUTH_MODE", "none")
+    config.reload_settings()
+    client = TestClient(create_app())
+    body = _request(None).model_dump(mode="json")
+    r1 = client.post("/v1/optimize/async", json=body, headers={"Idempotency-Key": "h"})
+    r2 = client.post("/v1/optimize/async", json=body, headers={"Idempotency-Key": "h"})
+    assert r1.status_code == 202 and r2.status_code == 202
+    assert r1.json()["job_id"] == r2.json()["job_id"]
+    other = _request(None, area=30).model_dump(mode="json")
+    r3 = client.post("/v1/optimize/async", json=other, headers={"Idempotency-Key": "h"})
+    assert r3.status_code == 409
+    # Let the background job settle before the app goes away
+    time.sleep(0.05)
+
+
+class _FakeTable:
+    def __init__(self) -> None:
+        self.items: dict[str, dict[str, Any]] = {}
+        self.queries: list[dict[str, Any]] = []
+
+    def put_item(self, *, Item: dict[str, Any], **_: Any) -> None:
+        self.items[Item["job_id"]] = Item
+
+    def query(self, **kwargs: Any) -> dict[str, Any]:
+        # Key conditions are not evaluated; all items share one idem key here
+        self.queries.append(kwargs)
+        items = sorted(
+            self.items.values(), key=lambda i: i["submitted_at"], reverse=True
+        )
+        return {"Items": items}
+
+
+class _FakeDynamo:
+    def __init__(self, table: _FakeTable) -> None:
+        self._table = table
+
+    def Table(self, _name: str) -> _FakeTable:  # noqa: N802 - boto3 API
+        return self._table
+
+
+class _Sink:
+    def __init__(self) -> None:
+        self.calls = 0
+
+    def put_object(self, **_: Any) -> None:
+        self.calls += 1
+
+    def send_message(self, **_: Any) -> None:
+        self.calls += 1
+
+
+def test_dynamo_enqueue_queries_index_and_reuses_job() -> None:
+    table = _FakeTable()
+    s3, sqs = _Sink(), _Sink()
+    backend = DynamoJobBackend(
+        table_name="jobs",
+        bucket_name="bucket",
+        queue_url="queue",
+        jobs_ttl_days=1,
+        idem_index_name="idem-index",
+        idempotency_window_s=60,
+        dynamodb_resource=_FakeDynamo(table),
+        s3_client=s3,
+        sqs_client=sqs,
+    )
+    first = backend.enqueue(_request("k1"))
+    again = backend.enqueue(_request("k1"))
+    assert again.job_id == first.job_id
+    assert len(table.items) == 1
+    assert s3.calls == 1 and sqs.calls == 1
+    assert table.queries[-1]["IndexName"] == "idem-index"
+    with pytest.raises(IdempotencyConflict):
+        backend.enqueue(_request("k1", area=20))
+
+    table.items[first.job_id]["status"] = "failed"
+    retried = backend.enqueue(_request("k1"))
+    assert retried.job_id != first.job_id
@@ -0,0 +1,117 @@
+from __future__ import annotations
+
+import multiprocessing as mp
+import threading
+import time
+from datetime import date
+
+import pytest
+
+from schemas import (
+    ApiCrop,
+    ApiEvent,
+    ApiHorizon,
+    ApiLand,
+    ApiPlan,
+    OptimizationRequest,
+    OptimizationResult,
+)
+from services.job_backend_process import ProcessJobBackend, _worker_main
+
+
+def _request() -> OptimizationRequest:
+    return OptimizationRequest(
+        plan=ApiPlan(
+            horizon=ApiHorizon(num_days=3, start_date=date(2025, 1, 1)),
+            crops=[ApiCrop(id="c1", name="作物", price_per_a=1000)],
+            events=[ApiEvent(id="e1", crop_id="c1", name="播種", uses_land=True)],
+            lands=[ApiLand(id="L1", name="畑1", area_a=10)],
+            workers=[],
+            resources=[],
+        ),
+    )
+
+
+def _wait_done(backend: ProcessJobBackend, job_id: str, timeout: float = 60.0):
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        job = backend.get(job_id)
+        if job.status not in {"pending", "running"}:
+            return job
+        time.sleep(0.1)
+    raise AssertionError("job did not finish")
+
+
+def test_process_backend_solves_in_worker_process() -> None:
+    backend = ProcessJobBackend(processes=1)
+    try:
+        assert backend.processes == 1
+        job = _wait_done(backend, backend.enqueue(_request()).job_id)
+        assert job.status == "succeeded"
+        assert job.progress == 1.0
+        assert job.result is not None and job.result.status == "ok"
+        assert job.result.timeline is not None
+    finally:
+        backend.shutdown(wait=True)
+
+
+def test_process_backend_fails_job_when_worker_dies() -> None:
+    # Far too little address space to even import OR-Tools
+    backend = ProcessJobBackend(processes=1, memory_mb=64)
+    try:
+        job = _wait_done(backend, backend.enqueue(_request()).job_id)
+        assert job.status == "failed"
+        assert backend.processes == 1  # replaced
+    finally:
+        backend.shutdown(wait=True)
+
+
+@pytest.mark.filterwarnings("ignore:This process .* is multi-threaded")
+def test_process_backend_keeps_worker_that_reported_an_error(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def _broken_solve(_req, *, progress_cb=None) -> OptimizationResult:
+        raise ValueError("broken plan")
+
+    # Forked workers inherit the patched solve
+    monkeypatch.setattr("services.optimizer_adapter.solve_sync", _broken_solve)
+    backend = ProcessJobBackend(processes=1, start_method="fork")
+    try:
+        pid = backend._workers[0].process.pid
+        job = _wait_done(backend, backend.enqueue(_request()).job_id)
+        assert job.status == "failed"
+        assert backend._workers[0].process.pid == pid
+
+        # A worker killed mid-solve gives back the CPU it leased
+        worker = backend._workers[0]
+        worker.cpu_held[:] = [1, 4]
+        backend._cpu_shared[:] = [1, 4]
+        backend._replace(worker)
+        assert list(backend._cpu_shared) == [0, 0]
+        assert backend.processes == 1
+    finally:
+        backend.shutdown(wait=True)
+
+
+def test_worker_loop_stops_on_cancel(monkeypatch: pytest.MonkeyPatch) -> None:
+    started = threading.Event()
+
+    def _slow_solve(_req, *, progress_cb=None) -> OptimizationResult:
+        started.set()
+        while True:
+            progress_cb(0.5, "stage:profit")
+            time.sleep(0.01)
+
+    monkeypatch.setattr("services.optimizer_adapter.solve_sync", _slow_solve)
+    parent, child = mp.Pipe()
+    loop = threading.Thread(target=_worker_main, args=(child, 0), daemon=True)
+    loop.start()
+    parent.send(("solve", _request().model_dump_json()))
+    assert started.wait(5)
+    parent.send(("cancel",))
+    while (msg := parent.recv())[0] == "progress":
+        assert msg[1:] == (0.5, "stage:profit")
+    assert msg == ("canceled",)
+    parent.send(("stop",))
+    loop.join(5)
+    assert not loop.is_alive()
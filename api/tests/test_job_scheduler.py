@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import date
+from typing import Any
+
+from schemas import (
+    ApiCrop,
+    ApiEvent,
+    ApiHorizon,
+    ApiLand,
+    ApiPlan,
+    OptimizationRequest,
+)
+from services.job_backend_dynamo import DynamoJobBackend
+from services.job_scheduler import PriorityScheduler, parse_priority_limits
+
+
+def _blocker(sched: PriorityScheduler, **kwargs: Any) -> threading.Event:
+    release = threading.Event()
+    started = threading.Event()
+
+    def fn() -> None:
+        started.set()
+        release.wait(2)
+
+    sched.submit(fn, **kwargs)
+    assert started.wait(2)
+    return release
+
+
+def test_smaller_priority_runs_first() -> None:
+    sched = PriorityScheduler(1, aging_s=0)
+    order: list[str] = []
+    release = _blocker(sched)
+    sched.submit(lambda: order.append("batch"), priority=10)
+    sched.submit(lambda: order.append("default"))
+    sched.submit(lambda: order.append("interactive"), priority=0)
+    release.set()
+    sched.shutdown(wait=True)
+    assert order == ["interactive", "default", "batch"]
+
+
+def test_aging_prevents_starvation() -> None:
+    sched = PriorityScheduler(1, aging_s=0.01)
+    order: list[str] = []
+    release = _blocker(sched)
+    sched.submit(lambda: order.append("old-batch"), priority=3)
+    time.sleep(0.1)  # waited ~10 aging steps -> effective priority < 0
+    sched.submit(lambda: order.append("new-interactive"), priority=0)
+    release.set()
+    sched.shutdown(wait=True)
+    assert order == ["old-batch", "new-interactive"]
+
+
+def test_per_priority_limit_keeps_slots_free() -> None:
+    sched = PriorityScheduler(2, aging_s=0, limits=parse_priority_limits("10:1"))
+    release = _blocker(sched, priority=10)
+    second_batch = sched.submit(lambda: "batch", priority=10)
+    interactive = sched.submit(lambda: "interactive", priority=0)
+    assert interactive.result(timeout=2) == "interactive"
+    assert not second_batch.done()
+    release.set()
+    assert second_batch.result(timeout=2) == "batch"
+    sched.shutdown(wait=True)
+
+
+def test_parse_priority_limits_skips_bad_parts() -> None:
+    assert parse_priority_limits("10:1, x:2,20:0,bad") == {10: 1, 20: 1}
+
+
+def _request(priority: int | None) -> OptimizationRequest:
+    return OptimizationRequest(
+        priority=priority,
+        plan=ApiPlan(
+            horizon=ApiHorizon(num_days=2, start_date=date(2025, 1, 1)),
+            crops=[ApiCrop(id="c1", name="作物", price_per_a=1000)],
+            events=[ApiEvent(id="e1", crop_id="c1", name="播種", uses_land=True)],
+            lands=[ApiLand(id="L1", name="畑1", area_a=10)],
+            workers=[],
+            resources=[],
+        ),
+    )
+
+
+class _Recorder:
+    def __init__(self) -> None:
+        self.messages: list[dict[str, Any]] = []
+
+    def put_object(self, **_: Any) -> None:
+        return None
+
+    def send_message(self, **kwargs: Any) -> None:
+        self.messages.append(kwargs)
+
+
+class _Table:
+    def put_item(self, **_: Any) -> None:
+        return None
+
+
+class _Dynamo:
+    def Table(self, _name: str) -> _Table:  # noqa: N802 - boto3 API
+        return _Table()
+
+
+def test_dynamo_routes_urgent_jobs_to_priority_queue() -> None:
+    sqs = _Recorder()
+    backend = DynamoJobBackend(
+        table_name="jobs",
+        bucket_name="bucket",
+        queue_url="normal",
+        jobs_ttl_days=1,
+        priority_queue_url="urgent",
+        priority_threshold=2,
+        dynamodb_resource=_Dynamo(),
+        s3_client=_Recorder(),
+        sqs_client=sqs,
+    )
+    backend.enqueue(_request(0))
+    backend.enqueue(_request(None))
+    assert [m["QueueUrl"] for m in sqs.messages] == ["urgent", "normal"]
+    assert sqs.messages[0]["MessageAttributes"]["priority"]["StringValue"] == "0"
+    assert sqs.messages[1]["MessageAttributes"]["priority"]["StringValue"] == "5"
@@ -0,0 +1,92 @@
+from __future__ import annotations
+
+import random
+
+from lib.constraints import (
+    EventsWindowConstraint,
+    LaborConstraint,
+    LandCapacityConstraint,
+    LinkAreaUseConstraint,
+    OccEqualizeConstraint,
+)
+from lib.lns import LnsOptions, Neighborhood, Pinned, improve, neighborhoods
+from lib.model_builder import build_model
+from lib.objectives import build_profit_expr
+from lib.schemas import Crop, Event, Horizon, Land, PlanRequest, Worker
+from lib.solver import SolveContext, solve
+
+
+def _request() -> PlanRequest:
+    crops = [
+        Crop(id="A", name="A", category="leaf", price_per_area=1000),
+        Crop(id="B", name="B", category="leaf", price_per_area=900),
+        Crop(id="C", name="C", category="root", price_per_area=700),
+    ]
+    events = [
+        Event(
+            id=f"{c.id}_sow",
+            crop_id=c.id,
+            name="sow",
+            start_cond={first},
+            end_cond={first + 4},
+            labor_total_per_area=1.0,
+            uses_land=True,
+        )
+        for c, first in zip(crops, (1, 6, 11), strict=True)
+    ]
+    return PlanRequest(
+        horizon=Horizon(num_days=15),
+        crops=crops,
+        events=events,
+        lands=[Land(id=f"L{i}", name=f"F{i}", area=4.0) for i in range(1, 5)],
+        workers=[Worker(id="W1", name="w1", capacity_per_day=8.0)],
+        resources=[],
+    )
+
+
+def test_neighborhoods_cycle_through_the_farm_structure() -> None:
+    hoods = neighborhoods(_request(), random.Random(0))
+    first = [next(hoods) for _ in range(3)]
+    assert [nb.kind for nb in first] == ["lands", "crops", "window"]
+    assert len(first[0].lands) == 1
+    assert first[1].crops in ({"A", "B"}, {"C"})
+    lo, hi = first[2].days
+    assert hi - lo + 1 == 4
+    # Events are relaxed on every land of a land neighbourhood
+    nb = Neighborhood("lands", lands=frozenset({"L1"}))
+    assert nb.free("L1", "A", 3) and nb.free(None, "C", 9)
+    assert not nb.free("L2", "A", 3)
+
+
+def test_improve_relaxes_parts_of_a_poor_incumbent() -> None:
+    req = _request()
+    base = [
+        LandCapacityConstraint(),
+        LinkAreaUseConstraint(),
+        EventsWindowConstraint(),
+        OccEqualizeConstraint(),
+        LaborConstraint(),
+    ]
+
+    def rebuild(extra):
+        ctx = build_model(req, [*base, *extra], [])
+        return ctx, build_profit_expr(ctx)
+
+    # Incumbent: only L1 is planted
+    ctx, expr = rebuild(
+        [Pinned(SolveContext(build=None), lambda land, _c, _t: land in (None, "L1"))]
+    )
+    ctx.model.Maximize(expr)
+    poor = solve(ctx)
+    assert poor.status == "OPTIMAL"
+    start = int(poor.objective_value)
+
+    best, rows = improve(
+        req, rebuild, poor, "max", LnsOptions(rounds=6, round_s=2.0, parallel=2)
+    )
+    assert len(rows) == 6
+    assert {r["kind"] for r in rows} == {"lands", "crops", "window"}
+    assert any(r["improved"] for r in rows)
+    assert int(best.objective_value) > start
+    # Neighbourhood optima do not prove the stage optimal
+    assert best.status == poor.status
@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from core import config
+from lib.capture import load_artifact, replay_artifact
+from lib.planner import plan
+from lib.schemas import Crop, Event, Horizon, Land, PlanRequest, Worker
+from services.model_capture import capture_sink
+
+
+def _request() -> PlanRequest:
+    return PlanRequest(
+        horizon=Horizon(num_days=3),
+        crops=[
+            Crop(id="C1", name="A", price_per_area=100.0),
+            Crop(id="C2", name="B", price_per_area=60.0),
+        ],
+        events=[
+            Event(
+                id="E1",
+                crop_id="C1",
+                name="plant",
+                start_cond={1, 2, 3},
+                end_cond={1, 2, 3},
+                labor_total_per_area=1.0,
+                uses_land=True,
+            )
+        ],
+        lands=[Land(id="L1", name="F1", area=1.0)],
+        workers=[Worker(id="W1", name="w", capacity_per_day=8.0)],
+        resources=[],
+    )
+
+
+def test_captured_stages_replay_to_same_objective() -> None:
+    captured: dict[str, bytes] = {}
+    resp = plan(
+        _request(),
+        stage_order=["profit", "dispersion"],
+        capture=lambda label, data: captured.__setitem__(label, data),
+    )
+    assert resp.diagnostics.feasible
+    assert sorted(captured) == ["00-profit", "01-dispersion"]
+
+    model, params_text, meta = load_artifact(captured["01-dispersion"])
+    # The second stage carries the hint from the first one
+    assert len(model.Proto().solution_hint.vars) > 0
+    assert "max_time_in_seconds" in params_text
+    assert meta["status"] == "OPTIMAL"
+
+    out = replay_artifact(captured["00-profit"], "num_workers: 1")
+    assert out["status"] == "OPTIMAL"
+    assert out["objective_value"] == out["captured_objective"]
+
+
+def test_capture_build_errors_do_not_fail_the_solve(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    def broken(*_args, **_kwargs):
+        raise ValueError("serialization failed")
+
+    monkeypatch.setattr("lib.solver.build_artifact", broken)
+    captured: dict[str, bytes] = {}
+    resp = plan(
+        _request(),
+        stage_order=["profit"],
+        capture=lambda label, data: captured.__setitem__(label, data),
+    )
+    assert resp.diagnostics.feasible
+    assert resp.objectives["profit"] == 100.0
+    assert captured == {}
+
+
+@pytest.fixture
+def _reset_settings():
+    yield
+    config.reload_settings()
+
+
+def test_capture_sink_writes_local_directory(
+    monkeypatch, tmp_path: Path, _reset_settings
+) -> None:
+    monkeypatch.delenv("SOLVER_CAPTURE", raising=False)
+    config.reload_settings()
+    assert capture_sink("c1") is None
+
+    monkeypatch.setenv("SOLVER_CAPTURE", str(tmp_path))
+    config.reload_settings()
+    sink = capture_sink("c1")
+    assert sink is not None
+    plan(_request(), stage_order=["profit"], capture=sink)
+    assert (tmp_path / "c1" / "00-profit.zip").exists()
@@ -41,7 +41,7 @@ def test_optimize_sync(monkeypatch):
     monkeypatch.setenv("SYNC_TIMEOUT_MS", "1234")
     config.reload_settings()
 
-    def fake_solver(req: OptimizationRequest, timeout_ms: int | None):
+    def fake_solver(req: OptimizationRequest, timeout_ms: int | None, **_kwargs):
         assert timeout_ms == 1234
         return {"status": "ok"}
 
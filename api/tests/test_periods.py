@@ -0,0 +1,194 @@
+from __future__ import annotations
+
+import pytest
+
+from lib.periods import Periods, expand_response, merge_equivalent_periods
+from lib.planner import plan
+from lib.schemas import (
+    Crop,
+    Event,
+    EventAssignment,
+    Horizon,
+    Land,
+    PlanAssignment,
+    PlanDiagnostics,
+    PlanRequest,
+    PlanResponse,
+    ResourceUsageRef,
+    Worker,
+    WorkerRef,
+)
+
+
+def test_periods_check_lags_against_first_days() -> None:
+    # Days 1-2, 3-7 and 8-10; events are reported on days 1, 3 and 8
+    periods = Periods.of(Horizon(num_days=3, period_lengths=[2, 5, 3]))
+    assert (periods.total, periods.length(2)) == (10, 5)
+    assert periods.gap(1, 3) == 7
+    assert periods.lag_predecessors(3, 4, 6) == range(2, 3)
+    assert not periods.lag_predecessors(3, 8, 9)
+    assert periods.recent_predecessors(3, 4) == range(3, 4)
+    assert periods.frequency_window(1, 8) == range(1, 4)
+    assert periods.frequency_window(2, 3) == range(2, 3)
+
+    days = Periods.of(Horizon(num_days=10))
+    assert days.lag_predecessors(5, 2, 3) == range(2, 4)
+    assert days.recent_predecessors(5, 2) == range(4, 6)
+    assert days.frequency_window(9, 3) == range(9, 11)
+
+
+def _request() -> PlanRequest:
+    return PlanRequest(
+        horizon=Horizon(num_days=30),
+        crops=[Crop(id="C1", name="A", price_per_area=1000)],
+        events=[
+            Event(
+                id="sow",
+                crop_id="C1",
+                name="sow",
+                start_cond={5},
+                end_cond={20},
+                # 100 h for the whole land: needs most of the 16-day window
+                labor_total_per_area=20.0,
+                labor_daily_cap=8.0,
+                uses_land=True,
+            ),
+            Event(
+                id="harvest",
+                crop_id="C1",
+                name="harvest",
+                labor_total_per_area=1.0,
+            ),
+        ],
+        lands=[Land(id="L1", name="F1", area=5.0, blocked_days={25, 26})],
+        workers=[Worker(id="W1", name="w1", capacity_per_day=8.0)],
+        resources=[],
+    )
+
+
+def test_merge_equivalent_periods() -> None:
+    merged = merge_equivalent_periods(_request())
+    assert merged.horizon.period_lengths == [4, 16, 4, 2, 4]
+    sow = merged.events[0]
+    assert (sow.start_cond, sow.end_cond) == ({2}, {2})
+    assert merged.lands[0].blocked_days == {4}
+    assert merge_equivalent_periods(merged) is merged
+    assert merged.horizon.period_days is None
+
+    # Buckets of days (compressed plans) keep their days when merged
+    bucketed = _request()
+    bucketed.horizon.period_days = [2] * 30
+    merged = merge_equivalent_periods(bucketed)
+    assert merged.horizon.period_days == [2] * 30
+    assert Periods.of(merged.horizon).length(2) == 32
+
+
+def test_plan_with_merged_periods_matches_days() -> None:
+    full = plan(_request(), stage_order=["profit"])
+    resp = plan(_request(), stage_order=["profit"], merge_periods=True)
+    assert resp.diagnostics.period_merge == {"periods": 30, "merged": 5}
+    # Worker capacity scales with the 16 merged days, so all 5a fit
+    assert resp.objectives["profit"] == full.objectives["profit"] == 5000.0
+    # Indices are original days again
+    days = resp.assignment.crop_area_by_land_t["L1"]
+    assert set(days) <= set(range(1, 31)) and len(days) > 5
+    # The work of the merged days 5-20 is spread over them within 8 h a day
+    sow = [ea for ea in resp.event_assignments if ea.event_id == "sow"]
+    assert [ea.index for ea in sow] == list(range(5, 21))
+    hours = [sum(w.used_time_hours for w in ea.assigned_workers) for ea in sow]
+    assert max(hours) <= 8.0
+    assert sum(hours) == pytest.approx(100.0)
+
+
+def _lagged_request(days: int = 20) -> PlanRequest:
+    return PlanRequest(
+        horizon=Horizon(num_days=days),
+        crops=[Crop(id="C1", name="A", price_per_area=1000)],
+        events=[
+            Event(
+                id="a",
+                crop_id="C1",
+                name="a",
+                labor_total_per_area=1.0,
+                uses_land=True,
+            ),
+            Event(
+                id="b",
+                crop_id="C1",
+                name="b",
+                preceding_event_id="a",
+                lag_min_days=3,
+                lag_max_days=5,
+                labor_total_per_area=1.0,
+                uses_land=True,
+            ),
+        ],
+        lands=[Land(id="L1", name="F1", area=1.0)],
+        workers=[Worker(id="W1", name="w1", capacity_per_day=8.0)],
+        resources=[],
+    )
+
+
+def _days(resp) -> dict[str, list[int]]:
+    out: dict[str, list[int]] = {}
+    for ea in resp.event_assignments or []:
+        out.setdefault(ea.event_id, []).append(ea.index)
+    return out
+
+
+def test_merged_periods_keep_lags_of_the_expanded_plan() -> None:
+    # Without windows, lagged events can fall on any day: nothing merges
+    req = _lagged_request()
+    assert merge_equivalent_periods(req) is req
+    resp = plan(req, stage_order=["profit"], merge_periods=True)
+    days = _days(resp)
+    assert all(3 <= b - max(a for a in days["a"] if a < b) <= 5 for b in days["b"])
+
+    # Windows day-accurate around the lag, merged elsewhere
+    req = _lagged_request(30)
+    req.events[0].start_cond, req.events[0].end_cond = {1}, {4}
+    req.events[1].start_cond, req.events[1].end_cond = {5}, {10}
+    req.events.append(
+        Event(
+            id="c",
+            crop_id="C1",
+            name="c",
+            start_cond={11},
+            end_cond={30},
+            labor_total_per_area=1.0,
+            uses_land=True,
+        )
+    )
+    merged = merge_equivalent_periods(req)
+    assert merged.horizon.period_lengths == [1] * 10 + [20]
+    resp = plan(req, stage_order=["profit"], merge_periods=True)
+    assert resp.diagnostics.period_merge == {"periods": 30, "merged": 11}
+    days = _days(resp)
+    assert days["b"] and days["c"] == list(range(11, 31))
+    assert all(3 <= b - max(a for a in days["a"] if a < b) <= 5 for b in days["b"])
+
+
+def test_expand_response_spreads_work_by_days() -> None:
+    # Index 2 merges buckets of 1 and 7 days
+    resp = PlanResponse(
+        diagnostics=PlanDiagnostics(feasible=True),
+        assignment=PlanAssignment(crop_area_by_land_t={"L1": {2: {"C1": 1.0}}}),
+        event_assignments=[
+            EventAssignment(
+                index=2,
+                event_id="sow",
+                assigned_workers=[WorkerRef(id="W1", name="w1", used_time_hours=16)],
+                resource_usage=[ResourceUsageRef(id="R1", used_time_hours=8)],
+            ),
+            EventAssignment(index=1, event_id="check"),
+        ],
+    )
+    horizon = Horizon(num_days=2, period_lengths=[1, 2], period_days=[7, 1, 7])
+    out = expand_response(resp, horizon)
+    assert set(out.assignment.crop_area_by_land_t["L1"]) == {2, 3}
+    sow = [ea for ea in out.event_assignments if ea.event_id == "sow"]
+    assert [ea.index for ea in sow] == [2, 3]
+    assert [ea.assigned_workers[0].used_time_hours for ea in sow] == [2.0, 14.0]
+    assert [ea.resource_usage[0].used_time_hours for ea in sow] == [1.0, 7.0]
+    # Events without work stay on the first period
+    assert [ea.index for ea in out.event_assignments if ea.event_id == "check"] == [1]
@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+from lib.planner import plan
+from lib.schemas import Crop, Event, Horizon, Land, PlanRequest, Worker
+
+
+def _build_two_crop_request(
+    price1: float, price2: float, labor1: float, labor2: float, *, days: int = 1
+) -> PlanRequest:
+    """Two land-using crops competing for one land and one worker."""
+    window = set(range(1, days + 1))
+    return PlanRequest(
+        horizon=Horizon(num_days=days),
+        crops=[
+            Crop(id="C1", name="A", price_per_area=price1),
+            Crop(id="C2", name="B", price_per_area=price2),
+        ],
+        events=[
+            Event(
+                id=f"E{i}",
+                crop_id=f"C{i}",
+                name=f"work{i}",
+                start_cond=window,
+                end_cond=window,
+                labor_total_per_area=labor,
+                labor_daily_cap=24.0,
+                uses_land=True,
+            )
+            for i, labor in ((1, labor1), (2, labor2))
+        ],
+        lands=[Land(id="L1", name="F1", area=1.0)],
+        workers=[Worker(id="W1", name="w", capacity_per_day=24.0)],
+        resources=[],
+    )
+
+
+def _used_crops(resp) -> set[str]:
+    return {
+        cid
+        for by_t in resp.assignment.crop_area_by_land_t.values()
+        for crops in by_t.values()
+        for cid, area in crops.items()
+        if area > 0
+    }
+
+
+def test_weighted_mode_matches_lexicographic_in_one_block() -> None:
+    req = _build_two_crop_request(
+        price1=120.0, price2=121.0, labor1=10.0, labor2=2.0, days=1
+    )
+    lex = plan(req, stage_order=["profit", "labor", "dispersion"])
+    weighted = plan(req, stage_order=["profit", "labor", "dispersion"], mode="weighted")
+
+    assert weighted.diagnostics.feasible
+    assert weighted.diagnostics.mode == "weighted"
+    assert weighted.diagnostics.mode_note is None
+    assert _used_crops(weighted) == _used_crops(lex) == {"C2"}
+    lex_values = {s["name"]: s["value"] for s in lex.diagnostics.stages}
+    weighted_values = {s["name"]: s["value"] for s in weighted.diagnostics.stages}
+    assert weighted_values == lex_values
+    # All stages were solved together
+    blocks = {tuple(s["weighted_block"]) for s in weighted.diagnostics.stages}
+    assert blocks == {("profit", "labor", "dispersion")}
+
+
+def test_weighted_mode_falls_back_with_tolerance() -> None:
+    req = _build_two_crop_request(
+        price1=120.0, price2=114.0, labor1=10.0, labor2=2.0, days=1
+    )
+    resp = plan(
+        req,
+        stage_order=["profit", "labor"],
+        lock_tolerance_pct=0.10,
+        mode="weighted",
+    )
+    assert resp.diagnostics.feasible
+    assert resp.diagnostics.mode == "lexicographic"
+    assert resp.diagnostics.mode_note
+    # Lexicographic semantics with relaxed profit still prefer low labor
+    assert _used_crops(resp) == {"C2"}
@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import pytest
+
+from core import config
+from lib.planner import plan
+from lib.portfolio import PortfolioOptions, members
+from lib.schemas import Crop, Event, Horizon, Land, PlanRequest, Worker
+from lib.solver_profiles import PROFILES
+
+
+def _request() -> PlanRequest:
+    return PlanRequest(
+        horizon=Horizon(num_days=10),
+        crops=[
+            Crop(id="A", name="A", price_per_area=1000),
+            Crop(id="B", name="B", price_per_area=600),
+        ],
+        events=[
+            Event(
+                id=f"{c}_sow",
+                crop_id=c,
+                name="sow",
+                start_cond={1, 2, 3},
+                end_cond={3},
+                labor_total_per_area=2.0,
+                uses_land=True,
+            )
+            for c in ("A", "B")
+        ],
+        lands=[Land(id="L1", name="F1", area=3.0), Land(id="L2", name="F2", area=2.0)],
+        workers=[Worker(id="W1", name="w1", capacity_per_day=4.0)],
+        resources=[],
+    )
+
+
+def test_members_keep_the_stage_profile_settings() -> None:
+    profiles = members(PROFILES["balanced"], ["lp0", "pseudo_cost"])
+    assert [p.name for p in profiles] == [
+        "balanced",
+        "balanced+lp0",
+        "balanced+pseudo_cost",
+    ]
+    assert {p.relative_gap_limit for p in profiles} == {0.005}
+    assert profiles[1].linearization_level == 0
+    assert profiles[2].search_branching == "PSEUDO_COST_SEARCH"
+    with pytest.raises(ValueError):
+        PortfolioOptions(("lp0", "nope"))
+
+
+def test_portfolio_race_matches_the_in_process_solve(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    monkeypatch.setenv("CP_NUM_WORKERS", "6")
+    config.reload_settings()
+    try:
+        req = _request()
+        single = plan(req, stage_order=["profit", "labor"])
+        raced = plan(
+            req,
+            stage_order=["profit", "labor"],
+            portfolio=PortfolioOptions(("lp0", "pseudo_cost")),
+        )
+        assert raced.diagnostics.feasible
+        for name in ("profit", "labor"):
+            assert raced.objectives[name] == single.objectives[name]
+        for row in raced.diagnostics.stages:
+            race = row["solver"]["portfolio"]
+            assert race["winner"] in {m["profile"] for m in race["members"]}
+            assert len(race["members"]) == 3
+            assert row["status"] == "OPTIMAL"
+
+        # Small models stay in-process
+        small = plan(
+            req,
+            stage_order=["profit"],
+            portfolio=PortfolioOptions(("lp0",), min_variables=10**6),
+        )
+        assert "portfolio" not in small.diagnostics.stages[0]["solver"]
+
+        # Two workers leave room for one member: the stage profile
+        monkeypatch.setenv("CP_NUM_WORKERS", "2")
+        config.reload_settings()
+        solo = plan(req, stage_order=["profit"], portfolio=PortfolioOptions(("lp0",)))
+        assert "portfolio" not in solo.diagnostics.stages[0]["solver"]
+        assert solo.diagnostics.stages[0]["solver"]["name"] == "exact"
+    finally:
+        monkeypatch.delenv("CP_NUM_WORKERS")
+        config.reload_settings()
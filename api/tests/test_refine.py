@@ -0,0 +1,199 @@
+from __future__ import annotations
+
+from datetime import date
+from pathlib import Path
+
+import pytest
+
+from core import config
+from lib.planner import plan
+from lib.refine import restrict_to_solution
+from lib.schemas import (
+    Crop,
+    Event,
+    EventAssignment,
+    Horizon,
+    Land,
+    PlanAssignment,
+    PlanDiagnostics,
+    PlanRequest,
+    PlanResponse,
+    Worker,
+)
+from schemas import (
+    ApiCrop,
+    ApiEvent,
+    ApiHorizon,
+    ApiLand,
+    ApiPlan,
+    ApiWorker,
+    OptimizationRequest,
+    OptimizationStagesConfig,
+)
+from services.optimizer_adapter import solve_sync
+
+
+def _day_request() -> PlanRequest:
+    events = []
+    for crop_id in ("C1", "C2"):
+        events += [
+            Event(
+                id=f"{crop_id}_sow",
+                crop_id=crop_id,
+                name="sow",
+                start_cond={1},
+                end_cond={30},
+                labor_total_per_area=1.0,
+                uses_land=True,
+            ),
+            Event(
+                id=f"{crop_id}_harvest",
+                crop_id=crop_id,
+                name="harvest",
+                preceding_event_id=f"{crop_id}_sow",
+                lag_min_days=7,
+                labor_total_per_area=1.0,
+            ),
+        ]
+    events.append(
+        Event(id="C1_water", crop_id="C1", name="water", start_cond={3}, end_cond={25})
+    )
+    return PlanRequest(
+        horizon=Horizon(num_days=30),
+        crops=[
+            Crop(id="C1", name="A", price_per_area=1000),
+            Crop(id="C2", name="B", price_per_area=500),
+        ],
+        events=events,
+        lands=[Land(id="L1", name="F1", area=5.0), Land(id="L2", name="F2", area=5.0)],
+        workers=[Worker(id="W1", name="w1", capacity_per_day=8.0)],
+        resources=[],
+    )
+
+
+def test_restrict_to_solution_narrows_windows_and_crops() -> None:
+    # Three 10-day periods; the coarse plan grew C1 on L1 only
+    days_by_period = {p: list(range(10 * p - 9, 10 * p + 1)) for p in (1, 2, 3)}
+    coarse = PlanResponse(
+        diagnostics=PlanDiagnostics(feasible=True),
+        assignment=PlanAssignment(crop_area_by_land_t={"L1": {1: {"C1": 5.0}}}),
+        event_assignments=[
+            EventAssignment(index=1, event_id="C1_sow"),
+            EventAssignment(index=2, event_id="C1_harvest"),
+        ],
+    )
+    req = restrict_to_solution(_day_request(), coarse, days_by_period, margin=0)
+    windows = {e.id: (e.start_cond, e.end_cond) for e in req.events}
+    assert windows == {
+        "C1_sow": ({1}, {10}),
+        "C1_harvest": ({11}, {20}),
+        # Inactive in the coarse plan: original window
+        "C1_water": ({3}, {25}),
+    }
+    assert req.allowed_crops_by_land == {"L1": {"C1"}, "L2": set()}
+
+    req = restrict_to_solution(_day_request(), coarse, days_by_period, margin=1)
+    assert {e.id: (e.start_cond, e.end_cond) for e in req.events}["C1_sow"] == (
+        {1},
+        {20},
+    )
+    req = restrict_to_solution(_day_request(), coarse, days_by_period, margin=None)
+    assert req.events[0].end_cond == {30}
+
+
+def test_allowed_crops_by_land_is_enforced() -> None:
+    req = _day_request()
+    req.allowed_crops_by_land = {"L1": {"C2"}}
+    resp = plan(req, stage_order=["profit"])
+    assert resp.diagnostics.feasible
+    by_land = resp.assignment.crop_area_by_land_t
+    assert {c for per in by_land["L1"].values() for c in per} == {"C2"}
+    # L2 is not listed and stays unrestricted
+    assert "C1" in {c for per in by_land["L2"].values() for c in per}
+
+
+def _api_plan() -> ApiPlan:
+    return ApiPlan(
+        horizon=ApiHorizon(num_days=40, start_date=date(2025, 1, 1)),
+        crops=[ApiCrop(id="c1", name="作物", price_per_a=1000)],
+        events=[
+            ApiEvent(
+                id="e1",
+                crop_id="c1",
+                name="播種",
+                labor_total_per_a=1.0,
+                uses_land=True,
+            ),
+            ApiEvent(
+                id="e2",
+                crop_id="c1",
+                name="収穫",
+                preceding_event_id="e1",
+                lag_min_days=7,
+                labor_total_per_a=1.0,
+                uses_land=True,
+            ),
+        ],
+        lands=[ApiLand(id="L1", name="畑1", area_a=5)],
+        workers=[ApiWorker(id="W1", name="w1", capacity_per_day=8.0)],
+        resources=[],
+        stages=OptimizationStagesConfig(stage_order=["profit"], refine_days=True),
+    )
+
+
+def test_solve_sync_refines_to_days(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    monkeypatch.setenv("SOLVER_CAPTURE", str(tmp_path))
+    config.reload_settings()
+    res = solve_sync(OptimizationRequest(plan=_api_plan()))
+    assert res.status == "ok"
+    refine = res.stats["refine"]
+    assert refine["applied"]
+    assert refine["day_profit"] == refine["coarse_profit"] == 5000.0
+
+    # Day-accurate lag in the day timeline; the third timeline stays compatible
+    days = {ev.event_id: ev.index for ev in res.day_timeline.events}
+    assert days["e2"] - days["e1"] >= 7
+    thirds = {ev.event_id: ev.index for ev in res.timeline.events}
+    assert thirds["e1"] <= thirds["e2"] <= 3
+    assert res.timeline.land_spans[0].end_index <= 3
+
+    # Refine attempts do not overwrite the coarse solve's capture
+    (capture_dir,) = tmp_path.iterdir()
+    labels = sorted(p.name for p in capture_dir.iterdir())
+    assert labels[0] == "00-profit.zip"
+    assert labels[1:] == [
+        f"refine-m{a['margin'] or 'full'}-00-profit.zip" for a in refine["attempts"]
+    ]
+    config.reload_settings()
+
+
+def test_refine_widens_windows_after_an_infeasible_attempt(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    import services.optimizer_adapter as adapter
+
+    monkeypatch.setenv("RESULT_CACHE_ENABLED", "false")
+    config.reload_settings()
+    day_calls = []
+
+    def narrow_fails(req, *args, **kwargs):
+        # The coarse plan has 4 thirds; the day-level ones have 40 days
+        if req.horizon.num_days == 40:
+            day_calls.append(req)
+            if len(day_calls) == 1:
+                return PlanResponse(
+                    diagnostics=PlanDiagnostics(feasible=False, reason="stub"),
+                    assignment=PlanAssignment(),
+                )
+        return plan(req, *args, **kwargs)
+
+    monkeypatch.setattr(adapter, "run_plan", narrow_fails)
+    res = solve_sync(OptimizationRequest(plan=_api_plan()))
+    refine = res.stats["refine"]
+    assert refine["applied"]
+    assert refine["attempts"][0] == {"margin": 1, "profit": None}
+    assert refine["attempts"][1]["margin"] == 3
+    assert refine["day_profit"] == 5000.0
+    config.reload_settings()
@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import time
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import create_app
+from core import config
+from lib.planner import plan
+from lib.replan import affected_crops, replan
+from lib.schemas import (
+    Crop,
+    Event,
+    Horizon,
+    Land,
+    PlanRequest,
+    PlanResponse,
+    Worker,
+)
+from schemas import (
+    ApiCrop,
+    ApiEvent,
+    ApiHorizon,
+    ApiLand,
+    ApiPlan,
+    ApiWorker,
+    OptimizationRequest,
+    OptimizationStagesConfig,
+)
+
+
+def _season(crop_id: str, first: int, last: int) -> list[Event]:
+    return [
+        Event(
+            id=f"{crop_id}_sow",
+            crop_id=crop_id,
+            name="sow",
+            start_cond={first},
+            end_cond={last},
+            labor_total_per_area=1.0,
+            uses_land=True,
+        ),
+        Event(
+            id=f"{crop_id}_harvest",
+            crop_id=crop_id,
+            name="harvest",
+            start_cond={first},
+            end_cond={20},
+            preceding_event_id=f"{crop_id}_sow",
+            lag_min_days=3,
+            labor_total_per_area=1.0,
+            uses_land=True,
+        ),
+    ]
+
+
+def _request() -> PlanRequest:
+    return PlanRequest(
+        horizon=Horizon(num_days=20),
+        crops=[
+            Crop(id="A", name="A", price_per_area=1000),
+            Crop(id="B", name="B", price_per_area=800),
+        ],
+        events=_season("A", 1, 8) + _season("B", 5, 12),
+        lands=[
+            Land(id="L1", name="F1", area=5.0),
+            Land(id="L2", name="F2", area=5.0),
+        ],
+        workers=[
+            Worker(id="W1", name="w1", capacity_per_day=8.0),
+            Worker(id="W2", name="w2", capacity_per_day=12.0),
+        ],
+        resources=[],
+    )
+
+
+def _areas(resp: PlanResponse, crop_id: str) -> dict[tuple[str, int], float]:
+    return {
+        (land_id, t): per_crop[crop_id]
+        for land_id, per_t in resp.assignment.crop_area_by_land_t.items()
+        for t, per_crop in per_t.items()
+        if crop_id in per_crop
+    }
+
+
+def test_replan_solves_only_the_edited_crop() -> None:
+    base_req = _request()
+    base = plan(base_req, stage_order=["profit", "dispersion"])
+    req = base_req.model_copy(
+        update={
+            "crops": [
+                base_req.crops[0],
+                base_req.crops[1].model_copy(update={"price_per_area": 900}),
+            ]
+        }
+    )
+    assert affected_crops(base_req, req, base) == {"B"}
+    resp = replan(req, base_req, base, stage_order=["profit", "dispersion"])
+    assert resp.diagnostics.feasible
+    assert resp.diagnostics.replan["scope"] == "neighborhood"
+    assert resp.diagnostics.replan["crops"] == ["B"]
+    assert resp.diagnostics.stages[0]["hint"] == "incumbent"
+    assert _areas(resp, "A") == _areas(base, "A")
+    assert resp.objectives["profit"] >= base.objectives["profit"]
+
+
+def test_replan_keeps_the_past_and_moves_the_future() -> None:
+    base_req = _request()
+    base = plan(base_req, stage_order=["profit"])
+    # W1 is away from day 6 on; days 1-5 already happened
+    workers = [
+        base_req.workers[0].model_copy(update={"blocked_days": set(range(6, 21))}),
+        base_req.workers[1],
+    ]
+    req = base_req.model_copy(update={"workers": workers})
+    resp = replan(req, base_req, base, freeze_before=6, stage_order=["profit"])
+    assert resp.diagnostics.feasible
+    assert resp.diagnostics.replan["frozen_before"] == 6
+
+    def past(r: PlanResponse) -> list[tuple]:
+        return sorted(
+            (ea.index, ea.event_id, w.id, w.used_time_hours)
+            for ea in r.event_assignments
+            if ea.index < 6
+            for w in ea.assigned_workers
+        )
+
+    assert past(resp) == past(base)
+    assert all(
+        w.id != "W1"
+        for ea in resp.event_assignments
+        if ea.index >= 6
+        for w in ea.assigned_workers
+    )
+
+
+def _api_plan() -> ApiPlan:
+    return ApiPlan(
+        horizon=ApiHorizon(num_days=20, start_date=date(2025, 4, 1)),
+        crops=[
+            ApiCrop(id="c1", name="レタス", price_per_a=1000),
+            ApiCrop(id="c2", name="キャベツ", price_per_a=800),
+        ],
+        events=[
+            ApiEvent(
+                id=f"{crop}_sow",
+                crop_id=crop,
+                name="播種",
+                start_min_day=first,
+                end_max_day=first + 6,
+                labor_total_per_a=1.0,
+                uses_land=True,
+            )
+            for crop, first in (("c1", 0), ("c2", 8))
+        ],
+        lands=[
+            ApiLand(id="L1", name="畑1", area_a=5),
+            ApiLand(id="L2", name="畑2", area_a=5),
+        ],
+        workers=[ApiWorker(id="W1", name="w1", capacity_per_day=8.0)],
+        resources=[],
+        stages=OptimizationStagesConfig(stage_order=["profit"], granularity="day"),
+    )
+
+
+def test_replan_endpoint(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("AUTH_MODE", "none")
+    config.reload_settings()
+    client = TestClient(create_app())
+
+    body = OptimizationRequest(plan=_api_plan()).model_dump(mode="json")
+    job_id = client.post("/v1/optimize/async", json=body).json()["job_id"]
+    for _ in range(200):
+        job = client.get(f"/v1/jobs/{job_id}").json()
+        if job["status"] not in ("pending", "running"):
+            break
+        time.sleep(0.05)
+    assert job["status"] == "succeeded"
+
+    delta = {"crops": [{"id": "c2", "name": "キャベツ", "price_per_a": 1200}]}
+    r = client.post(
+        "/v1/optimize/replan",
+        json={"base_job_id": job_id, "delta": delta, "freeze_before_day": 3},
+    )
+    assert r.status_code == 200, r.text
+    res = r.json()
+    assert res["status"] == "ok"
+    assert res["stats"]["replan"]["base_job_id"] == job_id
+    assert res["stats"]["replan"]["crops"] == ["c2"]
+    assert res["stats"]["replan"]["frozen_before"] == 4
+    c1 = [s for s in job["result"]["timeline"]["land_spans"] if s["crop_id"] == "c1"]
+    assert [s for s in res["timeline"]["land_spans"] if s["crop_id"] == "c1"] == c1
+
+    r = client.post("/v1/optimize/replan", json={"base_job_id": "missing"})
+    assert r.status_code == 404
+    r = client.post(
+        "/v1/optimize/replan",
+        json={"base_job_id": job_id, "delta": {"remove_ids": ["c2"]}},
+    )
+    assert r.json()["stats"]["replan"]["crops"] == []
+    bad = {"events": [{"id": "x", "crop_id": "c9", "name": "?"}]}
+    r = client.post("/v1/optimize/replan", json={"base_job_id": job_id, "delta": bad})
+    assert r.status_code == 422
@@ -0,0 +1,156 @@
+from __future__ import annotations
+
+from datetime import date
+from typing import Any
+
+import pytest
+
+from lib.schemas import Crop, Horizon, Land, PlanRequest
+from schemas import (
+    ApiCrop,
+    ApiEvent,
+    ApiHorizon,
+    ApiLand,
+    ApiPlan,
+    OptimizationRequest,
+    OptimizationResult,
+    OptimizationStagesConfig,
+)
+from services import result_cache
+from services.optimizer_adapter import request_hash, solve_sync
+from services.result_cache import ResultCache, request_key
+
+
+def _domain(tags: set[str]) -> PlanRequest:
+    return PlanRequest(
+        horizon=Horizon(num_days=3),
+        crops=[Crop(id="C1", name="A", price_per_area=1.0)],
+        events=[],
+        lands=[Land(id="L1", name="F1", area=1.0, tags=tags)],
+        workers=[],
+        resources=[],
+    )
+
+
+def _result(value: float, pad: int = 0) -> OptimizationResult:
+    return OptimizationResult(
+        status="ok",
+        objective_value=value,
+        solution={"pad": "x" * pad},
+        stats={"stages": [{"name": "profit", "status": "OPTIMAL"}]},
+        warnings=[],
+    )
+
+
+def test_request_key_is_canonical() -> None:
+    a = request_key(_domain({"a", "b", "c"}), None, "2025-01-01")
+    b = request_key(_domain({"c", "b", "a"}), None, "2025-01-01")
+    assert a == b
+    stages = OptimizationStagesConfig(stage_order=["profit"])
+    assert request_key(_domain({"a"}), stages, None) != request_key(
+        _domain({"a"}), None, None
+    )
+    assert request_key(_domain({"a"}), None, "2025-01-01") != request_key(
+        _domain({"a"}), None, "2025-02-01"
+    )
+
+
+def test_lru_evicts_by_size() -> None:
+    size = len(_result(1.0, pad=400).model_dump_json())
+    cache = ResultCache(max_bytes=size * 2 + 10)
+    cache.put("k1", _result(1.0, pad=400))
+    cache.put("k2", _result(2.0, pad=400))
+    assert cache.get("k1") is not None  # k1 becomes most recent
+    cache.put("k3", _result(3.0, pad=400))
+    assert cache.get("k2") is None
+    assert cache.get("k1").objective_value == 1.0
+    assert cache.get("k3").objective_value == 3.0
+    assert cache.size_bytes <= size * 2 + 10
+
+
+class _FakeS3:
+    def __init__(self) -> None:
+        self.objects: dict[str, bytes] = {}
+
+    def put_object(self, *, Bucket: str, Key: str, Body: bytes, **_: Any) -> None:
+        self.objects[f"{Bucket}/{Key}"] = Body
+
+    def get_object(self, *, Bucket: str, Key: str) -> dict[str, Any]:
+        data = self.objects[f"{Bucket}/{Key}"]
+
+        class _Body:
+            def read(self) -> bytes:
+                return data
+
+        return {"Body": _Body()}
+
+
+def test_persistent_tier_survives_memory_eviction() -> None:
+    s3 = _FakeS3()
+    ResultCache(max_bytes=1 << 20, bucket_name="b", s3_client=s3).put("k", _result(5.0))
+    fresh = ResultCache(max_bytes=1 << 20, bucket_name="b", s3_client=s3)
+    hit = fresh.get("k")
+    assert hit is not None and hit.objective_value == 5.0
+    assert fresh.get("missing") is None
+
+
+@pytest.fixture
+def _fresh_cache():
+    result_cache.reset_cache()
+    yield
+    result_cache.reset_cache()
+
+
+def test_solve_sync_reuses_cached_result(_fresh_cache) -> None:
+    req = OptimizationRequest(
+        plan=ApiPlan(
+            horizon=ApiHorizon(num_days=3, start_date=date(2025, 4, 1)),
+            crops=[ApiCrop(id="c1", name="作物", price_per_a=1000)],
+            events=[ApiEvent(id="e1", crop_id="c1", name="播種", uses_land=True)],
+            lands=[ApiLand(id="L1", name="畑1", area_a=2)],
+            workers=[],
+            resources=[],
+            stages=OptimizationStagesConfig(stage_order=["profit"]),
+        )
+    )
+    first = solve_sync(req)
+    assert first.status == "ok"
+    assert first.stats["cache"] == "miss"
+    second = solve_sync(req)
+    assert second.stats["cache"] == "hit"
+    assert second.objective_value == first.objective_value
+    assert second.timeline == first.timeline
+
+
+def test_refined_requests_differing_within_a_bucket_do_not_share_a_key(
+    _fresh_cache,
+) -> None:
+    def req(start_min_day: int) -> OptimizationRequest:
+        return OptimizationRequest(
+            plan=ApiPlan(
+                horizon=ApiHorizon(num_days=30, start_date=date(2025, 4, 1)),
+                crops=[ApiCrop(id="c1", name="作物", price_per_a=1000)],
+                events=[
+                    ApiEvent(
+                        id="e1",
+                        crop_id="c1",
+                        name="播種",
+                        start_min_day=start_min_day,
+                        uses_land=True,
+                    )
+                ],
+                lands=[ApiLand(id="L1", name="畑1", area_a=2)],
+                workers=[],
+                resources=[],
+                stages=OptimizationStagesConfig(
+                    stage_order=["profit"], granularity="third", refine_days=True
+                ),
+            )
+        )
+
+    # Both windows open in the first third
+    assert request_hash(req(1)) != request_hash(req(3))
+    solve_sync(req(1))
+    res = solve_sync(req(3))
+    assert res.stats.get("cache") != "hit"
+    assert all(ev.index >= 3 for ev in res.day_timeline.events)
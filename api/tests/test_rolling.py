@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+import pytest
+from pydantic import ValidationError
+
+from lib.constants import AREA_SCALE_UNITS_PER_A
+from lib.planner import plan
+from lib.rolling import _Reserved, crop_groups, plan_rolling
+from lib.schemas import (
+    Crop,
+    CropAreaBound,
+    Event,
+    Horizon,
+    Land,
+    PlanRequest,
+    Worker,
+)
+from schemas import OptimizationStagesConfig
+
+
+def _season(crop_id: str, first: int, last: int, **kw) -> list[Event]:
+    return [
+        Event(
+            id=f"{crop_id}_sow",
+            crop_id=crop_id,
+            name="sow",
+            start_cond={first},
+            end_cond={last},
+            labor_total_per_area=1.0,
+            uses_land=True,
+        ),
+        Event(
+            id=f"{crop_id}_harvest",
+            crop_id=crop_id,
+            name="harvest",
+            start_cond={first},
+            end_cond={last},
+            preceding_event_id=kw.get("after", f"{crop_id}_sow"),
+            lag_min_days=5,
+            labor_total_per_area=1.0,
+            uses_land=True,
+        ),
+    ]
+
+
+def _request() -> PlanRequest:
+    # Three seasons on one field; B's window overlaps A's, C comes later and
+    # its harvest follows B's sowing
+    events = _season("A", 1, 20) + _season("B", 15, 40)
+    events += _season("C", 45, 60, after="B_sow")
+    return PlanRequest(
+        horizon=Horizon(num_days=60),
+        crops=[
+            Crop(id="A", name="A", price_per_area=1000),
+            Crop(id="B", name="B", price_per_area=800),
+            Crop(id="C", name="C", price_per_area=500),
+        ],
+        events=events,
+        lands=[Land(id="L1", name="F1", area=5.0)],
+        workers=[Worker(id="W1", name="w1", capacity_per_day=8.0)],
+        resources=[],
+    )
+
+
+def test_crop_groups_follow_cross_crop_lags() -> None:
+    groups = crop_groups(_request())
+    assert [(g.crop_ids, g.start, g.end) for g in groups] == [
+        ({"A"}, 1, 20),
+        ({"B", "C"}, 15, 60),
+    ]
+
+
+def test_plan_rolling_reserves_frozen_crops() -> None:
+    req = _request()
+    full = plan(req, stage_order=["profit"])
+    resp = plan_rolling(req, window_days=10, step_days=10, stage_order=["profit"])
+    assert resp.diagnostics.feasible
+    windows = resp.diagnostics.rolling_windows
+    assert [(w["start_day"], w["decided"]) for w in windows] == [
+        (1, ["A"]),
+        (15, ["B", "C"]),
+    ]
+    assert {s["window"] for s in resp.diagnostics.stages} == {0, 1}
+    # A took the field first, B and C are planned around it on original days
+    by_day = resp.assignment.crop_area_by_land_t["L1"]
+    assert all(sum(per.values()) <= 5.0 for per in by_day.values())
+    assert max(by_day) > 40
+    assert resp.objectives["profit"] == full.objectives["profit"]
+    assert {ea.event_id for ea in resp.event_assignments} >= {"A_sow", "C_harvest"}
+
+    # Reservations are per day, so windows never merge periods
+    merged = plan_rolling(
+        req, window_days=10, step_days=10, stage_order=["profit"], merge_periods=True
+    )
+    assert merged.diagnostics.period_merge is None
+    assert merged.objectives["profit"] == resp.objectives["profit"]
+
+
+def test_land_reservations_are_explained() -> None:
+    req = PlanRequest(
+        horizon=Horizon(num_days=4),
+        crops=[Crop(id="C1", name="A", price_per_area=100)],
+        events=[
+            Event(
+                id="E1",
+                crop_id="C1",
+                name="sow",
+                start_cond={1, 2},
+                end_cond={1, 2},
+                labor_total_per_area=1.0,
+                uses_land=True,
+            )
+        ],
+        lands=[Land(id="L1", name="F1", area=2.0)],
+        workers=[Worker(id="W1", name="w1", capacity_per_day=8.0)],
+        resources=[],
+        crop_area_bounds=[CropAreaBound(crop_id="C1", min_area=1.0)],
+    )
+    assert plan(req, stage_order=["profit"]).diagnostics.feasible
+    # Frozen crops of earlier windows hold the whole field
+    frozen = _Reserved(
+        land={("L1", t): 2 * AREA_SCALE_UNITS_PER_A for t in range(1, 5)}
+    )
+    resp = plan(req, [frozen], stage_order=["profit"], explain=True)
+    assert not resp.diagnostics.feasible
+    assert "land_capacity:L1" in resp.diagnostics.violated_constraints
+
+
+def test_rolling_stage_config_is_validated() -> None:
+    with pytest.raises(ValidationError):
+        OptimizationStagesConfig(rolling_step_days=5)
+    with pytest.raises(ValidationError):
+        OptimizationStagesConfig(rolling_window_days=10, rolling_step_days=20)
+    assert OptimizationStagesConfig(rolling_window_days=10).rolling_step_days is None
@@ -0,0 +1,190 @@
+from __future__ import annotations
+
+import threading
+import time
+from datetime import date
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app import create_app
+from core import config
+from lib.cancel import SolveStopped, StopToken, current_token, stop_scope
+from lib.planner import plan
+from lib.scenarios import Scenario, run_scenarios
+from lib.schemas import (
+    Crop,
+    Event,
+    Horizon,
+    Land,
+    PlanRequest,
+    PlanResponse,
+    Worker,
+)
+from schemas import ApiCrop, ApiEvent, ApiHorizon, ApiLand, ApiPlan, ApiWorker
+from services.granularity import choose_bucketing
+from services.optimizer_adapter import _compress_api_plan
+
+
+def _request() -> PlanRequest:
+    crops = [
+        Crop(id="A", name="A", price_per_area=1000),
+        Crop(id="B", name="B", price_per_area=600),
+    ]
+    return PlanRequest(
+        horizon=Horizon(num_days=10),
+        crops=crops,
+        events=[
+            Event(
+                id=f"{c.id}_sow",
+                crop_id=c.id,
+                name="sow",
+                start_cond={1, 2, 3},
+                end_cond={5},
+                labor_total_per_area=3.0 if c.id == "A" else 1.0,
+                uses_land=True,
+            )
+            for c in crops
+        ],
+        lands=[Land(id=f"L{i}", name=f"F{i}", area=2.0) for i in range(1, 4)],
+        workers=[Worker(id="W1", name="w1", capacity_per_day=4.0)],
+        resources=[],
+    )
+
+
+def test_scenarios_match_independent_solves_and_hint_from_neighbours() -> None:
+    req = _request()
+    scenarios = [
+        Scenario("b_up", price_per_area={"B": 1200}),
+        Scenario("b_up_more", price_per_area={"B": 1500}),
+        Scenario("more_hands", capacity_per_day={"W1": 8.0}),
+        Scenario("cap_a", area_bounds={"A": (None, 1.0)}),
+    ]
+    order = ["profit", "labor"]
+    base, runs = run_scenarios(req, scenarios, parallel=2, stage_order=order)
+    assert base.hint_from is None
+    assert [r.name for r in runs] == [s.name for s in scenarios]
+    for sc, run in zip(scenarios, runs, strict=True):
+        alone = plan(sc.apply(req), stage_order=order)
+        assert run.feasible
+        assert run.hint_from is not None
+        for name in order:
+            assert run.response.objectives[name] == alone.objectives[name]
+    by_name = {r.name: r for r in runs}
+    # +150% on B is nearest to +100% on B (unless both ran at once)
+    assert by_name["b_up_more"].hint_from in ("b_up", "base")
+    assert Scenario("x", price_per_area={"B": 1500}).shifts(req) == {"price:B": 1.5}
+
+    with pytest.raises(ValueError):
+        run_scenarios(req, [Scenario("x", capacity_per_day={"W9": 1.0})])
+    with pytest.raises(ValueError):
+        run_scenarios(req, [Scenario("base")])
+
+
+def _stall_scenarios(monkeypatch: pytest.MonkeyPatch, base: PlanResponse) -> None:
+    """Answer the first plan with ``base`` at once, so deadlines do not
+    depend on solver speed; later ones wait for their stop token."""
+    import lib.scenarios as scenarios_mod
+
+    calls = []
+
+    def slow_plan(req, *args, **kwargs):
+        calls.append(req)
+        if len(calls) == 1:
+            return base
+        stopped = threading.Event()
+        token = current_token()
+        with token.on_stop(stopped.set):
+            stopped.wait(10)
+        token.check()
+
+    monkeypatch.setattr(scenarios_mod, "plan", slow_plan)
+
+
+def test_scenarios_deadline_keeps_finished_runs(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    req = _request()
+    _stall_scenarios(monkeypatch, plan(req))
+    scenarios = [Scenario(f"s{i}", price_per_area={"B": 700 + i}) for i in range(3)]
+    t0 = time.monotonic()
+    base, runs = run_scenarios(req, scenarios, deadline=t0 + 0.2)
+    assert time.monotonic() - t0 < 5
+    assert base.feasible and not base.stopped
+    assert [r.name for r in runs] == ["s0", "s1", "s2"]
+    assert all(r.stopped and not r.feasible and r.hint_from is None for r in runs)
+
+    # A stop of the caller's own token is not a deadline: it propagates
+    parent = StopToken()
+    threading.Timer(0.2, parent.stop).start()
+    with stop_scope(parent), pytest.raises(SolveStopped):
+        run_scenarios(req, scenarios)
+
+
+def _api_plan() -> ApiPlan:
+    return ApiPlan(
+        horizon=ApiHorizon(num_days=10, start_date=date(2025, 4, 1)),
+        crops=[
+            ApiCrop(id="c1", name="レタス", price_per_a=1000),
+            ApiCrop(id="c2", name="キャベツ", price_per_10a=6000),
+        ],
+        events=[
+            ApiEvent(
+                id=f"{crop}_sow",
+                crop_id=crop,
+                name="播種",
+                start_min_day=0,
+                end_max_day=4,
+                labor_total_per_a=labor,
+                uses_land=True,
+            )
+            for crop, labor in (("c1", 3.0), ("c2", 1.0))
+        ],
+        lands=[ApiLand(id=f"L{i}", name=f"畑{i}", area_a=2) for i in range(1, 4)],
+        workers=[ApiWorker(id="W1", name="w1", capacity_per_day=2.0)],
+        resources=[],
+    )
+
+
+def test_scenarios_endpoint(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("AUTH_MODE", "none")
+    config.reload_settings()
+    client = TestClient(create_app())
+
+    body = {
+        "plan": _api_plan().model_dump(mode="json"),
+        "scenarios": [
+            {"name": "c2_high", "price_per_a": {"c2": 2000}},
+            {"name": "busy", "capacity_per_day": {"W1": 0.5}},
+            {
+                "name": "c1_min",
+                "crop_area_bounds": [{"crop_id": "c1", "min_area_a": 6}],
+            },
+        ],
+    }
+    r = client.post("/v1/optimize/scenarios", json=body)
+    assert r.status_code == 200, r.text
+    res = r.json()
+    assert res["status"] == "ok"
+    assert res["base"]["name"] == "base" and res["base"]["profit_delta"] == 0
+    rows = {row["name"]: row for row in res["scenarios"]}
+    assert list(rows) == ["c2_high", "busy", "c1_min"]
+    assert rows["c2_high"]["profit_delta"] > 0
+    assert rows["busy"]["profit_delta"] < 0
+    assert rows["c1_min"]["crop_area_a"] == {"c1": 6.0}
+    assert all(row["hint_from"] is not None for row in rows.values())
+
+    api = _api_plan()
+    _stall_scenarios(monkeypatch, plan(_compress_api_plan(api, choose_bucketing(api))))
+    r = client.post("/v1/optimize/scenarios", json={**body, "timeout_ms": 200})
+    assert r.status_code == 200, r.text
+    res = r.json()
+    assert res["status"] == "ok" and res["base"]["status"] == "ok"
+    assert [row["status"] for row in res["scenarios"]] == ["timeout"] * 3
+    assert res["stats"]["timed_out"] == 3
+
+    body["scenarios"] = [{"name": "x", "price_per_a": {"nope": 1.0}}]
+    assert client.post("/v1/optimize/scenarios", json=body).status_code == 422
+    body["scenarios"] = [{"name": "base"}]
+    assert client.post("/v1/optimize/scenarios", json=body).status_code == 422
+    config.reload_settings()
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import pytest
+
+from lib.planner import plan
+from lib.schemas import (
+    Crop,
+    CropAreaBound,
+    Event,
+    FixedArea,
+    Horizon,
+    Land,
+    PlanRequest,
+    Worker,
+)
+from lib.screening import screen
+from schemas import OptimizationResult
+from services.result_cache import is_cacheable
+
+
+def _event(eid: str, **kw) -> Event:
+    return Event(
+        id=eid,
+        crop_id="C1",
+        name=eid,
+        labor_total_per_area=10.0,
+        start_cond={1, 2},
+        end_cond={1, 2},
+        uses_land=True,
+        **kw,
+    )
+
+
+def _request(events: list[Event], workers: list[Worker], **kw) -> PlanRequest:
+    return PlanRequest(
+        horizon=Horizon(num_days=4),
+        crops=[Crop(id="C1", name="A", price_per_area=100)],
+        events=events,
+        lands=[Land(id="L1", name="F1", area=2.0, tags={"north"})],
+        workers=workers,
+        resources=[],
+        crop_area_bounds=[CropAreaBound(crop_id="C1", min_area=1.0)],
+        **kw,
+    )
+
+
+def _worker(cap: float = 8.0, roles: set[str] | None = None) -> Worker:
+    return Worker(id="W1", name="w1", capacity_per_day=cap, roles=roles or set())
+
+
+def test_feasible_request_passes() -> None:
+    req = _request(
+        [_event("E1", required_roles={"harvester"})], [_worker(roles={"harvester"})]
+    )
+    assert screen(req) == []
+    assert plan(req, stage_order=["profit"]).diagnostics.feasible
+
+
+@pytest.mark.parametrize(
+    ("events", "workers", "code"),
+    [
+        # No worker holds the role
+        ([_event("E1", required_roles={"harvester"})], [_worker()], "missing_role"),
+        # 10 h for 1 a but 2 days x 4 h
+        ([_event("E1")], [_worker(cap=4.0)], "labor_capacity"),
+        # Event cap of 3 h/day over 2 days
+        ([_event("E1", labor_daily_cap=3.0)], [_worker()], "labor_capacity"),
+        # Each event fits alone (10 <= 16 h) but not both together
+        ([_event("E1"), _event("E2")], [_worker()], "labor_capacity"),
+    ],
+)
+def test_labor_screening_agrees_with_solver(
+    events: list[Event], workers: list[Worker], code: str
+) -> None:
+    req = _request(events, workers)
+    issues = screen(req)
+    assert [i.code for i in issues] == [code]
+
+    resp = plan(req, stage_order=["profit"])
+    assert not resp.diagnostics.feasible
+    assert resp.diagnostics.stages == []
+    assert resp.diagnostics.violated_constraints == [code]
+    assert resp.diagnostics.reason.startswith("screening: ")
+
+    # The full model must agree; screening only reports proven infeasibility
+    solved = plan(req, stage_order=["profit"], screening=False)
+    assert not solved.diagnostics.feasible
+    assert solved.diagnostics.failed_stage
+
+
+def test_area_screening() -> None:
+    req = _request(
+        [],
+        [],
+        fixed_areas=[FixedArea(land_tag="north", crop_id="C1", area=3.0)],
+    )
+    req.crop_area_bounds = [CropAreaBound(crop_id="C1", min_area=5.0, max_area=4.0)]
+    codes = [i.code for i in screen(req)]
+    assert codes == ["area_bounds", "fixed_area"]
+
+    req.crop_area_bounds = [CropAreaBound(crop_id="C1", min_area=5.0)]
+    req.fixed_areas = [FixedArea(land_tag="south", crop_id="C1", area=3.0)]
+    # The model ignores fixed areas whose tag matches no land
+    assert [i.code for i in screen(req)] == ["land_area"]
+
+
+def test_screened_result_is_cacheable() -> None:
+    result = OptimizationResult(
+        status="infeasible", stats={"screening": [{"code": "land_area"}]}
+    )
+    assert is_cacheable(result)
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import json
+
+from lib.planner import plan
+from lib.schemas import (
+    Crop,
+    CropAreaBound,
+    Event,
+    Horizon,
+    Land,
+    PlanRequest,
+    Worker,
+)
+
+
+def _request(min_area: float | None = None) -> PlanRequest:
+    return PlanRequest(
+        horizon=Horizon(num_days=3),
+        crops=[Crop(id="C1", name="A", price_per_area=100.0)],
+        events=[
+            Event(
+                id="E1",
+                crop_id="C1",
+                name="plant",
+                start_cond={1, 2, 3},
+                end_cond={1, 2, 3},
+                labor_total_per_area=1.0,
+                uses_land=True,
+            )
+        ],
+        lands=[Land(id="L1", name="F1", area=1.0)],
+        workers=[Worker(id="W1", name="w", capacity_per_day=8.0)],
+        resources=[],
+        crop_area_bounds=[CropAreaBound(crop_id="C1", min_area=min_area)]
+        if min_area is not None
+        else None,
+    )
+
+
+def test_stage_summaries_include_search_stats() -> None:
+    resp = plan(_request(), stage_order=["profit"])
+    assert resp.diagnostics.feasible
+    assert resp.diagnostics.failed_stage is None
+    search = resp.diagnostics.stages[0]["search"]
+    assert search["best_objective_bound"] is not None
+    assert search["gap"] == 0.0
+    assert search["num_branches"] >= 0
+    assert search["presolve"]["model_variables"] > 0
+    assert search["presolve"]["model_constraints"] > 0
+    # Persisted with job results as JSON
+    json.dumps(resp.diagnostics.model_dump(mode="json"), allow_nan=False)
+
+
+def test_failed_stage_keeps_search_stats() -> None:
+    # Skip screening, which would reject min_area > land area before solving
+    resp = plan(_request(min_area=5.0), stage_order=["profit"], screening=False)
+    assert not resp.diagnostics.feasible
+    failed = resp.diagnostics.failed_stage
+    assert failed is not None
+    assert failed["name"] == "profit"
+    assert failed["status"] == "INFEASIBLE"
+    assert failed["search"]["gap"] is None
+    json.dumps(resp.diagnostics.model_dump(mode="json"), allow_nan=False)
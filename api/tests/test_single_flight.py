@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+from functools import partial
+
+import pytest
+
+from core import config
+from lib.model_builder import build_model
+from lib.schemas import Crop, Horizon, Land, PlanRequest
+from lib.solver import solve
+from lib.solver_profiles import SolverProfile
+from schemas import (
+    ApiCrop,
+    ApiEvent,
+    ApiHorizon,
+    ApiLand,
+    ApiPlan,
+    OptimizationRequest,
+    OptimizationResult,
+)
+from services.admission import AdmissionController
+from services.job_backend import InMemoryJobBackend
+from services.optimizer_adapter import solve_sync_with_timeout
+from services.single_flight import FlightAbandoned, SingleFlight
+
+
+def _request() -> OptimizationRequest:
+    return OptimizationRequest(
+        plan=ApiPlan(
+            horizon=ApiHorizon(num_days=2, start_date=date(2025, 3, 1)),
+            crops=[ApiCrop(id="c1", name="作物", price_per_a=1000)],
+            events=[ApiEvent(id="e1", crop_id="c1", name="播種", uses_land=True)],
+            lands=[ApiLand(id="L1", name="畑1", area_a=10)],
+            workers=[],
+            resources=[],
+        )
+    )
+
+
+class _GatedSolve:
+    """Fake solve_sync that blocks until released and counts calls."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.release = threading.Event()
+
+    def __call__(self, _req, *, progress_cb=None) -> OptimizationResult:
+        self.calls += 1
+        while not self.release.wait(0.01):
+            if progress_cb is not None:
+                progress_cb(0.5, "stage:profit")
+        return OptimizationResult(
+            status="ok", objective_value=1.0, solution={}, stats={}, warnings=[]
+        )
+
+
+def test_concurrent_joins_share_one_call() -> None:
+    flights = SingleFlight()
+    gate = threading.Event()
+    calls: list[int] = []
+
+    def fn(_cb):
+        calls.append(1)
+        gate.wait(2)
+        return "done"
+
+    a = flights.join("k", fn)
+    b = flights.join("k", fn)
+    assert a.leader and not b.leader
+    gate.set()
+    assert a.wait(2) == "done" and b.wait(2) == "done"
+    assert len(calls) == 1
+    assert not flights.in_flight("k")
+
+
+def test_flight_stops_when_all_members_leave() -> None:
+    flights = SingleFlight()
+
+    def fn(cb):
+        for _ in range(200):
+            cb(0.1, "tick")
+            time.sleep(0.01)
+        return "finished"
+
+    ticket = flights.join("k", fn)
+    ticket.leave()
+    with pytest.raises(FlightAbandoned):
+        ticket.wait(2)
+
+
+def test_flights_beyond_the_limit_queue() -> None:
+    flights = SingleFlight(max_workers=1)
+    gate = threading.Event()
+    started: list[str] = []
+
+    def fn(key):
+        def run(_cb):
+            started.append(key)
+            gate.wait(2)
+            return key
+
+        return run
+
+    a = flights.join("a", fn("a"))
+    b = flights.join("b", fn("b"))
+    time.sleep(0.1)
+    assert started == ["a"]
+    gate.set()
+    assert a.wait(2) == "a" and b.wait(2) == "b"
+    assert started == ["a", "b"]
+
+
+def test_leaving_stops_the_running_search(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("CP_NUM_WORKERS", "1")
+    config.reload_settings()
+    req = PlanRequest(
+        horizon=Horizon(num_days=1),
+        crops=[Crop(id="C", name="C", price_per_area=1)],
+        events=[],
+        lands=[Land(id="L", name="L", area=1)],
+        workers=[],
+        resources=[],
+    )
+    ctx = build_model(req, [], [])
+    # A knapsack that one worker without presolve or LP cannot close quickly
+    xs = [ctx.model.NewBoolVar(f"x{i}") for i in range(60)]
+    ctx.model.Add(sum((i % 7 + 3) * x for i, x in enumerate(xs)) <= 101)
+    ctx.model.Add(sum((i % 11 + 2) * x for i, x in enumerate(xs)) <= 97)
+    ctx.model.Maximize(sum((i % 5 + 2) * x for i, x in enumerate(xs)))
+    slow = SolverProfile("slow", cp_model_presolve=False, linearization_level=0)
+    flights = SingleFlight()
+    try:
+        ticket = flights.join(
+            "k", lambda _cb: solve(ctx, profile=slow, time_limit_s=60)
+        )
+        time.sleep(0.5)
+        t0 = time.perf_counter()
+        ticket.leave()
+        with pytest.raises(FlightAbandoned):
+            ticket.wait(10)
+        assert time.perf_counter() - t0 < 5
+    finally:
+        monkeypatch.delenv("CP_NUM_WORKERS")
+        config.reload_settings()
+
+
+def test_sync_callers_coalesce(monkeypatch: pytest.MonkeyPatch) -> None:
+    fake = _GatedSolve()
+    monkeypatch.setattr("services.optimizer_adapter.solve_sync", fake)
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        futs = [ex.submit(solve_sync_with_timeout, _request(), 5000) for _ in range(3)]
+        time.sleep(0.1)
+        fake.release.set()
+        results = [f.result(timeout=5) for f in futs]
+    assert fake.calls == 1
+    assert all(r.status == "ok" for r in results)
+
+
+def test_admission_is_held_once_for_the_whole_solve(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fake = _GatedSolve()
+    # A solve that does not report progress runs on after its callers left
+    monkeypatch.setattr(
+        "services.optimizer_adapter.solve_sync",
+        lambda req, *, progress_cb=None: fake(req),
+    )
+    admission = AdmissionController(2, max_queue=0)
+    admit = partial(admission.admit, 1)
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        futs = [
+            ex.submit(solve_sync_with_timeout, _request(), 5000, admit=admit)
+            for _ in range(3)
+        ]
+        time.sleep(0.1)
+        assert admission.snapshot()["in_use"] == 1
+        fake.release.set()
+        assert all(f.result(timeout=5).status == "ok" for f in futs)
+    assert admission.snapshot()["in_use"] == 0
+
+    fake.release.clear()
+    assert solve_sync_with_timeout(_request(), 100, admit=admit).status == "timeout"
+    assert admission.snapshot()["in_use"] == 1
+    fake.release.set()
+    for _ in range(100):
+        if admission.snapshot()["in_use"] == 0:
+            break
+        time.sleep(0.01)
+    assert admission.snapshot()["in_use"] == 0
+
+
+def test_jobs_attach_and_survive_partial_cancel(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    fake = _GatedSolve()
+    monkeypatch.setattr("services.optimizer_adapter.solve_sync", fake)
+    backend = InMemoryJobBackend(max_workers=2)
+    try:
+        first = backend.enqueue(_request())
+        second = backend.enqueue(_request())
+        for _ in range(100):
+            if backend.get(second.job_id).status == "running":
+                break
+            time.sleep(0.01)
+        assert backend.cancel(first.job_id)
+        for _ in range(100):
+            if backend.get(first.job_id).status == "canceled":
+                break
+            time.sleep(0.01)
+        assert backend.get(first.job_id).status == "canceled"
+        fake.release.set()
+        for _ in range(200):
+            if backend.get(second.job_id).status == "succeeded":
+                break
+            time.sleep(0.01)
+        assert backend.get(second.job_id).status == "succeeded"
+        assert fake.calls == 1
+    finally:
+        fake.release.set()
+        backend.shutdown(wait=True)
@@ -0,0 +1,82 @@
+from __future__ import annotations
+
+import pytest
+from ortools.sat.python import cp_model
+
+from lib.planner import plan
+from lib.schemas import Crop, Event, Horizon, Land, PlanRequest, Worker
+from lib.solver import SolveOutcome
+from lib.solver_profiles import LARGE_MODEL_VARIABLES, default_profile
+
+
+def _request() -> PlanRequest:
+    return PlanRequest(
+        horizon=Horizon(num_days=3),
+        crops=[
+            Crop(id="C1", name="A", price_per_area=100.0),
+            Crop(id="C2", name="B", price_per_area=60.0),
+        ],
+        events=[
+            Event(
+                id="E1",
+                crop_id="C1",
+                name="plant",
+                start_cond={1, 2, 3},
+                end_cond={1, 2, 3},
+                labor_total_per_area=1.0,
+                uses_land=True,
+            )
+        ],
+        lands=[Land(id="L1", name="F1", area=1.0)],
+        workers=[Worker(id="W1", name="w", capacity_per_day=8.0)],
+        resources=[],
+    )
+
+
+def test_default_profile_by_stage_and_size() -> None:
+    assert default_profile("profit", 100) == "exact"
+    assert default_profile("profit", LARGE_MODEL_VARIABLES + 1) == "balanced"
+    assert default_profile("earliness", 100) == "fast"
+
+
+def test_effective_parameters_are_echoed_per_stage() -> None:
+    resp = plan(
+        _request(),
+        stage_order=["profit", "earliness"],
+        solver_profile_by={"profit": "deep"},
+    )
+    assert resp.diagnostics.feasible
+    stages = {s["name"]: s for s in resp.diagnostics.stages}
+    assert stages["profit"]["solver"]["name"] == "deep"
+    assert stages["profit"]["solver"]["linearization_level"] == 2
+    assert stages["profit"]["solver"]["relative_gap_limit"] == 0.0
+    assert "max_time_in_seconds" in stages["profit"]["solver"]
+    assert stages["earliness"]["solver"]["name"] == "fast"
+    assert stages["earliness"]["solver"]["relative_gap_limit"] == 0.02
+    assert resp.objectives["profit"] == 100.0
+
+
+def test_unknown_profile_is_rejected() -> None:
+    with pytest.raises(ValueError):
+        plan(_request(), stage_order=["profit"], solver_profile="turbo")
+
+
+def test_gap_limited_optimal_is_not_reported_as_proven() -> None:
+    model = cp_model.CpModel()
+    xs = [model.NewBoolVar(f"x{i}") for i in range(60)]
+    model.Add(sum((i % 7 + 3) * x for i, x in enumerate(xs)) <= 101)
+    model.Add(sum((i % 11 + 2) * x for i, x in enumerate(xs)) <= 97)
+    model.Maximize(sum((i % 5 + 2) * x for i, x in enumerate(xs)))
+    solver = cp_model.CpSolver()
+    # A loose bound (no presolve, no LP) and a gap limit any solution meets
+    solver.parameters.num_workers = 1
+    solver.parameters.cp_model_presolve = False
+    solver.parameters.linearization_level = 0
+    solver.parameters.relative_gap_limit = 10.0
+    solver.parameters.max_time_in_seconds = 5.0
+    status = solver.Solve(model)
+    assert status == cp_model.OPTIMAL
+    out = SolveOutcome.of(solver, model, status)
+    assert out.status == "FEASIBLE" and out.solved
+    assert out.search_stats["gap"] > 0
+    assert out.search_stats["gap_limited"] is True
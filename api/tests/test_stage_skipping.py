@@ -0,0 +1,51 @@
+from __future__ import annotations
+
+from lib.planner import plan
+from lib.schemas import Crop, Event, Horizon, Land, PlanRequest, Worker
+
+
+def _single_crop_request() -> PlanRequest:
+    # Only a land-using event -> event_span has no terms; one crop -> diversity<=1
+    return PlanRequest(
+        horizon=Horizon(num_days=3),
+        crops=[Crop(id="C1", name="A", price_per_area=100.0)],
+        events=[
+            Event(
+                id="E1",
+                crop_id="C1",
+                name="plant",
+                start_cond={1, 2, 3},
+                end_cond={1, 2, 3},
+                labor_total_per_area=1.0,
+                uses_land=True,
+            )
+        ],
+        lands=[Land(id="L1", name="F1", area=1.0)],
+        workers=[Worker(id="W1", name="w", capacity_per_day=8.0)],
+        resources=[],
+    )
+
+
+def test_constant_and_bounded_stages_are_skipped() -> None:
+    resp = plan(
+        _single_crop_request(), stage_order=["profit", "event_span", "diversity"]
+    )
+    assert resp.diagnostics.feasible
+    stages = {s["name"]: s for s in resp.diagnostics.stages}
+    assert "skipped" not in stages["profit"]
+    assert stages["event_span"]["skipped"] is True
+    assert stages["event_span"]["skip_reason"] == "constant objective"
+    assert stages["event_span"]["value"] == 0
+    assert stages["diversity"]["skipped"] is True
+    assert stages["diversity"]["skip_reason"] == "incumbent at bound"
+    assert stages["diversity"]["value"] == 1
+    # The profit incumbent is carried through unchanged
+    assert resp.objectives["profit"] == 100.0
+
+
+def test_first_stage_is_never_skipped() -> None:
+    resp = plan(_single_crop_request(), stage_order=["event_span", "profit"])
+    assert resp.diagnostics.feasible
+    stages = {s["name"]: s for s in resp.diagnostics.stages}
+    assert "skipped" not in stages["event_span"]
+    assert resp.objectives["profit"] == 100.0
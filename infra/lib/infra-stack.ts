@@ -26,6 +26,7 @@ export class InfraStack extends Stack {
   public readonly apiFunction: lambda.Function;
   public readonly workerFunction: lambda.Function;
   public readonly jobQueue: sqs.Queue;
+  public readonly priorityJobQueue: sqs.Queue;
   public readonly jobBucket: s3.Bucket;
   public readonly jobsTable: dynamodb.Table;
   public readonly apiKeysSecret: secretsmanager.Secret;
@@ -66,6 +67,15 @@ export class InfraStack extends Stack {
       },
     });
 
+    // 冪等性キーでの既存ジョブ検索（async enqueue の重複排除）
+    const idemIndexName = 'idem_key-submitted_at-index';
+    this.jobsTable.addGlobalSecondaryIndex({
+      indexName: idemIndexName,
+      partitionKey: { name: 'idem_key', type: dynamodb.AttributeType.STRING },
+      sortKey: { name: 'submitted_at', type: dynamodb.AttributeType.STRING },
+      projectionType: dynamodb.ProjectionType.ALL,
+    });
+
     const deadLetterQueue = new sqs.Queue(this, 'JobDlq', {
       retentionPeriod: Duration.days(14),
       encryption: sqs.QueueEncryption.KMS_MANAGED,
@@ -81,6 +91,18 @@ export class InfraStack extends Stack {
       },
     });
 
+    // 優先度の高い（小さい priority の）ジョブ専用キュー。
+    // 通常キューの滞留（長期の再計画バッチなど）に並ばずにワーカーへ渡す。
+    this.priorityJobQueue = new sqs.Queue(this, 'PriorityJobQueue', {
+      visibilityTimeout: Duration.minutes(15),
+      retentionPeriod: Duration.days(4),
+      encryption: sqs.QueueEncryption.KMS_MANAGED,
+      deadLetterQueue: {
+        maxReceiveCount: 3,
+        queue: deadLetterQueue,
+      },
+    });
+
     this.apiKeysSecret = new secretsmanager.Secret(this, 'ApiKeysSecret', {
       description: 'API keys for the Farm optimization API (JSON payload with keys array).',
       secretStringValue: SecretValue.unsafePlainText(JSON.stringify({ keys: [] })),
@@ -95,6 +117,9 @@ export class InfraStack extends Stack {
       JOB_QUEUE_URL: this.jobQueue.queueUrl,
       JOB_QUEUE_ARN: this.jobQueue.queueArn,
       JOBS_TTL_DAYS: String(jobsTtlDays),
+      JOBS_IDEM_INDEX_NAME: idemIndexName,
+      JOB_PRIORITY_QUEUE_URL: this.priorityJobQueue.queueUrl,
+      JOB_PRIORITY_THRESHOLD: '2',
       API_KEYS_SECRET_ARN: this.apiKeysSecret.secretArn,
       // API Gatewayの統合上限（約29秒）に合わせ、同期APIの自前タイムアウトも調整
       SYNC_TIMEOUT_MS: '29000',
@@ -135,6 +160,11 @@ export class InfraStack extends Stack {
         batchSize: 1,
       }),
     );
+    this.workerFunction.addEventSource(
+      new lambdaEventSources.SqsEventSource(this.priorityJobQueue, {
+        batchSize: 1,
+      }),
+    );
 
     this.jobsTable.grantReadWriteData(this.apiFunction);
     this.jobsTable.grantReadWriteData(this.workerFunction);
@@ -142,6 +172,8 @@ export class InfraStack extends Stack {
     this.jobBucket.grantReadWrite(this.workerFunction);
     this.jobQueue.grantSendMessages(this.apiFunction);
     this.jobQueue.grantConsumeMessages(this.workerFunction);
+    this.priorityJobQueue.grantSendMessages(this.apiFunction);
+    this.priorityJobQueue.grantConsumeMessages(this.workerFunction);
     this.apiKeysSecret.grantRead(this.apiFunction);
 
     this.apiFunction.addToRolePolicy(